@@ -1,7 +1,6 @@
 import os
 import time
 import basis.robot_math as rm
-import networkx as nx
 import numpy as np
 import visualization.panda.world as wd
 import modeling.collision_model as mcm
@@ -31,11 +30,7 @@ if __name__ == '__main__':
     goal_node_list = fsreg_planner.add_goal_pose(
         obj_pose=(np.array([.4, -.2, 0]), rm.rotmat_from_euler(np.pi / 3, np.pi / 6, 0)))
 
-    min_path = None
-    for start in start_node_list:
-        for goal in goal_node_list:
-            path = nx.shortest_path(fsreg_planner.fsreg_graph, source=start, target=goal)
-            min_path = path if min_path is None else path if len(path) < len(min_path) else min_path
+    min_path = fsreg_planner.plan(start_node_list, goal_node_list)
 
     print(min_path)
     fsreg_planner.show_graph_with_path(min_path)
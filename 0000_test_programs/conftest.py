@@ -0,0 +1,8 @@
+import os
+import sys
+
+# the tests import the packages of the repository (basis, modeling, robot_sim, ...) from its root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# scripts that need data files or packages outside the repository
+collect_ignore = ["urdf_parser_test.py"]
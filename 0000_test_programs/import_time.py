@@ -0,0 +1,86 @@
+"""
+Cold-start import time of the robot_sim stack
+Every module is imported in a fresh interpreter, so that the numbers include all the dependencies it pulls in.
+The heavy optional dependencies that got imported are listed as well; they should stay empty for robot modules.
+usage: python import_time.py [module_name ...] [--repeat 5]
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["sklearn", "matplotlib", "networkx", "shapely", "scipy.optimize", "scipy.interpolate"]
+
+_PROBE = """
+import sys, time, json
+tic = time.perf_counter()
+import {module_name}
+toc = time.perf_counter()
+print(json.dumps({{"seconds": toc - tic, "heavy": [name for name in {heavy} if name in sys.modules]}}))
+"""
+
+
+def list_robot_modules(root_dir):
+    """
+    the files are listed instead of walking the package, since walking would import the subpackages
+    :param root_dir: the root of the repository
+    :return: names of the robot modules under robot_sim.robots, e.g., robot_sim.robots.xarmlite6_wg.x6wg2
+    """
+    module_name_list = []
+    robots_dir = os.path.join(root_dir, "robot_sim", "robots")
+    for dir_path, dir_names, file_names in os.walk(robots_dir):
+        dir_names[:] = sorted(name for name in dir_names
+                              if name != "meshes" and os.path.isfile(os.path.join(dir_path, name, "__init__.py")))
+        package_name = os.path.relpath(dir_path, root_dir).replace(os.sep, ".")
+        for file_name in sorted(file_names):
+            leaf_name, ext = os.path.splitext(file_name)
+            if ext != ".py" or leaf_name.startswith("_") or leaf_name.endswith("_"):
+                continue
+            module_name_list.append(package_name + "." + leaf_name)
+    return module_name_list
+
+
+def time_import(module_name, repeat=5, root_dir=None):
+    """
+    :param module_name:
+    :param repeat:
+    :param root_dir: the root of the repository, added to PYTHONPATH
+    :return: median seconds, list of heavy modules; None, error message if the import failed
+    """
+    if root_dir is None:
+        root_dir = ROOT_DIR
+    env = dict(os.environ, PYTHONPATH=root_dir + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    probe = _PROBE.format(module_name=module_name, heavy=repr(HEAVY_MODULES))
+    seconds_list = []
+    heavy = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", probe], env=env, cwd=root_dir, capture_output=True, text=True)
+        if result.returncode != 0:
+            return None, result.stderr.strip().split("\n")[-1]
+        record = json.loads(result.stdout.strip().split("\n")[-1])
+        seconds_list.append(record["seconds"])
+        heavy = record["heavy"]
+    return statistics.median(seconds_list), heavy
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("module_names", nargs="*", help="modules to time; all robot modules if not given")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", default=None, help="save the results to this file")
+    args = parser.parse_args()
+    module_name_list = args.module_names if len(args.module_names) > 0 else list_robot_modules(ROOT_DIR)
+    result_dict = {}
+    for module_name in ["basis.robot_math", "modeling.collision_model"] + module_name_list:
+        seconds, info = time_import(module_name, repeat=args.repeat)
+        if seconds is None:
+            print(f"{module_name:<60} failed: {info}")
+            continue
+        result_dict[module_name] = {"seconds": seconds, "heavy": info}
+        print(f"{module_name:<60} {seconds * 1000:8.1f} ms  {' '.join(info)}")
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump(result_dict, f, indent=2)
@@ -0,0 +1,68 @@
+"""
+Time of solving the ik of an interpolated Cartesian path: one robot.ik per pose (seeded by the previous solution)
+against the batched pass of motion.primitives.interplated.InterplatedMotion._ik_along_poses
+The path is a 10cm vertical line with 5mm steps; the median of the repeats is reported, after one warm-up run.
+usage: python interplated_time.py [--repeat 10]
+"""
+import os
+import sys
+import math
+import time
+import types
+import argparse
+import builtins
+import statistics
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# headless, no mesh models are generated
+builtins.base = types.SimpleNamespace(toggle_mesh=False, destroy=lambda: None)
+
+import basis.robot_math as rm
+import motion.primitives.interplated as mpi
+import robot_sim.robots.xarmlite6_wg.x6wg2 as x6g2
+import robot_sim.robots.yumi.yumi as ym
+
+
+def ik_per_pose(robot, pose_list):
+    jv_list = []
+    seed_jnt_values = None
+    for pos, rotmat in pose_list:
+        jnt_values = robot.ik(pos, rotmat, seed_jnt_values=seed_jnt_values)
+        if jnt_values is None:
+            return None
+        jv_list.append(jnt_values)
+        seed_jnt_values = jnt_values
+    return np.array(jv_list)
+
+
+def gen_scenarios():
+    robot = x6g2.XArmLite6WG2()
+    robot.goto_home_conf()
+    yield "x6wg2", robot, robot.gl_tcp_pos + np.array([.05, 0, .15]), robot.gl_tcp_rotmat.copy()
+    robot = ym.Yumi()
+    robot.use_rgt()
+    yield "yumi_rgt", robot, np.array([.55, -.1, .4]), rm.rotmat_from_axangle(np.array([0, 1, 0]), math.pi / 2)
+
+
+def median_seconds(fn, n_repeat):
+    fn()
+    seconds_list = []
+    for _ in range(n_repeat):
+        tic = time.perf_counter()
+        fn()
+        seconds_list.append(time.perf_counter() - tic)
+    return statistics.median(seconds_list)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    for name, robot, start_pos, start_rotmat in gen_scenarios():
+        pose_list = list(rm.interplate_pos_rotmat(start_pos, start_rotmat, start_pos + np.array([0, 0, -.1]),
+                                                  start_rotmat, granularity=.005))
+        interplator = mpi.InterplatedMotion(robot)
+        per_pose = median_seconds(lambda: ik_per_pose(robot, pose_list), args.repeat)
+        batched = median_seconds(lambda: interplator._ik_along_poses(pose_list), args.repeat)
+        print(f"{name}: {len(pose_list)} poses, per pose {per_pose * 1000:.1f} ms, batched {batched * 1000:.1f} ms")
@@ -0,0 +1,34 @@
+"""
+Behavioral checks of modeling._asset_cache
+usage: python -m pytest 0000_test_programs/test_asset_cache.py
+"""
+import os
+import numpy as np
+import basis
+import modeling._asset_cache as mac
+
+_FILE_PATH = os.path.join(basis.__path__[0], "objects", "block.stl")
+
+
+def test_cached_mesh_equals_parsed_mesh(tmp_path, monkeypatch):
+    monkeypatch.setattr(mac, "CACHE_DIR", str(tmp_path))
+    parsed = mac.da.trm.load(_FILE_PATH)
+    for _ in range(2):
+        cached = mac.load_trm_mesh(_FILE_PATH)
+        assert cached.metadata["asset_dir"] == os.path.join(str(tmp_path), mac.file_digest(_FILE_PATH))
+        np.testing.assert_array_equal(cached.vertices, parsed.vertices)
+        np.testing.assert_array_equal(cached.faces, parsed.faces)
+
+
+def test_failed_save_returns_the_parsed_mesh(tmp_path, monkeypatch):
+    monkeypatch.setattr(mac, "CACHE_DIR", str(tmp_path))
+
+    def failing_rename(src, dst):
+        raise OSError("read-only cache")
+
+    monkeypatch.setattr(mac.os, "rename", failing_rename)
+    trm_mesh = mac.load_trm_mesh(_FILE_PATH)
+    assert "asset_dir" not in trm_mesh.metadata
+    assert len(trm_mesh.faces) > 0
+    # the temporary directory is removed and no entry was created
+    assert os.listdir(tmp_path) == []
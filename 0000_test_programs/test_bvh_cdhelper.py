@@ -0,0 +1,78 @@
+"""
+Behavioral checks of the batched ray casting in modeling._bvh_cdhelper
+usage: python -m pytest 0000_test_programs/test_bvh_cdhelper.py
+"""
+import numpy as np
+import basis.robot_math as rm
+import modeling.geometric_model as mgm
+import modeling.collision_model as mcm
+import modeling._bvh_cdhelper as mbvh
+
+
+def _brute_force_hits(vertices, faces, spos, epos):
+    """
+    moller-trumbore against every triangle
+    :return: a sorted list of the parameters of the hits along the segment
+    """
+    triangles = vertices[faces]
+    direction = epos - spos
+    edge1 = triangles[:, 1] - triangles[:, 0]
+    edge2 = triangles[:, 2] - triangles[:, 0]
+    pvec = np.cross(direction, edge2)
+    det = np.einsum('ij,ij->i', edge1, pvec)
+    det[np.abs(det) < 1e-12] = np.nan
+    tvec = spos - triangles[:, 0]
+    u = np.einsum('ij,ij->i', tvec, pvec) / det
+    qvec = np.cross(tvec, edge1)
+    v = qvec @ direction / det
+    t = np.einsum('ij,ij->i', edge2, qvec) / det
+    return sorted(t[(u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0) & (t <= 1)])
+
+
+def _gen_rays(n_rays, rng):
+    spos_array = rng.uniform(-.2, .2, (n_rays, 3))
+    epos_array = rng.uniform(-.2, .2, (n_rays, 3))
+    return spos_array, epos_array
+
+
+def _hit_params(result, spos, epos):
+    if result is None:
+        return []
+    direction = epos - spos
+    return sorted((np.asarray(result[0]) - spos) @ direction / (direction @ direction))
+
+
+def test_ray_hit_agrees_with_brute_force():
+    rng = np.random.default_rng(0)
+    sphere = mgm.gen_sphere(radius=.1)
+    trm_mesh = sphere.trm_mesh
+    vertices, faces = np.asarray(trm_mesh.vertices), np.asarray(trm_mesh.faces)
+    # small leaves and branches, so that the rays traverse several levels
+    bvh = mbvh.TriangleBVH(vertices, faces, leaf_size=2, branch_factor=2)
+    spos_array, epos_array = _gen_rays(200, rng)
+    result_list = bvh.ray_hit(spos_array, epos_array)
+    assert len(result_list) == len(spos_array)
+    n_hit = 0
+    for spos, epos, result in zip(spos_array, epos_array, result_list):
+        expected_t_list = _brute_force_hits(vertices, faces, spos, epos)
+        np.testing.assert_allclose(_hit_params(result, spos, epos), expected_t_list, atol=1e-9)
+        n_hit += result is not None
+    assert 0 < n_hit < len(spos_array)
+
+
+def test_ray_hit_batch_follows_the_pose():
+    rng = np.random.default_rng(1)
+    box = mcm.CollisionModel(mgm.gen_box(xyz_lengths=np.array([.2, .1, .05])))
+    spos_array, epos_array = _gen_rays(100, rng)
+    local_result_list = box.ray_hit_batch(spos_array, epos_array)
+    pos, rotmat = np.array([.3, -.1, .2]), rm.rotmat_from_euler(.3, -.5, 1.2)
+    box.pose = (pos, rotmat)
+    result_list = box.ray_hit_batch(spos_array @ rotmat.T + pos, epos_array @ rotmat.T + pos)
+    for local_result, result in zip(local_result_list, result_list):
+        assert (local_result is None) == (result is None)
+        if result is not None:
+            np.testing.assert_allclose(np.asarray(result[0]), np.asarray(local_result[0]) @ rotmat.T + pos,
+                                       atol=1e-9)
+            np.testing.assert_allclose(np.asarray(result[1]), np.asarray(local_result[1]) @ rotmat.T, atol=1e-9)
+            # the normals are unit vectors of the hit faces
+            np.testing.assert_allclose(np.linalg.norm(result[1], axis=1), 1, atol=1e-9)
@@ -0,0 +1,38 @@
+"""
+Behavioral checks of robot_sim._kinematics.collision_checker.CollisionChecker
+usage: python -m pytest 0000_test_programs/test_collision_checker.py
+"""
+import numpy as np
+import modeling.collision_model as mcm
+import robot_sim.robots.xarmlite6_wg.x6wg2 as x6g2
+
+
+def _gen_robots():
+    robot_a = x6g2.XArmLite6WG2()
+    robot_b = x6g2.XArmLite6WG2(pos=np.array([1.5, 0, 0]))
+    # the box overlaps robot_a but is far from robot_b
+    box = mcm.gen_box(xyz_lengths=np.array([.2, .2, .2]), pos=np.array([0, 0, .1]))
+    return robot_a, robot_b, box
+
+
+def test_resident_obstacles():
+    robot_a, _, box = _gen_robots()
+    assert not robot_a.is_collided()
+    assert robot_a.is_collided(obstacle_list=[box])
+    # resident obstacles absent from the next call are removed
+    assert not robot_a.is_collided()
+    box.pos = np.array([.5, .5, .1])
+    assert not robot_a.is_collided(obstacle_list=[box])
+    box.pos = np.array([0, 0, .1])
+    assert robot_a.is_collided(obstacle_list=[box])
+
+
+def test_other_robot_does_not_bring_its_obstacles():
+    robot_a, robot_b, box = _gen_robots()
+    assert not robot_b.is_collided(obstacle_list=[box])
+    # box is resident in robot_b's checker now, but it is not an obstacle of this call
+    assert not robot_a.is_collided(other_robot_list=[robot_b])
+    assert not robot_b.is_collided(obstacle_list=[box])
+    robot_c = x6g2.XArmLite6WG2(pos=np.array([.1, 0, 0]))
+    assert robot_a.is_collided(other_robot_list=[robot_c])
+    assert not robot_a.is_collided()
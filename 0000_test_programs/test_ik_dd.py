@@ -0,0 +1,46 @@
+"""
+Behavioral checks of robot_sim._kinematics.ik_dd.DDIKSolver
+usage: python -m pytest 0000_test_programs/test_ik_dd.py
+"""
+import weakref
+import numpy as np
+import robot_sim._kinematics.ik_dd as rkd
+import robot_sim.robots.xarmlite6_wg.x6wg2 as x6g2
+
+
+def _gen_solver(path):
+    jlc = x6g2.XArmLite6WG2().manipulator.jlc
+    rng = np.random.default_rng(0)
+    np.save(path / "test_ikdd_query.npy", rng.uniform(-1, 1, (100, 6)))
+    np.save(path / "test_ikdd_jnt.npy", rng.uniform(-1, 1, (100, jlc.n_dof)))
+    return rkd.DDIKSolver(jlc, path=str(path), identifier_str="test")
+
+
+def test_buffered_samples_are_saved_at_exit(tmp_path):
+    solver = _gen_solver(tmp_path)
+    for query_point, jnt_values in zip(np.ones((3, 6)), np.ones((3, solver.jlc.n_dof))):
+        assert not solver._add_sample(query_point, jnt_values)
+    # not merged yet
+    assert len(np.load(tmp_path / "test_ikdd_query.npy")) == 100
+    rkd._persist_at_exit(weakref.ref(solver))
+    assert len(solver._query_buffer) == 0
+    assert len(np.load(tmp_path / "test_ikdd_query.npy")) == 103
+    assert len(np.load(tmp_path / "test_ikdd_jnt.npy")) == 103
+
+
+def test_merged_samples_are_saved(tmp_path):
+    solver = _gen_solver(tmp_path)
+    solver._merge_size = 2
+    assert not solver._add_sample(np.zeros(6), np.zeros(solver.jlc.n_dof))
+    assert solver._add_sample(np.zeros(6), np.zeros(solver.jlc.n_dof))
+    assert len(solver._query_buffer) == 0
+    assert len(solver.query_tree.data) == len(solver.jnt_data) == 102
+
+
+def test_persist_data_leaves_no_temporary_files(tmp_path):
+    solver = _gen_solver(tmp_path)
+    solver._add_sample(np.zeros(6), np.zeros(solver.jlc.n_dof))
+    solver.persist_data()
+    solver.persist_data()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["test_ikdd_jnt.npy", "test_ikdd_query.npy"]
+    assert len(np.load(tmp_path / "test_ikdd_query.npy")) == 101
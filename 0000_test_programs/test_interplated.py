@@ -0,0 +1,60 @@
+"""
+Behavioral checks of motion.primitives.interplated.InterplatedMotion
+usage: python -m pytest 0000_test_programs/test_interplated.py
+"""
+import math
+import types
+import builtins
+import numpy as np
+import pytest
+import basis.robot_math as rm
+import motion.primitives.interplated as mpi
+import robot_sim.robots.xarmlite6_wg.x6wg2 as x6g2
+import robot_sim.robots.yumi.yumi as ym
+
+# headless, no mesh models are generated
+if not hasattr(builtins, "base"):
+    builtins.base = types.SimpleNamespace(toggle_mesh=False, destroy=lambda: None)
+
+
+def _gen_x6wg2():
+    robot = x6g2.XArmLite6WG2()
+    robot.goto_home_conf()
+    return robot, robot.gl_tcp_pos + np.array([.05, 0, .15]), robot.gl_tcp_rotmat.copy()
+
+
+def _gen_yumi():
+    robot = ym.Yumi()
+    robot.use_rgt()
+    return robot, np.array([.55, -.1, .4]), rm.rotmat_from_axangle(np.array([0, 1, 0]), math.pi / 2)
+
+
+def _ik_per_pose(robot, pose_list):
+    jv_list = []
+    seed_jnt_values = None
+    for pos, rotmat in pose_list:
+        jnt_values = robot.ik(pos, rotmat, seed_jnt_values=seed_jnt_values)
+        assert jnt_values is not None
+        jv_list.append(jnt_values)
+        seed_jnt_values = jnt_values
+    return np.array(jv_list)
+
+
+@pytest.mark.parametrize("gen_robot", [_gen_x6wg2, _gen_yumi])
+def test_ik_along_poses_is_continuous_and_reaches_the_poses(gen_robot):
+    robot, start_pos, start_rotmat = gen_robot()
+    pose_list = list(rm.interplate_pos_rotmat(start_pos, start_rotmat, start_pos + np.array([0, 0, -.1]),
+                                              start_rotmat, granularity=.005))
+    jv_array = mpi.InterplatedMotion(robot)._ik_along_poses(pose_list)
+    assert jv_array.shape == (len(pose_list), len(robot.home_conf))
+    for jnt_values, (pos, rotmat) in zip(jv_array, pose_list):
+        gl_pos, gl_rotmat = robot.fk(jnt_values)
+        np.testing.assert_allclose(gl_pos, pos, atol=1e-3)
+        assert np.linalg.norm(rm.delta_w_between_rotmat(gl_rotmat, rotmat)) < 1e-2
+    reference = _ik_per_pose(robot, pose_list)
+    # 5mm steps do not need large joint steps, neither per pose nor batched
+    max_step = np.abs(np.diff(jv_array, axis=0)).max()
+    assert max_step < .1
+    assert max_step < 2 * np.abs(np.diff(reference, axis=0)).max()
+    # same branch as solving pose by pose
+    np.testing.assert_allclose(jv_array, reference, atol=.01)
@@ -0,0 +1,66 @@
+"""
+Behavioral checks of the batched kinematics JLChain.fk_batch and JLChain.ik_batch
+usage: python -m pytest 0000_test_programs/test_jlchain_batch.py
+"""
+import numpy as np
+import robot_sim._kinematics.ik_num as rkn
+import robot_sim.robots.xarmlite6_wg.x6wg2 as x6g2
+
+
+def _gen_jlc_and_confs(n_confs=50):
+    jlc = x6g2.XArmLite6WG2().manipulator.jlc
+    rng = np.random.default_rng(0)
+    jnt_values_array = rng.uniform(jlc.jnt_ranges[:, 0], jlc.jnt_ranges[:, 1], (n_confs, jlc.n_dof))
+    return jlc, jnt_values_array
+
+
+def test_fk_batch_agrees_with_fk():
+    jlc, jnt_values_array = _gen_jlc_and_confs()
+    jnt_values = jlc.get_jnt_values()
+    pos_array, rotmat_array, j_mat_array = jlc.fk_batch(jnt_values_array, toggle_jacobian=True)
+    assert pos_array.shape == (len(jnt_values_array), 3)
+    assert rotmat_array.shape == (len(jnt_values_array), 3, 3)
+    assert j_mat_array.shape == (len(jnt_values_array), 6, jlc.n_dof)
+    for i, each_jnt_values in enumerate(jnt_values_array):
+        pos, rotmat, j_mat = jlc.fk(each_jnt_values, toggle_jacobian=True)
+        np.testing.assert_allclose(pos_array[i], pos, atol=1e-12)
+        np.testing.assert_allclose(rotmat_array[i], rotmat, atol=1e-12)
+        np.testing.assert_allclose(j_mat_array[i], j_mat, atol=1e-12)
+    # internal values are not updated
+    np.testing.assert_allclose(jlc.get_jnt_values(), jnt_values)
+    # a single conf is accepted as a 1xn_dof batch
+    pos_array, rotmat_array = jlc.fk_batch(jnt_values_array[0])
+    np.testing.assert_allclose(pos_array[0], jlc.fk(jnt_values_array[0])[0], atol=1e-12)
+
+
+def _assert_solutions_reach(jlc, pos_array, rotmat_array, result_array, success_mask):
+    assert np.all(np.isnan(result_array[~success_mask]))
+    reached_pos_array, reached_rotmat_array = jlc.fk_batch(result_array[success_mask])
+    np.testing.assert_allclose(reached_pos_array, pos_array[success_mask], atol=1e-3)
+    np.testing.assert_allclose(reached_rotmat_array, rotmat_array[success_mask], atol=1e-2)
+
+
+def test_ik_batch_reaches_the_targets():
+    jlc, jnt_values_array = _gen_jlc_and_confs()
+    pos_array, rotmat_array = jlc.fk_batch(jnt_values_array)
+    result_array, success_mask = jlc.ik_batch(pos_array, rotmat_array)
+    assert success_mask.mean() > .7
+    # every target solved by the ddik solver one by one is solved by the batch, which explores all k nearest seeds
+    for i in range(len(pos_array)):
+        if jlc._ik_solver(tgt_pos=pos_array[i], tgt_rotmat=rotmat_array[i], toggle_evolve=False) is not None:
+            assert success_mask[i]
+    _assert_solutions_reach(jlc, pos_array, rotmat_array, result_array, success_mask)
+
+
+def test_num_ik_batch_agrees_with_seeded_ik():
+    jlc, jnt_values_array = _gen_jlc_and_confs(20)
+    pos_array, rotmat_array = jlc.fk_batch(jnt_values_array)
+    # seeds near the solutions
+    seed_array = jnt_values_array + np.random.default_rng(1).uniform(-.1, .1, jnt_values_array.shape)
+    solver = rkn.NumIKSolver(jlc)
+    result_array, success_mask = solver.ik_batch(pos_array, rotmat_array, seed_jnt_values_array=seed_array)
+    assert np.all(success_mask)
+    _assert_solutions_reach(jlc, pos_array, rotmat_array, result_array, success_mask)
+    for i in range(len(seed_array)):
+        assert (solver(tgt_pos=pos_array[i], tgt_rotmat=rotmat_array[i], seed_jnt_values=seed_array[i]) is not
+                None)
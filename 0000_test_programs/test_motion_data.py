@@ -0,0 +1,87 @@
+"""
+Behavioral checks of motion.motion_data.MotionData
+usage: python -m pytest 0000_test_programs/test_motion_data.py
+"""
+import numpy as np
+import modeling.collision_model as mcm
+import motion.motion_data as motd
+import robot_sim.robots.xarmlite6_wg.x6wg2 as x6g2
+import robot_sim.robots.yumi.yumi as ym
+
+
+def _n_models(m_col):
+    return len(m_col.cm_list) + len(m_col.gm_list)
+
+
+def _gen_robot_and_box():
+    robot = x6g2.XArmLite6WG2()
+    box = mcm.gen_box(xyz_lengths=np.array([.02, .02, .02]), pos=robot.gl_tcp_pos)
+    return robot, box
+
+
+def test_lazy_mesh_ignores_objects_held_later():
+    robot, box = _gen_robot_and_box()
+    mot_data = motd.MotionData(robot)
+    mot_data.extend([robot.get_jnt_values(), robot.rand_conf()])
+    n_bare = _n_models(robot.gen_meshmodel())
+    robot.hold(obj_cmodel=box)
+    box_pose = (box.pos.copy(), box.rotmat.copy())
+    for mesh in mot_data.mesh_list:
+        assert _n_models(mesh) == n_bare
+    # the hold state and the held object are left as they were
+    assert len(robot.oiee_list) == 1
+    np.testing.assert_allclose(box.pos, box_pose[0])
+    np.testing.assert_allclose(box.rotmat, box_pose[1])
+    assert _n_models(robot.gen_meshmodel()) == n_bare + 1
+
+
+def test_posed_mesh_ignores_objects_held_later():
+    robot, box = _gen_robot_and_box()
+    mot_data = motd.MotionData(robot)
+    mot_data.extend([robot.get_jnt_values()])
+    posable_meshmodel = robot.gen_posable_meshmodel()
+    n_bare = _n_models(posable_meshmodel.m_col)
+    robot.hold(obj_cmodel=box)
+    assert _n_models(mot_data.get_posed_mesh(0, posable_meshmodel).m_col) == n_bare
+    assert len(robot.oiee_list) == 1
+
+
+def test_meshes_recorded_while_holding_keep_the_object():
+    robot, box = _gen_robot_and_box()
+    mot_data = motd.MotionData(robot)
+    robot.hold(obj_cmodel=box)
+    mot_data.extend([robot.get_jnt_values()])
+    n_holding = _n_models(robot.gen_meshmodel())
+    robot.release(obj_cmodel=box)
+    assert _n_models(mot_data.get_mesh(0)) == n_holding
+
+
+def _cm_poses(m_col):
+    return [cm.homomat for cm in m_col.cm_list]
+
+
+def _assert_same_poses(m_col_a, m_col_b):
+    poses_a, poses_b = _cm_poses(m_col_a), _cm_poses(m_col_b)
+    assert len(poses_a) == len(poses_b)
+    for pose_a, pose_b in zip(poses_a, poses_b):
+        np.testing.assert_allclose(pose_a, pose_b, atol=1e-9)
+
+
+def test_lazy_mesh_keeps_the_state_of_extending_on_dual_arm_robots():
+    robot = ym.Yumi()
+    robot.use_rgt()
+    jnt_values = robot.rand_conf()
+    mot_data = motd.MotionData(robot)
+    mot_data.extend([jnt_values])
+    robot.backup_state()
+    robot.goto_given_conf(jnt_values)
+    reference = robot.gen_meshmodel()
+    robot.restore_state()
+    # switch the delegator, move the other arm, and move the base after extending
+    robot.use_lft()
+    robot.goto_given_conf(robot.rand_conf())
+    robot.fix_to(pos=np.array([.3, .2, .1]), rotmat=np.eye(3))
+    _assert_same_poses(mot_data.get_mesh(0), reference)
+    posable_meshmodel = robot.gen_posable_meshmodel()
+    _assert_same_poses(mot_data.get_posed_mesh(0, posable_meshmodel).m_col, reference)
+    assert robot.delegator is robot.lft_arm
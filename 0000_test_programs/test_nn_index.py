@@ -0,0 +1,90 @@
+"""
+Behavioral checks of the incremental nearest neighbour indices in motion.probabilistic.nn_index
+usage: python -m pytest 0000_test_programs/test_nn_index.py
+"""
+import numpy as np
+import pytest
+import motion.probabilistic.nn_index as mpnn
+
+BACKENDS = ["kdtree", "rtree"]
+
+
+def _gen_nn_index(backend, dimension=3):
+    if backend == "rtree":
+        pytest.importorskip("rtree")
+    return mpnn.gen_nn_index(dimension=dimension, backend=backend)
+
+
+def _assert_agrees_with_brute_force(nn_index, conf_dict, rng, radius=.2):
+    assert len(nn_index) == len(conf_dict)
+    assert set(nn_index.nid_list) == set(conf_dict)
+    nid_array = np.array(list(conf_dict))
+    conf_array = np.array(list(conf_dict.values()))
+    for query in rng.uniform(-1, 1, (50, nn_index.dimension)):
+        dist_array = np.linalg.norm(conf_array - query, axis=1)
+        assert nn_index.nearest(query) == nid_array[np.argmin(dist_array)]
+        assert set(nn_index.nearby(query, radius=radius)) == set(nid_array[dist_array <= radius].tolist())
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_insert(backend):
+    rng = np.random.default_rng(0)
+    nn_index = _gen_nn_index(backend)
+    conf_dict = {}
+    # crosses the initial capacity and several rebuilds of the kd tree
+    for nid in range(3000):
+        conf_dict[nid] = rng.uniform(-1, 1, 3)
+        nn_index.insert(nid, conf_dict[nid])
+        if nid in (0, 10, 100, 1023, 1024, 2999):
+            _assert_agrees_with_brute_force(nn_index, conf_dict, rng)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_remove(backend):
+    rng = np.random.default_rng(1)
+    nn_index = _gen_nn_index(backend)
+    conf_dict = {}
+    for nid in range(2000):
+        conf_dict[nid] = rng.uniform(-1, 1, 3)
+        nn_index.insert(nid, conf_dict[nid])
+        if nid % 100 == 99:
+            removed_nid_set = set(rng.choice(list(conf_dict), size=30, replace=False).tolist())
+            # nids that are not in the index are ignored
+            nn_index.remove(removed_nid_set | {-1})
+            for removed_nid in removed_nid_set:
+                conf_dict.pop(removed_nid)
+            _assert_agrees_with_brute_force(nn_index, conf_dict, rng)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_removed_nearest_confs_are_skipped(backend):
+    rng = np.random.default_rng(2)
+    nn_index = _gen_nn_index(backend)
+    conf_dict = {nid: rng.uniform(-1, 1, 3) for nid in range(500)}
+    for nid, conf in conf_dict.items():
+        nn_index.insert(nid, conf)
+    # remove the confs nearest to the origin, fewer than needed to drop them from the kd tree
+    removed_nid_list = sorted(conf_dict, key=lambda nid: np.linalg.norm(conf_dict[nid]))[:20]
+    nn_index.remove(set(removed_nid_list))
+    for removed_nid in removed_nid_list:
+        conf_dict.pop(removed_nid)
+    assert nn_index.nearest(np.zeros(3)) == min(conf_dict, key=lambda nid: np.linalg.norm(conf_dict[nid]))
+    _assert_agrees_with_brute_force(nn_index, conf_dict, rng)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_empty_index(backend):
+    nn_index = _gen_nn_index(backend)
+    with pytest.raises(ValueError):
+        nn_index.nearest(np.zeros(3))
+    assert nn_index.nearby(np.zeros(3), radius=1) == []
+    # every conf removed, in the kd tree and in the buffer
+    for nid in range(100):
+        nn_index.insert(nid, np.full(3, nid / 100))
+    nn_index.remove(set(range(100)))
+    assert len(nn_index) == 0
+    with pytest.raises(ValueError):
+        nn_index.nearest(np.zeros(3))
+    assert nn_index.nearby(np.zeros(3), radius=10) == []
+    nn_index.insert("a", np.ones(3))
+    assert nn_index.nearest(np.zeros(3)) == "a"
@@ -0,0 +1,115 @@
+"""
+Behavioral checks of the persistent primitive collision detection in modeling._panda_cdhelper
+usage: python -m pytest 0000_test_programs/test_panda_cdhelper.py
+"""
+import gc
+import threading
+import weakref
+import numpy as np
+import basis.robot_math as rm
+import modeling.constant as mc
+import modeling.collision_model as mcm
+import modeling._panda_cdhelper as mph
+
+
+def _gen_models():
+    box = mcm.gen_box(xyz_lengths=np.array([.1, .1, .1]))
+    sphere_list = [mcm.gen_sphere(pos=np.array([.3 * i, 0, 0]), radius=.05) for i in range(3)]
+    return box, sphere_list
+
+
+def test_is_pcdwith_follows_moves_and_lists():
+    box, sphere_list = _gen_models()
+    assert box.is_pcdwith(sphere_list)
+    box.pos = np.array([.15, 0, 0])
+    assert not box.is_pcdwith(sphere_list)
+    box.pos = np.array([.3, 0, 0])
+    assert box.is_pcdwith(sphere_list)
+    # obstacles absent from the next call are not resident anymore
+    assert not box.is_pcdwith(sphere_list[:1])
+    sphere_list[0].pos = np.array([.3, .02, 0])
+    assert box.is_pcdwith(sphere_list[0])
+    # roles are exchangeable
+    assert sphere_list[0].is_pcdwith(box)
+
+
+def test_contacts():
+    box, sphere_list = _gen_models()
+    box.pos = np.array([.3, 0, 0])
+    is_collided, contact_points = box.is_pcdwith(sphere_list, toggle_contacts=True)
+    assert is_collided
+    assert np.all(np.linalg.norm(contact_points - np.array([.3, 0, 0]), axis=1) < .1)
+    box.pos = np.array([.15, 0, 0])
+    is_collided, contact_points = box.is_pcdwith(sphere_list, toggle_contacts=True)
+    assert not is_collided and len(contact_points) == 0
+
+
+def test_light_copies_and_changed_cdprims_are_not_stale():
+    box, sphere_list = _gen_models()
+    box_copy = box.light_copy()
+    box_copy.pos = np.array([.15, 0, 0])
+    assert box.is_pcdwith(sphere_list)
+    assert not box_copy.is_pcdwith(sphere_list)
+    box.pos = np.array([.15, 0, 0])
+    assert not box.is_pcdwith(sphere_list)
+    box.change_cdprim_type(cdprim_type=mc.CDPType.AABB, expand_radius=.2)
+    assert box.is_pcdwith(sphere_list)
+
+
+def test_query_agrees_with_is_collided():
+    box, sphere_list = _gen_models()
+    scene = mph.CollisionScene(obstacle_list=sphere_list, collider_list=[box])
+    pos_list = [np.array([x, 0, 0]) for x in np.linspace(-.2, .8, 21)]
+    result_list = scene.query([[(pos, np.eye(3))] for pos in pos_list])
+    for pos, result in zip(pos_list, result_list):
+        box.pos = pos
+        assert result == scene.is_collided() == box.is_pcdwith(sphere_list)
+
+
+def test_threads_have_their_own_scenes():
+    box, sphere_list = _gen_models()
+    box.pos = np.array([.15, 0, 0])
+    result_list = []
+
+    def check(cmodel, obstacle_list):
+        result_list.append(all(cmodel.is_pcdwith(obstacle_list) for _ in range(200)))
+
+    other_box = mcm.gen_box(xyz_lengths=np.array([.1, .1, .1]), pos=np.array([.6, 0, 0]))
+    thread = threading.Thread(target=check, args=(other_box, sphere_list[2:]))
+    thread.start()
+    for _ in range(200):
+        assert not box.is_pcdwith(sphere_list)
+    thread.join()
+    assert result_list == [True]
+
+
+def test_moves_in_place_are_followed():
+    box, sphere_list = _gen_models()
+    pos = np.array([.15, 0, 0])
+    box.pos = pos
+    assert not box.is_pcdwith(sphere_list)
+    # the same array is modified instead of replaced
+    pos[0] = .3
+    box.pos = pos
+    assert box.is_pcdwith(sphere_list)
+    box.pos[0] = .15
+    assert not box.is_pcdwith(sphere_list)
+    rotmat = np.eye(3)
+    box.rotmat = rotmat
+    box.pos = np.array([.3, .11, 0])
+    assert not box.is_pcdwith(sphere_list)
+    rotmat[:] = rm.rotmat_from_axangle(np.array([0, 0, 1]), np.pi / 4)
+    assert box.is_pcdwith(sphere_list)
+
+
+def test_scene_does_not_keep_models_alive():
+    box, sphere_list = _gen_models()
+    assert box.is_pcdwith(sphere_list)
+    box_ref, sphere_ref = weakref.ref(box), weakref.ref(sphere_list[0])
+    del box, sphere_list
+    gc.collect()
+    assert box_ref() is None and sphere_ref() is None
+    other_box, other_sphere_list = _gen_models()
+    assert other_box.is_pcdwith(other_sphere_list)
+    other_box.pos = np.array([.15, 0, 0])
+    assert not other_box.is_pcdwith(other_sphere_list)
@@ -0,0 +1,44 @@
+"""
+Behavioral checks of motion.trajectory.piecewisepoly_topp.PiecewisePolyTOPP
+usage: python -m pytest 0000_test_programs/test_piecewisepoly_topp.py
+"""
+import math
+import numpy as np
+import pytest
+import motion.trajectory.piecewisepoly_topp as pwpt
+
+
+def _gen_path(seed, n_waypoints=100, step=.1):
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.uniform(-step, step, size=(n_waypoints, 6)), axis=0)
+
+
+@pytest.mark.parametrize("seed, step", [(0, .1), (1, .1), (2, .5), (3, 1.0)])
+@pytest.mark.parametrize("n_grids_per_section", [4, 16])
+def test_sampled_output_respects_limits(seed, step, n_grids_per_section):
+    path = _gen_path(seed, step=step)
+    max_vels = np.array([math.pi * 2 / 3, 1.5, 1.0, 2.0, 2.5, 3.0])
+    max_accs = np.array([math.pi, 2.0, 1.5, 3.0, 4.0, 5.0])
+    tpp = pwpt.PiecewisePolyTOPP(n_grids_per_section=n_grids_per_section)
+    ts, confs, vels, accs = tpp.gen_trajectory(path, control_frequency=.002, max_vels=max_vels, max_accs=max_accs)
+    assert np.all(np.abs(vels) <= max_vels * (1 + 1e-6))
+    assert np.all(np.abs(accs) <= max_accs * (1 + 1e-6))
+    np.testing.assert_allclose(confs[0], path[0], atol=1e-9)
+    np.testing.assert_allclose(confs[-1], path[-1], atol=1e-6)
+    np.testing.assert_allclose(vels[-1], 0, atol=1e-6)
+
+
+def test_default_limits_of_demo_path():
+    ts, confs, vels, accs = pwpt.PiecewisePolyTOPP().gen_trajectory(_gen_path(0, n_waypoints=500))
+    assert np.abs(vels).max() <= math.pi * 2 / 3 * (1 + 1e-6)
+    assert np.abs(accs).max() <= math.pi * (1 + 1e-6)
+    # the limits are reached, i.e., the result is not slowed down needlessly
+    assert np.abs(accs).max() > math.pi * .99
+
+
+def test_refits_only_halve_violating_intervals():
+    path = _gen_path(0, n_waypoints=500)
+    tpp = pwpt.PiecewisePolyTOPP(n_grids_per_section=4)
+    n_grids = tpp.n_grids_per_section * (len(path) - 1)
+    segment = tpp.fit(path)
+    assert n_grids < len(segment._grid) - 1 < 2 * n_grids
@@ -0,0 +1,53 @@
+"""
+Behavioral checks of robot_sim._kinematics.model_generator.PosableMeshModel
+usage: python -m pytest 0000_test_programs/test_posable_meshmodel.py
+"""
+import numpy as np
+import modeling.collision_model as mcm
+import robot_sim.robots.xarmlite6_wg.x6wg2 as x6g2
+import robot_sim.robots.yumi.yumi as ym
+
+
+def _n_models(m_col):
+    return len(m_col.cm_list) + len(m_col.gm_list)
+
+
+def _gen_box(pos):
+    return mcm.gen_box(xyz_lengths=np.array([.02, .02, .02]), pos=pos)
+
+
+def test_update_follows_the_robot():
+    robot = x6g2.XArmLite6WG2()
+    posable_meshmodel = robot.gen_posable_meshmodel()
+    robot.goto_given_conf(robot.rand_conf())
+    posable_meshmodel.update()
+    for posed_cm, cm in zip(posable_meshmodel.m_col.cm_list, robot.gen_meshmodel().cm_list):
+        np.testing.assert_allclose(posed_cm.pdndp.getMat(), cm.pdndp.getMat(), atol=1e-6)
+
+
+def test_update_rebuilds_on_hold_and_release():
+    robot = x6g2.XArmLite6WG2()
+    posable_meshmodel = robot.gen_posable_meshmodel()
+    n_bare = _n_models(posable_meshmodel.m_col)
+    box = _gen_box(robot.gl_tcp_pos)
+    robot.hold(obj_cmodel=box)
+    posable_meshmodel.update()
+    assert _n_models(posable_meshmodel.m_col) == n_bare + 1
+    robot.release(obj_cmodel=box)
+    posable_meshmodel.update()
+    assert _n_models(posable_meshmodel.m_col) == n_bare
+
+
+def test_update_rebuilds_on_holds_of_any_arm():
+    robot = ym.Yumi()
+    posable_meshmodel = robot.gen_posable_meshmodel()
+    n_bare = _n_models(posable_meshmodel.m_col)
+    # the delegator is None, the holds of both arms count
+    robot.rgt_arm.hold(obj_cmodel=_gen_box(robot.rgt_arm.gl_tcp_pos))
+    posable_meshmodel.update()
+    assert _n_models(posable_meshmodel.m_col) == n_bare + 1
+    robot.use_rgt()
+    robot.lft_arm.hold(obj_cmodel=_gen_box(robot.lft_arm.gl_tcp_pos))
+    posable_meshmodel.update()
+    assert _n_models(posable_meshmodel.m_col) == n_bare + 2
+    assert len(robot.all_oiee_list) == 2
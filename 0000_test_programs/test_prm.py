@@ -0,0 +1,59 @@
+"""
+Behavioral checks of motion.probabilistic.prm.PRM
+usage: python -m pytest 0000_test_programs/test_prm.py
+"""
+import random
+import types
+import builtins
+import numpy as np
+import motion.probabilistic.benchmark as mpb
+import motion.probabilistic.prm as prm
+
+# headless, same as motion.probabilistic.benchmark.run_benchmark
+if not hasattr(builtins, "base"):
+    builtins.base = types.SimpleNamespace(toggle_mesh=False, destroy=lambda: None)
+
+
+def _gen_planner(static_obstacle_list, n_samples=300):
+    random.seed(0)
+    np.random.seed(0)
+    scenario = mpb.gen_xybot_clutter(0)
+    planner = prm.PRM(scenario["robot"])
+    planner.build_roadmap(static_obstacle_list=static_obstacle_list, n_samples=n_samples,
+                          ext_dist=scenario["ext_dist"])
+    return planner, scenario
+
+
+def test_smoothing_is_opt_in():
+    planner, scenario = _gen_planner(mpb.gen_xybot_clutter(0)["obstacle_list"])
+    mot_data = planner.plan(scenario["start_conf"], scenario["goal_conf"])
+    assert mot_data is not None
+    assert "smoothing" not in planner.phase_stats
+    smoothed_mot_data = planner.plan(scenario["start_conf"], scenario["goal_conf"], smoothing_n_iter=50)
+    assert "smoothing" in planner.phase_stats
+    assert len(smoothed_mot_data) < len(mot_data)
+    assert mpb.path_length(smoothed_mot_data.jv_list) <= mpb.path_length(mot_data.jv_list) + 1e-9
+
+
+def test_start_only_tries_components_near_the_goal():
+    planner = prm.PRM(mpb.gen_xybot_clutter(0)["robot"])
+    # an obstacle between start and goal; component 0 goes around it, component 1 is next to the start only
+    planner.static_obstacle_list = [((.5, 0), .3)]
+    planner.ext_dist = .05
+    planner.node_confs = np.array([[0, .3], [.5, .3], [1, .3], [-.15, 0], [-.2, .05]])
+    planner.edges = np.array([[0, 1], [1, 2], [3, 4]], dtype=np.int32)
+    planner.edge_lengths = np.linalg.norm(planner.node_confs[planner.edges[:, 0]] -
+                                          planner.node_confs[planner.edges[:, 1]], axis=1)
+    planner._update_adjacency()
+    n_checks = [0]
+    is_segment_collided = planner._is_segment_collided
+
+    def counted_is_segment_collided(*args, **kwargs):
+        n_checks[0] += 1
+        return is_segment_collided(*args, **kwargs)
+
+    planner._is_segment_collided = counted_is_segment_collided
+    mot_data = planner.plan(np.array([0, 0]), np.array([1, 0]), n_neighbors=3)
+    assert mot_data is not None
+    # start-goal, start-node 0, goal-node 2; component 1 is never tried
+    assert n_checks[0] == 3
@@ -0,0 +1,26 @@
+"""
+Behavioral checks of motion.probabilistic.benchmark and the collision model helpers its scenarios use
+usage: python -m pytest 0000_test_programs/test_probabilistic_benchmark.py
+"""
+import numpy as np
+import modeling.collision_model as mcm
+import motion.probabilistic.benchmark as mpb
+
+
+def test_gen_helpers_keep_colors():
+    # panda3d stores colors with limited precision
+    box = mcm.gen_box(xyz_lengths=np.array([.1, .2, .3]), rgb=np.array([0, 1, 0]), alpha=.5)
+    assert np.allclose(box.rgba, [0, 1, 0, .5], atol=1e-2)
+    sphere = mcm.gen_sphere(radius=.05, rgb=np.array([1, 0, 0]), alpha=.3)
+    assert np.allclose(sphere.rgba, [1, 0, 0, .3], atol=1e-2)
+    stick = mcm.gen_stick(epos=np.array([0, 0, .2]), rgb=np.array([0, 0, 1]))
+    assert np.allclose(stick.rgba, [0, 0, 1, 1], atol=1e-2)
+
+
+def test_xybot_scenario_runs():
+    results = mpb.run_benchmark(["xybot_clutter"], ["rrt_connect", "prm"], n_trials=2, max_time=5.0,
+                                prm_n_samples=200, toggle_dbg=False)
+    assert results["errors"] == []
+    assert {summary["planner"] for summary in results["summaries"]} == {"rrt_connect", "prm"}
+    for summary in results["summaries"]:
+        assert summary["success_rate"] > 0
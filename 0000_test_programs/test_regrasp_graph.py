@@ -0,0 +1,104 @@
+"""
+Compares the regrasp search of manipulation.regrasp.FSRegraspGraph with a brute-force bfs over explicit edges
+usage: python -m pytest 0000_test_programs/test_regrasp_graph.py
+"""
+import collections
+import types
+import numpy as np
+import manipulation.regrasp as reg
+
+
+def _gen_graph(rng, n_reference_grasps, n_pgs, max_n_feasible_gids):
+    graph = reg.FSRegraspGraph(n_reference_grasps=n_reference_grasps)
+    for _ in range(n_pgs):
+        n_feasible_gids = rng.integers(0, min(max_n_feasible_gids, n_reference_grasps) + 1)
+        feasible_gids = rng.choice(n_reference_grasps, n_feasible_gids, replace=False).tolist()
+        graph.add_pg(types.SimpleNamespace(feasible_gids=feasible_gids), plot_xy=np.zeros(2))
+    return graph
+
+
+def _is_connected(graph, nid0, nid1):
+    node0 = (graph._node_pgid_list[nid0], graph._node_gid_list[nid0])
+    node1 = (graph._node_pgid_list[nid1], graph._node_gid_list[nid1])
+    return nid0 != nid1 and (node0[0] == node1[0] or node0[1] == node1[1])
+
+
+def _bfs_length(graph, start_node_list, goal_node_list):
+    """
+    :return: the number of edges of the shortest path, or None if the goal is not reachable
+    """
+    adjacency_list = [[nid1 for nid1 in range(len(graph)) if _is_connected(graph, nid0, nid1)]
+                      for nid0 in range(len(graph))]
+    dist_dict = {nid: 0 for nid in start_node_list}
+    queue = collections.deque(start_node_list)
+    while queue:
+        nid = queue.popleft()
+        if nid in goal_node_list:
+            return dist_dict[nid]
+        for next_nid in adjacency_list[nid]:
+            if next_nid not in dist_dict:
+                dist_dict[next_nid] = dist_dict[nid] + 1
+                queue.append(next_nid)
+    return None
+
+
+def _check_search(graph, start_node_list, goal_node_list):
+    path = graph.search(start_node_list, goal_node_list)
+    length = _bfs_length(graph, start_node_list, goal_node_list)
+    if length is None:
+        assert path is None
+        return False
+    assert path is not None
+    assert len(path) - 1 == length
+    assert path[0] in start_node_list and path[-1] in goal_node_list
+    for nid0, nid1 in zip(path[:-1], path[1:]):
+        assert _is_connected(graph, nid0, nid1)
+    return True
+
+
+def test_search_matches_bfs_on_random_graphs():
+    rng = np.random.default_rng(0)
+    n_found = 0
+    n_trials = 300
+    for _ in range(n_trials):
+        graph = _gen_graph(rng,
+                           n_reference_grasps=rng.integers(2, 12),
+                           n_pgs=rng.integers(1, 8),
+                           max_n_feasible_gids=4)
+        if len(graph) < 2:
+            continue
+        start_node_list = rng.choice(len(graph), rng.integers(1, 3), replace=False).tolist()
+        goal_node_list = rng.choice(len(graph), rng.integers(1, 3), replace=False).tolist()
+        n_found += _check_search(graph, start_node_list, goal_node_list)
+    # both connected and disconnected cases are covered
+    assert 0 < n_found < n_trials
+
+
+def test_search_on_start_and_goal_pgs():
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        n_reference_grasps = rng.integers(4, 16)
+        graph = _gen_graph(rng, n_reference_grasps=n_reference_grasps, n_pgs=rng.integers(0, 6),
+                           max_n_feasible_gids=5)
+        start_gids = rng.choice(n_reference_grasps, rng.integers(1, 4), replace=False).tolist()
+        goal_gids = rng.choice(n_reference_grasps, rng.integers(1, 4), replace=False).tolist()
+        start_node_list = graph.add_pg(types.SimpleNamespace(feasible_gids=start_gids), plot_xy=np.zeros(2),
+                                       prefix='start')
+        goal_node_list = graph.add_pg(types.SimpleNamespace(feasible_gids=goal_gids), plot_xy=np.zeros(2),
+                                      prefix='goal')
+        _check_search(graph, start_node_list, goal_node_list)
+
+
+def test_disconnected_graph():
+    graph = reg.FSRegraspGraph(n_reference_grasps=4)
+    start_node_list = graph.add_pg(types.SimpleNamespace(feasible_gids=[0, 1]), plot_xy=np.zeros(2), prefix='start')
+    graph.add_pg(types.SimpleNamespace(feasible_gids=[1, 2]), plot_xy=np.zeros(2))
+    goal_node_list = graph.add_pg(types.SimpleNamespace(feasible_gids=[3]), plot_xy=np.zeros(2), prefix='goal')
+    assert graph.search(start_node_list, goal_node_list) is None
+
+
+def test_iter_edges_matches_explicit_edges():
+    graph = _gen_graph(np.random.default_rng(2), n_reference_grasps=6, n_pgs=6, max_n_feasible_gids=4)
+    edge_set = set(frozenset((nid0, nid1)) for nid0, nid1, _ in graph.iter_edges())
+    assert edge_set == set(frozenset((nid0, nid1)) for nid0 in range(len(graph)) for nid1 in range(len(graph))
+                           if _is_connected(graph, nid0, nid1))
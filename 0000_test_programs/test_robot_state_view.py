@@ -0,0 +1,60 @@
+"""
+Behavioral checks of RobotInterface.gen_state_view
+usage: python -m pytest 0000_test_programs/test_robot_state_view.py
+"""
+import numpy as np
+from concurrent import futures
+import modeling.collision_model as mcm
+import robot_sim.robots.xarmlite6_wg.x6wg2 as x6g2
+
+
+def _gen_robot_and_obj():
+    robot = x6g2.XArmLite6WG2()
+    obj = mcm.gen_box(xyz_lengths=np.array([.02, .02, .05]))
+    obj.pos = np.array([.2, 0, .025])
+    return robot, obj
+
+
+def test_view_owns_poses_and_shares_mesh_data():
+    robot, obj = _gen_robot_and_obj()
+    robot.hold(obj)
+    view = robot.gen_state_view()
+    view.goto_given_conf(robot.get_jnt_values() + .3)
+    view_obj = view.oiee_list[0].cmodel
+    assert view_obj is not obj
+    assert np.allclose(obj.pos, [.2, 0, .025])
+    assert not np.allclose(view_obj.pos, obj.pos)
+    assert view_obj.trm_mesh is obj.trm_mesh
+    assert view_obj.uuid == obj.uuid
+    lnk = robot.manipulator.jlc.jnts[2].lnk
+    view_lnk = view.manipulator.jlc.jnts[2].lnk
+    assert view_lnk.cmodel is not lnk.cmodel
+    assert view_lnk.cmodel.trm_mesh is lnk.cmodel.trm_mesh
+    assert not np.allclose(view_lnk.gl_pos, lnk.gl_pos)
+    assert np.allclose(lnk.cmodel.pos, lnk.gl_pos)
+
+
+def test_views_check_collisions_like_the_robot():
+    robot, obj = _gen_robot_and_obj()
+    obstacle = mcm.gen_box(xyz_lengths=np.array([.1, .1, .1]))
+    obstacle.pos = np.array([.25, 0, .2])
+    rng = np.random.default_rng(0)
+    conf_list = [rng.uniform(robot.jnt_ranges[:, 0], robot.jnt_ranges[:, 1]) for _ in range(40)]
+    expected = []
+    for conf in conf_list:
+        robot.goto_given_conf(conf)
+        expected.append(robot.is_collided(obstacle_list=[obstacle]))
+    assert any(expected) and not all(expected)
+    view_list = [robot.gen_state_view() for _ in range(4)]
+
+    def _check(i):
+        view = view_list[i % len(view_list)]
+        view.goto_given_conf(conf_list[i])
+        return view.is_collided(obstacle_list=[obstacle])
+
+    with futures.ThreadPoolExecutor(max_workers=len(view_list)) as executor:
+        # one task per view at a time, the views are not shared between threads
+        result = []
+        for start in range(0, len(conf_list), len(view_list)):
+            result += list(executor.map(_check, range(start, min(start + len(view_list), len(conf_list)))))
+    assert result == expected
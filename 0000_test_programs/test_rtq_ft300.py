@@ -0,0 +1,84 @@
+"""
+Behavioral checks of the ft300 stream parsing and buffering in robot_con.ur.robotiq.rtq_ft300
+usage: python -m pytest 0000_test_programs/test_rtq_ft300.py
+"""
+import numpy as np
+import robot_con.ur.robotiq.rtq_ft300 as rft
+
+
+def _encode(values_array):
+    return b"".join(b"(" + b" , ".join(b"%.2f" % x for x in values) + b")" for values in values_array)
+
+
+def test_frames_split_and_merged_across_recvs():
+    values_array = np.round(np.random.default_rng(0).uniform(-50, 50, (20, 6)), 2)
+    data = _encode(values_array)
+    parser = rft.FTFrameParser()
+    parsed_list = []
+    # recvs of arbitrary sizes, cutting frames anywhere
+    cut_ids = [0, 1, 7, 60, 61, 200, 333, len(data) - 3, len(data)]
+    for start, end in zip(cut_ids[:-1], cut_ids[1:]):
+        parsed_list.append(parser.feed(data[start:end]))
+    np.testing.assert_allclose(np.vstack(parsed_list), values_array)
+    assert parser.n_bad_frames == 0
+
+
+def test_bad_frames_are_counted_and_skipped():
+    parser = rft.FTFrameParser()
+    parsed = parser.feed(b"garbage(1,2,3)(1,2,3,4,5,6)(1,x,3,4,5,6)" + _encode([[6, 5, 4, 3, 2, 1]]) + b"(7,")
+    np.testing.assert_allclose(parsed, [[1, 2, 3, 4, 5, 6], [6, 5, 4, 3, 2, 1]])
+    assert parser.n_bad_frames == 2
+    # the partial frame is completed by the next recv
+    np.testing.assert_allclose(parser.feed(b"7,7,7,7,7)"), [[7] * 6])
+    assert parser.feed(b"no frame").shape == (0, 6)
+
+
+def test_ring_buffer_windows_and_stats():
+    rng = np.random.default_rng(1)
+    buffer = rft.FTRingBuffer(capacity=50)
+    assert buffer.get_latest() == (None, None)
+    values_list, timestamps_list = [], []
+    for i in range(30):
+        # batches of different sizes, one larger than the capacity
+        k = 70 if i == 10 else int(rng.integers(1, 8))
+        values_array = rng.normal(size=(k, 6))
+        timestamps = i + np.arange(k) / 100
+        buffer.append(values_array, timestamps)
+        values_list.append(values_array)
+        timestamps_list.append(timestamps)
+    all_values = np.vstack(values_list)
+    all_timestamps = np.concatenate(timestamps_list)
+    assert len(buffer) == 50
+    assert buffer.n_samples == len(all_values)
+    values, timestamps = buffer.get_window()
+    np.testing.assert_allclose(values, all_values[-50:])
+    np.testing.assert_allclose(timestamps, all_timestamps[-50:])
+    values, _ = buffer.get_window(5)
+    np.testing.assert_allclose(values, all_values[-5:])
+    latest_values, latest_timestamp = buffer.get_latest()
+    np.testing.assert_allclose(latest_values, all_values[-1])
+    assert latest_timestamp == all_timestamps[-1]
+    values, timestamps = buffer.get_window_by_time(2)
+    np.testing.assert_allclose(timestamps, all_timestamps[-50:][all_timestamps[-50:] >= all_timestamps[-1] - 2])
+    # the running statistics cover all samples since clear
+    stats = buffer.get_stats()
+    assert stats["n"] == len(all_values)
+    np.testing.assert_allclose(stats["mean"], all_values.mean(axis=0))
+    np.testing.assert_allclose(stats["std"], all_values.std(axis=0))
+    np.testing.assert_allclose(stats["min"], all_values.min(axis=0))
+    np.testing.assert_allclose(stats["max"], all_values.max(axis=0))
+    window_stats = buffer.get_window_stats(20)
+    np.testing.assert_allclose(window_stats["mean"], all_values[-20:].mean(axis=0))
+    buffer.clear()
+    assert len(buffer) == 0 and buffer.get_stats()["n"] == 0
+
+
+def test_contact_trigger_rearms():
+    triggered_list = []
+    trigger = rft.FTContactTrigger(lambda values, timestamp: triggered_list.append(timestamp), force_threshold=10)
+    forces = np.array([0, 5, 12, 15, 9, 7, 11, 0])
+    values_array = np.zeros((len(forces), 6))
+    values_array[:, 2] = forces
+    assert trigger.check(values_array, np.arange(len(forces)))
+    # triggered at 12, rearmed below 8, triggered again at 11
+    assert triggered_list == [2, 6]
@@ -0,0 +1,48 @@
+"""
+Behavioral checks of the RViz grpc server and client without a display (the per-frame task is not run)
+usage: python -m pytest 0000_test_programs/test_rviz_rpc.py
+"""
+import grpc
+import pickle
+import numpy as np
+from concurrent import futures
+import modeling.geometric_model as mgm
+import modeling.model_collection as mmc
+import visualization.panda.rpc.rviz_pb2 as rv_msg
+import visualization.panda.rpc.rviz_pb2_grpc as rv_rpc
+import visualization.panda.rpc.rviz_server as rvs
+import visualization.panda.rpc.rviz_client as rvc
+
+
+def _start(port=18377):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    rviz_server = rvs.RVizServer()
+    rv_rpc.add_RVizServicer_to_server(rviz_server, server)
+    server.add_insecure_port(f"localhost:{port}")
+    server.start()
+    return server, rviz_server, rvc.RVizClient(host=f"localhost:{port}")
+
+
+def test_create_instance_and_stream_states():
+    server, rviz_server, client = _start()
+    try:
+        box = mgm.GeometricModel(initor=mgm.gen_box(xyz_lengths=np.array([.1, .1, .1])))
+        model_collection = mmc.ModelCollection()
+        mgm.gen_sphere(radius=.05).attach_to(model_collection)
+        assert client.copy_to_remote(box, given_rmt_robot_s_name="rmt_box") == "rmt_box"
+        assert isinstance(vars(rvs)["rmt_box"], mgm.GeometricModel)
+        status = client.stub.create_instance(rv_msg.CreateInstanceRequest(name="rmt_mc",
+                                                                          data=pickle.dumps(model_collection)))
+        assert status.value == rv_msg.Status.DONE
+        assert isinstance(vars(rvs)["rmt_mc"], mmc.ModelCollection)
+        homomat = np.eye(4)
+        homomat[:3, 3] = [.1, .2, .3]
+        client.update_remote_states(rmt_robot_names=["unknown_robot"], jnt_values_list=[np.zeros(6)],
+                                    rmt_obj_names=["rmt_box", "unknown_obj"], homomat_list=[homomat, np.eye(4)])
+        client.close_state_stream()
+        # unknown names are dropped instead of failing in the per-frame task
+        assert list(rviz_server._pending_homomat_dict.keys()) == ["rmt_box"]
+        assert np.allclose(rviz_server._pending_homomat_dict["rmt_box"], homomat)
+        assert rviz_server._pending_jnt_values_dict == {}
+    finally:
+        server.stop(0)
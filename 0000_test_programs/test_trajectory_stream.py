@@ -0,0 +1,136 @@
+"""
+Behavioral checks of motion.trajectory.streaming.TrajectoryStream
+usage: python -m pytest 0000_test_programs/test_trajectory_stream.py
+"""
+import sys
+import math
+import threading
+import numpy as np
+import pytest
+import motion.trajectory.piecewisepoly_topp as pwpt
+import motion.trajectory.streaming as trs
+
+
+def _gen_path(seed, n_waypoints=10, step=.3):
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.uniform(-step, step, size=(n_waypoints, 6)), axis=0)
+
+
+def _stream_all(stream):
+    ts_list, vels_list = [], []
+    for ts, _, vels, _ in stream.gen_chunks():
+        ts_list.append(ts)
+        vels_list.append(vels)
+    return np.concatenate(ts_list), np.concatenate(vels_list, axis=0)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("progress", [.15, .5, .7])
+def test_splice_onto_remaining_waypoints(seed, progress):
+    path = _gen_path(seed)
+    tpp = pwpt.PiecewisePolyTOPP()
+    segment = tpp.fit(path)
+    stream = trs.TrajectoryStream(segment, control_frequency=.005, chunk_size=16)
+    chunks = stream.gen_chunks()
+    sent_ts, sent_vels = [], []
+    while stream.cursor_time < segment.duration * progress:
+        ts, _, vels, _ = next(chunks)
+        sent_ts.append(ts)
+        sent_vels.append(vels)
+    conf, vel, _ = stream.state_at(stream.cursor_time)
+    # continue through the waypoints that were not passed yet
+    stream.splice(tpp.fit([conf] + list(path[_n_passed(segment, stream.cursor_time):]), start_vels=vel))
+    ts, vels = _stream_all(stream)
+    ts = np.concatenate(sent_ts + [ts])
+    vels = np.concatenate(sent_vels + [vels], axis=0)
+    # no jump between two setpoints
+    accs = np.diff(vels, axis=0) / np.diff(ts)[:, None]
+    assert np.abs(accs).max() <= math.pi * (1 + 1e-6)
+    assert np.abs(vels).max() <= math.pi * 2 / 3 * (1 + 1e-6)
+    np.testing.assert_allclose(vels[-1], 0, atol=1e-6)
+
+
+def _n_passed(segment, time):
+    """
+    number of waypoints that were passed at time, using the knots of the spline
+    """
+    s = np.interp(time, segment._t_grid, segment._grid)
+    return np.searchsorted(segment._spline.x, s, side='right')
+
+
+def test_infeasible_start_speeds_raise():
+    path = _gen_path(0)
+    with pytest.raises(ValueError):
+        pwpt.PiecewisePolyTOPP().fit(path, start_vels=-(path[1] - path[0]) * 100)
+
+
+class _ConstantSegment(object):
+
+    def __init__(self, value, duration):
+        self.value = value
+        self.duration = duration
+
+    def evaluate(self, ts):
+        confs = np.full((len(ts), 1), float(self.value))
+        return confs, np.zeros_like(confs), np.zeros_like(confs)
+
+
+def test_splice_from_another_thread():
+    stream = trs.TrajectoryStream(_ConstantSegment(0, 2.0), control_frequency=.001, chunk_size=4)
+    n_splices = 500
+    error_list = []
+
+    def splice_repeatedly():
+        for i in range(1, n_splices + 1):
+            try:
+                stream.splice(_ConstantSegment(i, 2.0))
+            except ValueError as e:
+                error_list.append(e)
+
+    # switch threads as often as possible to interleave splicing and streaming
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        thread = threading.Thread(target=splice_repeatedly)
+        thread.start()
+        ts_list, confs_list = [], []
+        for ts, confs, _, _ in stream.gen_chunks():
+            ts_list.append(ts)
+            confs_list.append(confs[:, 0])
+        thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert error_list == []
+    ts, confs = np.concatenate(ts_list), np.concatenate(confs_list)
+    assert np.all(np.diff(ts) > 0)
+    # the setpoints never go back to an older segment, and the last segment is played to its end
+    assert np.all(np.diff(confs) >= 0)
+    assert confs[-1] == n_splices
+    np.testing.assert_allclose(ts[-1], stream.end_time)
+
+
+def test_splice_waits_for_the_chunk_being_evaluated():
+    stream = trs.TrajectoryStream(control_frequency=.01, chunk_size=4)
+    is_spliced_list = []
+    thread_list = []
+
+    class SplicingSegment(_ConstantSegment):
+
+        def evaluate(self, ts):
+            if len(is_spliced_list) == 0:
+                thread = threading.Thread(target=stream.splice, args=(_ConstantSegment(1, 1.0),))
+                thread.start()
+                thread_list.append(thread)
+                thread.join(timeout=.2)
+                is_spliced_list.append(not thread.is_alive())
+            return super().evaluate(ts)
+
+    stream.append(SplicingSegment(0, 1.0))
+    ts, confs, _, _ = next(stream.gen_chunks())
+    assert is_spliced_list == [False]
+    np.testing.assert_array_equal(confs[:, 0], 0)
+    # the splice is applied after the chunk, from the next setpoint on
+    thread_list[0].join()
+    ts, confs, _, _ = next(stream.gen_chunks())
+    np.testing.assert_allclose(ts[0], .04)
+    np.testing.assert_array_equal(confs[:, 0], 1)
@@ -0,0 +1,30 @@
+"""
+Behavioral checks of the xArm/Shuidi grpc server and client against the local stand-in
+usage: python -m pytest 0000_test_programs/test_xarm_shuidi_standin.py
+"""
+import sys
+import numpy as np
+import robot_con.xarm_shuidi_grpc.xarm_shuidi_standin as xsst
+import robot_con.xarm_shuidi_grpc.xarm_shuidi_client as xsc
+
+
+def test_stream_jspace_path():
+    server, aa_server = xsst.start_standin_server(host="localhost:18394")
+    try:
+        client = xsc.XArmShuidiClient(host="localhost:18394")
+        assert np.allclose(client.arm_get_jnt_values(), np.zeros(7))
+        goal_jnt_values = np.array([.3, -.2, .1, .4, 0, .2, -.1])
+        progress_list = []
+        n_executed = client.arm_stream_jspace_path([np.zeros(7), goal_jnt_values], chunk_size=16,
+                                                   progress_callback=lambda *args: progress_list.append(args))
+        servo_times = aa_server._arm_x.get_log()
+        assert n_executed == len(servo_times) > 16
+        assert len(progress_list) > 1
+        assert np.allclose(client.arm_get_jnt_values(), goal_jnt_values, atol=1e-6)
+        # setpoints are played on a fixed 5 ms clock
+        assert abs(np.median(np.diff(servo_times)) - .005) < 1e-3
+    finally:
+        server.stop(0)
+    # the vendor sdk and toppra are not needed when the arm and agv are injected
+    assert "drivers.xarm.wrapper.xarm_api" not in sys.modules
+    assert "toppra" not in sys.modules
@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
 eps = 1e-6
 pi = 3.14159265359
@@ -60,17 +59,33 @@ y_ax = np.array([0, 1, 0])
 z_ax = np.array([0, 0, 1])
 
 # matplotlib colors
-plasma_map = plt.get_cmap("plasma")
-cividis_map = plt.get_cmap("cividis")
-jet_map = plt.get_cmap("jet")
-winter_map = plt.get_cmap("winter")
-summer_map = plt.get_cmap("summer")
-cool_map = plt.get_cmap("cool")
-wistia_map = plt.get_cmap("Wistia")
-spring_map = plt.get_cmap("spring")
-copper_map = plt.get_cmap("copper")
-
-tab20_list = [(r,g,b,1.0) for r,g,b in plt.get_cmap("tab20").colors]
+# the colormaps are created at first access (see __getattr__) to avoid importing matplotlib at load time
+_cmap_names = {"plasma_map": "plasma",
+               "cividis_map": "cividis",
+               "jet_map": "jet",
+               "winter_map": "winter",
+               "summer_map": "summer",
+               "cool_map": "cool",
+               "wistia_map": "Wistia",
+               "spring_map": "spring",
+               "copper_map": "copper"}
+
+
+def __getattr__(name):
+    if name in _cmap_names:
+        import matplotlib.pyplot as plt
+        cmap = plt.get_cmap(_cmap_names[name])
+        globals()[name] = cmap
+        return cmap
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# matplotlib tab20, in 8-bit rgb
+_tab20_rgb255 = [(31, 119, 180), (174, 199, 232), (255, 127, 14), (255, 187, 120), (44, 160, 44), (152, 223, 138),
+                 (214, 39, 40), (255, 152, 150), (148, 103, 189), (197, 176, 213), (140, 86, 75), (196, 156, 148),
+                 (227, 119, 194), (247, 182, 210), (127, 127, 127), (199, 199, 199), (188, 189, 34), (219, 219, 141),
+                 (23, 190, 207), (158, 218, 229)]
+tab20_list = [(r / 255, g / 255, b / 255, 1.0) for r, g, b in _tab20_rgb255]
 hug_blue = tab20_list[0]
 hug_gray = tab20_list[15]
 # rgb_mat = np.column_stack((tab20_list[6][:3], tab20_list[4][:3], tab20_list[0][:3]))
@@ -5,15 +5,17 @@ import warnings
 import functools
 import numpy as np
 import numpy.typing as npt
-from sklearn import cluster
-import basis.trimesh.creation as trm_cr
 import basis.constant as bc
-import matplotlib.pyplot as plt
+import basis.utils as bu
 from scipy.spatial.transform import Slerp
 from scipy.spatial.transform import Rotation as R
-from scipy.interpolate import interp1d
 from scipy.spatial.transform import Rotation
 
+# heavy and rarely used dependencies are imported at first use
+cluster = bu.lazy_import("sklearn.cluster")
+trm_cr = bu.lazy_import("basis.trimesh.creation")
+plt = bu.lazy_import("matplotlib.pyplot")
+
 # epsilon for testing whether a number is close to zero
 _EPS = np.finfo(np.float32).eps
 # axis sequences for Euler angles
@@ -59,6 +61,36 @@ def rotmat_from_axangle(axis, angle):
                      [2.0 * (bd + ac), 2.0 * (cd - ab), aa + dd - bb - cc]])
 
 
+def rotmat_from_axangle_batch(axis, angles):
+    """
+    vectorized version of rotmat_from_axangle, rotating around a single axis by many angles
+
+    :param axis: 1x3 nparray
+    :param angles: 1xn nparray, angles in radian
+    :return: nx3x3 rotmats
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    axis = unit_vector(axis)
+    if np.allclose(axis, np.zeros(3)):
+        return np.tile(np.eye(3), (len(angles), 1, 1))
+    a = np.cos(angles / 2.0)
+    sin_half = np.sin(angles / 2.0)
+    b, c, d = -axis[0] * sin_half, -axis[1] * sin_half, -axis[2] * sin_half
+    aa, bb, cc, dd = a * a, b * b, c * c, d * d
+    bc, ad, ac, ab, bd, cd = b * c, a * d, a * c, a * b, b * d, c * d
+    rotmats = np.empty((len(angles), 3, 3))
+    rotmats[:, 0, 0] = aa + bb - cc - dd
+    rotmats[:, 0, 1] = 2.0 * (bc + ad)
+    rotmats[:, 0, 2] = 2.0 * (bd - ac)
+    rotmats[:, 1, 0] = 2.0 * (bc - ad)
+    rotmats[:, 1, 1] = aa + cc - bb - dd
+    rotmats[:, 1, 2] = 2.0 * (cd + ab)
+    rotmats[:, 2, 0] = 2.0 * (bd + ac)
+    rotmats[:, 2, 1] = 2.0 * (cd - ab)
+    rotmats[:, 2, 2] = aa + dd - bb - cc
+    return rotmats
+
+
 def rotmat_from_quaternion(quaternion):
     """
     convert a quaterion to rotmat
@@ -644,6 +676,26 @@ def diff_between_poses(src_pos,
     return pos_err, rot_err, delta
 
 
+def diff_between_poses_batch(src_pos_array,
+                             src_rotmat_array,
+                             tgt_pos_array,
+                             tgt_rotmat_array):
+    """
+    vectorized version of diff_between_poses
+    :param src_pos_array: nx3 nparray
+    :param src_rotmat_array: nx3x3 nparray
+    :param tgt_pos_array: nx3 nparray
+    :param tgt_rotmat_array: nx3x3 nparray
+    :return: pos_err_array (n), rot_err_array (n), delta_array (nx6)
+    """
+    delta_array = np.zeros((len(src_pos_array), 6))
+    delta_array[:, 0:3] = tgt_pos_array - src_pos_array
+    delta_array[:, 3:6] = Rotation.from_matrix(tgt_rotmat_array @ src_rotmat_array.transpose(0, 2, 1)).as_rotvec()
+    pos_err_array = np.linalg.norm(delta_array[:, :3], axis=1)
+    rot_err_array = np.linalg.norm(delta_array[:, 3:6], axis=1)
+    return pos_err_array, rot_err_array, delta_array
+
+
 def cosine_between_vecs(v1, v2):
     l1, v1_u = unit_vector(v1, toggle_length=True)
     l2, v2_u = unit_vector(v2, toggle_length=True)
@@ -29,14 +29,6 @@ from .ray.ray_mesh import RayMeshIntersector, contains_points
 from .voxel import Voxel
 from .points import transform_points
 from .constants import log, _log_time, tol
-from .scene import Scene
-
-try:
-    from .path.io.misc import faces_to_path
-    from .path.io.load import _create_path, load_path
-except ImportError:
-    log.warning('trimesh.path unavailable, try pip install shapely!',
-                exc_info=True)
 
 
 class Trimesh(object):
@@ -912,6 +904,7 @@ class Trimesh(object):
         lines = intersections.mesh_plane(mesh=self, plane_normal=plane_normal, plane_origin=plane_origin)
         if len(lines) == 0:
             raise ValueError('Specified plane doesn\'t intersect mesh!')
+        from .path.io.load import load_path  # imported here since path depends on shapely and networkx
         path = load_path(lines)
         return path
 
@@ -1085,6 +1078,8 @@ class Trimesh(object):
         ----------
         path:     Path3D object of the outline
         '''
+        from .path.io.misc import faces_to_path
+        from .path.io.load import _create_path
         path = _create_path(**faces_to_path(self, face_ids))
         return path
 
@@ -1159,6 +1154,7 @@ class Trimesh(object):
         Get a Scene object containing the current mesh.
         :return: trimesh.scene.scene.Scene object, containing the current mesh
         """
+        from .scene import Scene  # imported here since scene depends on networkx
         return Scene(self)
 
     def show(self, block=True, **kwargs):
@@ -9,8 +9,10 @@ from basis.trimesh import geometry
 from basis.trimesh import nsphere
 
 from scipy.spatial import ConvexHull
-from scipy import optimize
 from scipy.spatial import QhullError
+import basis.utils as bu
+
+optimize = bu.lazy_import("scipy.optimize")
 
 # a 90 degree rotation
 _flip = transformations.planar_matrix(theta=np.pi / 2)
@@ -11,11 +11,11 @@ from basis.trimesh import util
 import numpy as np
 from collections import deque
 
-try:
-    from shapely.geometry import Polygon
-    from shapely.wkb import loads as load_wkb
-except ImportError:
-    log.warning('shapely unavilable', exc_info=True)
+import basis.utils as bu
+
+# shapely is only needed for polygons and is imported at first use
+shp_geom = bu.lazy_import("shapely.geometry")
+shp_wkb = bu.lazy_import("shapely.wkb")
 
 _data = {"box": {
     "vertices": [[0.0, 0.0, 0.0], [0.0, 0.0, 1.0], [0.0, 1.0, 0.0], [0.0, 1.0, 1.0], [1.0, 0.0, 0.0], [1.0, 0.0, 1.0],
@@ -45,9 +45,9 @@ def validate_polygon(obj):
     if util.is_instance_named(obj, 'Polygon'):
         polygon = obj
     elif util.is_shape(obj, (-1, 2)):
-        polygon = Polygon(obj)
+        polygon = shp_geom.Polygon(obj)
     elif util.is_string(obj):
-        polygon = load_wkb(obj)
+        polygon = shp_wkb.loads(obj)
     else:
         raise ValueError('Input not a polygon!')
     if (not polygon.is_valid or
@@ -174,7 +174,7 @@ def triangulate_polygon(polygon, **kwargs):
         # by creating a polygon from the cleaned boundary region, and then
         # using a representative point. You could do things like take the mean of 
         # the points, but this is more robust (to things like concavity), if slower. 
-        test = Polygon(cleaned)
+        test = shp_geom.Polygon(cleaned)
         holes.append(np.array(test.representative_point().coords)[0])
 
         return len(cleaned)
@@ -1,7 +1,9 @@
 import numpy as np
 import copy
 import random
-import networkx as nx
+import basis.utils as bu
+
+nx = bu.lazy_import("networkx")
 import math
 
 from collections import deque
@@ -1,11 +1,13 @@
 import numpy as np
 from collections import deque
 
-from networkx import from_edgelist, connected_components
+import basis.utils as bu
 
 from .util import decimal_to_digits, vector_to_spherical, spherical_to_vector, unitize
 from .constants import log, tol
 
+nx = bu.lazy_import("networkx")
+
 try:
     from scipy.spatial import cKDTree as KDTree
 except ImportError:
@@ -448,8 +450,8 @@ def clusters(points, radius):
     """
     tree = KDTree(points)
     pairs = tree.query_pairs(radius)
-    graph = from_edgelist(pairs)
-    groups = list(connected_components(graph))
+    graph = nx.from_edgelist(pairs)
+    groups = list(nx.connected_components(graph))
     return groups
 
 
@@ -1,6 +1,6 @@
 from .generic import MeshScript
 from ..templates import get_template
-from distutils.spawn import find_executable
+from shutil import which as find_executable
 
 _blender_executable = find_executable('blender')
 _blender_template = get_template('blender.py.template')
@@ -4,7 +4,7 @@ import platform
 from basis.trimesh.interfaces.generic import MeshScript
 from basis.trimesh.constants import log
 
-from distutils.spawn import find_executable
+from shutil import which as find_executable
 
 _search_path = os.environ['PATH']
 if platform.system() == 'Windows':
@@ -1,5 +1,5 @@
 from .generic import MeshScript
-from distutils.spawn import find_executable
+from shutil import which as find_executable
 
 _scad_executable = find_executable('openscad')
 exists = _scad_executable is not None
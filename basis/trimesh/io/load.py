@@ -9,12 +9,6 @@ from .step import _step_loaders
 from .ply import _ply_loaders
 from .dae import _collada_loaders
 
-try:
-    from ..path.io.load import load_path, path_formats
-except:
-    log.warning('No path functionality available!', exc_info=True)
-
-
 def load_path(*args, **kwargs):
     raise ImportError('No path functionality available!')
 
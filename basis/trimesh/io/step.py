@@ -1,16 +1,18 @@
 import numpy as np
 
-import networkx as nx
+import basis.utils as bu
 import itertools
 
 from collections import deque
 from tempfile import NamedTemporaryFile
-from distutils.spawn import find_executable
+from shutil import which as find_executable
 from subprocess import check_call
 from xml.etree import cElementTree
 
 from ..constants import res, log
 
+nx = bu.lazy_import("networkx")
+
 _METERS_TO_INCHES = 1.0 / .0254
 _STEP_FACETER = find_executable('export_product_asm')
 
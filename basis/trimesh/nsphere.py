@@ -6,7 +6,9 @@ from . import convex
 from .constants import log, tol
 # scipy is a soft dependency
 from scipy import spatial
-from scipy.optimize import leastsq
+import basis.utils as bu
+
+optimize = bu.lazy_import("scipy.optimize")
 
 try:
     import psutil
@@ -102,7 +104,7 @@ def fit_nsphere(points, prior=None):
         return radii_sq - (radii_sq.sum() / len(radii_sq))
 
     guess = points.mean(axis=0) if prior is None else np.asanyarray(prior)
-    center_result, return_code = leastsq(residuals, guess, xtol=1e-8)
+    center_result, return_code = optimize.leastsq(residuals, guess, xtol=1e-8)
     if return_code not in [1, 2, 3, 4]:
         raise ValueError('Least square fit failed!')
     radii = util.row_norm(points - center_result)
@@ -1,5 +1,7 @@
 import numpy as np
-import networkx as nx
+import basis.utils as bu
+
+nx = bu.lazy_import("networkx")
 from collections import deque
 
 from .geometry import faces_to_edges
@@ -1,8 +1,7 @@
-from pkg_resources import resource_string
+from pkgutil import get_data
 
 def get_template(name):
-    result = resource_string('basis.trimesh',
-                             'templates/' + name)
+    result = get_data('basis.trimesh', 'templates/' + name)
     if hasattr(result, 'decode'):
         return result.decode('utf-8')
     return result
\ No newline at end of file
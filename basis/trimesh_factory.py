@@ -6,7 +6,9 @@ import basis.trimesh.primitives as trm_primit
 import basis.trimesh.geometry as trm_geom
 import basis.trimesh as trm
 import basis.robot_math as rm
-import shapely.geometry as shp_geom
+import basis.utils as bu
+
+shp_geom = bu.lazy_import("shapely.geometry")
 
 # declare constants
 ARROW_CH_SR = 8  # cone height vs stick radius for arrow
@@ -1,4 +1,8 @@
 # utility functions
+import sys
+import types
+import importlib
+
 
 def is_mesh_empty(mesh):
     return len(mesh.vertices) == 0 and len(mesh.faces) == 0
@@ -9,4 +13,38 @@ def get_yesno():
         if user_input == 'y' or user_input == 'n':
             return user_input
         else:
-            print("Invalid input. Must be 'y' or 'n', other input not acceptable.")
\ No newline at end of file
+            print("Invalid input. Must be 'y' or 'n', other input not acceptable.")
+
+class LazyModule(types.ModuleType):
+    """
+    a placeholder of a module that is imported at the first attribute access
+    heavy optional dependencies (sklearn, matplotlib, etc.) are bound with it so that importing
+    basis, modeling, and robot_sim does not pay for modules that a headless worker never uses
+    """
+
+    def __init__(self, module_name):
+        super().__init__(module_name)
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+            self.__dict__.update(self._module.__dict__)
+        return self._module
+
+    def __getattr__(self, item):
+        # only called when item is not found in __dict__, i.e., before loading or for missing attributes
+        return getattr(self._load(), item)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(module_name):
+    """
+    :param module_name: e.g., "matplotlib.pyplot"
+    :return: the module if it was already imported, or else a LazyModule
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    return LazyModule(module_name)
@@ -87,36 +87,34 @@ def define_gripper_grasps_with_rotation(gripper,
     """
     grasp_collection = gg.GraspCollection(end_effector=gripper)
     collided_grasp_collection = gg.GraspCollection(end_effector=gripper)
-    for rotate_angle in np.arange(rotation_range[0], rotation_range[1], rotation_interval):
-        rotated_rotmat = rm.rotmat_from_axangle(thumb_opening_direction, rotate_angle)
-        rotated_approaching_direction = np.dot(rotated_rotmat, approaching_direction)
-        rotated_thumb_opening_direction = np.dot(rotated_rotmat, thumb_opening_direction)
-        grasp = gripper.grip_at_by_twovecs(jaw_center_pos=jaw_center_pos,
-                                           approaching_direction=rotated_approaching_direction,
-                                           thumb_opening_direction=rotated_thumb_opening_direction,
-                                           jaw_width=jaw_width)
+    # the acting center rotmats of all candidates are computed in bulk
+    # rotating about the thumb opening direction does not change it, only the approaching direction rotates
+    rotate_angles = np.arange(rotation_range[0], rotation_range[1], rotation_interval)
+    rotated_rotmats = rm.rotmat_from_axangle_batch(thumb_opening_direction, rotate_angles)
+    rotated_approaching_directions = rotated_rotmats @ approaching_direction
+    rotated_approaching_directions /= np.linalg.norm(rotated_approaching_directions, axis=1, keepdims=True)
+    thumb_opening_direction = rm.unit_vector(thumb_opening_direction)
+    thumb_opening_direction_list = [thumb_opening_direction]
+    if toggle_flip:
+        thumb_opening_direction_list.append(-thumb_opening_direction)
+    ac_rotmat_list = []
+    for thumb_direction in thumb_opening_direction_list:
+        ac_rotmats = np.empty((len(rotate_angles), 3, 3))
+        ac_rotmats[:, :, 2] = rotated_approaching_directions
+        ac_rotmats[:, :, 1] = thumb_direction
+        ac_rotmats[:, :, 0] = np.cross(thumb_direction, rotated_approaching_directions)
+        ac_rotmat_list.append(ac_rotmats)
+    # the jaw width is shared by all candidates; only the pose of the gripper changes per candidate
+    gripper.change_jaw_width(jaw_width)
+    for ac_rotmat in np.concatenate(ac_rotmat_list):
+        gripper.align_acting_center_by_pose(acting_center_pos=jaw_center_pos, acting_center_rotmat=ac_rotmat)
+        grasp = gg.Grasp(ee_values=jaw_width, ac_pos=jaw_center_pos, ac_rotmat=ac_rotmat)
         if toggle_dbg:
-            gripper.grip_at_by_pose(jaw_center_pos=grasp.ac_pos,
-                                    jaw_center_rotmat=grasp.ac_rotmat,
-                                    jaw_width=grasp.ee_values)
             gripper.gen_meshmodel(alpha=.3).attach_to(base)
         if not gripper.is_mesh_collided([obj_cmodel], toggle_dbg=toggle_dbg):
             grasp_collection.append(grasp)
         else:
             collided_grasp_collection.append(grasp)
-    if toggle_flip:
-        for rotate_angle in np.arange(rotation_range[0], rotation_range[1], rotation_interval):
-            rotated_rotmat = rm.rotmat_from_axangle(thumb_opening_direction, rotate_angle)
-            rotated_approaching_direction = np.dot(rotated_rotmat, approaching_direction)
-            rotated_thumb_opening_direction = np.dot(rotated_rotmat, -thumb_opening_direction)
-            grasp = gripper.grip_at_by_twovecs(jaw_center_pos=jaw_center_pos,
-                                               approaching_direction=rotated_approaching_direction,
-                                               thumb_opening_direction=rotated_thumb_opening_direction,
-                                               jaw_width=jaw_width)
-            if not gripper.is_mesh_collided([obj_cmodel]):
-                grasp_collection.append(grasp)
-            else:
-                collided_grasp_collection.append(grasp)
     if toggle_dbg:
         for grasp in collided_grasp_collection:
             gripper.grip_at_by_pose(jaw_center_pos=grasp.ac_pos,
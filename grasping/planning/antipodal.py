@@ -5,6 +5,7 @@ import basis.robot_math as rm
 import grasping.grasp as gg
 import grasping.annotation.gripping as gau
 from scipy.spatial import cKDTree
+from tqdm import tqdm
 import modeling.geometric_model as mgm
 
 
@@ -29,11 +30,14 @@ def plan_contact_pairs(obj_cmodel,
     tree = cKDTree(contact_points)
     near_history = np.array([0] * len(contact_points), dtype=bool)
     dot_thresh = -math.cos(angle_between_contact_normals)
+    # cast the rays of all sampled points in one call
+    result_list = obj_cmodel.ray_hit_batch(contact_points - contact_normals * .001,
+                                           contact_points - contact_normals * 100)
     for i, contact_p0 in enumerate(contact_points):
         if near_history[i]:  # if the point was previous near to some points, ignore
             continue
         contact_n0 = contact_normals[i]
-        result = obj_cmodel.ray_hit(contact_p0 - contact_n0 * .001, contact_p0 - contact_n0 * 100)
+        result = result_list[i]
         if result is not None:
             hit_points, hit_normals = result
             for contact_p1, contact_n1 in zip(hit_points, hit_normals):
@@ -83,8 +87,7 @@ def plan_gripper_grasps(gripper,
             mgm.gen_arrow(spos=contact_p1, epos=contact_p1 + contact_n1 * .01, stick_radius=.00057,
                           rgba=np.array([0, 0, 1, 1])).attach_to(base)
     grasp_collection = gg.GraspCollection(end_effector=gripper)
-    for i, cp in enumerate(contact_pairs):
-        print(f"{i} of {len(contact_pairs)} done!")
+    for cp in tqdm(contact_pairs, desc="contact pairs"):
         contact_p0, contact_n0 = cp[0]
         contact_p1, contact_n1 = cp[1]
         contact_center = (contact_p0 + contact_p1) / 2
@@ -1,10 +1,30 @@
+import multiprocessing as mp
 import grasping.grasp as g
 import basis.robot_math as rm
 
+# the reasoner and the reasoning arguments inherited by the forked workers, see GraspReasoner._reason_in_parallel
+_worker_reasoner = None
+_worker_kwargs = None
+
+
+def _init_reasoning_worker(reasoner, kwargs):
+    global _worker_reasoner, _worker_kwargs
+    _worker_reasoner = reasoner
+    _worker_kwargs = kwargs
+
+
+def _reason_shard(gid_shard):
+    return _worker_reasoner._reason(previous_available_gids=gid_shard, **_worker_kwargs)
+
 
 class GraspReasoner(object):
-    def __init__(self, robot):
+    def __init__(self, robot, n_workers=1):
+        """
+        :param robot:
+        :param n_workers: number of worker processes; grasps are sharded across the workers if n_workers > 1
+        """
         self.robot = robot
+        self.n_workers = n_workers
 
     @staticmethod
     def keep_states_decorator(method):
@@ -128,6 +148,67 @@ class GraspReasoner(object):
                                        consider_robot=True,
                                        toggle_keep=True,
                                        toggle_dbg=False):
+        kwargs = dict(reference_grasp_collection=reference_grasp_collection,
+                      goal_pose_list=goal_pose_list,
+                      obstacle_list=obstacle_list,
+                      consider_robot=consider_robot)
+        if self.n_workers > 1 and not toggle_dbg:
+            previous_available_gids, previous_availalbe_grasps, previous_available_jv_list = \
+                self._reason_in_parallel(previous_available_gids=previous_available_gids, **kwargs)
+        else:
+            previous_available_gids, previous_availalbe_grasps, previous_available_jv_list = \
+                self._reason(previous_available_gids=previous_available_gids, toggle_dbg=toggle_dbg, **kwargs)
+        if consider_robot:
+            if len(previous_available_gids) == 0:
+                return None, None, None
+            return previous_available_gids, previous_availalbe_grasps, previous_available_jv_list
+        else:
+            if len(previous_available_gids) == 0:
+                return None, None
+            return previous_available_gids, previous_availalbe_grasps
+
+    def _reason_in_parallel(self, previous_available_gids, **kwargs):
+        """
+        shard the gids across forked worker processes; each worker holds its own copy of the robot and its
+        collision states. the results of the shards are merged in the original order of the gids
+        grasps are examined independently, so the merged results are the same as the serial ones
+        :param previous_available_gids:
+        :param kwargs: see self._reason
+        :return:
+        """
+        previous_available_gids = list(previous_available_gids)
+        if "fork" not in mp.get_all_start_methods():
+            print("Parallel reasoning requires forking worker processes. Falling back to serial reasoning.")
+            return self._reason(previous_available_gids=previous_available_gids, **kwargs)
+        # use more shards than workers to balance the loads
+        n_shards = min(len(previous_available_gids), self.n_workers * 4)
+        if n_shards <= 1:
+            return self._reason(previous_available_gids=previous_available_gids, **kwargs)
+        shard_size = -(-len(previous_available_gids) // n_shards)
+        gid_shard_list = [previous_available_gids[i:i + shard_size] for i in
+                          range(0, len(previous_available_gids), shard_size)]
+        with mp.get_context("fork").Pool(self.n_workers,
+                                         initializer=_init_reasoning_worker,
+                                         initargs=(self, kwargs)) as pool:
+            result_list = pool.map(_reason_shard, gid_shard_list)
+        available_gids, available_grasps, available_jv_list = [], [], []
+        for shard_gids, shard_grasps, shard_jv_list in result_list:
+            available_gids += shard_gids
+            available_grasps += shard_grasps
+            available_jv_list += shard_jv_list
+        return available_gids, available_grasps, available_jv_list
+
+    def _reason(self,
+                previous_available_gids,
+                reference_grasp_collection,
+                goal_pose_list,
+                obstacle_list=None,
+                consider_robot=True,
+                toggle_dbg=False):
+        """
+        examine the gids goal by goal; see reason_incremental_common_gids
+        :return: available gids, grasps, and jnt values (empty lists if none)
+        """
         # start reasoning
         intermediate_available_gids = []
         intermediate_available_grasps = []
@@ -201,14 +282,7 @@ class GraspReasoner(object):
                 print(f"Number of collided robots at goal-{str(goal_id)}: {rbt_collided_grasps_num}")
                 print("------end_type------")
                 base.run()
-        if consider_robot:
-            if len(previous_available_gids) == 0:
-                return None, None, None
-            return previous_available_gids, previous_availalbe_grasps, previous_available_jv_list
-        else:
-            if len(previous_available_gids) == 0:
-                return None, None
-            return previous_available_gids, previous_availalbe_grasps
+        return previous_available_gids, previous_availalbe_grasps, previous_available_jv_list
 
     # @keep_states_decorator
     def reason_common_gids(self,
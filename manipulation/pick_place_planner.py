@@ -367,20 +367,23 @@ if __name__ == '__main__':
         def __init__(self, mot_data):
             self.counter = 0
             self.mot_data = mot_data
+            self.posable_meshmodel = mot_data.robot.gen_posable_meshmodel()
+            self.mesh_model = None
 
 
     anime_data = Data(mot_data)
 
 
     def update(anime_data, task):
-        if anime_data.counter > 0:
-            anime_data.mot_data.mesh_list[anime_data.counter - 1].detach()
         if anime_data.counter >= len(anime_data.mot_data):
-            # for mesh_model in anime_data.mot_data.mesh_list:
-            #     mesh_model.detach()
             anime_data.counter = 0
-        mesh_model = anime_data.mot_data.mesh_list[anime_data.counter]
-        mesh_model.attach_to(base)
+        # only the link poses of the posable mesh model are updated, no mesh model is generated per frame
+        mesh_model = anime_data.mot_data.get_posed_mesh(anime_data.counter, anime_data.posable_meshmodel)
+        if mesh_model is not anime_data.mesh_model:
+            if anime_data.mesh_model is not None:
+                anime_data.mesh_model.detach()
+            mesh_model.attach_to(base)
+            anime_data.mesh_model = mesh_model
         if base.inputmgr.keymap['space']:
             anime_data.counter += 1
         return task.again
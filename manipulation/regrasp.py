@@ -1,7 +1,6 @@
-import uuid
+import heapq
 import itertools
 import numpy as np
-import networkx as nx
 import manipulation.placement.flat_surface_placement as mpfsp
 import manipulation.placement.general_placement as mpgp
 import grasping.reasoner as gr
@@ -14,15 +13,16 @@ import manipulation.pick_place_planner as ppp
 
 
 class RegraspSpotCollection(object):
-    def __init__(self, robot, obj_cmodel, reference_fsp_poses, reference_grasp_collection):
+    def __init__(self, robot, obj_cmodel, reference_fsp_poses, reference_grasp_collection, n_workers=1):
         """
         :param robot:
         :param reference_fsp_poses: an instance of ReferenceFSPPoses
         :param reference_grasp_collection: an instance of GraspCollection
+        :param n_workers: number of worker processes used by the grasp reasoner
         """
         self.robot = robot
         self.obj_cmodel = obj_cmodel
-        self.grasp_reasoner = gr.GraspReasoner(robot)
+        self.grasp_reasoner = gr.GraspReasoner(robot, n_workers=n_workers)
         self.reference_fsp_poses = reference_fsp_poses
         self.reference_grasp_collection = reference_grasp_collection
         self._regspot_list = []  # list of SpotFSPGs
@@ -104,16 +104,169 @@ class RegraspSpotCollection(object):
         return meshmodel_list
 
 
+class FSRegraspGraph(object):
+    """
+    an implicit regrasp graph
+    nodes are integer ids of the feasible grasps of the added placements (pgs); edges are not stored:
+    two nodes are connected by a transit edge if they share a pg, or by a transfer edge if they share a grasp id
+    the neighbours of a node are thus read from the pg-indexed and gid-indexed node lists on demand,
+    which avoids the quadratic number of edges of an explicit graph
+    """
+
+    def __init__(self, n_reference_grasps):
+        self._nodes_by_gid = [[] for _ in range(n_reference_grasps)]
+        self._nodes_by_pgid = []
+        self._pg_list = []
+        self._pg_prefix_list = []
+        self._pg_plot_xy_list = []
+        self._node_gid_list = []
+        self._node_pgid_list = []
+        self._node_local_id_list = []
+
+    def __len__(self):
+        return len(self._node_gid_list)
+
+    @property
+    def n_pgs(self):
+        return len(self._pg_list)
+
+    def add_pg(self, pg, plot_xy, prefix=''):
+        """
+        add the feasible grasps of a pg as new nodes
+        :param pg: an instance of mpgp.PG or mpfsp.FSPG
+        :param plot_xy: where to plot the pg
+        :param prefix: '', 'start', or 'goal'; used to name the edges that connect the new nodes
+        :return: a list of the new node ids
+        """
+        pgid = len(self._pg_list)
+        self._pg_list.append(pg)
+        self._pg_prefix_list.append(prefix)
+        self._pg_plot_xy_list.append(plot_xy)
+        new_nodes = []
+        for local_id, gid in enumerate(pg.feasible_gids):
+            nid = len(self._node_gid_list)
+            self._node_gid_list.append(gid)
+            self._node_pgid_list.append(pgid)
+            self._node_local_id_list.append(local_id)
+            self._nodes_by_gid[gid].append(nid)
+            new_nodes.append(nid)
+        self._nodes_by_pgid.append(new_nodes)
+        return new_nodes
+
+    def get_node(self, nid):
+        """
+        :param nid:
+        :return: a dict with the obj_pose, grasp, jnt_values, gid, pgid, and pg_plot_xy of the node
+        """
+        pgid = self._node_pgid_list[nid]
+        local_id = self._node_local_id_list[nid]
+        pg = self._pg_list[pgid]
+        return {'obj_pose': pg.obj_pose,
+                'grasp': pg.feasible_grasps[local_id],
+                'jnt_values': pg.feasible_jv_list[local_id],
+                'gid': self._node_gid_list[nid],
+                'pgid': pgid,
+                'pg_plot_xy': self._pg_plot_xy_list[pgid]}
+
+    def get_edge_type(self, nid0, nid1):
+        """
+        the edge is named after the pg added later, following the order in which edges used to be created
+        :param nid0:
+        :param nid1:
+        :return: None if not connected, or else '(prefix_)transit' or '(prefix_)transfer'
+        """
+        pgid0 = self._node_pgid_list[nid0]
+        pgid1 = self._node_pgid_list[nid1]
+        if pgid0 == pgid1:
+            edge_type = 'transit'
+        elif self._node_gid_list[nid0] == self._node_gid_list[nid1]:
+            edge_type = 'transfer'
+        else:
+            return None
+        prefix = self._pg_prefix_list[max(pgid0, pgid1)]
+        return prefix + '_' + edge_type if prefix else edge_type
+
+    def neighbor_groups(self, nid):
+        """
+        :param nid:
+        :return: the keys and node lists of the two groups that nid is connected to (the node itself is included)
+        """
+        pgid = self._node_pgid_list[nid]
+        gid = self._node_gid_list[nid]
+        return [(('pg', pgid), self._nodes_by_pgid[pgid]), (('gid', gid), self._nodes_by_gid[gid])]
+
+    def iter_edges(self):
+        """
+        enumerate all edges explicitly; only meant for visualization
+        :return: a generator of (nid0, nid1, edge_type)
+        """
+        for nodes in self._nodes_by_pgid:
+            for nid0, nid1 in itertools.combinations(nodes, 2):
+                yield nid0, nid1, self.get_edge_type(nid0, nid1)
+        for nodes in self._nodes_by_gid:
+            for nid0, nid1 in itertools.combinations(nodes, 2):
+                if self._node_pgid_list[nid0] != self._node_pgid_list[nid1]:
+                    yield nid0, nid1, self.get_edge_type(nid0, nid1)
+
+    def search(self, start_node_list, goal_node_list):
+        """
+        A* search with lazily expanded neighbours and unit edge costs
+        h(n) is 0 at a goal, 1 if n shares a pg or a gid with a goal, and 2 otherwise; it is consistent
+        all members of a group are reached at once when the group is expanded, and a group is expanded again
+        only if it is reached with a smaller cost; the search thus touches every node O(1) times
+        :param start_node_list:
+        :param goal_node_list:
+        :return: a list of node ids from one of the start nodes to one of the goal nodes, or None
+        """
+        goal_node_set = set(goal_node_list)
+        goal_pgid_set = set(self._node_pgid_list[nid] for nid in goal_node_list)
+        goal_gid_set = set(self._node_gid_list[nid] for nid in goal_node_list)
+
+        def heuristic(nid):
+            if nid in goal_node_set:
+                return 0
+            if self._node_pgid_list[nid] in goal_pgid_set or self._node_gid_list[nid] in goal_gid_set:
+                return 1
+            return 2
+
+        cost_dict = {}
+        parent_dict = {}
+        open_heap = []
+        for nid in start_node_list:
+            cost_dict[nid] = 0
+            parent_dict[nid] = None
+            heapq.heappush(open_heap, (heuristic(nid), 0, nid))
+        expanded_group_cost_dict = {}
+        while open_heap:
+            _, cost, nid = heapq.heappop(open_heap)
+            if cost > cost_dict[nid]:
+                continue  # outdated entry
+            if nid in goal_node_set:
+                path = [nid]
+                while parent_dict[path[-1]] is not None:
+                    path.append(parent_dict[path[-1]])
+                return path[::-1]
+            for group_key, group_nodes in self.neighbor_groups(nid):
+                if expanded_group_cost_dict.get(group_key, np.inf) <= cost:
+                    continue
+                expanded_group_cost_dict[group_key] = cost
+                for next_nid in group_nodes:
+                    if cost + 1 < cost_dict.get(next_nid, np.inf):
+                        cost_dict[next_nid] = cost + 1
+                        parent_dict[next_nid] = nid
+                        heapq.heappush(open_heap, (cost + 1 + heuristic(next_nid), cost + 1, next_nid))
+        return None
+
+
 class FSRegraspPlanner(object):
 
     def __init__(self, robot, obj_cmodel, reference_fsp_poses, reference_grasp_collection):
-        self.fsreg_graph = nx.Graph()
+        self.fsreg_graph = FSRegraspGraph(n_reference_grasps=len(reference_grasp_collection))
         self.regspot_col = RegraspSpotCollection(robot=robot,
                                                  obj_cmodel=obj_cmodel,
                                                  reference_fsp_poses=reference_fsp_poses,
                                                  reference_grasp_collection=reference_grasp_collection)
         self.pp_planner = ppp.PickPlacePlanner(robot)
-        self._global_nodes_by_gid = [[] for _ in range(len(reference_grasp_collection))]
         self._plot_g_radius = .01
         self._plot_p_radius = 0.05
         self._n_reference_poses = len(reference_fsp_poses)
@@ -186,36 +339,8 @@ class FSRegraspPlanner(object):
         :param regspot_col: an instance of RegraspSpotCollection or a list of SpotFSPGs
         :return:
         """
-        new_global_nodes_by_gid = [[] for _ in range(len(self.reference_grasp_collection))]
         for fsregspot in regspot_col:
-            spot_x = fsregspot.spot_pos[0]
-            spot_y = fsregspot.spot_pos[1]
-            for fspg in fsregspot.fspgs:
-                plot_pose_x = spot_x + self._plot_p_radius * np.sin(fspg.fsp_pose_id * self._p_angle_interval)
-                plot_pose_y = spot_y + self._plot_p_radius * np.cos(fspg.fsp_pose_id * self._p_angle_interval)
-                local_nodes = []
-                obj_pose = fspg.obj_pose
-                for gid, grasp, jnt_values in zip(fspg.feasible_gids, fspg.feasible_grasps, fspg.feasible_jv_list):
-                    local_nodes.append(uuid.uuid4())
-                    plot_grasp_x = plot_pose_x + self._plot_g_radius * np.sin(gid * self._g_angle_interval)
-                    plot_grasp_y = plot_pose_y + self._plot_g_radius * np.cos(gid * self._g_angle_interval)
-                    self.fsreg_graph.add_node(local_nodes[-1],
-                                              obj_pose=obj_pose,
-                                              grasp=grasp,
-                                              jnt_values=jnt_values,
-                                              plot_xy=(plot_grasp_x, plot_grasp_y))
-                    new_global_nodes_by_gid[gid].append(local_nodes[-1])
-                    self._global_nodes_by_gid[gid].append(local_nodes[-1])
-                for node_pair in itertools.combinations(local_nodes, 2):
-                    self.fsreg_graph.add_edge(node_pair[0], node_pair[1], type='transit')
-        for i in range(len(self.reference_grasp_collection)):
-            new_global_nodes = new_global_nodes_by_gid[i]
-            original_global_nodes = self._global_nodes_by_gid[i]
-            for node_pair in itertools.product(new_global_nodes, original_global_nodes):
-                self.fsreg_graph.add_edge(node_pair[0], node_pair[1], type='transfer')
-        # for global_nodes in tqdm(self._global_nodes_by_gid):
-        #     for global_node_pair in itertools.combinations(global_nodes, 2):
-        #         self.fsreg_graph.add_edge(global_node_pair[0], global_node_pair[1], type='transfer')
+            self._add_regspot_to_fsreg_graph(fsregspot)
 
     def _add_regspot_to_fsreg_graph(self, regspot):
         """
@@ -223,90 +348,50 @@ class FSRegraspPlanner(object):
         :param regspot:
         :return:
         """
-        new_global_nodes_by_gid = [[] for _ in range(len(self.reference_grasp_collection))]
         spot_x = regspot.spot_pos[0]
         spot_y = regspot.spot_pos[1]
         for fspg in regspot.fspgs:
             plot_pose_x = spot_x + self._plot_p_radius * np.sin(fspg.fsp_pose_id * self._p_angle_interval)
             plot_pose_y = spot_y + self._plot_p_radius * np.cos(fspg.fsp_pose_id * self._p_angle_interval)
-            local_nodes = []
-            obj_pose = fspg.obj_pose
-            for gid, grasp, jnt_values in zip(fspg.feasible_gids, fspg.feasible_grasps, fspg.feasible_jv_list):
-                local_nodes.append(uuid.uuid4())
-                plot_grasp_x = plot_pose_x + self._plot_g_radius * np.sin(gid * self._g_angle_interval)
-                plot_grasp_y = plot_pose_y + self._plot_g_radius * np.cos(gid * self._g_angle_interval)
-                self.fsreg_graph.add_node(local_nodes[-1],
-                                          obj_pose=obj_pose,
-                                          grasp=grasp,
-                                          jnt_values=jnt_values,
-                                          plot_xy=(plot_grasp_x, plot_grasp_y))
-                new_global_nodes_by_gid[gid].append(local_nodes[-1])
-                self._global_nodes_by_gid[gid].append(local_nodes[-1])
-            for node_pair in itertools.combinations(local_nodes, 2):
-                self.fsreg_graph.add_edge(node_pair[0], node_pair[1], type='transit')
-        for i in range(len(self.reference_grasp_collection)):
-            new_global_nodes = new_global_nodes_by_gid[i]
-            original_global_nodes = self._global_nodes_by_gid[i]
-            for node_pair in itertools.product(new_global_nodes, original_global_nodes):
-                self.fsreg_graph.add_edge(node_pair[0], node_pair[1], type='transfer')
+            self.fsreg_graph.add_pg(fspg, plot_xy=(plot_pose_x, plot_pose_y))
 
     def _add_fspg_to_fsreg_graph(self, fspg, plot_pose_xy, prefix=''):
         """
         add a fspg to the regrasp graph
         :param fspg:
         :param plot_pose_xy: specify where to plot the fspg
-        :return:
+        :return: a list of the new node ids
         """
-        new_global_nodes_by_gid = [[] for _ in range(len(self.reference_grasp_collection))]
-        local_nodes = []
-        obj_pose = fspg.obj_pose
-        for gid, grasp, jnt_values in zip(fspg.feasible_gids, fspg.feasible_grasps, fspg.feasible_jv_list):
-            local_nodes.append(uuid.uuid4())
-            plot_grasp_x = plot_pose_xy[0] + self._plot_g_radius * np.sin(gid * self._g_angle_interval)
-            plot_grasp_y = plot_pose_xy[1] + self._plot_g_radius * np.cos(gid * self._g_angle_interval)
-            self.fsreg_graph.add_node(local_nodes[-1],
-                                      obj_pose=obj_pose,
-                                      grasp=grasp,
-                                      jnt_values=jnt_values,
-                                      plot_xy=(plot_grasp_x, plot_grasp_y))
-            new_global_nodes_by_gid[gid].append(local_nodes[-1])
-            self._global_nodes_by_gid[gid].append(local_nodes[-1])
-        for node_pair in itertools.combinations(local_nodes, 2):
-            self.fsreg_graph.add_edge(node_pair[0], node_pair[1], type=prefix + '_transit')
-        for i in range(len(self.reference_grasp_collection)):
-            new_global_nodes = new_global_nodes_by_gid[i]
-            original_global_nodes = self._global_nodes_by_gid[i]
-            for node_pair in itertools.product(new_global_nodes, original_global_nodes):
-                self.fsreg_graph.add_edge(node_pair[0], node_pair[1], type=prefix + '_transfer')
-        return local_nodes
+        return self.fsreg_graph.add_pg(fspg, plot_xy=plot_pose_xy, prefix=prefix)
+
+    def _get_plot_xy(self, nid):
+        node = self.fsreg_graph.get_node(nid)
+        plot_pose_xy = node['pg_plot_xy']
+        return (plot_pose_xy[0] + self._plot_g_radius * np.sin(node['gid'] * self._g_angle_interval),
+                plot_pose_xy[1] + self._plot_g_radius * np.cos(node['gid'] * self._g_angle_interval))
 
     def draw_fsreg_graph(self):
         # for regspot in self.regspot_col:
         #     spot_x = regspot.spot_pos[0]
         #     spot_y = regspot.spot_pos[1]
         #     plt.plot(spot_x, spot_y, 'ko')
-        for node_tuple in self.fsreg_graph.edges:
-            node1_plot_xy = self.fsreg_graph.nodes[node_tuple[0]]['plot_xy']
-            node2_plot_xy = self.fsreg_graph.nodes[node_tuple[1]]['plot_xy']
-            if self.fsreg_graph.edges[node_tuple]['type'] == 'transit':
-                plt.plot([node1_plot_xy[0], node2_plot_xy[0]], [node1_plot_xy[1], node2_plot_xy[1]], 'c-')
-            elif self.fsreg_graph.edges[node_tuple]['type'] == 'transfer':
-                plt.plot([node1_plot_xy[0], node2_plot_xy[0]], [node1_plot_xy[1], node2_plot_xy[1]], 'k-')
-            elif self.fsreg_graph.edges[node_tuple]['type'] == 'start_transit':
-                plt.plot([node1_plot_xy[0], node2_plot_xy[0]], [node1_plot_xy[1], node2_plot_xy[1]], 'm-')
-            elif self.fsreg_graph.edges[node_tuple]['type'] == 'start_transfer':
-                plt.plot([node1_plot_xy[0], node2_plot_xy[0]], [node1_plot_xy[1], node2_plot_xy[1]], 'g-')
-            elif self.fsreg_graph.edges[node_tuple]['type'] == 'goal_transit':
-                plt.plot([node1_plot_xy[0], node2_plot_xy[0]], [node1_plot_xy[1], node2_plot_xy[1]], 'y-')
-            elif self.fsreg_graph.edges[node_tuple]['type'] == 'goal_transfer':
-                plt.plot([node1_plot_xy[0], node2_plot_xy[0]], [node1_plot_xy[1], node2_plot_xy[1]], 'b-')
+        style_dict = {'transit': 'c-',
+                      'transfer': 'k-',
+                      'start_transit': 'm-',
+                      'start_transfer': 'g-',
+                      'goal_transit': 'y-',
+                      'goal_transfer': 'b-'}
+        for nid0, nid1, edge_type in self.fsreg_graph.iter_edges():
+            node1_plot_xy = self._get_plot_xy(nid0)
+            node2_plot_xy = self._get_plot_xy(nid1)
+            plt.plot([node1_plot_xy[0], node2_plot_xy[0]], [node1_plot_xy[1], node2_plot_xy[1]], style_dict[edge_type])
         plt.gca().set_aspect('equal', adjustable='box')
 
     def draw_path(self, path):
         n_nodes_on_path = len(path)
         for i in range(1, n_nodes_on_path):
-            node1_plot_xy = self.fsreg_graph.nodes[path[i]]['plot_xy']
-            node2_plot_xy = self.fsreg_graph.nodes[path[i - 1]]['plot_xy']
+            node1_plot_xy = self._get_plot_xy(path[i])
+            node2_plot_xy = self._get_plot_xy(path[i - 1])
             plt.plot([node1_plot_xy[0], node2_plot_xy[0]], [node1_plot_xy[1], node2_plot_xy[1]], 'r-', linewidth=2)
 
     def show_graph(self):
@@ -318,23 +403,24 @@ class FSRegraspPlanner(object):
         self.draw_path(path)
         plt.show()
 
-    def plan(self, start_fsp_pose_id, goal_fsp_pos_id):
+    def plan(self, start_node_list, goal_node_list):
         """
-
-        :param start_fsp_pose_id:
-        :param goal_fsp_pos_id:
-        :return:
+        find the regrasp sequence with the fewest transit and transfer motions
+        :param start_node_list: returned by add_start_pose
+        :param goal_node_list: returned by add_goal_pose
+        :return: a list of node ids, or None if the start and goal are not connected
         """
-        pass
+        return self.fsreg_graph.search(start_node_list, goal_node_list)
 
     def gen_regrasp_motion(self, path):
         """
         """
         mesh_list = []
         for i, node in enumerate(path):
-            obj_pose = self.fsreg_graph.nodes[node]['obj_pose']
-            grasp = self.fsreg_graph.nodes[node]['grasp']
-            jnt_values = self.fsreg_graph.nodes[node]['jnt_values']
+            node_dict = self.fsreg_graph.get_node(node)
+            obj_pose = node_dict['obj_pose']
+            grasp = node_dict['grasp']
+            jnt_values = node_dict['jnt_values']
             m_col = mmc.ModelCollection()
             obj_cmodel_copy = self.obj_cmodel.copy()
             obj_cmodel_copy.pose = obj_pose
@@ -343,10 +429,10 @@ class FSRegraspPlanner(object):
             self.robot.gen_meshmodel().attach_to(m_col)
             if i >= 1:
                 prev_node = path[i - 1]
-                prev_obj_pose = self.fsreg_graph.nodes[prev_node]['obj_pose']
-                prev_grasp = self.fsreg_graph.nodes[prev_node]['grasp']
-                prev_jnt_values = self.fsreg_graph.nodes[prev_node]['jnt_values']
-                if self.fsreg_graph.edges[(prev_node, node)]['type'].endswith('transfer'):
+                prev_node_dict = self.fsreg_graph.get_node(prev_node)
+                prev_grasp = prev_node_dict['grasp']
+                prev_jnt_values = prev_node_dict['jnt_values']
+                if self.fsreg_graph.get_edge_type(prev_node, node).endswith('transfer'):
                     self.robot.hold(obj_cmodel=obj_cmodel_copy, jaw_width=prev_grasp.ee_values)
                     prev2current = self.pp_planner.rrtc_planner.plan(start_conf=prev_jnt_values,
                                                                     goal_conf=jnt_values,
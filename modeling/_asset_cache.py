@@ -0,0 +1,167 @@
+"""
+Content-hashed on-disk cache of mesh assets
+A mesh file is parsed and processed by basis.trimesh only once. The processed vertices, faces, normals, the vertex
+buffer of the Panda3D geom, and the expensive bounding primitives (obb, cylinder) are saved as npy files in a
+directory named after the hash of the file content, and loaded back with memory mapping.
+The directory can be changed with the environment variable WRS_ASSET_CACHE_DIR; WRS_ASSET_CACHE=0 disables the cache.
+"""
+import os
+import hashlib
+import tempfile
+import shutil
+import numpy as np
+import basis.data_adapter as da
+from panda3d.core import Geom, GeomNode, GeomTriangles, GeomVertexData, GeomVertexFormat, GeomEnums, NodePath
+
+_FORMAT_VERSION = b"1"
+_MESH_KEYS = ("vertices", "faces", "face_normals", "vertex_normals")
+CACHE_DIR = os.environ.get("WRS_ASSET_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                   "_asset_cache"))
+TOGGLE_CACHE = os.environ.get("WRS_ASSET_CACHE", "1") != "0"
+
+
+def file_digest(file_path):
+    """
+    :param file_path:
+    :return: hex digest of the file content
+    """
+    hasher = hashlib.blake2b(_FORMAT_VERSION, digest_size=16)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _gen_vertex_buffer(trm_mesh):
+    """
+    the interleaved vertex buffer used by da.pdgeom_from_vfnf (each triangle refers to its own vertices)
+    :return: (3*n_faces)x6 float32 nparray
+    """
+    vertex_buffer = np.empty((len(trm_mesh.faces) * 3, 6), dtype=np.float32)
+    vertex_buffer[:, :3] = trm_mesh.vertices[trm_mesh.faces.flatten()]
+    vertex_buffer[:, 3:] = np.repeat(trm_mesh.face_normals, repeats=3, axis=0)
+    return vertex_buffer
+
+
+def _save_entry(entry_dir, trm_mesh):
+    """
+    write into a temporary directory first and rename it, so that readers never see a partial entry
+    raises OSError if the entry could not be written and does not exist either
+    """
+    os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(entry_dir))
+    try:
+        for key in _MESH_KEYS:
+            np.save(os.path.join(tmp_dir, key + ".npy"), np.ascontiguousarray(getattr(trm_mesh, key)))
+        np.save(os.path.join(tmp_dir, "vertex_buffer.npy"), _gen_vertex_buffer(trm_mesh))
+        os.rename(tmp_dir, entry_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        # another process may have created the entry in the meantime, otherwise the failure is real
+        if not os.path.isdir(entry_dir):
+            raise
+
+
+def _seed_bounds(entry_dir, trm_mesh):
+    """
+    put the cached obb and cylinder bounds into the cache of trm_mesh
+    """
+    from basis.trimesh import primitives
+    obb_file = os.path.join(entry_dir, "obb.npy")
+    if os.path.isfile(obb_file):
+        obb_params = np.load(obb_file)
+        trm_mesh._cache['obb'] = primitives.Box(homomat=obb_params[:16].reshape(4, 4), extents=obb_params[16:19])
+    cyl_file = os.path.join(entry_dir, "cyl.npy")
+    if os.path.isfile(cyl_file):
+        cyl_params = np.load(cyl_file)
+        trm_mesh._cache['cyl'] = primitives.Cylinder(homomat=cyl_params[:16].reshape(4, 4),
+                                                     height=cyl_params[16],
+                                                     radius=cyl_params[17])
+
+
+def load_trm_mesh(file_path):
+    """
+    load a mesh file through the cache
+    the returned trimesh carries the cache directory and its md5 in metadata["asset_dir"] and metadata["asset_md5"]
+    :param file_path:
+    :return: basis.trimesh.Trimesh
+    """
+    if not TOGGLE_CACHE:
+        return da.trm.load(file_path)
+    entry_dir = os.path.join(CACHE_DIR, file_digest(file_path))
+    if not os.path.isdir(entry_dir):
+        trm_mesh = da.trm.load(file_path)
+        if not isinstance(trm_mesh, da.trm.Trimesh):
+            return trm_mesh
+        try:
+            _save_entry(entry_dir, trm_mesh)
+        except OSError as e:
+            print(f"Failed to cache {file_path}: {e}")
+            return trm_mesh
+    # copy-on-write mapping: the arrays are shared until somebody modifies them in place
+    array_dict = {key: np.load(os.path.join(entry_dir, key + ".npy"), mmap_mode="c") for key in _MESH_KEYS}
+    trm_mesh = da.trm.Trimesh(**array_dict, metadata={"asset_dir": entry_dir}, process=False)
+    trm_mesh.metadata["asset_md5"] = trm_mesh.md5()
+    _seed_bounds(entry_dir, trm_mesh)
+    return trm_mesh
+
+
+def _get_entry_dir(trm_mesh):
+    """
+    :return: the cache directory of a trimesh returned by load_trm_mesh, or None if it is not cached or was modified
+    """
+    entry_dir = trm_mesh.metadata.get("asset_dir", None)
+    if entry_dir is None or trm_mesh.metadata.get("asset_md5", None) != trm_mesh.md5():
+        return None
+    return entry_dir
+
+
+def save_bounds(trm_mesh):
+    """
+    save the obb and cylinder bounds computed for a cached trimesh, so that later loads skip computing them
+    :param trm_mesh: a trimesh returned by load_trm_mesh, other trimeshes are ignored
+    :return:
+    """
+    entry_dir = _get_entry_dir(trm_mesh)
+    if entry_dir is None:
+        return
+    obb = trm_mesh._cache['obb']
+    obb_file = os.path.join(entry_dir, "obb.npy")
+    if obb is not None and not os.path.isfile(obb_file):
+        _save_atomic(obb_file, np.concatenate((np.asarray(obb.homomat).ravel(), obb.extents)))
+    cyl = trm_mesh._cache['cyl']
+    cyl_file = os.path.join(entry_dir, "cyl.npy")
+    if cyl is not None and not os.path.isfile(cyl_file):
+        _save_atomic(cyl_file, np.concatenate((np.asarray(cyl.homomat).ravel(), [cyl.height, cyl.radius])))
+
+
+def _save_atomic(file_path, array):
+    try:
+        tmp_file = file_path + f".{os.getpid()}.tmp.npy"
+        np.save(tmp_file, array)
+        os.replace(tmp_file, file_path)
+    except OSError as e:
+        print(f"Failed to cache {file_path}: {e}")
+
+
+def trimesh_to_nodepath(trm_mesh, name="auto"):
+    """
+    same as da.trimesh_to_nodepath, but uses the cached vertex buffer of a trimesh returned by load_trm_mesh
+    :param trm_mesh:
+    :param name:
+    :return:
+    """
+    entry_dir = _get_entry_dir(trm_mesh)
+    if entry_dir is None:
+        return da.trimesh_to_nodepath(trm_mesh, name=name)
+    vertex_buffer = np.load(os.path.join(entry_dir, "vertex_buffer.npy"), mmap_mode="r")
+    vertex_data = GeomVertexData(name + '_pdgeom', GeomVertexFormat.getV3n3(), Geom.UHStatic)
+    vertex_data.modifyArrayHandle(0).setData(vertex_buffer.tobytes())
+    primitive = GeomTriangles(Geom.UHStatic)
+    primitive.setIndexType(GeomEnums.NTUint32)
+    primitive.modifyVertices(-1).modifyHandle().setData(np.arange(len(vertex_buffer), dtype=np.uint32).tobytes())
+    pdgeom = Geom(vertex_data)
+    pdgeom.addPrimitive(primitive)
+    pdgeom_nd = GeomNode(name + '_pdgeom_node')
+    pdgeom_nd.addGeom(pdgeom)
+    return NodePath(pdgeom_nd)
@@ -0,0 +1,187 @@
+# vectorized ray casting against triangle meshes
+# a two-level bounding volume hierarchy is used: triangles are sorted along a morton curve and grouped into leaves;
+# all rays are tested against the leaf aabbs at once, and then against the triangles of the overlapped leaves at once
+import numpy as np
+
+_EPS = 1e-12
+
+
+def _morton_code(points, n_bits=10):
+    """
+    interleave the bits of quantized coordinates
+    :param points: nx3 nparray
+    :param n_bits: number of bits used for each axis
+    :return: 1xn nparray of integers
+    """
+    min_pnt = points.min(axis=0)
+    extent = np.maximum(points.max(axis=0) - min_pnt, _EPS)
+    quantized = ((points - min_pnt) / extent * (2 ** n_bits - 1)).astype(np.int64)
+    code = np.zeros(len(points), dtype=np.int64)
+    for bit in range(n_bits):
+        for axis in range(3):
+            code |= ((quantized[:, axis] >> bit) & 1) << (3 * bit + axis)
+    return code
+
+
+class TriangleBVH(object):
+    """
+    an implicit bvh over the triangles sorted along a morton curve
+    a node at level k covers leaf_size*branch_factor^k consecutive triangles, so no explicit tree is stored;
+    rays traverse the levels top-down in lock step, keeping all (ray, node) pairs of a level in flat arrays
+    """
+
+    def __init__(self, vertices, faces, face_normals=None, leaf_size=4, branch_factor=8):
+        """
+        :param vertices: nx3 nparray
+        :param faces: mx3 nparray
+        :param face_normals: mx3 nparray, computed from the vertices if None
+        :param leaf_size: number of triangles in a leaf node
+        :param branch_factor: number of children of an inner node
+        """
+        triangles = np.asarray(vertices, dtype=np.float64)[np.asarray(faces)]
+        if face_normals is None:
+            face_normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+            face_normals = face_normals / np.maximum(np.linalg.norm(face_normals, axis=1, keepdims=True), _EPS)
+        order = np.argsort(_morton_code(triangles.mean(axis=1)), kind='stable')
+        triangles = triangles[order]
+        self._face_normals = np.asarray(face_normals, dtype=np.float64)[order]
+        self._n_triangles = len(triangles)
+        self._leaf_size = leaf_size
+        self._branch_factor = branch_factor
+        # moller-trumbore only needs one vertex and two edges per triangle
+        self._vert0 = triangles[:, 0]
+        self._edge1 = triangles[:, 1] - triangles[:, 0]
+        self._edge2 = triangles[:, 2] - triangles[:, 0]
+        # leaf level
+        tri_min = triangles.min(axis=1)
+        tri_max = triangles.max(axis=1)
+        self._level_min_list = [self._group_reduce(tri_min, leaf_size, np.minimum)]
+        self._level_max_list = [self._group_reduce(tri_max, leaf_size, np.maximum)]
+        # inner levels, the last one in the list is the top level
+        while len(self._level_min_list[-1]) > branch_factor:
+            self._level_min_list.append(self._group_reduce(self._level_min_list[-1], branch_factor, np.minimum))
+            self._level_max_list.append(self._group_reduce(self._level_max_list[-1], branch_factor, np.maximum))
+
+    @staticmethod
+    def _group_reduce(box_array, group_size, ufunc):
+        """
+        reduce every group_size consecutive rows; the last group is padded with its last row
+        """
+        n_groups = -(-len(box_array) // group_size)
+        padded = np.concatenate((box_array, np.repeat(box_array[-1:], n_groups * group_size - len(box_array), axis=0)))
+        return ufunc.reduce(padded.reshape(n_groups, group_size, 3), axis=1)
+
+    @staticmethod
+    def _slab_test(box_min, box_max, spos, inv_dir, length):
+        """
+        row-wise segment-aabb overlap
+        """
+        with np.errstate(invalid='ignore'):
+            t0 = (box_min - spos) * inv_dir
+            t1 = (box_max - spos) * inv_dir
+        # nan appears when a ray lies on a slab plane; it is ignored by fmin/fmax
+        t_near = np.fmax.reduce(np.fmin(t0, t1), axis=1)
+        t_far = np.fmin.reduce(np.fmax(t0, t1), axis=1)
+        return (t_near <= t_far) & (t_far >= 0) & (t_near <= length)
+
+    @staticmethod
+    def _expand(ray_ids, node_ids, n_children, n_nodes):
+        """
+        replace every (ray, node) pair with the (ray, child) pairs of the node
+        """
+        child_ids = (node_ids[:, None] * n_children + np.arange(n_children)[None, :]).ravel()
+        ray_ids = np.repeat(ray_ids, n_children)
+        valid = child_ids < n_nodes
+        return ray_ids[valid], child_ids[valid]
+
+    def _candidate_pairs(self, spos_array, dir_array, length_array):
+        """
+        traverse the levels top-down with slab tests
+        :return: ray ids and triangle ids of the candidate pairs
+        """
+        with np.errstate(divide='ignore'):
+            inv_dir_array = 1.0 / dir_array
+        n_top_nodes = len(self._level_min_list[-1])
+        ray_ids = np.repeat(np.arange(len(spos_array)), n_top_nodes)
+        node_ids = np.tile(np.arange(n_top_nodes), len(spos_array))
+        for level in range(len(self._level_min_list) - 1, -1, -1):
+            if level < len(self._level_min_list) - 1:
+                ray_ids, node_ids = self._expand(ray_ids, node_ids, self._branch_factor,
+                                                 len(self._level_min_list[level]))
+            is_overlapped = self._slab_test(self._level_min_list[level][node_ids],
+                                            self._level_max_list[level][node_ids],
+                                            spos_array[ray_ids],
+                                            inv_dir_array[ray_ids],
+                                            length_array[ray_ids])
+            ray_ids, node_ids = ray_ids[is_overlapped], node_ids[is_overlapped]
+        return self._expand(ray_ids, node_ids, self._leaf_size, self._n_triangles)
+
+    def ray_hit_flat(self, spos_array, epos_array):
+        """
+        intersect segments spos-epos with the mesh (moller-trumbore, both sides of triangles)
+        :param spos_array: nx3 nparray
+        :param epos_array: nx3 nparray
+        :return: ray_ids, hit_points, hit_normals of all hits, sorted by ray id and then by distance to spos;
+                 hit_normals are the face normals of the hit triangles
+        """
+        spos_array = np.asarray(spos_array, dtype=np.float64).reshape(-1, 3)
+        epos_array = np.asarray(epos_array, dtype=np.float64).reshape(-1, 3)
+        vec_array = epos_array - spos_array
+        length_array = np.linalg.norm(vec_array, axis=1)
+        dir_array = vec_array / np.maximum(length_array[:, None], _EPS)
+        ray_ids, tri_ids = self._candidate_pairs(spos_array, dir_array, length_array)
+        # moller-trumbore on all candidate pairs
+        edge1 = self._edge1[tri_ids]
+        edge2 = self._edge2[tri_ids]
+        dirs = dir_array[ray_ids]
+        pvec = np.cross(dirs, edge2)
+        det = np.einsum('ij,ij->i', edge1, pvec)
+        not_parallel = np.abs(det) > _EPS
+        inv_det = np.where(not_parallel, 1.0 / np.where(not_parallel, det, 1.0), 0.0)
+        tvec = spos_array[ray_ids] - self._vert0[tri_ids]
+        u = np.einsum('ij,ij->i', tvec, pvec) * inv_det
+        qvec = np.cross(tvec, edge1)
+        v = np.einsum('ij,ij->i', dirs, qvec) * inv_det
+        t = np.einsum('ij,ij->i', edge2, qvec) * inv_det
+        is_hit = (not_parallel & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0) & (t <= length_array[ray_ids]))
+        ray_ids, tri_ids, t = ray_ids[is_hit], tri_ids[is_hit], t[is_hit]
+        order = np.lexsort((t, ray_ids))
+        ray_ids, tri_ids, t = ray_ids[order], tri_ids[order], t[order]
+        hit_points = spos_array[ray_ids] + dir_array[ray_ids] * t[:, None]
+        return ray_ids, hit_points, self._face_normals[tri_ids]
+
+    def ray_hit(self, spos_array, epos_array):
+        """
+        :param spos_array: nx3 nparray
+        :param epos_array: nx3 nparray
+        :return: a list with one entry per segment: None if not hit, or else (hit_points, hit_normals)
+        """
+        return group_hits(len(spos_array), *self.ray_hit_flat(spos_array, epos_array))
+
+
+def group_hits(n_rays, ray_ids, hit_points, hit_normals):
+    """
+    split the flat results of TriangleBVH.ray_hit_flat into one entry per ray
+    :return: a list with one entry per ray: None if not hit, or else (hit_points, hit_normals)
+    """
+    result_list = [None] * n_rays
+    unique_ray_ids, start_ids = np.unique(ray_ids, return_index=True)
+    end_ids = np.append(start_ids[1:], len(ray_ids))
+    for ray_id, start, end in zip(unique_ray_ids, start_ids, end_ids):
+        result_list[ray_id] = (list(hit_points[start:end]), list(hit_normals[start:end]))
+    return result_list
+
+
+def rayhit_all_batch(spos_array, epos_array, target_cmodel):
+    """
+    :param spos_array: nx3 nparray, in the global frame
+    :param epos_array: nx3 nparray, in the global frame
+    :param target_cmodel: the bvh of the cdmesh is built in the local frame and cached by target_cmodel
+    :return: see TriangleBVH.ray_hit; points and normals are in the global frame
+    """
+    bvh = target_cmodel.cdmesh_bvh
+    pos, rotmat = target_cmodel.pos, target_cmodel.rotmat
+    # transform the segments into the local frame of the cmodel, and the hits back
+    ray_ids, hit_points, hit_normals = bvh.ray_hit_flat((np.asarray(spos_array) - pos) @ rotmat,
+                                                        (np.asarray(epos_array) - pos) @ rotmat)
+    return group_hits(len(spos_array), ray_ids, hit_points @ rotmat.T + pos, hit_normals @ rotmat.T)
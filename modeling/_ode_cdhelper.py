@@ -1,3 +1,4 @@
+import collections
 import numpy as np
 import modeling.collision_model as mcm
 import basis.robot_math as rm
@@ -20,6 +21,26 @@ def copy_cdmesh(objcm):
     return pdotrmgeom
 
 
+# ode trimesh data cannot be memory mapped from disk, but it is read-only once built and can be shared by geoms;
+# the data of identical meshes (e.g., the links of dual-arm robots, or repeated robot instances) is built only once
+_TRIMESH_DATA_CACHE = collections.OrderedDict()
+_TRIMESH_DATA_CACHE_SIZE = 512
+
+
+def _get_trimesh_data(trm_model):
+    key = trm_model.md5()
+    pdotrmdata = _TRIMESH_DATA_CACHE.get(key, None)
+    if pdotrmdata is not None:
+        _TRIMESH_DATA_CACHE.move_to_end(key)
+        return pdotrmdata
+    pdgeom_ndp = da.pdgeomndp_from_vvnf(trm_model.vertices, trm_model.vertex_normals, trm_model.faces)
+    pdotrmdata = OdeTriMeshData(model=pdgeom_ndp, use_normals=True)
+    _TRIMESH_DATA_CACHE[key] = pdotrmdata
+    if len(_TRIMESH_DATA_CACHE) > _TRIMESH_DATA_CACHE_SIZE:
+        _TRIMESH_DATA_CACHE.popitem(last=False)
+    return pdotrmdata
+
+
 def gen_cdmesh(trm_model):
     """
     generate cdmesh given vertices, vertex_normals, and faces
@@ -27,11 +48,20 @@ def gen_cdmesh(trm_model):
     author: weiwei
     date: 20210118
     """
-    pdgeom_ndp = da.pdgeomndp_from_vvnf(trm_model.vertices, trm_model.vertex_normals, trm_model.faces)
-    pdotrmgeom = OdeTriMeshGeom(OdeTriMeshData(model=pdgeom_ndp, use_normals=True))  # otgeom = ode trimesh geom
+    pdotrmgeom = OdeTriMeshGeom(_get_trimesh_data(trm_model))  # otgeom = ode trimesh geom
     return pdotrmgeom
 
 
+def share_cdmesh(pdotrmgeom):
+    """
+    a new geom with its own pose that shares the trimesh data of pdotrmgeom
+    unlike the deprecated copy_cdmesh, it takes the geom instead of the collision model
+    :param pdotrmgeom: panda3d.ode.OdeTriMeshGeom
+    :return: panda3d.ode.OdeTriMeshGeom
+    """
+    return OdeTriMeshGeom(pdotrmgeom.getTriMeshData())
+
+
 def update_pose(pdotrmgeom, objcm):
     """
     update obj_ode_trimesh using the transformation matrix of obj_cmodel.pdndp
@@ -2,6 +2,8 @@
 # note: This script is not used by robot simulations, as collison checker is faster
 import math
 import copy
+import threading
+import weakref
 import numpy as np
 import basis.robot_math as rm
 import basis.data_adapter as da
@@ -314,9 +316,15 @@ def gen_pdndp_wireframe(trm_model,
 #     else:
 #         return False, np.asarray([]) if toggle_contacts else False
 
+# one persistent scene per thread, see is_collided
+_thread_local = threading.local()
+
+
 def is_collided(cmodel_list0, cmodel_list1, toggle_contacts=False):
     """
     detect the collision between collision models
+    the cdprims stay resident in a persistent scene of the calling thread; only the models that differ from the last
+    call are attached or detached, and only the poses that changed are updated
     :param: cmodel_list0, a single collision model or a list of collision models
     :param: cmodel_list1
     :param toggle_contacts: True default
@@ -328,37 +336,169 @@ def is_collided(cmodel_list0, cmodel_list1, toggle_contacts=False):
         cmodel_list0 = [cmodel_list0]
     if not isinstance(cmodel_list1, list):
         cmodel_list1 = [cmodel_list1]
-    cd_trav = CollisionTraverser()
-    cd_handler = CollisionHandlerQueue()
-    tgt_pdndp = NodePath("collision pdndp")
-    # attach to collision tree, change bitmasks, and add colliders
-    for cmodel in cmodel_list0:
-        cdprim = cmodel.attach_cdprim_to(tgt_pdndp)
+    scene = getattr(_thread_local, "cd_scene", None)
+    if scene is None:
+        scene = _thread_local.cd_scene = CollisionScene()
+    scene.sync(obstacle_list=cmodel_list1, collider_list=cmodel_list0)
+    return scene.is_collided(toggle_contacts=toggle_contacts)
+
+
+class CollisionScene(object):
+    """
+    a persistent collision tree for repeated primitive collision detection
+    obstacles and colliders are attached once; only their poses are updated between queries
+    this avoids creating traversers and attaching/detaching cdprims for every is_collided call
+    """
+
+    def __init__(self, obstacle_list=None, collider_list=None):
+        """
+        :param obstacle_list: collision models that are collided into
+        :param collider_list: collision models whose collisions with the obstacles are detected
+        """
+        self._cd_trav = CollisionTraverser()
+        self._cd_handler = CollisionHandlerQueue()
+        self._pdndp = NodePath("collision scene")
+        # id(cmodel): [weakref of cmodel, reference cdprim, cdprim in the scene, synchronized pos, synchronized rotmat]
+        # ids instead of uuids as light copies share the uuid; the models are weakly referenced so that a scene does
+        # not keep them alive, an entry whose model was collected is replaced when another model reuses its id
+        self._obstacle_dict = {}
+        self._collider_dict = {}  # same as above, insertion ordered
+        if obstacle_list is not None:
+            for cmodel in obstacle_list:
+                self.add_obstacle(cmodel)
+        if collider_list is not None:
+            for cmodel in collider_list:
+                self.add_collider(cmodel)
+
+    @property
+    def n_colliders(self):
+        return len(self._collider_dict)
+
+    def add_obstacle(self, cmodel):
+        ref_cdprim = cmodel.cdprim
+        entry = self._obstacle_dict.get(id(cmodel))
+        if entry is not None:
+            if entry[0]() is cmodel and entry[1] is ref_cdprim:
+                return
+            # the cdprim of the model was changed or the id was reused, replace the stale copy
+            self.remove_obstacle(cmodel)
+        cdprim = copy_cdprim_attach_to(cmodel, self._pdndp, homomat=cmodel.homomat)
+        self._obstacle_dict[id(cmodel)] = [weakref.ref(cmodel), ref_cdprim, cdprim, cmodel.pos.copy(),
+                                           cmodel.rotmat.copy()]
+
+    def remove_obstacle(self, cmodel):
+        self._remove_obstacle_entry(id(cmodel))
+
+    def _remove_obstacle_entry(self, key):
+        detach_cdprim(self._obstacle_dict.pop(key)[2])
+
+    def add_collider(self, cmodel):
+        ref_cdprim = cmodel.cdprim
+        entry = self._collider_dict.get(id(cmodel))
+        if entry is not None:
+            if entry[0]() is cmodel and entry[1] is ref_cdprim:
+                return
+            self.remove_collider(cmodel)
+        cdprim = copy_cdprim_attach_to(cmodel, self._pdndp, homomat=cmodel.homomat)
         change_cdmask(cdprim, BITMASK_EXT, action="remove", type="into")
         for child_pdcnd in cdprim.getChildren():
-            cd_trav.addCollider(collider=child_pdcnd, handler=cd_handler)
-    for cmodel in cmodel_list1:
-        cmodel.attach_cdprim_to(tgt_pdndp)
-    # perform collision detection
-    cd_trav.traverse(tgt_pdndp)
-    # detach from collision tree, change bitmasks, and remove colliders
-    for cmodel in cmodel_list0:
-        cmodel.detach_cdprim()
-        change_cdmask(cmodel.cdprim, BITMASK_EXT, action="add", type="into")
-        for child_pdcnd in cmodel.cdprim.getChildren():
-            cd_trav.removeCollider(child_pdcnd)
-    for cmodel in cmodel_list1:
-        cmodel.detach_cdprim()
-    if cd_handler.getNumEntries() > 0:
-        if toggle_contacts:
-            contact_points = np.asarray([da.pdvec3_to_npvec3(cd_entry.getSurfacePoint(base.render)) for cd_entry in
-                                         cd_handler.getEntries()])
-            print(contact_points)
-            return True, contact_points
+            self._cd_trav.addCollider(collider=child_pdcnd, handler=self._cd_handler)
+        self._collider_dict[id(cmodel)] = [weakref.ref(cmodel), ref_cdprim, cdprim, cmodel.pos.copy(),
+                                           cmodel.rotmat.copy()]
+
+    def remove_collider(self, cmodel):
+        self._remove_collider_entry(id(cmodel))
+
+    def _remove_collider_entry(self, key):
+        cdprim = self._collider_dict.pop(key)[2]
+        for child_pdcnd in cdprim.getChildren():
+            self._cd_trav.removeCollider(child_pdcnd)
+        detach_cdprim(cdprim)
+
+    def sync(self, obstacle_list, collider_list):
+        """
+        make the resident obstacles and colliders identical to the given lists
+        models that are no longer in the lists are removed; new ones are added
+        :param obstacle_list:
+        :param collider_list:
+        :return:
+        """
+        for entry_dict, cmodel_list, remove_entry, add in (
+                (self._obstacle_dict, obstacle_list, self._remove_obstacle_entry, self.add_obstacle),
+                (self._collider_dict, collider_list, self._remove_collider_entry, self.add_collider)):
+            if len(entry_dict) > 0:
+                id_set = set(map(id, cmodel_list))
+                for key in [key for key in entry_dict if key not in id_set]:
+                    remove_entry(key)
+            for cmodel in cmodel_list:
+                add(cmodel)
+
+    def update_poses(self):
+        """
+        synchronize the poses of all cdprims with their collision models
+        the poses are compared by value against copies kept at the last synchronization, so that models moved by
+        modifying their pos or rotmat in place are followed as well; only the cdprims of the moved models are updated
+        :return:
+        """
+        for entry_dict in (self._obstacle_dict, self._collider_dict):
+            for entry in entry_dict.values():
+                cmodel = entry[0]()
+                if cmodel is None:
+                    continue
+                if not (np.array_equal(cmodel.pos, entry[3]) and np.array_equal(cmodel.rotmat, entry[4])):
+                    entry[2].setMat(da.npv3mat3_to_pdmat4(cmodel.pos, cmodel.rotmat))
+                    entry[3] = cmodel.pos.copy()
+                    entry[4] = cmodel.rotmat.copy()
+
+    def _traverse(self, toggle_contacts=False):
+        self._cd_handler.clearEntries()
+        self._cd_trav.traverse(self._pdndp)
+        if self._cd_handler.getNumEntries() > 0:
+            if toggle_contacts:
+                contact_points = np.asarray([da.pdvec3_to_npvec3(cd_entry.getSurfacePoint(self._pdndp)) for cd_entry
+                                             in self._cd_handler.getEntries()])
+                return True, contact_points
+            else:
+                return True
         else:
-            return True
-    else:
-        return False, np.asarray([]) if toggle_contacts else False
+            return (False, np.asarray([])) if toggle_contacts else False
+
+    def is_collided(self, toggle_contacts=False):
+        """
+        detect collisions between the colliders and the obstacles at the current poses of their collision models
+        :param toggle_contacts:
+        :return:
+        """
+        self.update_poses()
+        return self._traverse(toggle_contacts=toggle_contacts)
+
+    def query(self, pose_set_list, toggle_contacts=False):
+        """
+        detect collisions for a batch of collider poses; obstacle poses are synchronized once before the batch
+        the poses of the collision models themselves are not changed
+        :param pose_set_list: [[(pos, rotmat) for each collider in the order they were added], ...]
+        :param toggle_contacts:
+        :return: a list of results, one for each pose set
+        """
+        self.update_poses()
+        cdprim_list = [entry[2] for entry in self._collider_dict.values()]
+        result_list = []
+        for pose_set in pose_set_list:
+            if len(pose_set) != len(cdprim_list):
+                raise ValueError("The number of poses in a pose set must be equal to the number of colliders!")
+            for cdprim, (pos, rotmat) in zip(cdprim_list, pose_set):
+                cdprim.setMat(da.npv3mat3_to_pdmat4(pos, rotmat))
+            result_list.append(self._traverse(toggle_contacts=toggle_contacts))
+        # the colliders are no longer at the poses of their models
+        for entry in self._collider_dict.values():
+            entry[3] = entry[4] = None
+        return result_list
+
+    def clear(self):
+        for key in list(self._collider_dict):
+            self._remove_collider_entry(key)
+        for key in list(self._obstacle_dict):
+            self._remove_obstacle_entry(key)
 
 
 # *** deprecated ***
@@ -7,6 +7,8 @@ import modeling.geometric_model as mgm
 import modeling.model_collection as mmc
 import modeling._panda_cdhelper as mph
 import modeling._ode_cdhelper as moh
+import modeling._bvh_cdhelper as mbvh
+import modeling._asset_cache as mac
 import modeling.constant as mc
 import uuid
 
@@ -81,6 +83,7 @@ class CollisionModel(mgm.GeometricModel):
             # cd mesh
             self._cdmesh_type = initor.cdmesh_type
             self._cdmesh = copy.deepcopy(initor.cdprim)
+            self._cdmesh_bvh = initor._cdmesh_bvh  # read-only, shared
             # delays
             self._is_cdprim_delayed = True
             self._is_cdmesh_delayed = True
@@ -103,6 +106,7 @@ class CollisionModel(mgm.GeometricModel):
             # cd mesh
             self._cdmesh_type = cdmesh_type
             self._cdmesh = self._acquire_cdmesh(cdmesh_type)
+            self._cdmesh_bvh = None  # built lazily by ray_hit_batch
             # delays
             self._is_cdprim_delayed = True
             self._is_cdmesh_delayed = True
@@ -209,6 +213,8 @@ class CollisionModel(mgm.GeometricModel):
             print(cdprim_type)
             raise ValueError("Wrong primitive collision model cdprim_type name!")
         mph.change_cdmask(pdcndp, mph.BITMASK_EXT, action="new", type="both")
+        if cdprim_type in (mc.CDPType.OBB, mc.CDPType.CAPSULE, mc.CDPType.CYLINDER):
+            mac.save_bounds(self._trm_mesh)  # obb and cylinder bounds are expensive, keep them for later loads
         return pdcndp
 
     @mgm.GeometricModel.pos.setter
@@ -254,6 +260,17 @@ class CollisionModel(mgm.GeometricModel):
     def cdmesh(self):
         return self._cdmesh
 
+    @property
+    def cdmesh_bvh(self):
+        """
+        a bounding volume hierarchy of the cdmesh in the local frame, built at the first call
+        :return:
+        """
+        if self._cdmesh_bvh is None:
+            _, trm_mesh = self._acquire_cdmesh(toggle_trm=True)
+            self._cdmesh_bvh = mbvh.TriangleBVH(trm_mesh.vertices, trm_mesh.faces, trm_mesh.face_normals)
+        return self._cdmesh_bvh
+
     @property
     def cdprim_type(self):
         return self._cdprim_type
@@ -267,6 +284,7 @@ class CollisionModel(mgm.GeometricModel):
     def change_cdmesh_type(self, cdmesh_type):
         self._cdmesh = self._acquire_cdmesh(cdmesh_type)
         self._cdmesh_type = cdmesh_type
+        self._cdmesh_bvh = None
         # update if show_cdmesh is toggled on
         if "cdmesh" in self._cache_for_show:
             self._cache_for_show["cdmesh"].removeNode()
@@ -427,6 +445,32 @@ class CollisionModel(mgm.GeometricModel):
         elif option == "closest":
             return moh.rayhit_closet(spos, epos, self)
 
+    def ray_hit_batch(self, spos_array, epos_array):
+        """
+        check the intersections between a batch of segments and the mesh
+        all segments are tested at once against a cached bvh of the cdmesh
+        :param spos_array: nx3 nparray
+        :param epos_array: nx3 nparray
+        :return: a list with one entry per segment, None or [hit_points, hit_normals] like ray_hit(option="all")
+        """
+        return mbvh.rayhit_all_batch(spos_array, epos_array, self)
+
+    def light_copy(self):
+        """
+        a copy with its own pose, pdndp, cdprim, and cdmesh geom that shares the trimesh, the collision solids,
+        the ode trimesh data, and the bvh with this model; the uuid is kept
+        :return:
+        """
+        cmodel = super().light_copy()
+        if self._cdprim is not None:
+            cmodel._cdprim = copy.deepcopy(self._cdprim)  # the copied collision nodes share their solids
+        if self._cdmesh is not None:
+            cmodel._cdmesh = moh.share_cdmesh(self._cdmesh)
+        cmodel._is_cdprim_delayed = True
+        cmodel._is_cdmesh_delayed = True
+        cmodel._cache_for_show = {}
+        return cmodel
+
     def copy(self):
         cmodel = CollisionModel(self)
         cmodel.pos = self.pos
@@ -460,7 +504,7 @@ def gen_box(xyz_lengths=rm.np.array([.1, .1, .1]),
     author: weiwei
     date: 20201202, 20240303
     """
-    box_sgm = mgm.gen_box(xyz_lengths=xyz_lengths, pos=pos, rotmat=rotmat, rgba=rm.np.append(rgb, alpha))
+    box_sgm = mgm.gen_box(xyz_lengths=xyz_lengths, pos=pos, rotmat=rotmat, rgb=rgb, alpha=alpha)
     box_cm = CollisionModel(box_sgm)
     return box_cm
 
@@ -475,7 +519,7 @@ def gen_sphere(pos=rm.np.array([0, 0, 0]), radius=0.01, rgb=rm.bc.tab20_list[10]
     author: weiwei
     date: 20161212tsukuba, 20191228osaka
     """
-    sphere_sgm = mgm.gen_sphere(pos=pos, radius=radius, rgba=rm.np.append(rgb, alpha))
+    sphere_sgm = mgm.gen_sphere(pos=pos, radius=radius, rgb=rgb, alpha=alpha)
     sphere_cm = CollisionModel(sphere_sgm)
     return sphere_cm
 
@@ -497,7 +541,7 @@ def gen_stick(spos=rm.np.array([.0, .0, .0]),
     :param n_sec:
     :return: 20210328
     """
-    stick_sgm = mgm.gen_stick(spos=spos, epos=epos, radius=radius, type=type, rgba=rm.np.append(rgb, alpha), n_sec=n_sec)
+    stick_sgm = mgm.gen_stick(spos=spos, epos=epos, radius=radius, type=type, rgb=rgb, alpha=alpha, n_sec=n_sec)
     stick_cm = CollisionModel(stick_sgm)
     return stick_cm
 
@@ -4,6 +4,7 @@ import basis.trimesh_factory as trm_factory
 import basis.robot_math as rm
 import basis.constant as cst
 import modeling.model_collection as mc
+import modeling._asset_cache as mac
 import numpy as np
 from panda3d.core import NodePath, LineSegs, GeomNode, TransparencyAttrib, RenderModeAttrib
 from visualization.panda.world import ShowBase
@@ -58,13 +59,13 @@ class StaticGeometricModel(object):
             self._pdndp = NodePath(name)
             if isinstance(initor, str):
                 self._file_path = initor
-                self._trm_mesh = da.trm.load(self._file_path)
-                pdndp_core = da.trimesh_to_nodepath(self._trm_mesh, name='pdndp_core')
+                self._trm_mesh = mac.load_trm_mesh(self._file_path)
+                pdndp_core = mac.trimesh_to_nodepath(self._trm_mesh, name='pdndp_core')
                 pdndp_core.reparentTo(self._pdndp)
             elif isinstance(initor, da.trm.Trimesh):
                 self._file_path = None
                 self._trm_mesh = initor
-                pdndp_core = da.trimesh_to_nodepath(self._trm_mesh)
+                pdndp_core = mac.trimesh_to_nodepath(self._trm_mesh)
                 pdndp_core.reparentTo(self._pdndp)
             elif isinstance(initor, np.ndarray):  # TODO should pointcloud be pdndp or pdnp_raw
                 self._file_path = None
@@ -443,6 +444,22 @@ class GeometricModel(StaticGeometricModel):
         gmodel.rotmat = self.rotmat
         return gmodel
 
+    def light_copy(self):
+        """
+        a copy with its own pose and pdndp that shares the trimesh and the rendered geometry with this model
+        much cheaper than copy, used by robot state views (see RobotInterface.gen_state_view)
+        :return:
+        """
+        gmodel = copy.copy(self)
+        gmodel._pdndp = NodePath(self._pdndp.getName())
+        gmodel._pdndp.setState(self._pdndp.getState())
+        self.pdndp_core.instanceTo(gmodel._pdndp)
+        gmodel._pos = np.array(self._pos)
+        gmodel._rotmat = np.array(self._rotmat)
+        gmodel._is_pdndp_pose_delayed = True
+        gmodel._local_frame = None
+        return gmodel
+
 
 # ======================================================
 # helper functions for creating various geometric models
@@ -1,10 +1,46 @@
+import collections
+
+# placeholder of a mesh model that is generated when it is read
+_LAZY_MESH = object()
+
+
+class MeshList(object):
+    """
+    read-only sequence view of the mesh models in a MotionData
+    lazy entries are materialized by MotionData.get_mesh when they are accessed
+    """
+
+    def __init__(self, mot_data):
+        self._mot_data = mot_data
+
+    def __len__(self):
+        return len(self._mot_data)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self._mot_data.get_mesh(i) for i in range(*idx.indices(len(self)))]
+        return self._mot_data.get_mesh(idx)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._mot_data.get_mesh(i)
+
+
 class MotionData(object):
 
-    def __init__(self, robot):
+    def __init__(self, robot, mesh_cache_size=64):
+        """
+        :param robot:
+        :param mesh_cache_size: max number of lazily generated mesh models kept in memory
+        """
         self.robot = robot
         self._jv_list = []  # a list of jnt values
         self._ev_list = []  # a list of end effector values
-        self._mesh_list = []
+        self._mesh_list = []  # mesh models, None, or _LAZY_MESH placeholders
+        self._state_view_list = []  # state views of the robot taken when extending, None for non-lazy entries
+        self._mesh_cache = collections.OrderedDict()  # lru cache of lazily generated mesh models
+        self._mesh_cache_size = mesh_cache_size
+        self._posable_meshmodel_dict = {}  # id of a state view: posable mesh model of the state view
 
     @property
     def jv_list(self):
@@ -16,14 +52,71 @@ class MotionData(object):
 
     @property
     def mesh_list(self):
-        return self._mesh_list
+        return MeshList(self)
+
+    def _goto_idx(self, robot, idx):
+        # a hand holding objects refuses to change its ee values (see ee_interface), they are kept as they were
+        if self._ev_list[idx] is None or len(getattr(robot, "oiee_list", [])) > 0:
+            robot.goto_given_conf(jnt_values=self._jv_list[idx])
+        else:
+            robot.goto_given_conf(jnt_values=self._jv_list[idx], ee_values=self._ev_list[idx])
+
+    def get_mesh(self, idx):
+        """
+        get the mesh model at idx; lazy entries are generated from their state views and kept in a lru cache
+        :param idx:
+        :return:
+        """
+        idx = range(len(self._mesh_list))[idx]
+        mesh = self._mesh_list[idx]
+        if mesh is not _LAZY_MESH:
+            return mesh
+        if idx in self._mesh_cache:
+            self._mesh_cache.move_to_end(idx)
+            return self._mesh_cache[idx]
+        state_view = self._state_view_list[idx]
+        self._goto_idx(state_view, idx)
+        mesh = state_view.gen_meshmodel()
+        self._mesh_cache[idx] = mesh
+        if len(self._mesh_cache) > self._mesh_cache_size:
+            self._mesh_cache.popitem(last=False)
+        return mesh
+
+    def get_posed_mesh(self, idx, posable_meshmodel):
+        """
+        for animation: pose posable_meshmodel (see robot.gen_posable_meshmodel) at idx and return it,
+        no mesh model is generated per idx; entries that were generated when extending are returned as they are,
+        lazy entries are posed by a copy of posable_meshmodel that follows their state view (one per state view)
+        :param idx:
+        :param posable_meshmodel:
+        :return:
+        """
+        idx = range(len(self._mesh_list))[idx]
+        mesh = self._mesh_list[idx]
+        if mesh is not _LAZY_MESH and mesh is not None:
+            return mesh
+        if mesh is _LAZY_MESH:
+            state_view = self._state_view_list[idx]
+            if id(state_view) not in self._posable_meshmodel_dict:
+                self._posable_meshmodel_dict[id(state_view)] = posable_meshmodel.copy_to(state_view)
+            posable_meshmodel = self._posable_meshmodel_dict[id(state_view)]
+            self._goto_idx(state_view, idx)
+            posable_meshmodel.update()
+        else:
+            self.robot.backup_state()
+            self._goto_idx(self.robot, idx)
+            posable_meshmodel.update()
+            self.robot.restore_state()
+        return posable_meshmodel
 
     def extend(self, jv_list, ev_list=None, mesh_list=None):
         """
         :param jv_list:
         :param ev_list:
-        :param mesh_list: auto gen if None, fill with None if [], assign other wise
+        :param mesh_list: lazily gen if None, fill with None if [], assign other wise
         :return:
+        lazy entries keep a state view of the robot taken here (see robot.gen_state_view), so that they are generated
+        with the delegator, the other arms, the base pose, and the held objects of now instead of those at reading
         """
         self._jv_list += jv_list
         if ev_list is not None:
@@ -33,7 +126,11 @@ class MotionData(object):
                 self._ev_list += [self.robot.get_ee_values()] * len(jv_list)
             except:
                 self._ev_list += [None] * len(jv_list)
-        if mesh_list is None:
+        state_view = None
+        if mesh_list is None and hasattr(self.robot, "gen_state_view"):
+            self._mesh_list += [_LAZY_MESH] * len(jv_list)
+            state_view = self.robot.gen_state_view()
+        elif mesh_list is None:
             tmp_mesh_list = []
             self.robot.backup_state()
             for i, jnt_values in enumerate(jv_list):
@@ -47,16 +144,24 @@ class MotionData(object):
         elif len(mesh_list) == 0:
             self._mesh_list += [None] * len(jv_list)
         else:
-            self._mesh_list += mesh_list
+            self._mesh_list += list(mesh_list)
+        self._state_view_list += [state_view] * len(jv_list)
 
     def __len__(self):
         return len(self._jv_list)
 
     def __add__(self, other):
         if self.robot is other.robot:
+            n_self = len(self._mesh_list)
             self._jv_list += other.jv_list
             self._ev_list += other.ev_list
-            self._mesh_list += other.mesh_list
+            self._mesh_list += other._mesh_list
+            self._state_view_list += other._state_view_list
+            self._posable_meshmodel_dict.update(other._posable_meshmodel_dict)
+            for idx, mesh in other._mesh_cache.items():
+                self._mesh_cache[n_self + idx] = mesh
+            while len(self._mesh_cache) > self._mesh_cache_size:
+                self._mesh_cache.popitem(last=False)
             return self
         else:
             raise ValueError("Motion data for different robots cannot be concatenated.")
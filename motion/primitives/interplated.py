@@ -41,6 +41,81 @@ class InterplatedMotion(object):
 
         return wrapper
 
+    def _ik_along_poses(self, pose_list, seed_jnt_values=None, max_jnt_step=math.pi / 4):
+        """
+        solve ik for a densely interpolated pose path in one pass
+        the first pose is solved with robot.ik; the others are seeded by a first-order step
+        q0+pinv(J(q0))*(pose_i-pose_0) and refined together by robot.ik_batch. poses that fail or jump more than
+        max_jnt_step from their predecessor are re-solved one by one with the previous solution as the seed
+        :param pose_list: [[pos, rotmat], ...]
+        :param seed_jnt_values:
+        :param max_jnt_step: max change of a joint between two consecutive poses
+        :return: nxn_dof nparray, or None if any pose cannot be solved
+        """
+        pose_list = list(pose_list)
+        pos_array = np.array([pos for pos, _ in pose_list])
+        rotmat_array = np.array([rotmat for _, rotmat in pose_list])
+        first_jnt_values = self.robot.ik(pos_array[0], rotmat_array[0], seed_jnt_values=seed_jnt_values)
+        if first_jnt_values is None:
+            return None
+        n_poses = len(pose_list)
+        if n_poses == 1:
+            return first_jnt_values.reshape(1, -1)
+        _, _, delta_array = rm.diff_between_poses_batch(src_pos_array=np.tile(pos_array[0], (n_poses, 1)),
+                                                        src_rotmat_array=np.tile(rotmat_array[0], (n_poses, 1, 1)),
+                                                        tgt_pos_array=pos_array,
+                                                        tgt_rotmat_array=rotmat_array)
+        j_mat = self.robot.jacobian(jnt_values=first_jnt_values)
+        seeds = first_jnt_values + delta_array @ np.linalg.pinv(j_mat).T
+        seeds = np.clip(seeds, self.robot.jnt_ranges[:, 0], self.robot.jnt_ranges[:, 1])
+        jv_array, success_mask = self.robot.ik_batch(tgt_pos_array=pos_array[1:],
+                                                     tgt_rotmat_array=rotmat_array[1:],
+                                                     seeds=seeds[1:])
+        jv_array = np.vstack((first_jnt_values, jv_array))
+        success_mask = np.concatenate(([True], success_mask))
+        for i in range(1, n_poses):
+            if success_mask[i] and np.max(np.abs(jv_array[i] - jv_array[i - 1])) <= max_jnt_step:
+                continue
+            jnt_values = self.robot.ik(pos_array[i], rotmat_array[i], seed_jnt_values=jv_array[i - 1])
+            if jnt_values is None:
+                return None
+            jv_array[i] = jnt_values
+        return jv_array
+
+    def _gen_motion_along_poses(self, pose_list, seed_jnt_values=None, obstacle_list=None, ee_values=None,
+                                toggle_dbg=False):
+        """
+        ik of all poses first, then one collision check over the whole sequence; mesh models are generated lazily
+        :param pose_list: [[pos, rotmat], ...]
+        :return: MotionData, or None if failed
+        """
+        jv_array = self._ik_along_poses(pose_list, seed_jnt_values=seed_jnt_values)
+        if jv_array is None:
+            print("IK not solvable along the given poses!")
+            return None
+        if ee_values is not None:
+            self.robot.change_ee_values(ee_values=ee_values)
+        jv_list = list(jv_array)
+        is_collided, collided_id = self.robot.is_conf_list_collided(jnt_values_list=jv_list,
+                                                                    obstacle_list=obstacle_list,
+                                                                    toggle_first_id=True)
+        if is_collided:
+            if toggle_dbg:
+                self.robot.goto_given_conf(jnt_values=jv_list[collided_id], ee_values=ee_values)
+                _, contacts = self.robot.is_collided(obstacle_list=obstacle_list, toggle_contacts=True)
+                for pnt in contacts:
+                    gm.gen_sphere(pnt, radius=.005).attach_to(base)
+                print(jv_list[collided_id])
+                self.robot.gen_meshmodel(alpha=.3).attach_to(base)
+                base.run()
+            print("Intermediate pose collided!")
+            return None
+        mot_data = motu.MotionData(robot=self.robot)
+        mot_data.extend(jv_list=jv_list,
+                        ev_list=[self.robot.get_ee_values()] * len(jv_list),
+                        mesh_list=None if getattr(base, "toggle_mesh", True) else [])
+        return mot_data
+
     @keep_states_decorator
     def gen_linear_motion(self,
                           start_tcp_pos,
@@ -69,43 +144,11 @@ class InterplatedMotion(object):
                                              goal_tcp_pos,
                                              goal_tcp_rotmat,
                                              granularity=granularity)
-        jv_list = []
-        ev_list = []
-        mesh_list = []
-        seed_jnt_values = None
-        for pos, rotmat in pose_list:
-            jnt_values = self.robot.ik(pos, rotmat, seed_jnt_values=seed_jnt_values)
-            if jnt_values is None:
-                if toggle_dbg:
-                    for jnt_values in jv_list:
-                        self.robot.goto_given_conf(jnt_values=jnt_values, ee_values=ee_values)
-                        self.robot.gen_meshmodel(alpha=.3).attach_to(base)
-                    base.run()
-                print("IK not solvable in gen_linear_motion!")
-                return None
-            else:
-                self.robot.goto_given_conf(jnt_values=jnt_values, ee_values=ee_values)
-                result, contacts = self.robot.is_collided(obstacle_list=obstacle_list, toggle_contacts=True)
-                if result:
-                    if toggle_dbg:
-                        for pnt in contacts:
-                            gm.gen_sphere(pnt, radius=.005).attach_to(base)
-                        print(jnt_values)
-                        self.robot.goto_given_conf(jnt_values=jnt_values)
-                        if ee_values is not None:
-                            self.robot.change_jaw_width(jaw_width=ee_values)
-                        self.robot.gen_meshmodel(alpha=.3).attach_to(base)
-                        base.run()
-                    print("Intermediated pose collided in gen_linear_motion!")
-                    return None
-            jv_list.append(jnt_values)
-            ev_list.append(self.robot.get_ee_values())
-            if getattr(base, "toggle_mesh", True):
-                mesh_list.append(self.robot.gen_meshmodel())
-            seed_jnt_values = jnt_values
-        mot_data = motu.MotionData(robot=self.robot)
-        mot_data.extend(jv_list=jv_list, ev_list=ev_list, mesh_list=mesh_list)
-        return mot_data
+        return self._gen_motion_along_poses(pose_list,
+                                            seed_jnt_values=None,
+                                            obstacle_list=obstacle_list,
+                                            ee_values=ee_values,
+                                            toggle_dbg=toggle_dbg)
 
     @keep_states_decorator
     def gen_interplated_between_given_conf(self,
@@ -235,43 +278,11 @@ class InterplatedMotion(object):
                                              goal_pos=goal_tcp_pos,
                                              goal_rotmat=goal_tcp_rotmat,
                                              granularity=granularity)
-        jv_list = []
-        ev_list = []
-        mesh_list = []
-        seed_jnt_values = goal_jnt_values
-        for pos, rotmat in pose_list:
-            jnt_values = self.robot.ik(pos, rotmat, seed_jnt_values=seed_jnt_values)
-            if jnt_values is None:
-                if toggle_dbg:
-                    for jnt_values in jv_list:
-                        self.robot.goto_given_conf(jnt_values, ee_values=ee_values)
-                        self.robot.gen_meshmodel(alpha=.3).attach_to(base)
-                    base.run()
-                print("IK not solvable in gen_linear_motion!")
-                return None
-            else:
-                self.robot.goto_given_conf(jnt_values, ee_values=ee_values)
-                result, contacts = self.robot.is_collided(obstacle_list=obstacle_list, toggle_contacts=True)
-                if result:
-                    if toggle_dbg:
-                        for pnt in contacts:
-                            gm.gen_sphere(pnt, radius=.005).attach_to(base)
-                        print(jnt_values)
-                        self.robot.goto_given_conf(jnt_values)
-                        if ee_values is not None:
-                            self.robot.change_jaw_width(jaw_width=ee_values)
-                        self.robot.gen_meshmodel(alpha=.3).attach_to(base)
-                        base.run()
-                    print("Intermediated pose collided in gen_linear_motion!")
-                    return None
-            jv_list.append(jnt_values)
-            ev_list.append(self.robot.get_ee_values())
-            if getattr(base, "toggle_mesh", True):
-                mesh_list.append(self.robot.gen_meshmodel())
-            seed_jnt_values = jnt_values
-        mot_data = motu.MotionData(robot=self.robot)
-        mot_data.extend(jv_list=jv_list, ev_list=ev_list, mesh_list=mesh_list)
-        return mot_data
+        return self._gen_motion_along_poses(pose_list,
+                                            seed_jnt_values=goal_jnt_values,
+                                            obstacle_list=obstacle_list,
+                                            ee_values=ee_values,
+                                            toggle_dbg=toggle_dbg)
 
     @keep_states_decorator
     def gen_circular_motion(self,
@@ -301,32 +312,11 @@ class InterplatedMotion(object):
         """
         pose_list = rm.interplate_pos_rotmat_around_circle(circle_center_pos, circle_normal_ax, radius,
                                                            start_tcp_rotmat, end_tcp_rotmat, granularity)
-        jv_list = []
-        ev_list = []
-        mesh_list = []
-        seed_jnt_values = None
-        for pos, rotmat in pose_list:
-            jnt_values = self.robot.ik(pos, rotmat, seed_jnt_values=seed_jnt_values)
-            if jnt_values is None:
-                print("IK not solvable in gen_circular_motion!")
-                return None
-            else:
-                self.robot.goto_given_conf(jnt_values, ee_values=ee_values)
-                result, contacts = self.robot.is_collided(obstacle_list, toggle_contacts=True)
-                if result:
-                    if toggle_dbg:
-                        for pnt in contacts:
-                            gm.gen_sphere(pnt, radius=.005).attach_to(base)
-                    print("Intermediate pose collided in gen_linear_motion!")
-                    return None
-            jv_list.append(jnt_values)
-            ev_list.append(self.robot.get_ee_values())
-            if getattr(base, "toggle_mesh", True):
-                mesh_list.append(self.robot.gen_meshmodel())
-            seed_jnt_values = jnt_values
-        mot_data = motu.MotionData(robot=self.robot)
-        mot_data.extend(jv_list=jv_list, ev_list=ee_values, mesh_list=mesh_list)
-        return mot_data
+        return self._gen_motion_along_poses(pose_list,
+                                            seed_jnt_values=None,
+                                            obstacle_list=obstacle_list,
+                                            ee_values=ee_values,
+                                            toggle_dbg=toggle_dbg)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,303 @@
+"""
+Headless benchmark for the planners in motion.probabilistic
+Scenarios are seeded, so the same scenario name and seed always give the same robot, obstacles, start and goal.
+Each trial records the planning time, the per-phase statistics collected by rrt.RRT.timing_decorator, the path
+length and whether a path was found. The results can be saved as json (trials and summaries) and csv (trials).
+usage:
+    python -m motion.probabilistic.benchmark --scenarios xarm7_clutter --planners rrt_connect prm --n_trials 10
+        --json result.json --csv result.csv
+"""
+import os
+import csv
+import json
+import time
+import types
+import random
+import argparse
+import builtins
+import numpy as np
+import modeling.geometric_model as mgm
+import modeling.collision_model as mcm
+import motion.probabilistic.rrt as rrt
+import motion.probabilistic.rrt_connect as rrtc
+import motion.probabilistic.rrt_star as rrts
+import motion.probabilistic.rrt_star_connect as rrtsc
+import motion.probabilistic.prm as prm
+
+PLANNERS = {"rrt": rrt.RRT,
+            "rrt_connect": rrtc.RRTConnect,
+            "rrt_star": rrts.RRTStar,
+            "rrt_star_connect": rrtsc.RRTStarConnect,
+            "prm": prm.PRM}
+
+
+def _gen_clutter(robot, start_conf, goal_conf, rng, n_boxes, x_range, y_range, z_range, size_range):
+    """
+    random boxes that do not collide with the robot at start_conf and goal_conf
+    :return: a list of CollisionModel
+    """
+    obstacle_list = []
+    n_attempts = 0
+    while len(obstacle_list) < n_boxes and n_attempts < n_boxes * 50:
+        n_attempts += 1
+        xyz_lengths = rng.uniform(size_range[0], size_range[1], 3)
+        pos = np.array([rng.uniform(*x_range), rng.uniform(*y_range), rng.uniform(*z_range)])
+        box = mcm.CollisionModel(mgm.gen_box(xyz_lengths=xyz_lengths, pos=pos))
+        robot.goto_given_conf(start_conf)
+        if robot.is_collided(obstacle_list=[box]):
+            continue
+        robot.goto_given_conf(goal_conf)
+        if robot.is_collided(obstacle_list=[box]):
+            continue
+        obstacle_list.append(box)
+    robot.goto_given_conf(start_conf)
+    return obstacle_list
+
+
+def gen_xybot_clutter(seed):
+    """
+    2d point robot among circles, the robot is checked without a collision checker
+    :param seed:
+    :return: a dict with robot, start_conf, goal_conf, obstacle_list, ext_dist
+    """
+    import robot_sim.robots.xybot.xybot as xyb
+    rng = np.random.default_rng(seed)
+    robot = xyb.XYBot()
+    start_conf = np.array([0, 0])
+    goal_conf = np.array([1.3, 1.3])
+    obstacle_list = []
+    while len(obstacle_list) < 20:
+        pos = rng.uniform(-.2, 1.5, 2)
+        diameter = rng.uniform(.1, .3)
+        if min(np.linalg.norm(pos - start_conf), np.linalg.norm(pos - goal_conf)) > diameter / 2 + .05:
+            obstacle_list.append((tuple(pos), diameter))
+    return dict(robot=robot, start_conf=start_conf, goal_conf=goal_conf, obstacle_list=obstacle_list, ext_dist=.05)
+
+
+def gen_ur3_clutter(seed):
+    """
+    ur3e with a robotiq he gripper, boxes in front of the robot
+    :param seed:
+    :return: a dict with robot, start_conf, goal_conf, obstacle_list, ext_dist
+    """
+    import robot_sim.robots.ur3e_dual.ur3e_rtqhe as ur3e
+    rng = np.random.default_rng(seed)
+    robot = ur3e.UR3e_RtqHE(enable_cc=True)
+    start_conf = np.array([-1.2, -1.6, 1.6, -1.6, -1.6, 0])
+    goal_conf = np.array([1.2, -1.6, 1.6, -1.6, -1.6, 0])
+    obstacle_list = _gen_clutter(robot, start_conf, goal_conf, rng, n_boxes=8, x_range=(.15, .45),
+                                 y_range=(-.35, .35), z_range=(.0, .4), size_range=(.04, .1))
+    return dict(robot=robot, start_conf=start_conf, goal_conf=goal_conf, obstacle_list=obstacle_list, ext_dist=.1)
+
+
+def gen_xarm7_clutter(seed):
+    """
+    xarm7 with an xarm gripper, boxes in front of the robot
+    :param seed:
+    :return: a dict with robot, start_conf, goal_conf, obstacle_list, ext_dist
+    """
+    import robot_sim.robots.xarm7_xg_shuidi.xarm7_xg as xarm7
+    rng = np.random.default_rng(seed)
+    robot = xarm7.XArm7XG(enable_cc=True)
+    start_conf = np.array([-1.2, .3, 0, .9, 0, .6, 0])
+    goal_conf = np.array([1.2, .3, 0, .9, 0, .6, 0])
+    obstacle_list = _gen_clutter(robot, start_conf, goal_conf, rng, n_boxes=8, x_range=(.2, .55),
+                                 y_range=(-.4, .4), z_range=(.0, .45), size_range=(.04, .12))
+    return dict(robot=robot, start_conf=start_conf, goal_conf=goal_conf, obstacle_list=obstacle_list, ext_dist=.1)
+
+
+def gen_xarmlite6_clutter(seed):
+    """
+    xarm lite6 with a wrs gripper v2, boxes in front of the robot
+    :param seed:
+    :return: a dict with robot, start_conf, goal_conf, obstacle_list, ext_dist
+    """
+    import robot_sim.robots.xarmlite6_wg.x6wg2 as x6wg2
+    rng = np.random.default_rng(seed)
+    robot = x6wg2.XArmLite6WG2(enable_cc=True)
+    start_conf = np.array([0, .3, 1.0, 0, .7, 0])
+    goal_conf = np.array([2.5, .3, 1.0, 0, .7, 0])
+    obstacle_list = _gen_clutter(robot, start_conf, goal_conf, rng, n_boxes=6, x_range=(-.2, .4),
+                                 y_range=(-.1, .4), z_range=(.0, .3), size_range=(.04, .12))
+    return dict(robot=robot, start_conf=start_conf, goal_conf=goal_conf, obstacle_list=obstacle_list, ext_dist=.1)
+
+
+SCENARIOS = {"xybot_clutter": gen_xybot_clutter,
+             "ur3_clutter": gen_ur3_clutter,
+             "xarm7_clutter": gen_xarm7_clutter,
+             "xarmlite6_clutter": gen_xarmlite6_clutter}
+
+
+def path_length(jv_list):
+    if len(jv_list) < 2:
+        return 0.0
+    return float(np.sum(np.linalg.norm(np.diff(np.asarray(jv_list), axis=0), axis=1)))
+
+
+def run_trial(planner, scenario, seed, max_time=15.0, max_n_iter=10000):
+    """
+    :param planner: an instance of the classes in PLANNERS, a PRM must have its roadmap built
+    :param scenario: a dict returned by the functions in SCENARIOS
+    :param seed: seeds random and np.random
+    :return: a dict of the measurements
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    planner.phase_stats.clear()
+    tic = time.perf_counter()
+    if isinstance(planner, prm.PRM):
+        mot_data = planner.plan(start_conf=scenario["start_conf"],
+                                goal_conf=scenario["goal_conf"])
+    else:
+        mot_data = planner.plan(start_conf=scenario["start_conf"],
+                                goal_conf=scenario["goal_conf"],
+                                obstacle_list=scenario["obstacle_list"],
+                                ext_dist=scenario["ext_dist"],
+                                max_n_iter=max_n_iter,
+                                max_time=max_time)
+    plan_time = time.perf_counter() - tic
+    result = dict(seed=seed,
+                  success=mot_data is not None,
+                  plan_time=plan_time,
+                  path_length=path_length(mot_data.jv_list) if mot_data is not None else None,
+                  n_waypoints=len(mot_data.jv_list) if mot_data is not None else None)
+    for phase, (n_calls, phase_time) in planner.phase_stats.items():
+        result[f"{phase}_n_calls"] = n_calls
+        result[f"{phase}_time"] = phase_time
+    return result
+
+
+def summarize(trial_list):
+    """
+    :param trial_list: results of run_trial
+    :return: success rate and the medians and means of the numerical measurements (successful trials only for the
+             path measurements)
+    """
+    summary = dict(n_trials=len(trial_list),
+                   success_rate=float(np.mean([trial["success"] for trial in trial_list])) if trial_list else 0.0)
+    key_list = sorted({key for trial in trial_list for key in trial
+                       if key not in ("scenario", "planner", "seed", "success")})
+    for key in key_list:
+        value_list = [trial[key] for trial in trial_list if trial.get(key, None) is not None]
+        if len(value_list) == 0:
+            continue
+        summary[f"{key}_median"] = float(np.median(value_list))
+        summary[f"{key}_mean"] = float(np.mean(value_list))
+    return summary
+
+
+def run_benchmark(scenario_name_list,
+                  planner_name_list,
+                  n_trials=10,
+                  seed=0,
+                  max_time=15.0,
+                  max_n_iter=10000,
+                  prm_n_samples=500,
+                  toggle_dbg=True):
+    """
+    every planner solves the same seeded scenario n_trials times with the seeds seed, seed+1, ...
+    scenarios that cannot be built (e.g., missing robot files) are reported with an error instead of trials
+    :param scenario_name_list: keys of SCENARIOS
+    :param planner_name_list: keys of PLANNERS
+    :param n_trials:
+    :param seed: seed of the scenarios and the first trial
+    :param max_time: time limit of every trial
+    :param max_n_iter:
+    :param prm_n_samples: number of roadmap nodes for prm, the roadmap is built once per scenario
+    :param toggle_dbg: print progress
+    :return: {"trials": [...], "summaries": [...], "errors": [...]}
+    """
+    if not hasattr(builtins, "base"):
+        # headless, motion data is generated without meshes (see the toggle_mesh checks in the planners);
+        # destroy is called by panda3d at exit
+        builtins.base = types.SimpleNamespace(toggle_mesh=False, destroy=lambda: None)
+    for name in planner_name_list:
+        if name not in PLANNERS:
+            raise ValueError(f"Unknown planner {name}, available: {list(PLANNERS)}")
+    for name in scenario_name_list:
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name}, available: {list(SCENARIOS)}")
+    results = dict(trials=[], summaries=[], errors=[])
+    for scenario_name in scenario_name_list:
+        try:
+            scenario = SCENARIOS[scenario_name](seed)
+        except Exception as e:
+            results["errors"].append(dict(scenario=scenario_name, error=repr(e)))
+            if toggle_dbg:
+                print(f"{scenario_name}: failed to build the scenario, {e!r}")
+            continue
+        for planner_name in planner_name_list:
+            planner = PLANNERS[planner_name](scenario["robot"])
+            setup_time = 0.0
+            if isinstance(planner, prm.PRM):
+                random.seed(seed)
+                np.random.seed(seed)
+                tic = time.perf_counter()
+                planner.build_roadmap(static_obstacle_list=scenario["obstacle_list"],
+                                      n_samples=prm_n_samples,
+                                      ext_dist=scenario["ext_dist"])
+                setup_time = time.perf_counter() - tic
+            trial_list = []
+            for i in range(n_trials):
+                try:
+                    trial = run_trial(planner, scenario, seed + i, max_time=max_time, max_n_iter=max_n_iter)
+                except Exception as e:
+                    results["errors"].append(dict(scenario=scenario_name, planner=planner_name, seed=seed + i,
+                                                  error=repr(e)))
+                    if toggle_dbg:
+                        print(f"{scenario_name} {planner_name}: trial {seed + i} raised {e!r}")
+                    continue
+                trial.update(scenario=scenario_name, planner=planner_name)
+                trial_list.append(trial)
+            if len(trial_list) == 0:
+                continue
+            summary = summarize(trial_list)
+            summary.update(scenario=scenario_name, planner=planner_name, setup_time=setup_time)
+            results["trials"] += trial_list
+            results["summaries"].append(summary)
+            if toggle_dbg:
+                print(f"{scenario_name} {planner_name}: success {summary['success_rate']:.2f}, "
+                      f"median time {summary['plan_time_median']:.3f}s, "
+                      f"median collision checks {summary.get('collision_n_calls_median', 0):.0f}")
+    return results
+
+
+def save_json(results, file_path):
+    with open(file_path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def save_csv(results, file_path):
+    """
+    one row per trial, columns are the union of the measurements of all trials
+    """
+    lead_key_list = ["scenario", "planner", "seed", "success", "plan_time", "path_length", "n_waypoints"]
+    key_set = {key for trial in results["trials"] for key in trial}
+    key_list = lead_key_list + sorted(key_set - set(lead_key_list))
+    with open(file_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=key_list)
+        writer.writeheader()
+        for trial in results["trials"]:
+            writer.writerow(trial)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Headless benchmark of the planners in motion.probabilistic")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--planners", nargs="+", default=["rrt", "rrt_connect", "rrt_star"], choices=list(PLANNERS))
+    parser.add_argument("--n_trials", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max_time", type=float, default=15.0)
+    parser.add_argument("--max_n_iter", type=int, default=10000)
+    parser.add_argument("--prm_n_samples", type=int, default=500)
+    parser.add_argument("--json", default=None, help="path of the json output")
+    parser.add_argument("--csv", default=None, help="path of the csv output (one row per trial)")
+    args = parser.parse_args()
+    results = run_benchmark(args.scenarios, args.planners, n_trials=args.n_trials, seed=args.seed,
+                            max_time=args.max_time, max_n_iter=args.max_n_iter, prm_n_samples=args.prm_n_samples)
+    if args.json is not None:
+        save_json(results, args.json)
+        print(f"saved to {os.path.abspath(args.json)}")
+    if args.csv is not None:
+        save_csv(results, args.csv)
+        print(f"saved to {os.path.abspath(args.csv)}")
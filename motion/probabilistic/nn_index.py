@@ -0,0 +1,227 @@
+"""
+Incremental nearest neighbour indices for the roadmaps of sampling-based planners
+The confs of an index are kept in a preallocated nxdof array that grows by doubling.
+"""
+import itertools
+import numpy as np
+import scipy.spatial
+import motion.probabilistic.rtree_point as rtp
+
+
+class KDTreeNN(object):
+    """
+    a kd tree rebuilt in batches
+    newly inserted confs are kept in a small buffer that is examined by brute force;
+    the tree is rebuilt when the buffer grows larger than rebuild_ratio*n_tree_confs
+    the amortized cost of an insertion is thus O(log n) instead of the O(n log n) of rebuilding per query
+    removed confs are masked in the same way, they are dropped when they grow larger than rebuild_ratio*n_confs
+    """
+
+    def __init__(self, dimension, init_capacity=1024, rebuild_ratio=.25, min_buffer_size=64):
+        """
+        :param dimension: dimension of the confs
+        :param init_capacity: number of confs preallocated
+        :param rebuild_ratio: rebuild the tree when n_buffered > rebuild_ratio*n_tree_confs
+        :param min_buffer_size: confs are never rebuilt into the tree before the buffer reaches this size
+        """
+        self._dimension = dimension
+        self._rebuild_ratio = rebuild_ratio
+        self._min_buffer_size = min_buffer_size
+        self._conf_array = np.empty((init_capacity, dimension))
+        self._removed_array = np.zeros(init_capacity, dtype=bool)
+        self._nid_list = []
+        self._row_dict = {}  # nid: row in self._conf_array
+        self._tree = None
+        self._n_tree_confs = 0
+        self._n_removed = 0
+
+    def __len__(self):
+        return len(self._nid_list) - self._n_removed
+
+    @property
+    def dimension(self):
+        return self._dimension
+
+    @property
+    def conf_array(self):
+        n_confs = len(self._nid_list)
+        return self._conf_array[:n_confs][~self._removed_array[:n_confs]]
+
+    @property
+    def nid_list(self):
+        return list(itertools.compress(self._nid_list, ~self._removed_array[:len(self._nid_list)]))
+
+    def _rebuild(self):
+        self._n_tree_confs = len(self._nid_list)
+        self._tree = scipy.spatial.cKDTree(self._conf_array[:self._n_tree_confs])
+
+    def _drop_removed(self):
+        n_confs = len(self._nid_list)
+        kept_array = ~self._removed_array[:n_confs]
+        n_kept = np.count_nonzero(kept_array)
+        self._conf_array[:n_kept] = self._conf_array[:n_confs][kept_array]
+        self._removed_array[:n_confs] = False
+        self._nid_list = list(itertools.compress(self._nid_list, kept_array))
+        self._row_dict = {nid: row for row, nid in enumerate(self._nid_list)}
+        self._n_removed = 0
+        self._tree = None
+        self._n_tree_confs = 0
+        if n_kept > 0:
+            self._rebuild()
+
+    def insert(self, nid, conf):
+        """
+        :param nid: node id in the roadmap
+        :param conf: 1xdimension nparray
+        :return:
+        """
+        n_confs = len(self._nid_list)
+        if n_confs == len(self._conf_array):
+            self._conf_array = np.vstack((self._conf_array, np.empty_like(self._conf_array)))
+            self._removed_array = np.concatenate((self._removed_array, np.zeros_like(self._removed_array)))
+        self._conf_array[n_confs] = conf
+        self._nid_list.append(nid)
+        self._row_dict[nid] = n_confs
+        n_buffered = n_confs + 1 - self._n_tree_confs
+        if n_buffered > max(self._min_buffer_size, self._rebuild_ratio * self._n_tree_confs):
+            self._rebuild()
+
+    def remove(self, nid_set):
+        """
+        :param nid_set: nids in the roadmap, the nids that are not in the index are ignored
+        :return:
+        """
+        for nid in nid_set:
+            row = self._row_dict.pop(nid, None)
+            if row is not None:
+                self._removed_array[row] = True
+                self._n_removed += 1
+        if self._n_removed > max(self._min_buffer_size, self._rebuild_ratio * len(self._nid_list)):
+            self._drop_removed()
+
+    def nearest(self, conf):
+        """
+        :param conf: 1xdimension nparray
+        :return: nid of the nearest conf
+        """
+        if len(self) == 0:
+            raise ValueError("The nearest neighbour index is empty.")
+        n_confs = len(self._nid_list)
+        min_dist, min_indx = np.inf, -1
+        if self._n_tree_confs > 0:
+            # the nearest confs may be removed ones, query more of them until a kept one is found
+            k = 1
+            while True:
+                dist_array, indx_array = self._tree.query(conf, k=k)
+                dist_array, indx_array = np.atleast_1d(dist_array), np.atleast_1d(indx_array)
+                kept_indx_array = np.flatnonzero(~self._removed_array[indx_array])
+                if len(kept_indx_array) > 0:
+                    min_dist, min_indx = dist_array[kept_indx_array[0]], indx_array[kept_indx_array[0]]
+                    break
+                if k == self._n_tree_confs:
+                    break
+                k = min(k * 2, self._n_tree_confs)
+        if n_confs > self._n_tree_confs:
+            dist_array = np.linalg.norm(self._conf_array[self._n_tree_confs:n_confs] - conf, axis=1)
+            dist_array[self._removed_array[self._n_tree_confs:n_confs]] = np.inf
+            buffer_indx = np.argmin(dist_array)
+            if dist_array[buffer_indx] < min_dist:
+                min_indx = self._n_tree_confs + buffer_indx
+        return self._nid_list[min_indx]
+
+    def nearby(self, conf, radius):
+        """
+        :param conf: 1xdimension nparray
+        :param radius:
+        :return: a list of nids whose confs are within radius
+        """
+        n_confs = len(self._nid_list)
+        indx_list = []
+        if self._n_tree_confs > 0:
+            indx_list = self._tree.query_ball_point(conf, r=radius)
+        if n_confs > self._n_tree_confs:
+            dist_array = np.linalg.norm(self._conf_array[self._n_tree_confs:n_confs] - conf, axis=1)
+            indx_list = list(indx_list) + list(self._n_tree_confs + np.flatnonzero(dist_array <= radius))
+        return [self._nid_list[indx] for indx in indx_list if not self._removed_array[indx]]
+
+    def clear(self):
+        self._removed_array[:] = False
+        self._nid_list = []
+        self._row_dict = {}
+        self._tree = None
+        self._n_tree_confs = 0
+        self._n_removed = 0
+
+
+class RtreeNN(object):
+    """
+    wraps rtree_point.RtreePoint so that it can be used as a roadmap index
+    """
+
+    def __init__(self, dimension, init_capacity=1024):
+        self._dimension = dimension
+        self._conf_array = np.empty((init_capacity, dimension))
+        self._nid_list = []
+        self._rtp = rtp.RtreePoint(dimension=dimension)
+
+    def __len__(self):
+        return len(self._nid_list)
+
+    @property
+    def dimension(self):
+        return self._dimension
+
+    @property
+    def conf_array(self):
+        return self._conf_array[:len(self._nid_list)]
+
+    @property
+    def nid_list(self):
+        return self._nid_list
+
+    def insert(self, nid, conf):
+        n_confs = len(self._nid_list)
+        if n_confs == len(self._conf_array):
+            self._conf_array = np.vstack((self._conf_array, np.empty_like(self._conf_array)))
+        self._conf_array[n_confs] = conf
+        self._nid_list.append(nid)
+        # rtree ids must be integers; use the row number of the conf array
+        self._rtp.insert(n_confs, conf)
+
+    def nearest(self, conf):
+        if len(self) == 0:
+            raise ValueError("The nearest neighbour index is empty.")
+        return self._nid_list[self._rtp.nearest(conf)]
+
+    def nearby(self, conf, radius):
+        n_confs = len(self._nid_list)
+        dist_array = np.linalg.norm(self._conf_array[:n_confs] - conf, axis=1)
+        return [self._nid_list[indx] for indx in np.flatnonzero(dist_array <= radius)]
+
+    def remove(self, nid_set):
+        """
+        :param nid_set: nids in the roadmap, the nids that are not in the index are ignored
+        :return:
+        """
+        kept_list = [(nid, conf) for nid, conf in zip(self._nid_list, self.conf_array) if nid not in nid_set]
+        self.clear()
+        for nid, conf in kept_list:
+            self.insert(nid, conf)
+
+    def clear(self):
+        self._nid_list = []
+        self._rtp = rtp.RtreePoint(dimension=self._dimension)
+
+
+def gen_nn_index(dimension, backend="kdtree"):
+    """
+    :param dimension:
+    :param backend: "kdtree" for KDTreeNN; "rtree" for RtreeNN
+    :return:
+    """
+    if backend == "kdtree":
+        return KDTreeNN(dimension=dimension)
+    elif backend == "rtree":
+        return RtreeNN(dimension=dimension)
+    else:
+        raise ValueError(f"Unknown nearest neighbour backend: {backend}")
@@ -0,0 +1,379 @@
+"""
+Multi-query probabilistic roadmap
+The roadmap is built once for a robot and its static obstacles, saved as compact arrays (npz), and reused by queries.
+Edges are checked against the static obstacles when the roadmap is built; dynamic obstacles given to a query are
+checked lazily on the edges of candidate paths only.
+"""
+import time
+import heapq
+import collections
+import numpy as np
+import scipy.spatial
+import scipy.sparse as sps
+import scipy.sparse.csgraph as spsg
+import motion.probabilistic.rrt as rrt
+
+
+class PRM(rrt.RRT):
+    """
+    usage:
+        prm = PRM(robot)
+        prm.build_roadmap(static_obstacle_list=obstacle_list, n_samples=2000)
+        prm.save_roadmap("cell.npz")
+        # later, in another process
+        prm.load_roadmap("cell.npz", static_obstacle_list=obstacle_list)
+        mot_data = prm.plan(start_conf, goal_conf, obstacle_list=dynamic_obstacle_list)
+    """
+
+    def __init__(self, robot, nn_backend="kdtree"):
+        super().__init__(robot, nn_backend=nn_backend)
+        self.static_obstacle_list = []
+        self.ext_dist = .1
+        self.node_confs = np.empty((0, 0))  # n_nodes x n_dof
+        self.edges = np.empty((0, 2), dtype=np.int32)  # n_edges x 2, node ids
+        self.edge_lengths = np.empty(0)
+        # csr adjacency: the neighbours of node i are _adj_nodes[_adj_ptr[i]:_adj_ptr[i+1]]
+        self._adj_ptr = np.zeros(1, dtype=np.int64)
+        self._adj_nodes = np.empty(0, dtype=np.int32)
+        self._adj_edges = np.empty(0, dtype=np.int32)
+        self._component_labels = np.empty(0, dtype=np.int32)
+        self._kdtree = None
+
+    @property
+    def n_nodes(self):
+        return len(self.node_confs)
+
+    @property
+    def n_edges(self):
+        return len(self.edges)
+
+    def _update_adjacency(self):
+        """
+        csr adjacency and kd tree from self.node_confs and self.edges
+        """
+        n_edges = len(self.edges)
+        src = np.concatenate((self.edges[:, 0], self.edges[:, 1]))
+        dst = np.concatenate((self.edges[:, 1], self.edges[:, 0]))
+        edge_ids = np.concatenate((np.arange(n_edges), np.arange(n_edges))).astype(np.int32)
+        order = np.argsort(src, kind="stable")
+        self._adj_nodes = dst[order].astype(np.int32)
+        self._adj_edges = edge_ids[order]
+        self._adj_ptr = np.concatenate(([0], np.cumsum(np.bincount(src, minlength=self.n_nodes))))
+        self._kdtree = scipy.spatial.cKDTree(self.node_confs) if self.n_nodes > 0 else None
+        adj_mat = sps.csr_matrix((np.ones(len(self._adj_nodes)), self._adj_nodes, self._adj_ptr),
+                                 shape=(self.n_nodes, self.n_nodes))
+        _, self._component_labels = spsg.connected_components(adj_mat, directed=False)
+
+    @staticmethod
+    def _bisection_order(n):
+        """
+        indices of a sequence of length n, midpoints first
+        e.g., 7 -> [3, 1, 5, 0, 2, 4, 6]
+        :param n:
+        :return:
+        """
+        order = []
+        interval_queue = collections.deque([(0, n)])
+        while interval_queue:
+            lo, hi = interval_queue.popleft()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            order.append(mid)
+            interval_queue.append((lo, mid))
+            interval_queue.append((mid + 1, hi))
+        return order
+
+    def _is_segment_collided(self, src_conf, end_conf, obstacle_list=[], other_robot_list=[]):
+        """
+        check the confs interpolated between src_conf and end_conf (both included) in the bisection order
+        :return:
+        """
+        conf_list = self._extend_conf(src_conf, end_conf, self.ext_dist)
+        for i in self._bisection_order(len(conf_list)):
+            if self._is_collided(conf_list[i], obstacle_list, other_robot_list):
+                return True
+        return False
+
+    @rrt.RRT.keep_states_decorator
+    @rrt.RRT.timing_decorator("build")
+    def build_roadmap(self,
+                      static_obstacle_list=[],
+                      other_robot_list=[],
+                      n_samples=1000,
+                      n_neighbors=10,
+                      ext_dist=.1,
+                      max_edge_length=None,
+                      toggle_dbg=False):
+        """
+        sample collision-free confs and connect each of them to its n_neighbors nearest confs
+        :param static_obstacle_list: obstacles that do not move; they are also used by later queries
+        :param other_robot_list:
+        :param n_samples: number of collision-free nodes
+        :param n_neighbors:
+        :param ext_dist: resolution for checking edges
+        :param max_edge_length: longer edges are not considered, no limit if None
+        :param toggle_dbg: print progress
+        :return:
+        """
+        self.static_obstacle_list = list(static_obstacle_list)
+        self.ext_dist = ext_dist
+        tic = time.time()
+        conf_list = []
+        while len(conf_list) < n_samples:
+            conf = self.robot.rand_conf()
+            if not self._is_collided(conf, self.static_obstacle_list, other_robot_list):
+                conf_list.append(conf)
+        self.node_confs = np.asarray(conf_list, dtype=np.float64)
+        if toggle_dbg:
+            print(f"PRM: {n_samples} nodes sampled in {time.time() - tic:.2f}s")
+        kdtree = scipy.spatial.cKDTree(self.node_confs)
+        dist_array, nn_array = kdtree.query(self.node_confs, k=min(n_neighbors + 1, n_samples))
+        # each undirected pair is considered once
+        pair_set = set()
+        for i in range(n_samples):
+            for dist, j in zip(dist_array[i, 1:], nn_array[i, 1:]):
+                if max_edge_length is not None and dist > max_edge_length:
+                    continue
+                pair_set.add((min(i, j), max(i, j)))
+        edge_list = []
+        for i, j in sorted(pair_set):
+            if not self._is_segment_collided(self.node_confs[i], self.node_confs[j], self.static_obstacle_list,
+                                             other_robot_list):
+                edge_list.append((i, j))
+        self.edges = np.asarray(edge_list, dtype=np.int32).reshape(-1, 2)
+        self.edge_lengths = np.linalg.norm(self.node_confs[self.edges[:, 0]] - self.node_confs[self.edges[:, 1]],
+                                           axis=1)
+        self._update_adjacency()
+        if toggle_dbg:
+            print(f"PRM: {len(self.edges)} of {len(pair_set)} edges kept, {time.time() - tic:.2f}s in total")
+
+    def save_roadmap(self, file_path):
+        """
+        :param file_path: a npz file
+        :return:
+        """
+        np.savez(file_path,
+                 node_confs=self.node_confs,
+                 edges=self.edges,
+                 edge_lengths=self.edge_lengths,
+                 ext_dist=np.array(self.ext_dist),
+                 robot_name=np.array(self.robot.name))
+
+    def load_roadmap(self, file_path, static_obstacle_list=[]):
+        """
+        :param file_path: a npz file saved by save_roadmap
+        :param static_obstacle_list: the static obstacles used to build the roadmap, needed to connect queries
+        :return:
+        """
+        with np.load(file_path) as data:
+            node_confs = data["node_confs"]
+            if node_confs.shape[1] != self.robot.n_dof:
+                raise ValueError(f"The roadmap does not match the robot: {node_confs.shape[1]} vs. "
+                                 f"{self.robot.n_dof} dofs")
+            if str(data["robot_name"]) != self.robot.name:
+                print(f"PRM: the roadmap was built for {data['robot_name']}, loaded for {self.robot.name}.")
+            self.node_confs = node_confs
+            self.edges = data["edges"]
+            self.edge_lengths = data["edge_lengths"]
+            self.ext_dist = float(data["ext_dist"])
+        self.static_obstacle_list = list(static_obstacle_list)
+        self._update_adjacency()
+
+    def _nearby_components(self, conf, n_neighbors):
+        """
+        :return: set of the component labels of the n_neighbors nearest nodes
+        """
+        _, nn_array = self._kdtree.query(conf, k=min(n_neighbors, self.n_nodes))
+        return set(self._component_labels[np.atleast_1d(nn_array)].tolist())
+
+    @rrt.RRT.timing_decorator("connect")
+    def _connect_to_roadmap(self, conf, obstacle_list, other_robot_list, n_neighbors, component_set=None):
+        """
+        find the roadmap nodes that can be reached from conf by a straight line
+        the n_neighbors nearest nodes are tried in the order of distance, one node is kept for each connected component;
+        the search stops once every component among the n_neighbors nodes is connected
+        :param component_set: only try the nodes in these components, all components if None
+        :return: {component label: node id}
+        """
+        n_neighbors = min(n_neighbors, self.n_nodes)
+        _, nn_array = self._kdtree.query(conf, k=n_neighbors)
+        nid_list = np.atleast_1d(nn_array).tolist()
+        label_set = set(self._component_labels[nid_list].tolist())
+        if component_set is not None:
+            label_set &= component_set
+        connected_dict = {}
+        for nid in nid_list:
+            label = self._component_labels[nid]
+            if label in connected_dict or label not in label_set:
+                continue
+            if not self._is_segment_collided(conf, self.node_confs[nid], obstacle_list, other_robot_list):
+                connected_dict[label] = nid
+                if len(connected_dict) == len(label_set):
+                    break
+        return connected_dict
+
+    @rrt.RRT.timing_decorator("search")
+    def _search(self, start_nid, goal_nid, invalid_edge_set):
+        """
+        a* over the roadmap with euclidean distances
+        :return: node ids from start_nid to goal_nid and the ids of the edges in between, None if not connected
+        """
+        goal_conf = self.node_confs[goal_nid]
+        cost_dict = {start_nid: 0.0}
+        parent_dict = {start_nid: (None, None)}
+        open_heap = [(np.linalg.norm(self.node_confs[start_nid] - goal_conf), start_nid)]
+        closed_set = set()
+        while open_heap:
+            _, nid = heapq.heappop(open_heap)
+            if nid == goal_nid:
+                nid_path, edge_path = [], []
+                while nid is not None:
+                    nid_path.append(nid)
+                    nid, eid = parent_dict[nid]
+                    if eid is not None:
+                        edge_path.append(eid)
+                return nid_path[::-1], edge_path[::-1]
+            if nid in closed_set:
+                continue
+            closed_set.add(nid)
+            lo, hi = self._adj_ptr[nid], self._adj_ptr[nid + 1]
+            for next_nid, eid in zip(self._adj_nodes[lo:hi].tolist(), self._adj_edges[lo:hi].tolist()):
+                if next_nid in closed_set or eid in invalid_edge_set:
+                    continue
+                new_cost = cost_dict[nid] + self.edge_lengths[eid]
+                if new_cost < cost_dict.get(next_nid, np.inf):
+                    cost_dict[next_nid] = new_cost
+                    parent_dict[next_nid] = (nid, eid)
+                    heapq.heappush(open_heap,
+                                   (new_cost + np.linalg.norm(self.node_confs[next_nid] - goal_conf), next_nid))
+        return None
+
+    @rrt.RRT.timing_decorator("lazy_validation")
+    def _lazy_search(self, start_nid, goal_nid, obstacle_list=[], other_robot_list=[]):
+        """
+        search the roadmap and check the edges of the found path against the dynamic obstacles
+        edges in collision are excluded and the search is repeated; unchecked edges are never tested
+        :return: node ids from start_nid to goal_nid, None if failed
+        """
+        invalid_edge_set = set()
+        valid_edge_set = set()
+        while True:
+            result = self._search(start_nid, goal_nid, invalid_edge_set)
+            if result is None:
+                return None
+            nid_path, edge_path = result
+            if len(obstacle_list) == 0 and len(other_robot_list) == 0:
+                return nid_path
+            for i in self._bisection_order(len(edge_path)):
+                eid = edge_path[i]
+                if eid in valid_edge_set:
+                    continue
+                src_nid, end_nid = self.edges[eid]
+                if self._is_segment_collided(self.node_confs[src_nid], self.node_confs[end_nid], obstacle_list,
+                                             other_robot_list):
+                    invalid_edge_set.add(eid)
+                    break
+                valid_edge_set.add(eid)
+            else:
+                return nid_path
+
+    @rrt.RRT.keep_states_decorator
+    def plan(self,
+             start_conf,
+             goal_conf,
+             obstacle_list=[],
+             other_robot_list=[],
+             n_neighbors=50,
+             smoothing_n_iter=0,
+             animation=False):
+        """
+        :param start_conf:
+        :param goal_conf:
+        :param obstacle_list: dynamic obstacles, in addition to self.static_obstacle_list
+        :param other_robot_list:
+        :param n_neighbors: number of roadmap nodes tried when connecting start and goal
+        :param smoothing_n_iter: iterations of shortcut smoothing, no smoothing if 0; smoothing the densified path
+               costs far more than the roadmap query itself
+        :param animation: not used, kept for the same interface as rrt
+        :return: MotionData or None
+        """
+        if self.n_nodes == 0:
+            raise ValueError("The roadmap is empty, use build_roadmap or load_roadmap first!")
+        all_obstacle_list = self.static_obstacle_list + list(obstacle_list)
+        self.start_conf = start_conf
+        self.goal_conf = goal_conf
+        if self._is_collided(start_conf, all_obstacle_list, other_robot_list):
+            print("PRM: The start robot configuration is in collision!")
+            return None
+        if self._is_collided(goal_conf, all_obstacle_list, other_robot_list):
+            print("PRM: The goal robot configuration is in collision!")
+            return None
+        if not self._is_segment_collided(start_conf, goal_conf, all_obstacle_list, other_robot_list):
+            path = [start_conf, goal_conf]
+        else:
+            # the goal can only be connected to the components near it, the start does not need to try the others
+            start_nid_dict = self._connect_to_roadmap(start_conf, all_obstacle_list, other_robot_list, n_neighbors,
+                                                      component_set=self._nearby_components(goal_conf, n_neighbors))
+            goal_nid_dict = self._connect_to_roadmap(goal_conf, all_obstacle_list, other_robot_list, n_neighbors,
+                                                     component_set=set(start_nid_dict))
+            if len(goal_nid_dict) == 0:
+                print("PRM: Failed to connect the start and goal to the same component of the roadmap!")
+                return None
+            nid_path = None
+            for label, goal_nid in goal_nid_dict.items():
+                nid_path = self._lazy_search(start_nid_dict[label], goal_nid, obstacle_list, other_robot_list)
+                if nid_path is not None:
+                    break
+            if nid_path is None:
+                print("PRM: Start and goal are not connected by the roadmap!")
+                return None
+            path = [start_conf] + list(self.node_confs[nid_path]) + [goal_conf]
+        # same resolution as the paths of rrt
+        dense_path = [start_conf]
+        for src_conf, end_conf in zip(path[:-1], path[1:]):
+            dense_path += self._extend_conf(src_conf, end_conf, self.ext_dist)[1:]
+        if smoothing_n_iter > 0:
+            dense_path = self._smooth_path(path=dense_path,
+                                           obstacle_list=all_obstacle_list,
+                                           other_robot_list=other_robot_list,
+                                           granularity=self.ext_dist,
+                                           n_iter=smoothing_n_iter)
+        mot_data = rrt.motu.MotionData(self.robot)
+        if getattr(base, "toggle_mesh", True):
+            mot_data.extend(jv_list=dense_path)
+        else:
+            mot_data.extend(jv_list=dense_path, mesh_list=[])
+        return mot_data
+
+
+if __name__ == '__main__':
+    import os
+    import math
+    import visualization.panda.world as wd
+    import modeling.geometric_model as mgm
+    import modeling.collision_model as mcm
+    import robot_sim.robots.xarmlite6_wg.x6wg2 as x6wg2
+
+    base = wd.World(cam_pos=[1.5, 1, 1], lookat_pos=[0, 0, .2])
+    mgm.gen_frame().attach_to(base)
+    robot = x6wg2.XArmLite6WG2(enable_cc=True)
+    static_obstacle_list = [mcm.CollisionModel(mgm.gen_box(xyz_lengths=[.12, .12, .25], pos=np.array([.12, .22, .125])))]
+    for obstacle in static_obstacle_list:
+        obstacle.attach_to(base)
+    prm = PRM(robot)
+    roadmap_file = "x6wg2_prm.npz"
+    if os.path.isfile(roadmap_file):
+        prm.load_roadmap(roadmap_file, static_obstacle_list=static_obstacle_list)
+    else:
+        prm.build_roadmap(static_obstacle_list=static_obstacle_list, n_samples=1000, toggle_dbg=True)
+        prm.save_roadmap(roadmap_file)
+    start_conf = np.array([0, .3, 1.0, 0, .7, 0])
+    goal_conf = np.array([math.radians(143), .3, 1.0, 0, .7, 0])
+    tic = time.time()
+    mot_data = prm.plan(start_conf, goal_conf)
+    print(f"query: {time.time() - tic:.3f}s")
+    for mesh_model in mot_data.mesh_list:
+        mesh_model.alpha = .3
+        mesh_model.attach_to(base)
+    base.run()
@@ -1,11 +1,13 @@
 import time
 import math
+import collections
 import uuid
 import random
 import scipy
 import numpy as np
 import basis.robot_math as rm
 import motion.motion_data as motu
+import motion.probabilistic.nn_index as mpnn
 import networkx as nx
 import matplotlib.pyplot as plt
 from operator import itemgetter
@@ -17,13 +19,19 @@ class RRT(object):
     date: 20230807
     """
 
-    def __init__(self, robot):
+    def __init__(self, robot, nn_backend="kdtree"):
+        """
+        :param robot:
+        :param nn_backend: nearest neighbour index kept alongside each roadmap, "kdtree" or "rtree"
+        """
         self.robot = robot
+        self.nn_backend = nn_backend
         self.roadmap = nx.Graph()
         self.start_conf = None
         self.goal_conf = None
         # define data type
         self.toggle_keep = True
+        self.phase_stats = collections.defaultdict(lambda: [0, 0.0])  # phase: [n_calls, seconds], see timing_decorator
 
     @staticmethod
     def keep_states_decorator(method):
@@ -47,6 +55,30 @@ class RRT(object):
 
         return wrapper
 
+    @staticmethod
+    def timing_decorator(phase):
+        """
+        decorator function for accumulating the number of calls and the time spent in a planning phase
+        the results are kept in self.phase_stats as {phase: [n_calls, seconds]}; phases may nest, e.g., "extend"
+        includes the "collision" and "nearest" calls made while extending
+        :param phase: name of the phase
+        :return:
+        """
+
+        def decorator(method):
+            def wrapper(self, *args, **kwargs):
+                tic = time.perf_counter()
+                result = method(self, *args, **kwargs)
+                stats = self.phase_stats[phase]
+                stats[0] += 1
+                stats[1] += time.perf_counter() - tic
+                return result
+
+            return wrapper
+
+        return decorator
+
+    @timing_decorator("collision")
     def _is_collided(self,
                      conf,
                      obstacle_list=[],
@@ -98,29 +130,57 @@ class RRT(object):
         else:
             return default_conf
 
+    def _get_nn_index(self, roadmap):
+        """
+        the nn index is saved as a graph attribute of the roadmap, it is cleared together with roadmap.clear()
+        the index is rebuilt if it is out of sync with the roadmap, e.g., nodes added without using self._add_node
+        :param roadmap:
+        :return:
+        """
+        nn_index = roadmap.graph.get("nn_index", None)
+        if nn_index is None or len(nn_index) != roadmap.number_of_nodes():
+            nodes_dict = dict(roadmap.nodes(data="conf"))
+            dimension = len(next(iter(nodes_dict.values())))
+            nn_index = mpnn.gen_nn_index(dimension=dimension, backend=self.nn_backend)
+            for nid, conf in nodes_dict.items():
+                nn_index.insert(nid, conf)
+            roadmap.graph["nn_index"] = nn_index
+        return nn_index
+
+    def _add_node(self, roadmap, nid, conf, **kwargs):
+        """
+        add a node to the roadmap and its nn index
+        :param roadmap:
+        :param nid:
+        :param conf:
+        :param kwargs: other node attributes, e.g., cost
+        :return:
+        """
+        is_new = nid not in roadmap
+        roadmap.add_node(nid, conf=conf, **kwargs)
+        if is_new and "nn_index" in roadmap.graph:
+            roadmap.graph["nn_index"].insert(nid, conf)
+
+    @timing_decorator("nearest")
     def _get_nearest_nid(self, roadmap, new_conf):
         """
-        convert to numpy to accelerate access
+        query the incrementally maintained nn index of the roadmap
         :param roadmap:
         :param new_conf:
         :return:
         author: weiwei
         date: 20210523
         """
-        nodes_dict = dict(roadmap.nodes(data="conf"))
-        nodes_key_list = list(nodes_dict.keys())  # use python > 3.7, or else there is no guarantee on the order
-        nodes_value_list = list(nodes_dict.values())  # attention, correspondence is not guanranteed in python
         # ===============
-        # the following code computes euclidean distances. it is decprecated and replaced using cdtree
-        # ***** date: 20240304, correspondent: weiwei *****
-        # conf_array = np.array(nodes_value_list)
-        # diff_conf_array = np.linalg.norm(conf_array - new_conf, axis=1)
-        # min_dist_nid = np.argmin(diff_conf_array)
-        # return nodes_key_list[min_dist_nid]
+        # the following code rebuilds a cKDTree for every query. it is decprecated and replaced using nn_index
+        # nodes_dict = dict(roadmap.nodes(data="conf"))
+        # nodes_key_list = list(nodes_dict.keys())
+        # nodes_value_list = list(nodes_dict.values())
+        # querry_tree = scipy.spatial.cKDTree(nodes_value_list)
+        # dist_value, indx = querry_tree.query(new_conf, k=1, workers=-1)
+        # return nodes_key_list[indx]
         # ===============
-        querry_tree = scipy.spatial.cKDTree(nodes_value_list)
-        dist_value, indx = querry_tree.query(new_conf, k=1, workers=-1)
-        return nodes_key_list[indx]
+        return self._get_nn_index(roadmap).nearest(new_conf)
 
     def _extend_conf(self, src_conf, end_conf, ext_dist, exact_end=True):
         """
@@ -148,6 +208,7 @@ class RRT(object):
             conf_array = np.vstack((conf_array, end_conf))
         return list(conf_array)
 
+    @timing_decorator("extend")
     def _extend_roadmap(self,
                         roadmap,
                         conf,
@@ -169,7 +230,7 @@ class RRT(object):
                 return nearest_nid
             else:
                 new_nid = uuid.uuid4()
-                roadmap.add_node(new_nid, conf=new_conf)
+                self._add_node(roadmap, new_nid, conf=new_conf)
                 roadmap.add_edge(nearest_nid, new_nid)
                 nearest_nid = new_nid
                 # all_sampled_confs.append([new_node.point, False])
@@ -179,7 +240,7 @@ class RRT(object):
                                      new_conf, '^c')
                 # check goal
                 if self._is_goal_reached(conf=roadmap.nodes[new_nid]["conf"], goal_conf=goal_conf, threshold=ext_dist):
-                    roadmap.add_node("goal", conf=goal_conf)
+                    self._add_node(roadmap, "goal", conf=goal_conf)
                     roadmap.add_edge(new_nid, "goal")
                     return "goal"
         return nearest_nid
@@ -196,6 +257,7 @@ class RRT(object):
         nid_path = nx.shortest_path(self.roadmap, source="start", target="goal")
         return list(itemgetter(*nid_path)(self.roadmap.nodes(data="conf")))
 
+    @timing_decorator("smoothing")
     def _smooth_path(self,
                      path,
                      obstacle_list=[],
@@ -259,7 +321,7 @@ class RRT(object):
             mot_data = motu.MotionData(self.robot)
             mot_data.extend(jv_list=[start_conf, goal_conf])
             return mot_data
-        self.roadmap.add_node("start", conf=start_conf)
+        self._add_node(self.roadmap, "start", conf=start_conf)
         tic = time.time()
         for _ in range(max_n_iter):
             toc = time.time()
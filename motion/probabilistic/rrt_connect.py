@@ -7,11 +7,12 @@ from motion.probabilistic import rrt
 
 class RRTConnect(rrt.RRT):
 
-    def __init__(self, robot):
-        super().__init__(robot)
+    def __init__(self, robot, nn_backend="kdtree"):
+        super().__init__(robot, nn_backend=nn_backend)
         self.roadmap_start = nx.Graph()
         self.roadmap_goal = nx.Graph()
 
+    @rrt.RRT.timing_decorator("extend")
     def _extend_roadmap(self,
                         roadmap,
                         conf,
@@ -33,7 +34,7 @@ class RRTConnect(rrt.RRT):
                 return -1
             else:
                 new_nid = uuid.uuid4()
-                roadmap.add_node(new_nid, conf=new_conf)
+                self._add_node(roadmap, new_nid, conf=new_conf)
                 roadmap.add_edge(nearest_nid, new_nid)
                 nearest_nid = new_nid
                 # all_sampled_confs.append([new_node.point, False])
@@ -43,7 +44,7 @@ class RRTConnect(rrt.RRT):
                                      "^c")
                 # check goal
                 if self._is_goal_reached(conf=roadmap.nodes[new_nid]["conf"], goal_conf=goal_conf, threshold=ext_dist):
-                    roadmap.add_node("connection", conf=goal_conf)
+                    self._add_node(roadmap, "connection", conf=goal_conf)
                     roadmap.add_edge(new_nid, "connection")
                     return "connection"
         return nearest_nid
@@ -75,8 +76,8 @@ class RRTConnect(rrt.RRT):
             mot_data = rrt.motu.MotionData(self.robot)
             mot_data.extend(jv_list=[start_conf, goal_conf])
             return mot_data
-        self.roadmap_start.add_node("start", conf=start_conf)
-        self.roadmap_goal.add_node("goal", conf=goal_conf)
+        self._add_node(self.roadmap_start, "start", conf=start_conf)
+        self._add_node(self.roadmap_goal, "goal", conf=goal_conf)
         tic = time.time()
         tree_a = self.roadmap_start
         tree_b = self.roadmap_goal
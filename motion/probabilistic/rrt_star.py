@@ -12,12 +12,13 @@ from operator import itemgetter
 
 class RRTStar(rrt.RRT):
 
-    def __init__(self, robot, nearby_ratio=2):
+    def __init__(self, robot, nearby_ratio=2, nn_backend="kdtree"):
         """
         :param robot:
         :param nearby_ratio: the threshold_hold = ext_dist*nearby_ratio
+        :param nn_backend: see rrt.RRT
         """
-        super().__init__(robot)
+        super().__init__(robot, nn_backend=nn_backend)
         self.roadmap = nx.DiGraph()
         self.nearby_ratio = nearby_ratio
 
@@ -63,6 +64,7 @@ class RRTStar(rrt.RRT):
         len, vec = rm.unit_vector(end_conf - src_conf, toggle_length=True)
         return [src_conf + ext_dist * vec] if len > 1e-6 else []
 
+    @rrt.RRT.timing_decorator("nearest")
     def _get_nearby_nid_with_min_cost(self, roadmap, new_conf, ext_dist):
         """
         :param roadmap:
@@ -71,16 +73,10 @@ class RRTStar(rrt.RRT):
         author: weiwei
         date: 20210523
         """
-        nodes_conf_dict = dict(roadmap.nodes(data='conf'))
-        nodes_conf_key_list = list(nodes_conf_dict.keys())
-        nodes_conf_value_list = list(nodes_conf_dict.values())
-        conf_array = np.array(nodes_conf_value_list)
-        diff_conf_array = np.linalg.norm(conf_array - new_conf, axis=1)
-        candidate_mask = diff_conf_array < ext_dist * self.nearby_ratio  # warninng: assumes no collision
-        nodes_conf_key_array = np.array(nodes_conf_key_list, dtype=object)
-        nearby_nid_list = list(nodes_conf_key_array[candidate_mask])
+        nearby_nid_list = self._get_nn_index(roadmap).nearby(new_conf, radius=ext_dist * self.nearby_ratio)
         return nearby_nid_list
 
+    @rrt.RRT.timing_decorator("extend")
     def _extend_roadmap(self,
                         roadmap,
                         conf,
@@ -110,7 +106,7 @@ class RRTStar(rrt.RRT):
                 if type(nearby_cost_list) == np.ndarray:
                     nearby_cost_list = [nearby_cost_list]
                 nearby_min_cost_nid = nearby_nid_list[np.argmin(np.asarray(nearby_cost_list))]
-                roadmap.add_node(new_nid, conf=new_conf, cost=roadmap.nodes[nearby_min_cost_nid]["cost"] + 1)
+                self._add_node(roadmap, new_nid, conf=new_conf, cost=roadmap.nodes[nearby_min_cost_nid]["cost"] + 1)
                 roadmap.add_edge(nearby_min_cost_nid, new_nid)  # add new edge
                 # rewire
                 for nearby_nid in nearby_nid_list:
@@ -130,7 +126,7 @@ class RRTStar(rrt.RRT):
                                      new_conf, '^c')
                 # check goal
                 if self._is_goal_reached(conf=roadmap.nodes[new_nid]['conf'], goal_conf=goal_conf, threshold=ext_dist):
-                    roadmap.add_node('goal', conf=goal_conf)  # TODO current name -> connection
+                    self._add_node(roadmap, 'goal', conf=goal_conf)  # TODO current name -> connection
                     roadmap.add_edge(new_nid, 'goal')
                     return 'goal'
                 return new_nid
@@ -168,7 +164,7 @@ class RRTStar(rrt.RRT):
             mot_data = rrt.motu.MotionData(self.robot)
             mot_data.extend(jv_list=[start_conf, goal_conf])
             return mot_data
-        self.roadmap.add_node('start', conf=start_conf, cost=0)
+        self._add_node(self.roadmap, 'start', conf=start_conf, cost=0)
         tic = time.time()
         n = 0
         for _ in range(max_n_iter):
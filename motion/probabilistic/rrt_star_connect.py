@@ -1,5 +1,6 @@
 import time
 import networkx as nx
+import numpy as np
 import motion.probabilistic.rrt_star as rrtst
 from operator import itemgetter
 import uuid
@@ -8,16 +9,18 @@ import warnings
 
 class RRTStarConnect(rrtst.RRTStar):
 
-    def __init__(self, robot_s, nearby_ratio=2):
+    def __init__(self, robot_s, nearby_ratio=2, nn_backend="kdtree"):
         """
         :param robot_s:
         :param nearby_ratio: the threshold_hold = ext_dist*nearby_ratio
+        :param nn_backend: see rrt.RRT
         """
-        super().__init__(robot_s)
+        super().__init__(robot_s, nn_backend=nn_backend)
         self.nearby_ratio = nearby_ratio
         self.roadmap_start = nx.Graph()
         self.roadmap_goal = nx.Graph()
 
+    @rrtst.rrt.RRT.timing_decorator("nearest")
     def _get_nearby_nid_with_min_cost(self, roadmap, new_conf, ext_dist):
         """
         :param roadmap:
@@ -26,16 +29,10 @@ class RRTStarConnect(rrtst.RRTStar):
         author: weiwei
         date: 20210523
         """
-        nodes_conf_dict = dict(roadmap.nodes(data='conf'))
-        nodes_conf_key_list = list(nodes_conf_dict.keys())
-        nodes_conf_value_list = list(nodes_conf_dict.values())
-        conf_array = np.array(nodes_conf_value_list)
-        diff_conf_array = np.linalg.norm(conf_array - new_conf, axis=1)
-        candidate_mask = diff_conf_array < ext_dist * self.nearby_ratio  # warninng: assumes no collision
-        nodes_conf_key_array = np.array(nodes_conf_key_list, dtype=object)
-        nearby_nid_list = list(nodes_conf_key_array[candidate_mask])
+        nearby_nid_list = self._get_nn_index(roadmap).nearby(new_conf, radius=ext_dist * self.nearby_ratio)
         return nearby_nid_list
 
+    @rrtst.rrt.RRT.timing_decorator("extend")
     def _extend_roadmap(self,
                         roadmap,
                         conf,
@@ -65,7 +62,7 @@ class RRTStarConnect(rrtst.RRTStar):
                 if type(nearby_cost_list) == np.ndarray:
                     nearby_cost_list = [nearby_cost_list]
                 nearby_min_cost_nid = nearby_nid_list[np.argmin(np.array(nearby_cost_list))]
-                roadmap.add_node(new_nid, conf=new_conf, cost=0)  # add new nid
+                self._add_node(roadmap, new_nid, conf=new_conf, cost=0)  # add new nid
                 roadmap.add_edge(nearby_min_cost_nid, new_nid)  # add new edge
                 roadmap.nodes[new_nid]['cost'] = roadmap.nodes[nearby_min_cost_nid]['cost'] + 1  # update cost
                 # rewire
@@ -82,7 +79,7 @@ class RRTStarConnect(rrtst.RRTStar):
                                      '^c')
                 # check goal
                 if self._is_goal_reached(conf=roadmap.nodes[new_nid]['conf'], goal_conf=goal_conf, threshold=ext_dist):
-                    roadmap.add_node('connection', conf=goal_conf)  # TODO current name -> connection
+                    self._add_node(roadmap, 'connection', conf=goal_conf)  # TODO current name -> connection
                     roadmap.add_edge(new_nid, 'connection')
                     return 'connection'
                 return new_nid
@@ -123,8 +120,8 @@ class RRTStarConnect(rrtst.RRTStar):
             mot_data = rrtst.rrt.motu.MotionData(self.robot)
             mot_data.extend(jv_list=[start_conf, goal_conf])
             return mot_data
-        self.roadmap_start.add_node('start', conf=start_conf, cost=0)
-        self.roadmap_goal.add_node('goal', conf=goal_conf, cost=0)
+        self._add_node(self.roadmap_start, 'start', conf=start_conf, cost=0)
+        self._add_node(self.roadmap_goal, 'goal', conf=goal_conf, cost=0)
         tic = time.time()
         tree_a = self.roadmap_start
         tree_b = self.roadmap_goal
@@ -26,69 +26,43 @@ class PiecewisePolyOpt(object):
     def _optimization_goal(self, time_intervals):
         return np.sum(time_intervals)
 
+    @staticmethod
+    def _gen_samples(x, time_intervals, sampling_interval):
+        """
+        sample every section with max(ceil(time_interval/sampling_interval), 2) points (shared section ends only once)
+        :param x: 1x(n_sections+1) nparray, section ends
+        :param time_intervals: 1xn_sections nparray
+        :param sampling_interval:
+        :return: 1xn_samples nparray
+        """
+        n_samples = np.maximum(np.ceil(time_intervals / sampling_interval).astype(int), 2)
+        section_ids = np.repeat(np.arange(len(time_intervals)), n_samples - 1)
+        section_starts = np.cumsum(n_samples - 1) - (n_samples - 1)
+        sample_ids = np.arange(len(section_ids)) - section_starts[section_ids]
+        samples = x[section_ids] + time_intervals[section_ids] * sample_ids / (n_samples[section_ids] - 1)
+        return np.append(samples, x[-1])
+
     def _constraint_spdacc(self, time_intervals):
-        self._x = [0]
-        tmp_total_time = 0
-        samples_list = []
-        for i in range(len(time_intervals)):
-            tmp_time_interval = time_intervals[i]
-            n_samples = math.ceil(tmp_time_interval / .008)
-            if n_samples <= 1:
-                n_samples = 2
-            samples = np.linspace(0,
-                                  tmp_time_interval,
-                                  n_samples,
-                                  endpoint=True)
-            samples_list.append(samples + self._x[-1])
-            self._x.append(tmp_time_interval + tmp_total_time)
-            tmp_total_time += tmp_time_interval
-        interpolated_x = []
-        for i in range(len(samples_list)):
-            if i == len(samples_list) - 1:  # last
-                interpolated_x_sec = (samples_list[i]).tolist()
-            else:
-                interpolated_x_sec = (samples_list[i]).tolist()[:-1]
-            interpolated_x += interpolated_x_sec
+        time_intervals = np.asarray(time_intervals)
+        self._x = np.concatenate(([0], np.cumsum(time_intervals)))
+        interpolated_x = self._gen_samples(self._x, time_intervals, .008)
         A = self._solve()
-        interpolated_y = A(np.array(interpolated_x)).tolist()
-        interpolated_y_d1 = A(np.array(interpolated_x), 1).tolist()
-        interpolated_y_d2 = A(np.array(interpolated_x), 2).tolist()
-        interpolated_y_d3 = A(np.array(interpolated_x), 3).tolist()
-        original_x = self._x
+        interpolated_y_d2 = A(interpolated_x, 2)
         if self._toggle_debug_fine:
             import matplotlib.pyplot as plt
+            original_x = self._x
             fig, axs = plt.subplots(4, figsize=(35, 47.5))
             fig.tight_layout(pad=.7)
-            axs[0].plot(interpolated_x, interpolated_y, 'o')
-            for xc in original_x:
-                axs[0].axvline(x=xc)
-            # axs[0].plot(np.arange(len(jnt_values_list)), jnt_values_list, '--o')
-            axs[1].plot(interpolated_x, interpolated_y_d1)
-            for xc in original_x:
-                axs[1].axvline(x=xc)
+            axs[0].plot(interpolated_x, A(interpolated_x), 'o')
+            axs[1].plot(interpolated_x, A(interpolated_x, 1))
             axs[2].plot(interpolated_x, interpolated_y_d2)
-            for xc in original_x:
-                axs[2].axvline(x=xc)
-            axs[3].plot(interpolated_x, interpolated_y_d3)
-            for xc in original_x:
-                axs[3].axvline(x=xc)
-            for xc in original_x:
-                axs[2].axvline(x=xc)
+            axs[3].plot(interpolated_x, A(interpolated_x, 3))
+            for ax in axs:
+                for xc in original_x:
+                    ax.axvline(x=xc)
             plt.show()
-        acc_diff = np.tile(self._max_accs, (len(interpolated_y_d2), 1)) - np.abs(interpolated_y_d2)
-        # jks_diff = np.tile(self._max_accs, (len(interpolated_y_d3), 1)) - np.abs(interpolated_y_d3)
-        print(np.sum(acc_diff[acc_diff < 0] ** 2))
+        acc_diff = self._max_accs - np.abs(interpolated_y_d2)
         return np.sum(acc_diff[acc_diff < 0] ** 2)
-        # The following code only uses give points
-        # for i in range(self._n_pnts - 1):
-        #     tmp_time_interval = time_intervals[i]
-        #     self._x.append(tmp_time_interval + tmp_total_time)
-        #     tmp_total_time += tmp_time_interval
-        # A = self._solve()
-        # interpolated_y_d2 = A(np.array(self._x), 2).tolist()
-        # acc_diff = np.tile(self._max_accs, (len(interpolated_y_d2),1)) - np.abs(interpolated_y_d2)
-        # print(np.sum(acc_diff[acc_diff<0]**2))
-        # return np.sum(acc_diff[acc_diff<0]**2)
 
     def _solve_opt(self, method='SLSQP'):
         """
@@ -99,7 +73,7 @@ class PiecewisePolyOpt(object):
         :return:
         """
         constraints = []
-        constraints.append({'end_type': 'eq', 'fun': self._constraint_spdacc})
+        constraints.append({'type': 'eq', 'fun': self._constraint_spdacc})
         bounds = []
         for i in range(len(self._seed_time_intervals)):
             bounds.append((self._seed_time_intervals[i], None))
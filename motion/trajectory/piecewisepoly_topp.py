@@ -0,0 +1,366 @@
+import math
+import numpy as np
+import scipy.interpolate as sinter
+
+
+class TOPPSegment(object):
+    """
+    a time-parameterized path returned by PiecewisePolyTOPP.fit
+    s is quadratic in t inside a grid interval as dds is constant there, so any time can be evaluated in closed form
+    """
+
+    def __init__(self, spline=None, grid=None, x_grid=None, u_grid=None, start_conf=None):
+        """
+        :param spline: q(s)
+        :param grid: 1x(n_grids+1) nparray of s
+        :param x_grid: 1x(n_grids+1) nparray of ds^2
+        :param u_grid: 1xn_grids nparray of dds
+        :param start_conf: a path with a single conf, used when spline is None
+        """
+        self._spline = spline
+        self._start_conf = start_conf
+        if spline is None:
+            self.duration = 0.0
+            return
+        self._grid = grid
+        self._sqrt_x = np.sqrt(x_grid)
+        self._u_grid = u_grid
+        sqrt_x_sum = self._sqrt_x[:-1] + self._sqrt_x[1:]
+        delta_t = np.where(sqrt_x_sum > 0, 2 * np.diff(grid) / np.where(sqrt_x_sum > 0, sqrt_x_sum, 1.0), 0)
+        self._t_grid = np.concatenate(([0], np.cumsum(delta_t)))
+        self.duration = float(self._t_grid[-1])
+
+    @property
+    def n_dim(self):
+        return len(self._start_conf) if self._spline is None else self._spline.c.shape[-1]
+
+    def evaluate(self, ts):
+        """
+        :param ts: 1xn nparray of time, clipped to [0, duration]
+        :return: confs, vels, accs (n x n_jnts nparrays)
+        """
+        ts = np.clip(np.asarray(ts, dtype=float), 0, self.duration)
+        if self._spline is None:
+            confs = np.tile(self._start_conf, (len(ts), 1))
+            return confs, np.zeros_like(confs), np.zeros_like(confs)
+        ids = np.clip(np.searchsorted(self._t_grid, ts, side='right') - 1, 0, len(self._u_grid) - 1)
+        tau = ts - self._t_grid[ids]
+        sd = np.maximum(self._sqrt_x[ids] + self._u_grid[ids] * tau, 0)
+        s = np.clip(self._grid[ids] + self._sqrt_x[ids] * tau + self._u_grid[ids] * tau ** 2 / 2,
+                    self._grid[ids], self._grid[ids + 1])
+        sdd = self._u_grid[ids]
+        d1 = self._spline(s, 1)
+        confs = self._spline(s)
+        vels = d1 * sd[:, None]
+        accs = self._spline(s, 2) * (sd ** 2)[:, None] + d1 * sdd[:, None]
+        return confs, vels, accs
+
+
+class PiecewisePolyTOPP(object):
+    """
+    time-optimal path parameterization with joint velocity and acceleration limits, following the reachability
+    analysis of TOPP-RA (Pham and Pham, 2018)
+    the geometric path is a clamped cubic spline q(s) through the waypoints; the stage constraints of all grid points
+    are computed at once, leaving only a scalar backward and a scalar forward pass over the grid
+    the constraints only hold at the grid points, the profile is therefore checked in between; the grid intervals that
+    break the limits are halved and refit with tightened limits until the sampled output respects the given limits
+    unlike piecewisepoly_toppra, this module does not depend on the toppra package
+    """
+
+    def __init__(self, n_grids_per_section=4, n_max_refits=5):
+        """
+        :param n_grids_per_section: number of grid intervals between two adjacent waypoints
+        :param n_max_refits: number of refits of the intervals that violate the limits between grid points;
+               the profile is slowed down uniformly if the violation persists
+        """
+        self.n_grids_per_section = n_grids_per_section
+        self.n_max_refits = n_max_refits
+
+    def _remove_duplicate(self, path):
+        path_array = np.asarray(path, dtype=float)
+        is_kept = np.ones(len(path_array), dtype=bool)
+        is_kept[:-1] = np.any(~np.isclose(path_array[:-1], path_array[1:]), axis=1)
+        return path_array[is_kept]
+
+    def _gen_grid(self, x):
+        """
+        :param x: knots of the spline
+        :return: grid points, n_grids_per_section uniform intervals in every knot interval
+        """
+        ratios = np.arange(self.n_grids_per_section) / self.n_grids_per_section
+        grid = (x[:-1, None] + np.diff(x)[:, None] * ratios[None, :]).ravel()
+        return np.append(grid, x[-1])
+
+    @staticmethod
+    def _stage_constraints(d1, d2, delta_s, max_vels, max_accs):
+        """
+        x = ds^2, u = dds; the joint velocity is d1*sqrt(x), the joint acceleration is d1*u + d2*x
+        the acceleration limits of stage i are imposed at both ends of the grid interval, using x_{i+1} = x_i+2*delta_s*u
+        at the end (the interpolation scheme of TOPP-RA)
+        :param d1: (n_grids+1)xn_jnts nparray, dq/ds at grid points
+        :param d2: (n_grids+1)xn_jnts nparray, d2q/ds2 at grid points
+        :param delta_s: 1xn_grids nparray
+        :return: max_x (n_grids+1), lower_p, lower_q, upper_p, upper_q (n_grids x 2n_jnts) so that in stage i,
+                 max_j(lower_p_ij+lower_q_ij*x_i) <= u_i <= min_j(upper_p_ij+upper_q_ij*x_i)
+        """
+        abs_d1 = np.abs(d1)
+        abs_d2 = np.abs(d2)
+        is_moving = abs_d1 > 1e-9
+        is_bending = abs_d2 > 1e-9
+        # velocity limits; joints that do not move at a grid point only limit x through d2*x
+        max_x = np.min(np.where(is_moving, (max_vels / np.where(is_moving, abs_d1, 1.0)) ** 2, np.inf), axis=1)
+        max_x = np.minimum(max_x, np.min(np.where(~is_moving & is_bending,
+                                                  max_accs / np.where(is_bending, abs_d2, 1.0), np.inf), axis=1))
+        # acceleration limits at the beginning of a stage: -alpha+beta*x <= u <= alpha+beta*x
+        alpha = np.where(is_moving, max_accs / np.where(is_moving, abs_d1, 1.0), np.inf)
+        beta = np.where(is_moving, -d2 / np.where(is_moving, d1, 1.0), 0.0)
+        # at the end of a stage: k*u bounded by -alpha'+beta'*x and alpha'+beta'*x with k = 1-2*delta_s*beta'
+        k = 1 - 2 * delta_s[:, None] * beta[1:]
+        is_valid = np.isfinite(alpha[1:]) & (np.abs(k) > 1e-9)
+        safe_k = np.where(is_valid, k, 1.0)
+        bound_a = np.where(is_valid, (-alpha[1:]) / safe_k, -np.inf)
+        bound_b = np.where(is_valid, alpha[1:] / safe_k, np.inf)
+        slope = np.where(is_valid, beta[1:] / safe_k, 0.0)
+        is_flipped = k < 0
+        lower_p = np.hstack((-alpha[:-1], np.where(is_flipped, bound_b, bound_a)))
+        upper_p = np.hstack((alpha[:-1], np.where(is_flipped, bound_a, bound_b)))
+        lower_q = np.hstack((beta[:-1], slope))
+        upper_q = lower_q.copy()
+        # a lower bound must not exceed an upper bound:
+        # lower_p_j+lower_q_j*x <= upper_p_k+upper_q_k*x, i.e., x <= (upper_p_k-lower_p_j)/(lower_q_j-upper_q_k)
+        q_diff = lower_q[:, :, None] - upper_q[:, None, :]
+        p_diff = upper_p[:, None, :] - lower_p[:, :, None]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pair_max_x = np.where(q_diff > 1e-12, p_diff / np.where(q_diff > 1e-12, q_diff, 1.0), np.inf)
+        pair_max_x = np.nan_to_num(pair_max_x, nan=np.inf, posinf=np.inf).reshape(len(delta_s), -1).min(axis=1)
+        max_x[:-1] = np.minimum(max_x[:-1], np.maximum(pair_max_x, 0))
+        return max_x, lower_p, lower_q, upper_p, upper_q
+
+    @staticmethod
+    def _backward_pass(max_x, lower_p, lower_q, delta_s):
+        """
+        the upper bounds of the controllable sets; the lower bounds are 0 as the robot can always stop
+        x_i is controllable if the minimum reachable x_{i+1} = x_i+2*delta_s_i*u_min(x_i) is controllable
+        :return: 1x(n_grids+1) nparray
+        """
+        n_grids = len(delta_s)
+        # x_i+2*delta_s_i*(p_ij+q_ij*x_i) <= hi_{i+1}  ->  x_i <= (hi_{i+1}-2*delta_s_i*p_ij)/d_ij for d_ij > 0
+        d = 1 + 2 * delta_s[:, None] * lower_q
+        is_valid = (d > 1e-12) & np.isfinite(lower_p)
+        inv_d = np.where(is_valid, 1 / np.where(is_valid, d, 1.0), 0.0)
+        offset = np.where(is_valid, -2 * delta_s[:, None] * np.where(is_valid, lower_p, 0.0) * inv_d, np.inf)
+        inv_d_list = inv_d.tolist()
+        offset_list = offset.tolist()
+        max_x_list = max_x.tolist()
+        controllable_x = [0.0] * (n_grids + 1)
+        hi = 0.0  # stop at the end
+        for i in range(n_grids - 1, -1, -1):
+            hi = min([max_x_list[i]] + [hi * a + b for a, b in zip(inv_d_list[i], offset_list[i])])
+            hi = max(hi, 0.0)
+            controllable_x[i] = hi
+        return np.asarray(controllable_x)
+
+    @staticmethod
+    def _forward_pass(controllable_x, upper_p, upper_q, delta_s, start_x=0.0):
+        """
+        greedily take the maximum u that keeps the next x controllable
+        :param start_x: ds^2 at the beginning, must be controllable
+        :return: x (n_grids+1), u (n_grids)
+        """
+        n_grids = len(delta_s)
+        upper_p_list = upper_p.tolist()
+        upper_q_list = upper_q.tolist()
+        delta_s_list = delta_s.tolist()
+        controllable_x_list = controllable_x.tolist()
+        x = [0.0] * (n_grids + 1)
+        x[0] = start_x
+        u = [0.0] * n_grids
+        for i in range(n_grids):
+            x_i = x[i]
+            u_i = (controllable_x_list[i + 1] - x_i) / (2 * delta_s_list[i])
+            u_i = min([u_i] + [p + q * x_i for p, q in zip(upper_p_list[i], upper_q_list[i])])
+            x_next = x_i + 2 * delta_s_list[i] * u_i
+            if x_next < 0:
+                x_next = 0.0
+                u_i = -x_i / (2 * delta_s_list[i])
+            u[i] = u_i
+            x[i + 1] = x_next
+        return np.asarray(x), np.asarray(u)
+
+    @staticmethod
+    def _peak_quadratic(f0, f_half, f1):
+        """
+        :param f0, f_half, f1: values of quadratic functions at r=0, .5, 1 (n_grids x n_jnts nparrays)
+        :return: max |f| over r in [0, 1] (n_grids x n_jnts nparray)
+        """
+        b = -3 * f0 + 4 * f_half - f1
+        c = 2 * f0 - 4 * f_half + 2 * f1
+        is_curved = np.abs(c) > 1e-12
+        r = np.clip(np.where(is_curved, -b / (2 * np.where(is_curved, c, 1.0)), 0), 0, 1)
+        return np.maximum.reduce([np.abs(f0), np.abs(f1), np.abs(f0 + b * r + c * r ** 2)])
+
+    def _peak_vels_accs(self, spline, grid, x_grid, u_grid):
+        """
+        peak joint speeds and accelerations of a profile inside every grid interval, not only at the grid points
+        inside a grid interval, dq/ds is quadratic in s, d2q/ds2 and x = ds^2 are linear in s, and dds is constant,
+        so the joint accelerations are quadratic in s and their peaks are exact; the speeds are bounded by the peak
+        of |dq/ds| times the larger ds of the two ends
+        :return: peak_vels, peak_accs (n_grids x n_jnts nparrays)
+        """
+        s_half = (grid[:-1] + grid[1:]) / 2
+        x_half = (x_grid[:-1] + x_grid[1:]) / 2
+        d1, d2 = spline(grid, 1), spline(grid, 2)
+        d1_half, d2_half = spline(s_half, 1), spline(s_half, 2)
+        u = u_grid[:, None]
+        peak_d1 = self._peak_quadratic(d1[:-1], d1_half, d1[1:])
+        peak_vels = peak_d1 * np.sqrt(np.maximum(x_grid[:-1], x_grid[1:]))[:, None]
+        peak_accs = self._peak_quadratic(d2[:-1] * x_grid[:-1, None] + d1[:-1] * u,
+                                         d2_half * x_half[:, None] + d1_half * u,
+                                         d2[1:] * x_grid[1:, None] + d1[1:] * u)
+        return peak_vels, peak_accs
+
+    def _fit_profile(self, spline, grid, max_vels, max_accs, start_x=0.0):
+        """
+        the constraints are imposed at the grid points; while the profile violates the given limits between the
+        grid points, the violating grid intervals are halved and the limits at their ends are tightened by the
+        violation, the other intervals are left as they are
+        :param start_x: ds^2 at the beginning
+        :return: grid, x_grid, u_grid; None if start_x cannot be kept
+        """
+        grid_vels = np.tile(max_vels, (len(grid), 1))
+        grid_accs = np.tile(max_accs, (len(grid), 1))
+        for _ in range(self.n_max_refits + 1):
+            delta_s = np.diff(grid)
+            max_x, lower_p, lower_q, upper_p, upper_q = self._stage_constraints(spline(grid, 1), spline(grid, 2),
+                                                                                delta_s, grid_vels, grid_accs)
+            controllable_x = self._backward_pass(max_x, lower_p, lower_q, delta_s)
+            if start_x > controllable_x[0] * (1 + 1e-9):
+                return None
+            x_grid, u_grid = self._forward_pass(controllable_x, upper_p, upper_q, delta_s,
+                                                start_x=min(start_x, controllable_x[0]))
+            peak_vels, peak_accs = self._peak_vels_accs(spline, grid, x_grid, u_grid)
+            vel_ratios = np.maximum(peak_vels / max_vels, 1)
+            acc_ratios = np.maximum(peak_accs / max_accs, 1)
+            is_violated = np.any(vel_ratios > 1, axis=1) | np.any(acc_ratios > 1, axis=1)
+            fit_grid = grid
+            if not np.any(is_violated):
+                return fit_grid, x_grid, u_grid
+            # tighten the limits at both ends of the violating intervals
+            for ratios, grid_limits in ((vel_ratios, grid_vels), (acc_ratios, grid_accs)):
+                grid_limits[:-1] /= ratios
+                grid_limits[1:] /= ratios
+            # halve the violating intervals, the new grid points take the limits of the start of their interval
+            ids = np.flatnonzero(is_violated)
+            grid = np.insert(grid, ids + 1, (grid[ids] + grid[ids + 1]) / 2)
+            grid_vels = np.insert(grid_vels, ids + 1, grid_vels[ids], axis=0)
+            grid_accs = np.insert(grid_accs, ids + 1, grid_accs[ids], axis=0)
+        if start_x > 0:
+            return None
+        # slow down uniformly, speeds scale with sqrt(x) and accelerations with x and u
+        scale = max(vel_ratios.max() ** 2, acc_ratios.max())
+        return fit_grid, x_grid / scale, u_grid / scale
+
+    def fit(self, path, max_vels=None, max_accs=None, start_vels=None):
+        """
+        :param path: a list of 1xn_jnts nparray
+        :param max_vels: max joint speeds, math.pi*2/3 if None
+        :param max_accs: max joint accelerations, math.pi if None
+        :param start_vels: joint speeds at path[0], zeros if None; used to continue a moving robot (e.g., splicing)
+                           ValueError is raised if the robot cannot follow the path from these speeds
+        :return: TOPPSegment
+        """
+        path_array = self._remove_duplicate(path)
+        n_jnts = path_array.shape[1]
+        if len(path_array) < 2:
+            return TOPPSegment(start_conf=path_array[0])
+        max_vels = np.full(n_jnts, math.pi * 2 / 3) if max_vels is None else np.asarray(max_vels, dtype=float)
+        max_accs = np.full(n_jnts, math.pi) if max_accs is None else np.asarray(max_accs, dtype=float)
+        start_vels = np.zeros(n_jnts) if start_vels is None else np.asarray(start_vels, dtype=float)
+        # knots: seed time intervals at max speed, same as piecewisepoly_toppra
+        x = np.concatenate(([0], np.cumsum(np.max(np.abs(np.diff(path_array, axis=0)) / max_vels, axis=1))))
+        grid = self._gen_grid(x)
+        start_speed = np.linalg.norm(start_vels)
+        if start_speed == 0:
+            spline = sinter.CubicSpline(x, path_array, axis=0, bc_type=((1, start_vels), (1, np.zeros(n_jnts))))
+            grid, x_grid, u_grid = self._fit_profile(spline, grid, max_vels, max_accs)
+            return TOPPSegment(spline=spline, grid=grid, x_grid=x_grid, u_grid=u_grid)
+        # dq/ds = start_vels/start_sd at s=0 and ds/dt = start_sd reproduce the start speeds
+        # start_sd is first chosen so that the start slope is as steep as the first section; a smaller start_sd
+        # lowers the accelerations caused by bending towards path[1] at the cost of a wider bend, it is halved until
+        # the start speeds can be kept (a short first section may need a much smaller one)
+        matched_sd = start_speed * x[1] / np.linalg.norm(path_array[1] - path_array[0])
+        for start_sd in matched_sd * .5 ** np.arange(11):
+            spline = sinter.CubicSpline(x, path_array, axis=0,
+                                        bc_type=((1, start_vels / start_sd), (1, np.zeros(n_jnts))))
+            result = self._fit_profile(spline, grid, max_vels, max_accs, start_x=start_sd ** 2)
+            if result is not None:
+                return TOPPSegment(spline=spline, grid=result[0], x_grid=result[1], u_grid=result[2])
+        raise ValueError("The start speeds are too high to follow the path without breaking the limits!")
+
+    def gen_trajectory(self, path, control_frequency=.005, max_vels=None, max_accs=None):
+        """
+        :param path: a list of 1xn_jnts nparray
+        :param control_frequency: sampling interval of the output (in seconds)
+        :param max_vels: max joint speeds, math.pi*2/3 if None
+        :param max_accs: max joint accelerations, math.pi if None
+        :return: ts (n_samples), confs, vels, accs (n_samples x n_jnts nparrays)
+        """
+        segment = self.fit(path, max_vels=max_vels, max_accs=max_accs)
+        ts = np.arange(0, segment.duration, control_frequency)
+        ts = np.append(ts, segment.duration) if len(ts) == 0 or segment.duration - ts[-1] > 1e-9 else ts
+        return (ts,) + segment.evaluate(ts)
+
+    def interpolate_by_max_spdacc(self,
+                                  path,
+                                  control_frequency=.005,
+                                  max_vels=None,
+                                  max_accs=None,
+                                  toggle_debug=False):
+        """
+        drop-in replacement of piecewisepoly_toppra.PiecewisePolyTOPPRA.interpolate_by_max_spdacc
+        TODO: prismatic motor speed is not considered
+        :param path:
+        :param control_frequency:
+        :param max_vels: max joint speeds, math.pi*2/3 if None
+        :param max_accs: max joint accelerations, math.pi if None
+        :return: interpolated_confs, (n_samples x n_jnts nparray), use gen_trajectory for speeds and accelerations
+        """
+        ts, interpolated_confs, interpolated_spds, interpolated_accs = self.gen_trajectory(
+            path, control_frequency=control_frequency, max_vels=max_vels, max_accs=max_accs)
+        if toggle_debug:
+            print("Found optimal trajectory with duration {:f} sec".format(ts[-1]))
+            import matplotlib.pyplot as plt
+            fig, axs = plt.subplots(3, figsize=(10, 30))
+            fig.tight_layout(pad=.7)
+            # curve
+            axs[0].plot(ts, interpolated_confs, 'o')
+            # speed
+            axs[1].plot(ts, interpolated_spds)
+            for ys in max_vels if max_vels is not None else []:
+                axs[1].axhline(y=ys)
+                axs[1].axhline(y=-ys)
+            # acceleration
+            axs[2].plot(ts, interpolated_accs)
+            for ys in max_accs if max_accs is not None else []:
+                axs[2].axhline(y=ys)
+                axs[2].axhline(y=-ys)
+            plt.show()
+        return interpolated_confs
+
+
+if __name__ == '__main__':
+    import time
+
+    rng = np.random.default_rng(0)
+    path = np.cumsum(rng.uniform(-.1, .1, size=(500, 6)), axis=0)
+    tpp = PiecewisePolyTOPP()
+    time_list = []
+    for _ in range(6):
+        tic = time.perf_counter()
+        ts, confs, vels, accs = tpp.gen_trajectory(path, control_frequency=.005)
+        time_list.append(time.perf_counter() - tic)
+    # the first run includes warming up
+    print(f"500 waypoints retimed in {np.median(time_list[1:]) * 1000:.1f} ms (median), duration {ts[-1]:.3f} s, "
+          f"{len(ts)} samples")
+    print("max |vel|", np.abs(vels).max(axis=0))
+    print("max |acc|", np.abs(accs).max(axis=0))
@@ -0,0 +1,170 @@
+"""
+Stream setpoints of a time-parameterized trajectory chunk by chunk
+Only one chunk is kept in memory; the remaining motion can be replaced by a new segment at any time (splice)
+A segment is any object with a duration attribute (seconds) and an evaluate(ts) method that returns confs, vels,
+and accs (n x n_jnts nparrays) at the given times, e.g., piecewisepoly_topp.TOPPSegment or SplineSegment
+"""
+import threading
+import numpy as np
+
+
+class SplineSegment(object):
+    """
+    wrap a scipy spline (BSpline, CubicSpline, PPoly, etc.) whose parameter is time
+    e.g., SplineSegment(pwp_scl._solve(), pwp_scl._x[-1]) after PiecewisePolyScl.interpolate_by_max_spdacc
+    """
+
+    def __init__(self, spline, duration, start_time=0.0):
+        """
+        :param spline: a callable in the form of spline(ts, nu), where nu is the order of derivative
+        :param duration:
+        :param start_time: the time in spline that corresponds to the beginning of the segment
+        """
+        self._spline = spline
+        self._start_time = start_time
+        self.duration = float(duration)
+
+    def evaluate(self, ts):
+        ts = np.clip(np.asarray(ts, dtype=float), 0, self.duration) + self._start_time
+        return self._spline(ts), self._spline(ts, 1), self._spline(ts, 2)
+
+
+class TrajectoryStream(object):
+    """
+    setpoints are sampled at k*control_frequency (k=0, 1, ...) from the beginning of the stream, the exact end of
+    the last segment is sampled as the final setpoint so that the robot stops at the goal
+    usage:
+        stream = TrajectoryStream(PiecewisePolyTOPP().fit(path), control_frequency=.008)
+        for jnt_values in stream.gen_setpoints():
+            send(jnt_values)
+    the loop itself or another thread may call stream.splice(new_segment) while streaming; append, splice, state_at,
+    and the evaluation of a chunk are serialized by a lock, the setpoints of a chunk count as sent once it is
+    evaluated, so a splice from another thread takes effect from the next chunk
+    """
+
+    def __init__(self, segment=None, control_frequency=.005, chunk_size=64):
+        """
+        :param segment: the first segment, more can be appended or spliced later
+        :param control_frequency: sampling interval (in seconds)
+        :param chunk_size: number of setpoints evaluated together
+        """
+        self.control_frequency = control_frequency
+        self.chunk_size = chunk_size
+        self._segment_list = []  # [segment, start time in the stream], sorted by the start time
+        self._n_sent = 0  # cursor, number of time grid points that were sampled
+        self._last_sent_time = -1.0
+        self._lock = threading.Lock()
+        if segment is not None:
+            self.append(segment)
+
+    @property
+    def cursor_time(self):
+        """
+        the time of the next setpoint on the time grid
+        """
+        return self._n_sent * self.control_frequency
+
+    @property
+    def end_time(self):
+        if len(self._segment_list) == 0:
+            return 0.0
+        segment, start_time = self._segment_list[-1]
+        return start_time + segment.duration
+
+    def append(self, segment):
+        """
+        play segment after the last one
+        :param segment:
+        :return:
+        """
+        with self._lock:
+            self._segment_list.append([segment, max(self.end_time, self.cursor_time)])
+
+    def splice(self, segment, at_time=None):
+        """
+        replace the motion after at_time with segment
+        the segment is expected to start from the state at at_time, e.g.,
+            conf, vel, _ = stream.state_at(stream.cursor_time)
+            stream.splice(PiecewisePolyTOPP().fit([conf] + new_path, start_vels=vel))
+        fit raises ValueError if new_path cannot be followed from vel within the limits, the stream is not changed then
+        :param segment:
+        :param at_time: time in the stream, the time of the next setpoint if None; sent setpoints cannot be changed
+        :return:
+        """
+        with self._lock:
+            if at_time is None:
+                at_time = self.cursor_time
+            if at_time <= self._last_sent_time:
+                raise ValueError("Cannot splice before the setpoints that were already sent!")
+            self._segment_list = [item for item in self._segment_list if item[1] < at_time] + [[segment, at_time]]
+
+    def _evaluate(self, ts):
+        """
+        :param ts: sorted times in the stream
+        :return: confs, vels, accs
+        """
+        segment_list = self._segment_list
+        start_times = np.array([start_time for _, start_time in segment_list])
+        ids = np.maximum(np.searchsorted(start_times, ts + 1e-12, side='right') - 1, 0)
+        result_list = []
+        for id in np.unique(ids):
+            segment, start_time = segment_list[id]
+            result_list.append(segment.evaluate(ts[ids == id] - start_time))
+        return tuple(np.concatenate(item, axis=0) for item in zip(*result_list))
+
+    def state_at(self, time):
+        """
+        :param time: time in the stream
+        :return: conf, vel, acc at the given time
+        """
+        with self._lock:
+            if len(self._segment_list) == 0:
+                raise ValueError("The stream is empty!")
+            confs, vels, accs = self._evaluate(np.array([min(time, self.end_time)]))
+        return confs[0], vels[0], accs[0]
+
+    def _next_chunk(self):
+        """
+        :return: ts, confs, vels, accs of the next chunk; None if there is nothing left
+        """
+        with self._lock:
+            # segments that were passed are no longer needed
+            while len(self._segment_list) > 1 and self._segment_list[1][1] <= self.cursor_time:
+                self._segment_list.pop(0)
+            if len(self._segment_list) == 0:
+                return None
+            end_time = self.end_time
+            ts = (self._n_sent + np.arange(self.chunk_size)) * self.control_frequency
+            ts = ts[ts < end_time - 1e-9]
+            if len(ts) == 0:
+                if self._last_sent_time >= end_time - 1e-9:
+                    return None
+                # the exact end, which replaces the grid point at the same time if there is one
+                ts = np.array([end_time])
+                if self.cursor_time <= end_time + 1e-9:
+                    self._n_sent += 1
+            else:
+                self._n_sent += len(ts)
+            self._last_sent_time = ts[-1]
+            return (ts,) + self._evaluate(ts)
+
+    def gen_chunks(self):
+        """
+        a generator of (ts, confs, vels, accs), each holding at most chunk_size setpoints
+        :return:
+        """
+        while True:
+            chunk = self._next_chunk()
+            if chunk is None:
+                return
+            yield chunk
+
+    def gen_setpoints(self, toggle_vels=False):
+        """
+        a generator of single setpoints
+        :param toggle_vels: yield (conf, vel) if True, otherwise conf only
+        :return:
+        """
+        for _, confs, vels, _ in self.gen_chunks():
+            for i in range(len(confs)):
+                yield (confs[i], vels[i]) if toggle_vels else confs[i]
@@ -0,0 +1,327 @@
+"""
+Latency, throughput, and jitter benchmarks of the drivers in robot_con, run against local stand-ins
+(robot_con.ur.ur_standin, robot_con.xarm_shuidi_grpc.xarm_shuidi_standin) instead of hardware.
+Each benchmark drives the real client code and the real protocol; the stand-ins only replace the robot.
+Benchmarks whose drivers cannot be set up (e.g., missing vendor packages) are reported with an error.
+usage:
+    python -m robot_con.benchmark --benchmarks ur_command_latency xarm_stream_jspace_path --json result.json
+"""
+import os
+import csv
+import json
+import time
+import asyncio
+import argparse
+import numpy as np
+
+
+def _stats(values, prefix, scale=1e3):
+    """
+    :param values: seconds
+    :param prefix:
+    :param scale: 1e3 reports milliseconds
+    :return: dict of median, mean, p95, p99, and max
+    """
+    values = np.asarray(values, dtype=float) * scale
+    if len(values) == 0:
+        return {}
+    return {f"{prefix}_median": float(np.median(values)),
+            f"{prefix}_mean": float(np.mean(values)),
+            f"{prefix}_p95": float(np.percentile(values, 95)),
+            f"{prefix}_p99": float(np.percentile(values, 99)),
+            f"{prefix}_max": float(np.max(values))}
+
+
+def _jitter_stats(exec_times, period, prefix="jitter_ms"):
+    """
+    deviation of the intervals between executed setpoints from the nominal period
+    """
+    intervals = np.diff(np.asarray(exec_times))
+    if len(intervals) == 0:
+        return {}
+    deviations = np.abs(intervals - period)
+    result = {f"{prefix}_std": float(np.std(intervals) * 1e3)}
+    result.update(_stats(deviations, prefix))
+    return result
+
+
+def _gen_confs(n_setpoints, n_jnts, rng):
+    """
+    a smooth joint-space trajectory with n_setpoints setpoints
+    """
+    ts = np.linspace(0, 1, n_setpoints)[:, None]
+    amplitudes = rng.uniform(-.5, .5, n_jnts)
+    return np.sin(np.pi * ts) * amplitudes
+
+
+def _gen_ur_arm_x(servo_time):
+    """
+    :return: UR3Rtq85X connected to a URStandIn through the loopback
+    """
+    import robot_con.ur.ur3_rtq85_x as u3r85x
+    import robot_con.ur.ur_standin as urs
+    standin = urs.URStandIn(servo_time=servo_time)
+    return u3r85x.UR3Rtq85X(robot_ip="127.0.0.1", pc_ip="127.0.0.1", arm=standin), standin
+
+
+def bench_ur_command_latency(n_repeats=200, seed=0):
+    """
+    round trip of one-setpoint trajectories over a persistent ur_async_x connection (send -> "done")
+    plus the time to upload the driver script and accept the connection
+    """
+    import robot_con.ur.ur_async_x as uax
+    arm_x, standin = _gen_ur_arm_x(servo_time=0)
+    link = uax.AsyncURArmLink(arm_x, name="arm")
+    rng = np.random.default_rng(seed)
+
+    async def _run():
+        tic = time.perf_counter()
+        await link.connect()
+        connect_time = time.perf_counter() - tic
+        latency_list = []
+        for _ in range(n_repeats):
+            confs = rng.uniform(-1, 1, (1, 6))
+            tic = time.perf_counter()
+            await (await link.send_confs(confs))
+            latency_list.append(time.perf_counter() - tic)
+        await link.close()
+        return connect_time, latency_list
+
+    connect_time, latency_list = asyncio.run(_run())
+    result = {"n_repeats": n_repeats, "connect_time_ms": connect_time * 1e3}
+    result.update(_stats(latency_list, "latency_ms"))
+    return result
+
+
+def bench_ur_setpoint_throughput(n_setpoints=20000, n_repeats=3, seed=0):
+    """
+    setpoints per second accepted by the persistent ur_async_x link when the robot does not wait (servo_time=0)
+    """
+    import robot_con.ur.ur_async_x as uax
+    arm_x, standin = _gen_ur_arm_x(servo_time=0)
+    link = uax.AsyncURArmLink(arm_x, name="arm")
+    confs = _gen_confs(n_setpoints, 6, np.random.default_rng(seed))
+
+    async def _run():
+        await link.connect()
+        time_list = []
+        for _ in range(n_repeats):
+            tic = time.perf_counter()
+            await (await link.send_confs(confs))
+            time_list.append(time.perf_counter() - tic)
+        await link.close()
+        return time_list
+
+    time_list = asyncio.run(_run())
+    return {"n_setpoints": n_setpoints,
+            "n_repeats": n_repeats,
+            "throughput_hz_median": float(n_setpoints / np.median(time_list)),
+            "pack_time_ms": _time_it(lambda: uax.pack_confs(confs, arm_x.jnts_scaler)) * 1e3}
+
+
+def bench_ur_servo_jitter(n_setpoints=500, servo_time=.008, seed=0):
+    """
+    intervals between the setpoints executed by a robot that servos every servo_time seconds,
+    and the delay between the first write and the first executed setpoint
+    """
+    import robot_con.ur.ur_async_x as uax
+    arm_x, standin = _gen_ur_arm_x(servo_time=servo_time)
+    link = uax.AsyncURArmLink(arm_x, name="arm")
+    confs = _gen_confs(n_setpoints, 6, np.random.default_rng(seed))
+
+    async def _run():
+        await link.connect()
+        standin.clear_log()
+        tic = time.perf_counter()
+        await (await link.send_confs(confs))
+        await link.close()
+        return tic
+
+    tic = asyncio.run(_run())
+    recv_times, exec_times = standin.get_log()
+    result = {"n_setpoints": len(exec_times),
+              "servo_time_ms": servo_time * 1e3,
+              "start_latency_ms": float((exec_times[0] - tic) * 1e3),
+              "duration_error_ms": float((exec_times[-1] - exec_times[0] - (n_setpoints - 1) * servo_time) * 1e3)}
+    result.update(_jitter_stats(exec_times, servo_time))
+    return result
+
+
+def bench_ur_ft_stream(n_frames=20000, rate=1000.0):
+    """
+    frames per second parsed by UR3Rtq85X.start_recvft from an unthrottled ft stream, and the latency from
+    sending a frame to storing it in the ring buffer at the given rate
+    """
+    import robot_con.ur.ur3_rtq85_x as u3r85x
+    import robot_con.ur.ur_standin as urs
+    result = {"n_frames": n_frames, "rate_hz": rate}
+    for frame_rate, n_expected in [(None, n_frames), (rate, int(rate))]:  # one second at the given rate
+        ft_standin = urs.FT300StandIn(rate=frame_rate)
+        ft_standin.limit_frames(n_expected)
+        arm_x = u3r85x.UR3Rtq85X(robot_ip="127.0.0.1", pc_ip="127.0.0.1", arm=urs.URStandIn(),
+                                 ftsensor_port=ft_standin.port)
+        tic = time.perf_counter()
+        arm_x.start_recvft(buffer_capacity=n_expected)
+        while arm_x.ftsensor_buffer.n_samples < n_expected and time.perf_counter() - tic < 30:
+            time.sleep(.001)
+        toc = time.perf_counter()
+        arm_x.stop_recvft()
+        ft_standin.stop()
+        values, timestamps = arm_x.get_ftsensor_values()
+        n_received = arm_x.ftsensor_buffer.n_samples
+        if frame_rate is None:
+            result["throughput_hz"] = float(n_received / (toc - tic))
+            result["n_lost"] = n_expected - n_received
+        else:
+            send_times = np.array(ft_standin.send_time_list[:len(timestamps)])
+            result.update(_stats(timestamps - send_times, "latency_ms"))
+    return result
+
+
+def _gen_xarm_standin(host):
+    import robot_con.xarm_shuidi_grpc.xarm_shuidi_standin as xsst
+    import robot_con.xarm_shuidi_grpc.xarm_shuidi_client as xsc
+    server, aa_server = xsst.start_standin_server(host=host)
+    return server, aa_server._arm_x, xsc.XArmShuidiClient(host=host)
+
+
+def bench_xarm_get_jnt_values(n_repeats=500, host="localhost:18391"):
+    """
+    round trip of the unary arm_get_jnt_values rpc
+    """
+    server, arm_standin, client = _gen_xarm_standin(host)
+    try:
+        client.arm_get_jnt_values()  # connect
+        latency_list = []
+        for _ in range(n_repeats):
+            tic = time.perf_counter()
+            client.arm_get_jnt_values()
+            latency_list.append(time.perf_counter() - tic)
+    finally:
+        server.stop(0)
+    result = {"n_repeats": n_repeats}
+    result.update(_stats(latency_list, "latency_ms"))
+    return result
+
+
+def bench_xarm_stream_jspace_path(n_setpoints=2000, chunk_size=64, control_frequency=.005,
+                                  host="localhost:18392", seed=0):
+    """
+    the same setpoints sent as one Path message (arm_move_jspace_path) and as PathChunk messages
+    (arm_stream_jspace_path); start latency is the time from the call to the first servo setpoint
+    """
+    import robot_con.xarm_shuidi_grpc.xarm_shuidi_pb2 as aa_msg
+    server, arm_standin, client = _gen_xarm_standin(host)
+    confs = _gen_confs(n_setpoints, 7, np.random.default_rng(seed))
+    result = {"n_setpoints": n_setpoints, "chunk_size": chunk_size}
+    try:
+        client.arm_get_jnt_values()  # connect
+        # unary, the server paces its own fixed sleeps
+        arm_standin.clear_log()
+        tic = time.perf_counter()
+        client.stub.arm_move_jspace_path(aa_msg.Path(length=len(confs), njnts=confs.shape[1], data=confs.tobytes()))
+        toc = time.perf_counter()
+        servo_times = arm_standin.get_log()
+        result["unary_message_bytes"] = len(confs.tobytes())
+        result["unary_start_latency_ms"] = float((servo_times[0] - tic) * 1e3)
+        result["unary_total_time_s"] = toc - tic
+
+        # streaming
+        def _gen_chunk_msgs():
+            for start_id in range(0, len(confs), chunk_size):
+                chunk = confs[start_id:start_id + chunk_size]
+                yield aa_msg.PathChunk(start_id=start_id, length=len(chunk), njnts=chunk.shape[1],
+                                       data=chunk.tobytes(), control_frequency=control_frequency,
+                                       is_last=start_id + chunk_size >= len(confs))
+
+        arm_standin.clear_log()
+        tic = time.perf_counter()
+        progress_list = list(client.stub.arm_stream_jspace_path(_gen_chunk_msgs()))
+        toc = time.perf_counter()
+        servo_times = arm_standin.get_log()
+        result["stream_message_bytes"] = len(confs[:chunk_size].tobytes())
+        result["stream_start_latency_ms"] = float((servo_times[0] - tic) * 1e3)
+        result["stream_total_time_s"] = toc - tic
+        result["stream_n_progress"] = len(progress_list)
+        result["stream_is_done"] = bool(progress_list[-1].is_done)
+        result.update(_jitter_stats(servo_times, control_frequency, prefix="stream_jitter_ms"))
+    finally:
+        server.stop(0)
+    return result
+
+
+def _time_it(func, n_repeats=5):
+    time_list = []
+    for _ in range(n_repeats):
+        tic = time.perf_counter()
+        func()
+        time_list.append(time.perf_counter() - tic)
+    return float(np.median(time_list))
+
+
+BENCHMARKS = {"ur_command_latency": bench_ur_command_latency,
+              "ur_setpoint_throughput": bench_ur_setpoint_throughput,
+              "ur_servo_jitter": bench_ur_servo_jitter,
+              "ur_ft_stream": bench_ur_ft_stream,
+              "xarm_get_jnt_values": bench_xarm_get_jnt_values,
+              "xarm_stream_jspace_path": bench_xarm_stream_jspace_path}
+
+
+def run_benchmark(benchmark_name_list, toggle_dbg=True, **kwargs_dict):
+    """
+    :param benchmark_name_list: keys of BENCHMARKS
+    :param toggle_dbg: print the results
+    :param kwargs_dict: {benchmark_name: kwargs}, to override the default parameters
+    :return: {"results": [...], "errors": [...]}
+    """
+    for name in benchmark_name_list:
+        if name not in BENCHMARKS:
+            raise ValueError(f"Unknown benchmark {name}, available: {list(BENCHMARKS)}")
+    results = dict(results=[], errors=[])
+    for name in benchmark_name_list:
+        try:
+            result = BENCHMARKS[name](**kwargs_dict.get(name, {}))
+        except Exception as e:
+            results["errors"].append(dict(benchmark=name, error=repr(e)))
+            if toggle_dbg:
+                print(f"{name}: failed, {e!r}")
+            continue
+        result["benchmark"] = name
+        results["results"].append(result)
+        if toggle_dbg:
+            print(f"{name}: " + ", ".join(f"{key} {value:.3f}" if isinstance(value, float) else f"{key} {value}"
+                                          for key, value in result.items() if key != "benchmark"))
+    return results
+
+
+def save_json(results, file_path):
+    with open(file_path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def save_csv(results, file_path):
+    """
+    one row per (benchmark, metric)
+    """
+    with open(file_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["benchmark", "metric", "value"])
+        for result in results["results"]:
+            for key, value in result.items():
+                if key != "benchmark":
+                    writer.writerow([result["benchmark"], key, value])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks of the robot_con drivers against local stand-ins")
+    parser.add_argument("--benchmarks", nargs="+", default=list(BENCHMARKS), choices=list(BENCHMARKS))
+    parser.add_argument("--json", default=None, help="path of the json output")
+    parser.add_argument("--csv", default=None, help="path of the csv output (one row per metric)")
+    args = parser.parse_args()
+    results = run_benchmark(args.benchmarks)
+    if args.json is not None:
+        save_json(results, args.json)
+        print(f"saved to {os.path.abspath(args.json)}")
+    if args.csv is not None:
+        save_csv(results, args.csv)
+        print(f"saved to {os.path.abspath(args.csv)}")
@@ -1,7 +1,223 @@
 import logging
+import threading
+import numpy as np
 # import socket
 # import robot_con.ur3dual as ur3urx
 
+
+class FTFrameParser(object):
+    """
+    the ft300 streams ascii frames like "( 1.20 , -0.30 , ... )" through port 63351
+    a tcp recv may return a partial frame or several merged frames, so incoming bytes are buffered
+    and only complete frames between "(" and ")" are decoded
+    """
+
+    def __init__(self, n_values=6):
+        self.n_values = n_values
+        self._buffer = bytearray()
+        self.n_bad_frames = 0
+
+    def reset(self):
+        self._buffer.clear()
+        self.n_bad_frames = 0
+
+    def feed(self, data):
+        """
+        :param data: bytes received from the socket
+        :return: a kx6 nparray of the complete frames in data and in the remainder of previous calls
+        """
+        self._buffer += data
+        end = self._buffer.rfind(b")")
+        if end < 0:
+            # no complete frame yet, drop the bytes before the last "(" in case the stream is garbage
+            start = self._buffer.rfind(b"(")
+            del self._buffer[:start if start >= 0 else len(self._buffer)]
+            return np.empty((0, self.n_values))
+        complete, self._buffer = bytes(self._buffer[:end + 1]), self._buffer[end + 1:]
+        values_list = []
+        for frame in complete.split(b")"):
+            start = frame.rfind(b"(")
+            if start < 0:
+                continue
+            try:
+                values = [float(x) for x in frame[start + 1:].split(b",")]
+            except ValueError:
+                values = []
+            if len(values) != self.n_values:
+                self.n_bad_frames += 1
+                continue
+            values_list.append(values)
+        return np.array(values_list, dtype=np.float64).reshape(-1, self.n_values)
+
+
+class FTRingBuffer(object):
+    """
+    preallocated buffer of the latest ft values and their timestamps
+    every sample is written twice (at i and i+capacity), so that the latest n samples are always
+    a contiguous slice and windows are returned as views without copying
+    one writer thread is assumed; readers should copy a view if they keep it longer than
+    capacity samples
+    """
+
+    def __init__(self, capacity=10000, n_values=6):
+        self.capacity = capacity
+        self.n_values = n_values
+        self._values = np.zeros((2 * capacity, n_values))
+        self._timestamps = np.zeros(2 * capacity)
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._next_id = 0  # next write position in [0, capacity)
+            self._n_samples = 0  # number of samples since clear, not bounded by capacity
+            # running statistics (welford)
+            self._mean = np.zeros(self.n_values)
+            self._m2 = np.zeros(self.n_values)
+            self._min = np.full(self.n_values, np.inf)
+            self._max = np.full(self.n_values, -np.inf)
+
+    def __len__(self):
+        return min(self._n_samples, self.capacity)
+
+    @property
+    def n_samples(self):
+        return self._n_samples
+
+    def append(self, values_array, timestamps):
+        """
+        :param values_array: kx6 nparray
+        :param timestamps: k nparray or a float shared by all k values
+        :return:
+        """
+        values_array = np.asarray(values_array, dtype=np.float64).reshape(-1, self.n_values)
+        k = len(values_array)
+        if k == 0:
+            return
+        timestamps = np.broadcast_to(np.asarray(timestamps, dtype=np.float64), (k,))
+        batch_mean = values_array.mean(axis=0)
+        batch_m2 = ((values_array - batch_mean) ** 2).sum(axis=0)
+        batch_min, batch_max = values_array.min(axis=0), values_array.max(axis=0)
+        if k > self.capacity:
+            values_array, timestamps = values_array[-self.capacity:], timestamps[-self.capacity:]
+        with self._lock:
+            ids = (self._next_id + np.arange(len(values_array))) % self.capacity
+            self._values[ids] = values_array
+            self._values[ids + self.capacity] = values_array
+            self._timestamps[ids] = timestamps
+            self._timestamps[ids + self.capacity] = timestamps
+            self._next_id = (ids[-1] + 1) % self.capacity
+            # merge the running statistics of the batch (chan et al.)
+            n_a, n_b = self._n_samples, k
+            delta = batch_mean - self._mean
+            self._mean = self._mean + delta * n_b / (n_a + n_b)
+            self._m2 = self._m2 + batch_m2 + delta ** 2 * n_a * n_b / (n_a + n_b)
+            self._min = np.minimum(self._min, batch_min)
+            self._max = np.maximum(self._max, batch_max)
+            self._n_samples += k
+
+    def get_window(self, n=None):
+        """
+        the latest n samples in chronological order
+        :param n: all samples in the buffer if None
+        :return: (nx6 view of values, n view of timestamps)
+        """
+        with self._lock:
+            n_available = min(self._n_samples, self.capacity)
+            n = n_available if n is None else min(n, n_available)
+            end = self._next_id + self.capacity
+            return self._values[end - n:end], self._timestamps[end - n:end]
+
+    def get_window_by_time(self, duration):
+        """
+        the samples received in the last duration seconds (relative to the latest timestamp)
+        :param duration: seconds
+        :return: (nx6 view of values, n view of timestamps)
+        """
+        values, timestamps = self.get_window()
+        if len(timestamps) == 0:
+            return values, timestamps
+        start = np.searchsorted(timestamps, timestamps[-1] - duration, side='left')
+        return values[start:], timestamps[start:]
+
+    def get_latest(self):
+        """
+        :return: (1x6 nparray, timestamp), (None, None) if empty
+        """
+        values, timestamps = self.get_window(1)
+        if len(timestamps) == 0:
+            return None, None
+        return values[0].copy(), timestamps[0]
+
+    def get_stats(self):
+        """
+        running statistics of all samples since the last clear
+        :return: dict with n, mean, std, min, max
+        """
+        with self._lock:
+            n = self._n_samples
+            std = np.sqrt(self._m2 / n) if n > 0 else np.zeros(self.n_values)
+            return {"n": n, "mean": self._mean.copy(), "std": std, "min": self._min.copy(), "max": self._max.copy()}
+
+    def get_window_stats(self, n=None):
+        """
+        statistics of the latest n samples
+        :param n:
+        :return: dict with n, mean, std, min, max
+        """
+        values, _ = self.get_window(n)
+        if len(values) == 0:
+            return {"n": 0, "mean": np.zeros(self.n_values), "std": np.zeros(self.n_values),
+                    "min": np.full(self.n_values, np.nan), "max": np.full(self.n_values, np.nan)}
+        return {"n": len(values), "mean": values.mean(axis=0), "std": values.std(axis=0),
+                "min": values.min(axis=0), "max": values.max(axis=0)}
+
+
+class FTContactTrigger(object):
+    """
+    calls callback(values, timestamp) when the force (or torque) norm rises above a threshold
+    the trigger re-arms after the norm falls below threshold*rearm_ratio, avoiding repeated calls
+    while the contact persists
+    """
+
+    def __init__(self, callback, force_threshold, torque_threshold=None, offset=None, rearm_ratio=.8):
+        """
+        :param callback: function(values, timestamp), runs in the receiving thread and should return quickly
+        :param force_threshold: N
+        :param torque_threshold: Nm, not checked if None
+        :param offset: 1x6 nparray subtracted before comparison, e.g. a no-contact mean from FTRingBuffer.get_stats
+        :param rearm_ratio:
+        """
+        self.callback = callback
+        self.force_threshold = force_threshold
+        self.torque_threshold = torque_threshold
+        self.offset = np.zeros(6) if offset is None else np.asarray(offset)
+        self.rearm_ratio = rearm_ratio
+        self.is_armed = True
+
+    def check(self, values_array, timestamps):
+        """
+        :param values_array: kx6 nparray
+        :param timestamps: k nparray
+        :return: True if the callback was called
+        """
+        if len(values_array) == 0:
+            return False
+        compensated = values_array - self.offset
+        ratios = np.linalg.norm(compensated[:, :3], axis=1) / self.force_threshold
+        if self.torque_threshold is not None:
+            ratios = np.maximum(ratios, np.linalg.norm(compensated[:, 3:], axis=1) / self.torque_threshold)
+        is_triggered = False
+        for i in np.flatnonzero((ratios > 1) | (ratios < self.rearm_ratio)):
+            if ratios[i] < self.rearm_ratio:
+                self.is_armed = True
+            elif self.is_armed:
+                self.is_armed = False
+                is_triggered = True
+                self.callback(values_array[i], timestamps[i])
+        return is_triggered
+
+
 class RobotiqFT300(object):
     complete_program = ""
     header = "def myProg():" + "\n"
@@ -1,5 +1,6 @@
 import time
 import robot_con.ur.ur3_rtq85_x as u3r85x
+import robot_con.ur.ur_async_x as uax
 import robot_con.ur.program_builder as pb
 import struct
 import os
@@ -129,6 +130,18 @@ class UR3DualX(object):
         else:
             raise ValueError("Component_name must be in ['all', 'lft_arm', 'rgt_arm']!")
 
+    def gen_async_controller(self, control_frequency=.008):
+        """
+        an asyncio controller that keeps persistent connections to both arms and moves them concurrently
+        example: see ur_async_x; call and await connect once, then move_jspace_path("all", path)
+        :param control_frequency:
+        :return: ur_async_x.AsyncMultiArmController with components "lft_arm" and "rgt_arm";
+                 "all" uses 1x12 confs ordered as lft, rgt
+        """
+        link_dict = {"lft_arm": uax.AsyncURArmLink(self._lft_arm_hnd, series="cbseries", name="lft_arm"),
+                     "rgt_arm": uax.AsyncURArmLink(self._rgt_arm_hnd, series="cbseries", name="rgt_arm")}
+        return uax.AsyncMultiArmController(link_dict, control_frequency=control_frequency)
+
     def get_jnt_values(self, component_name):
         """
         get the joint angles of both arms
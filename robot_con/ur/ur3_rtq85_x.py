@@ -9,6 +9,7 @@ import threading
 import socket
 import struct
 import os
+import numpy as np
 import motion.trajectory.piecewisepoly_scl as pwp
 
 
@@ -18,20 +19,23 @@ class UR3Rtq85X(object):
     date: 20180131
     """
 
-    def __init__(self, robot_ip='10.2.0.50', pc_ip='10.2.0.100'):
+    def __init__(self, robot_ip='10.2.0.50', pc_ip='10.2.0.100', arm=None, ftsensor_port=63351):
         """
         :param robot_ip:
         :param pc_ip:
+        :param arm: an object with the interface of urrobot.URRobot (e.g. ur_standin.URStandIn),
+                    a URRobot is connected to robot_ip if None
+        :param ftsensor_port:
         """
         # setup arm
-        self._arm = urrobot.URRobot(robot_ip)
+        self._arm = urrobot.URRobot(robot_ip) if arm is None else arm
         self._arm.set_tcp((0, 0, 0, 0, 0, 0))
         self._arm.set_payload(1.28)
         # setup hand
         self._hnd = r2f.RobotiqCBTwoFinger(type='rtq85')
         # setup ftsensor
         self._ftsensor = rft.RobotiqFT300()
-        self._ftsensor_socket_addr = (robot_ip, 63351)
+        self._ftsensor_socket_addr = (robot_ip, ftsensor_port)
         self._ftsensor_urscript = self._ftsensor.get_program_to_run()
         # setup pc server
         self._pc_server_socket_addr = (pc_ip, 0)  # 0: the system finds an available port
@@ -52,8 +56,11 @@ class UR3Rtq85X(object):
         self._modern_driver_urscript = self._modern_driver_urscript.replace("parameter_jointscaler",
                                                                             str(self._jnts_scaler))
         self._ftsensor_thread = None
-        self._ftsensor_values = []
-        self.trajt = pwp.PiecewisePoly(method='quintic')
+        self._ftsensor_stop_event = threading.Event()
+        self._ftsensor_parser = rft.FTFrameParser()
+        self._ftsensor_buffer = rft.FTRingBuffer(capacity=10000)  # 100s at the 100Hz rate of ft300
+        self._ftsensor_trigger_list = []
+        self.trajt = pwp.PiecewisePolyScl(method='quintic')
 
     @property
     def arm(self):
@@ -75,6 +82,11 @@ class UR3Rtq85X(object):
         # read-only property
         return self._ftsensor_socket_addr
 
+    @property
+    def ftsensor_buffer(self):
+        # read-only property
+        return self._ftsensor_buffer
+
     @property
     def pc_server_socket_info(self):
         """
@@ -111,34 +123,93 @@ class UR3Rtq85X(object):
         """
         self._arm.send_program(self._hnd.get_program_to_run(speedpercentange, forcepercentage, fingerdistance=0))
 
-    def start_recvft(self):
+    def start_recvft(self, buffer_capacity=None):
         """
         start receive ft values using thread
         the values are in the local frame of the force sensors
         transformation is to be done by higher-level code
-        :return: [fx, fy, fz, tx, ty, tz] in N and Nm
+        values are stored in [fx, fy, fz, tx, ty, tz] (N and Nm) in a preallocated ring buffer,
+        see get_ftsensor_values and ftsensor_buffer; frames received in one recv share the same timestamp
+        :param buffer_capacity: number of latest samples to keep, the previous capacity is used if None
+        :return:
         """
+        if self._ftsensor_thread is not None and self._ftsensor_thread.is_alive():
+            print("The ft sensor is already being received!")
+            return
+        if buffer_capacity is not None and buffer_capacity != self._ftsensor_buffer.capacity:
+            self._ftsensor_buffer = rft.FTRingBuffer(capacity=buffer_capacity)
+        self._ftsensor_stop_event.clear()
+        self._ftsensor_parser.reset()
+
         def recvft():
             self._arm.send_program(self._ftsensor_urscript)
             ftsocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            ftsocket.settimeout(.5)  # wake up regularly to check the stop event
             ftsocket.connect(self._ftsensor_socket_addr)
-            while True:
-                ftdata = ftsocket.recv(1024)
-                ftdata = ftdata.decode()
-                ftdata = ftdata.strip('()')
-                self._ftsensor_values.append([float(x) for x in ftdata.split(',')])
+            try:
+                while not self._ftsensor_stop_event.is_set():
+                    try:
+                        ftdata = ftsocket.recv(4096)
+                    except socket.timeout:
+                        continue
+                    if len(ftdata) == 0:
+                        print("The ft sensor socket is closed by the robot!")
+                        break
+                    values_array = self._ftsensor_parser.feed(ftdata)
+                    if len(values_array) == 0:
+                        continue
+                    timestamps = np.full(len(values_array), time.time())
+                    self._ftsensor_buffer.append(values_array, timestamps)
+                    for trigger in self._ftsensor_trigger_list:
+                        trigger.check(values_array, timestamps)
+            finally:
+                ftsocket.close()
 
-        self._ftsensor_thread = threading.Thread(target=recvft, name="threadft")
+        self._ftsensor_thread = threading.Thread(target=recvft, name="threadft", daemon=True)
         self._ftsensor_thread.start()
 
     def stop_recvft(self):
+        if self._ftsensor_thread is None:
+            return
+        self._ftsensor_stop_event.set()
         self._ftsensor_thread.join()
+        self._ftsensor_thread = None
 
     def reset_ftsensor(self):
         pass
 
     def clear_ftsensor_values(self):
-        self._ftsensor_values = []
+        self._ftsensor_buffer.clear()
+
+    def get_ftsensor_values(self, n=None, duration=None):
+        """
+        the latest ft values, the returned arrays are views of the ring buffer (no copy)
+        :param n: number of latest samples, all if both n and duration are None
+        :param duration: seconds, used if n is None
+        :return: (nx6 nparray, n nparray of timestamps)
+        """
+        if n is None and duration is not None:
+            return self._ftsensor_buffer.get_window_by_time(duration)
+        return self._ftsensor_buffer.get_window(n)
+
+    def add_contact_trigger(self, callback, force_threshold, torque_threshold=None, offset=None):
+        """
+        call callback(values, timestamp) in the receiving thread when the ft norm exceeds the thresholds
+        :param callback:
+        :param force_threshold: N
+        :param torque_threshold: Nm
+        :param offset: 1x6, subtracted before comparison, the running mean is used if None
+        :return: the trigger, to be passed to remove_contact_trigger
+        """
+        if offset is None and self._ftsensor_buffer.n_samples > 0:
+            offset = self._ftsensor_buffer.get_stats()["mean"]
+        trigger = rft.FTContactTrigger(callback, force_threshold, torque_threshold=torque_threshold, offset=offset)
+        # replace instead of append so that the receiving thread iterates over a consistent list
+        self._ftsensor_trigger_list = self._ftsensor_trigger_list + [trigger]
+        return trigger
+
+    def remove_contact_trigger(self, trigger):
+        self._ftsensor_trigger_list = [item for item in self._ftsensor_trigger_list if item is not trigger]
 
     def move_jnts(self, jnt_values, wait=True):
         """
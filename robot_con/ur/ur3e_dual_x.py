@@ -5,6 +5,7 @@ import struct
 import numpy as np
 import robot_con.ur.program_builder as pb
 import robot_con.ur.ur3e_rtqhe_x as u3erhex
+import robot_con.ur.ur_async_x as uax
 
 class Ur3EDualUrx(object):
     """
@@ -110,6 +111,18 @@ class Ur3EDualUrx(object):
         else:
             raise ValueError("Component_name must be in ['all', 'lft_arm', 'rgt_arm']!")
 
+    def gen_async_controller(self, control_frequency=.008):
+        """
+        an asyncio controller that keeps persistent connections to both arms and moves them concurrently
+        example: see ur_async_x; call and await connect once, then move_jspace_path("all", path)
+        :param control_frequency:
+        :return: ur_async_x.AsyncMultiArmController with components "lft_arm" and "rgt_arm";
+                 "all" uses 1x12 confs ordered as lft, rgt
+        """
+        link_dict = {"lft_arm": uax.AsyncURArmLink(self._lft_arm_hnd, series="eseries", name="lft_arm"),
+                     "rgt_arm": uax.AsyncURArmLink(self._rgt_arm_hnd, series="eseries", name="rgt_arm")}
+        return uax.AsyncMultiArmController(link_dict, control_frequency=control_frequency)
+
     def get_jnt_values(self, component_name):
         """
         get the joint angles of both arms
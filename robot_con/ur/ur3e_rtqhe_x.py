@@ -18,13 +18,15 @@ class UR3ERtqHE():
     date: 20180131, 20210401osaka
     """
 
-    def __init__(self, robot_ip='10.2.0.50', pc_ip='10.2.0.91'):
+    def __init__(self, robot_ip='10.2.0.50', pc_ip='10.2.0.91', arm=None):
         """
         :param robot_ip:
         :param pc_ip:
+        :param arm: an object with the interface of urrobot.URRobot (e.g. ur_standin.URStandIn),
+                    a URRobot is connected to robot_ip if None
         """
         # setup arm
-        self._arm = urrobot.URRobot(robot_ip)
+        self._arm = urrobot.URRobot(robot_ip) if arm is None else arm
         self._arm.set_tcp((0, 0, 0, 0, 0, 0))
         self._arm.set_payload(1.0)
         # setup hand
@@ -59,6 +61,14 @@ class UR3ERtqHE():
         # read-only property
         return self._arm
 
+    @property
+    def pc_server_socket(self):
+        return self._pc_server_socket
+
+    @property
+    def jnts_scaler(self):
+        return self._jointscaler
+
     @property
     def ftsensor_urscript(self):
         # read-only property
@@ -0,0 +1,258 @@
+"""
+Asyncio command dispatch for multiple UR arms
+Each arm runs moderndriver_*_persistent.script, which keeps its connection to the pc server open and executes
+one trajectory after another, replying "done" after the last conf of each trajectory.
+Trajectories are sent to several arms in the same event loop iteration, so the arms start together
+without waiting for each other's handshakes.
+"""
+import os
+import time
+import socket
+import asyncio
+import numpy as np
+import robot_con.ur.program_builder as pb
+import motion.trajectory.piecewisepoly_topp as pwp
+
+# keepalive flags of the persistent driver scripts
+KEEPALIVE_CONTINUE = 1
+KEEPALIVE_END = 0
+KEEPALIVE_CLOSE = -1
+
+
+def pack_confs(interpolated_confs, jnts_scaler):
+    """
+    pack the confs of one trajectory into the binary frames read by the driver scripts
+    :param interpolated_confs: nx6 array in radian
+    :param jnts_scaler:
+    :return: bytes, n frames of 7 big-endian int32 (6 scaled joint values and keepalive)
+    """
+    interpolated_confs = np.asarray(interpolated_confs, dtype=np.float64).reshape(-1, 6)
+    frames = np.empty((len(interpolated_confs), 7), dtype='>i4')
+    frames[:, :6] = (interpolated_confs * jnts_scaler).astype(np.int64)
+    frames[:, 6] = KEEPALIVE_CONTINUE
+    frames[-1, 6] = KEEPALIVE_END
+    return frames.tobytes()
+
+
+def gen_persistent_urscript(pc_server_socket, jnts_scaler, series="cbseries"):
+    """
+    :param pc_server_socket: the listening socket that the arm connects to
+    :param jnts_scaler:
+    :param series: "cbseries" or "eseries"
+    :return:
+    """
+    if series not in ["cbseries", "eseries"]:
+        raise ValueError("Series must be in ['cbseries', 'eseries']!")
+    program_builder = pb.ProgramBuilder()
+    program_builder.load_prog(os.path.join(os.path.dirname(__file__),
+                                           "urscripts_%s/moderndriver_%s_persistent.script" % (series, series)))
+    urscript = program_builder.get_program_to_run()
+    urscript = urscript.replace("parameter_ip", pc_server_socket.getsockname()[0])
+    urscript = urscript.replace("parameter_port", str(pc_server_socket.getsockname()[1]))
+    urscript = urscript.replace("parameter_jointscaler", str(jnts_scaler))
+    return urscript
+
+
+class AsyncURArmLink(object):
+    """
+    a persistent connection to one arm
+    """
+
+    def __init__(self, arm_x, series="cbseries", name="arm"):
+        """
+        :param arm_x: a driver with arm (urx robot), pc_server_socket, jnts_scaler, and get_jnt_values,
+                      e.g. ur3_rtq85_x.UR3Rtq85X or ur3e_rtqhe_x.UR3ERtqHE
+        :param series: "cbseries" or "eseries"
+        :param name:
+        """
+        self.arm_x = arm_x
+        self.name = name
+        self._urscript = gen_persistent_urscript(arm_x.pc_server_socket, arm_x.jnts_scaler, series=series)
+        self._reader = None
+        self._writer = None
+        self._feedback_task = None
+        self._pending_list = []  # [(future, n_confs, send_time), ...] in the order of sending
+
+    @property
+    def is_connected(self):
+        return self._writer is not None
+
+    @property
+    def n_pending(self):
+        return len(self._pending_list)
+
+    async def connect(self, timeout=10.0):
+        """
+        upload the persistent driver script and accept the connection from the arm
+        :param timeout: seconds
+        :return:
+        """
+        if self.is_connected:
+            return
+        loop = asyncio.get_running_loop()
+        server_socket = self.arm_x.pc_server_socket
+        await loop.run_in_executor(None, self.arm_x.arm.send_program, self._urscript)
+        # the blocking methods of arm_x share the server socket, restore it after accepting
+        server_socket.setblocking(False)
+        try:
+            arm_socket, arm_socket_addr = await asyncio.wait_for(loop.sock_accept(server_socket), timeout)
+        finally:
+            server_socket.setblocking(True)
+        arm_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        print("PC server connected by ", self.name, arm_socket_addr)
+        self._reader, self._writer = await asyncio.open_connection(sock=arm_socket)
+        self._feedback_task = asyncio.create_task(self._recv_feedback())
+
+    async def _recv_feedback(self):
+        """
+        resolve the pending futures in order as "done" lines arrive
+        """
+        try:
+            while True:
+                line = await self._reader.readline()
+                if len(line) == 0:
+                    raise ConnectionError("The connection to %s is closed by the robot!" % self.name)
+                if line.strip() != b"done" or len(self._pending_list) == 0:
+                    continue
+                future, n_confs, send_time = self._pending_list.pop(0)
+                if not future.done():
+                    future.set_result({"name": self.name,
+                                       "n_confs": n_confs,
+                                       "elapsed_time": time.perf_counter() - send_time})
+        except Exception as e:
+            for future, _, _ in self._pending_list:
+                if not future.done():
+                    future.set_exception(e)
+            self._pending_list = []
+
+    def write_confs(self, interpolated_confs):
+        """
+        write one trajectory without waiting, use drain to wait for the socket buffer
+        :param interpolated_confs: nx6 array
+        :return: a future resolved with {"name", "n_confs", "elapsed_time"} when the arm finishes
+        """
+        if not self.is_connected:
+            raise ValueError("%s is not connected, call connect first!" % self.name)
+        future = asyncio.get_running_loop().create_future()
+        self._pending_list.append((future, len(interpolated_confs), time.perf_counter()))
+        self._writer.write(pack_confs(interpolated_confs, self.arm_x.jnts_scaler))
+        return future
+
+    async def drain(self):
+        await self._writer.drain()
+
+    async def send_confs(self, interpolated_confs):
+        future = self.write_confs(interpolated_confs)
+        await self.drain()
+        return future
+
+    async def get_jnt_values(self):
+        return await asyncio.get_running_loop().run_in_executor(None, self.arm_x.get_jnt_values)
+
+    async def close(self):
+        """
+        ask the driver script to exit and close the connection
+        """
+        if not self.is_connected:
+            return
+        frame = np.zeros(7, dtype='>i4')
+        frame[6] = KEEPALIVE_CLOSE
+        self._writer.write(frame.tobytes())
+        await self._writer.drain()
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._feedback_task.cancel()
+        self._reader, self._writer, self._feedback_task = None, None, None
+
+
+class AsyncMultiArmController(object):
+    """
+    dispatch trajectories to several arms concurrently
+    """
+
+    def __init__(self, link_dict, control_frequency=.008):
+        """
+        :param link_dict: {component_name: AsyncURArmLink}, the order defines the layout of stacked confs
+        :param control_frequency: the sampling interval (seconds) of the driver script
+        """
+        self.link_dict = link_dict
+        self.control_frequency = control_frequency
+        self.trajt = pwp.PiecewisePolyTOPP()
+
+    def _get_links(self, component_name):
+        if component_name == "all":
+            return list(self.link_dict.values())
+        if component_name in self.link_dict:
+            return [self.link_dict[component_name]]
+        raise ValueError("Component_name must be in %s!" % (["all"] + list(self.link_dict.keys())))
+
+    async def connect(self, timeout=10.0):
+        await asyncio.gather(*[link.connect(timeout=timeout) for link in self.link_dict.values()])
+
+    async def close(self):
+        await asyncio.gather(*[link.close() for link in self.link_dict.values()])
+
+    def interpolate(self, path, max_vels=None, max_accs=None):
+        """
+        time-parameterize a path of stacked confs, so that all arms share one timing
+        :param path: a list of 1x(6*n_arms) arrays
+        :param max_vels:
+        :param max_accs:
+        :return: nx(6*n_arms) nparray
+        """
+        return self.trajt.interpolate_by_max_spdacc(path=[np.asarray(conf) for conf in path],
+                                                    control_frequency=self.control_frequency,
+                                                    max_vels=max_vels,
+                                                    max_accs=max_accs)
+
+    async def dispatch_confs(self, component_name, interpolated_confs):
+        """
+        send interpolated confs to the arms of component_name; the trajectories of all arms are written
+        in the same event loop iteration before any drain, so that none of them waits for another
+        :param component_name: "all" or a key of link_dict
+        :param interpolated_confs: nx6 or nx(6*n_arms) array
+        :return: a future resolved with the list of completion results of all arms
+        """
+        links = self._get_links(component_name)
+        interpolated_confs = np.asarray(interpolated_confs)
+        if interpolated_confs.shape[1] != 6 * len(links):
+            raise ValueError("The confs must have %d columns for %s!" % (6 * len(links), component_name))
+        futures = [link.write_confs(interpolated_confs[:, 6 * i:6 * i + 6]) for i, link in enumerate(links)]
+        await asyncio.gather(*[link.drain() for link in links])
+        return asyncio.gather(*futures)
+
+    async def move_jspace_path(self, component_name, path, max_vels=None, max_accs=None, wait=True):
+        """
+        :param component_name: "all" or a key of link_dict
+        :param path: a list of 1x6 or 1x(6*n_arms) arrays, depending on component_name
+        :param max_vels:
+        :param max_accs:
+        :param wait: return the completion results if True, else the completion future
+        :return:
+        """
+        interpolated_confs = self.interpolate(path, max_vels=max_vels, max_accs=max_accs)
+        completion = await self.dispatch_confs(component_name, interpolated_confs)
+        if wait:
+            return await completion
+        return completion
+
+    async def move_jnts(self, component_name, jnt_values, max_vels=None, max_accs=None, wait=True):
+        """
+        move from the current joint values to jnt_values
+        :param component_name:
+        :param jnt_values: 1x6 or 1x(6*n_arms) array, depending on component_name
+        :return:
+        """
+        start_jnt_values = await self.get_jnt_values(component_name)
+        return await self.move_jspace_path(component_name, [start_jnt_values, np.asarray(jnt_values)],
+                                           max_vels=max_vels, max_accs=max_accs, wait=wait)
+
+    async def get_jnt_values(self, component_name):
+        """
+        :return: 1x6 or 1x(6*n_arms) nparray, the arms are queried concurrently
+        """
+        jnt_values_list = await asyncio.gather(*[link.get_jnt_values() for link in self._get_links(component_name)])
+        return np.concatenate([np.asarray(jnt_values) for jnt_values in jnt_values_list])
@@ -0,0 +1,206 @@
+"""
+Local stand-ins of a UR controller for running the drivers in robot_con.ur without hardware
+URStandIn replaces urrobot.URRobot (pass it as the arm of ur3_rtq85_x.UR3Rtq85X or ur3e_rtqhe_x.UR3ERtqHE):
+the driver scripts uploaded by send_program are not interpreted, instead the stand-in plays the robot side of
+their socket protocol (connect to the pc server, read 7-int frames, reply "done" for the persistent scripts).
+FT300StandIn serves the ascii stream of the robotiq ft300 urcap.
+usage:
+    ft = FT300StandIn(rate=100)
+    arm_x = ur3_rtq85_x.UR3Rtq85X(robot_ip="127.0.0.1", pc_ip="127.0.0.1", arm=URStandIn(),
+                                  ftsensor_port=ft.port)
+"""
+import re
+import time
+import socket
+import struct
+import threading
+import numpy as np
+
+
+class URStandIn(object):
+    """
+    the subset of urrobot.URRobot used by the drivers
+    setpoints are executed on a fixed clock of servo_time seconds, like servoj, or as fast as they arrive if
+    servo_time is 0; every executed setpoint is logged with its receiving and execution time
+    """
+
+    def __init__(self, robot_s=None, init_jnt_values=None, servo_time=.008):
+        """
+        :param robot_s: a robot_sim manipulator or robot, moved to every executed setpoint if given
+        :param init_jnt_values: zeros if None
+        :param servo_time: seconds per setpoint, 0 to execute without waiting
+        """
+        self.robot_s = robot_s
+        self.servo_time = servo_time
+        self._jnt_values = np.zeros(6) if init_jnt_values is None else np.asarray(init_jnt_values, dtype=float)
+        self._lock = threading.Lock()
+        self._driver_thread_list = []
+        self.program_list = []  # (time, program) of every send_program call
+        self.clear_log()
+
+    def clear_log(self):
+        with self._lock:
+            self.recv_time_list = []
+            self.exec_time_list = []
+            self.n_out_of_range = 0
+
+    def get_log(self):
+        """
+        :return: recv times and execution times of the executed setpoints (nparrays)
+        """
+        with self._lock:
+            return np.array(self.recv_time_list), np.array(self.exec_time_list)
+
+    def set_tcp(self, tcp):
+        pass
+
+    def set_payload(self, weight, cog=None):
+        pass
+
+    def getj(self):
+        with self._lock:
+            return self._jnt_values.tolist()
+
+    def movej(self, jnt_values, acc=.1, vel=.05, wait=True, **kwargs):
+        self._goto(np.asarray(jnt_values, dtype=float))
+
+    def send_program(self, prog):
+        """
+        driver scripts (those reading binary integers from a socket) are played by a thread,
+        other programs (grippers, ft sensors) are only logged
+        :param prog: urscript
+        :return:
+        """
+        self.program_list.append((time.perf_counter(), prog))
+        if "socket_read_binary_integer" not in prog:
+            return
+        address = re.search(r'socket_open\("([^"]+)",\s*(\d+)\)', prog)
+        jnts_scaler = re.search(r'params_mult\[1\]/([0-9.e+]+)', prog)
+        if address is None or jnts_scaler is None:
+            raise ValueError("Cannot find the pc server address or the joint scaler in the given program!")
+        thread = threading.Thread(target=self._run_driver,
+                                  args=((address.group(1), int(address.group(2))),
+                                        float(jnts_scaler.group(1)),
+                                        "keepalive >= 0" in prog),
+                                  daemon=True)
+        self._driver_thread_list = [item for item in self._driver_thread_list if item.is_alive()] + [thread]
+        thread.start()
+
+    def wait_for_programs(self, timeout=None):
+        for thread in self._driver_thread_list:
+            thread.join(timeout)
+
+    def _goto(self, jnt_values):
+        with self._lock:
+            self._jnt_values = jnt_values
+        if self.robot_s is not None:
+            if not self.robot_s.are_jnts_in_ranges(jnt_values):
+                self.n_out_of_range += 1
+            self.robot_s.goto_given_conf(jnt_values=jnt_values)
+
+    def _run_driver(self, pc_server_addr, jnts_scaler, is_persistent):
+        """
+        the robot side of moderndriver_*.script (is_persistent=False) and moderndriver_*_persistent.script
+        """
+        arm_socket = socket.create_connection(pc_server_addr)
+        arm_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        reader = arm_socket.makefile("rb")
+        next_time = None
+        try:
+            while True:
+                frame = reader.read(28)
+                if len(frame) < 28:
+                    break
+                recv_time = time.perf_counter()
+                params = struct.unpack("!7i", frame)
+                keepalive = params[6]
+                if keepalive < 0:
+                    break
+                if self.servo_time > 0:
+                    # fixed clock, restarted when the stream underruns
+                    if next_time is None or next_time < recv_time - self.servo_time:
+                        next_time = recv_time
+                    sleep_time = next_time - time.perf_counter()
+                    if sleep_time > 0:
+                        time.sleep(sleep_time)
+                    next_time += self.servo_time
+                self._goto(np.array(params[:6]) / jnts_scaler)
+                with self._lock:
+                    self.recv_time_list.append(recv_time)
+                    self.exec_time_list.append(time.perf_counter())
+                if keepalive == 0:
+                    next_time = None
+                    if not is_persistent:
+                        break
+                    arm_socket.sendall(b"done\n")
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            reader.close()
+            arm_socket.close()
+
+
+class FT300StandIn(object):
+    """
+    serves "( fx , fy , fz , tx , ty , tz )" frames like the ft300 urcap on port 63351
+    the send time (time.time, the clock of the timestamps in UR3Rtq85X.ftsensor_buffer) of every frame is logged
+    so that the latency of a reader can be measured
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, rate=100.0, noise=.05, seed=0):
+        """
+        :param host:
+        :param port: 0 lets the system choose, see the port attribute
+        :param rate: frames per second, None to send as fast as possible
+        :param noise: std of the gaussian noise added to every value
+        :param seed:
+        """
+        self.rate = rate
+        self.noise = noise
+        self.wrench = np.zeros(6)  # set to emulate a contact
+        self._rng = np.random.default_rng(seed)
+        self._server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server_socket.bind((host, port))
+        self._server_socket.listen(1)
+        self.host, self.port = self._server_socket.getsockname()
+        self.send_time_list = []
+        self._n_frames = None
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def limit_frames(self, n_frames):
+        """
+        close the connection after n_frames frames, None to stream until stop
+        """
+        self._n_frames = n_frames
+
+    def _serve(self):
+        while not self._stop_event.is_set():
+            try:
+                client_socket, _ = self._server_socket.accept()
+            except OSError:
+                return
+            next_time = time.perf_counter()
+            try:
+                while not self._stop_event.is_set():
+                    if self._n_frames is not None and len(self.send_time_list) >= self._n_frames:
+                        break
+                    values = self.wrench + self._rng.normal(0, self.noise, 6)
+                    frame = "( " + " , ".join("%.2f" % value for value in values) + " )"
+                    client_socket.sendall(frame.encode())
+                    self.send_time_list.append(time.time())
+                    if self.rate is not None:
+                        next_time += 1.0 / self.rate
+                        sleep_time = next_time - time.perf_counter()
+                        if sleep_time > 0:
+                            time.sleep(sleep_time)
+            except (ConnectionError, OSError):
+                pass
+            finally:
+                client_socket.close()
+
+    def stop(self):
+        self._stop_event.set()
+        self._server_socket.close()
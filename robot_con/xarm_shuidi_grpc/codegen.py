@@ -1,12 +1,14 @@
-from grpc.tools import protoc
-
+import os
+from grpc_tools import protoc
 
+# generated from the root of the repository, so that the pb2_grpc module imports the pb2 module by package
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
 protoc.main(
     (
         '',
-        '-I.',
-        '--python_out=.',
-        '--grpc_python_out=.',
-        './xarm_shuidi_grpc.proto',
+        f'-I{root_dir}',
+        f'--python_out={root_dir}',
+        f'--grpc_python_out={root_dir}',
+        os.path.join(root_dir, 'robot_con/xarm_shuidi_grpc/xarm_shuidi.proto'),
     )
-)
\ No newline at end of file
+)
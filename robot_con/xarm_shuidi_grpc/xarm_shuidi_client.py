@@ -2,9 +2,14 @@ import grpc
 import math
 import time
 import numpy as np
+import basis.utils as bu
 import robot_con.xarm_shuidi_grpc.xarm_shuidi_pb2 as aa_msg
 import robot_con.xarm_shuidi_grpc.xarm_shuidi_pb2_grpc as aa_rpc
-import motion.trajectory.piecewisepoly_toppra as pwp
+import motion.trajectory.piecewisepoly_topp as pwp_topp
+import motion.trajectory.streaming as trs
+
+# toppra is only needed by arm_move_jspace_path
+pwp = bu.lazy_import("motion.trajectory.piecewisepoly_toppra")
 
 
 class XArmShuidiClient(object):
@@ -66,6 +71,57 @@ class XArmShuidiClient(object):
         else:
             print("The rbt_s has finished the given motion.")
 
+    def arm_stream_jspace_path(self,
+                               path,
+                               max_jntvel=None,
+                               max_jntacc=None,
+                               control_frequency=.005,
+                               chunk_size=64,
+                               progress_callback=None):
+        """
+        stream the interpolated path in chunks, the setpoints of a chunk are evaluated only when it is sent,
+        and the robot starts moving after the first chunk arrives
+        :param path: [jnt_values0, jnt_values1, ...], results of motion planning
+        :param max_jntvel: max joint speeds, math.pi*2/3 if None
+        :param max_jntacc: max joint accelerations, math.pi if None
+        :param control_frequency: seconds between setpoints
+        :param chunk_size: number of setpoints per message
+        :param progress_callback: function(n_received, n_executed), called when the server reports progress
+        :return: the number of executed setpoints
+        """
+        if not path or path is None:
+            raise ValueError("The given is incorrect!")
+        segment = pwp_topp.PiecewisePolyTOPP().fit(path=[np.asarray(jnt_values) for jnt_values in path],
+                                                   max_vels=max_jntvel,
+                                                   max_accs=max_jntacc)
+        stream = trs.TrajectoryStream(segment, control_frequency=control_frequency, chunk_size=chunk_size)
+
+        def _gen_chunk_msgs():
+            start_id = 0
+            chunks = stream.gen_chunks()
+            chunk = next(chunks, None)
+            while chunk is not None:
+                next_chunk = next(chunks, None)
+                confs = np.ascontiguousarray(chunk[1], dtype=np.float64)
+                yield aa_msg.PathChunk(start_id=start_id,
+                                       length=len(confs),
+                                       njnts=confs.shape[1],
+                                       data=confs.tobytes(),
+                                       control_frequency=control_frequency,
+                                       is_last=next_chunk is None)
+                start_id += len(confs)
+                chunk = next_chunk
+
+        progress = None
+        for progress in self.stub.arm_stream_jspace_path(_gen_chunk_msgs()):
+            if progress_callback is not None:
+                progress_callback(progress.n_received, progress.n_executed)
+        if progress is None or not progress.is_done:
+            print("Something went wrong with the server!! Try again!")
+            raise Exception()
+        print("The rbt_s has finished the given motion.")
+        return progress.n_executed
+
     def arm_get_jawwidth(self):
         gripper_msg = self.stub.arm_get_gripper_status(aa_msg.Empty())
         return (gripper_msg.position + 10) / 860 * .085
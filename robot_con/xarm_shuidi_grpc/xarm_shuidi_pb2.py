@@ -1,11 +1,22 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
-# source: xarm_shuidi_grpc.proto
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: robot_con/xarm_shuidi_grpc/xarm_shuidi.proto
+# Protobuf Python Version: 7.35.1
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
 from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'robot_con/xarm_shuidi_grpc/xarm_shuidi.proto'
+)
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
@@ -13,373 +24,31 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor.FileDescriptor(
-  name='xarm_shuidi_grpc.proto',
-  package='',
-  syntax='proto3',
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\x11xarm_shuidi.proto\"\x07\n\x05\x45mpty\"P\n\x06Status\x12\"\n\x05value\x18\x01 \x01(\x0e\x32\x13.Status.StatusValue\"\"\n\x0bStatusValue\x12\t\n\x05\x45RROR\x10\x00\x12\x08\n\x04\x44ONE\x10\x01\"\x19\n\tJntValues\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\"3\n\x04Path\x12\x0e\n\x06length\x18\x01 \x01(\x05\x12\r\n\x05njnts\x18\x02 \x01(\x05\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c\"0\n\rGripperStatus\x12\r\n\x05speed\x18\x01 \x01(\x05\x12\x10\n\x08position\x18\x02 \x01(\x05\":\n\x05Speed\x12\x17\n\x0flinear_velocity\x18\x01 \x01(\x02\x12\x18\n\x10\x61ngular_velocity\x18\x02 \x01(\x02\x32\xde\x01\n\nXArmShuidi\x12(\n\x14\x61rm_move_jspace_path\x12\x05.Path\x1a\x07.Status\"\x00\x12*\n\x12\x61rm_get_jnt_values\x12\x06.Empty\x1a\n.JntValues\"\x00\x12\'\n\narm_jaw_to\x12\x0e.GripperStatus\x1a\x07.Status\"\x00\x12\x32\n\x16\x61rm_get_gripper_status\x12\x06.Empty\x1a\x0e.GripperStatus\"\x00\x12\x1d\n\x08\x61gv_move\x12\x06.Speed\x1a\x07.Status\"\x00\x62\x06proto3'
-)
-
-
-
-_STATUS_STATUSVALUE = _descriptor.EnumDescriptor(
-  name='StatusValue',
-  full_name='Status.StatusValue',
-  filename=None,
-  file=DESCRIPTOR,
-  create_key=_descriptor._internal_create_key,
-  values=[
-    _descriptor.EnumValueDescriptor(
-      name='ERROR', index=0, number=0,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='DONE', index=1, number=1,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-  ],
-  containing_type=None,
-  serialized_options=None,
-  serialized_start=76,
-  serialized_end=110,
-)
-_sym_db.RegisterEnumDescriptor(_STATUS_STATUSVALUE)
-
-
-_EMPTY = _descriptor.Descriptor(
-  name='Empty',
-  full_name='Empty',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=21,
-  serialized_end=28,
-)
-
-
-_STATUS = _descriptor.Descriptor(
-  name='Status',
-  full_name='Status',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='value', full_name='Status.value', index=0,
-      number=1, type=14, cpp_type=8, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-    _STATUS_STATUSVALUE,
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=30,
-  serialized_end=110,
-)
-
-
-_JNTVALUES = _descriptor.Descriptor(
-  name='JntValues',
-  full_name='JntValues',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='data', full_name='JntValues.data', index=0,
-      number=1, type=12, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"",
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=112,
-  serialized_end=137,
-)
-
-
-_PATH = _descriptor.Descriptor(
-  name='Path',
-  full_name='Path',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='axis_length', full_name='Path.axis_length', index=0,
-      number=1, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='n_jnts', full_name='Path.n_jnts', index=1,
-      number=2, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='data', full_name='Path.data', index=2,
-      number=3, type=12, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"",
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=139,
-  serialized_end=190,
-)
-
-
-_GRIPPERSTATUS = _descriptor.Descriptor(
-  name='GripperStatus',
-  full_name='GripperStatus',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='speed', full_name='GripperStatus.speed', index=0,
-      number=1, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='position', full_name='GripperStatus.position', index=1,
-      number=2, type=5, cpp_type=1, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=192,
-  serialized_end=240,
-)
-
-
-_SPEED = _descriptor.Descriptor(
-  name='Speed',
-  full_name='Speed',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='linear_velocity', full_name='Speed.linear_velocity', index=0,
-      number=1, type=2, cpp_type=6, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='angular_velocity', full_name='Speed.angular_velocity', index=1,
-      number=2, type=2, cpp_type=6, label=1,
-      has_default_value=False, default_value=float(0),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=242,
-  serialized_end=300,
-)
-
-_STATUS.fields_by_name['value'].enum_type = _STATUS_STATUSVALUE
-_STATUS_STATUSVALUE.containing_type = _STATUS
-DESCRIPTOR.message_types_by_name['Empty'] = _EMPTY
-DESCRIPTOR.message_types_by_name['Status'] = _STATUS
-DESCRIPTOR.message_types_by_name['JntValues'] = _JNTVALUES
-DESCRIPTOR.message_types_by_name['Path'] = _PATH
-DESCRIPTOR.message_types_by_name['GripperStatus'] = _GRIPPERSTATUS
-DESCRIPTOR.message_types_by_name['Speed'] = _SPEED
-_sym_db.RegisterFileDescriptor(DESCRIPTOR)
-
-Empty = _reflection.GeneratedProtocolMessageType('Empty', (_message.Message,), {
-  'DESCRIPTOR' : _EMPTY,
-  '__module__' : 'xarm_shuidi_pb2'
-  # @@protoc_insertion_point(class_scope:Empty)
-  })
-_sym_db.RegisterMessage(Empty)
-
-Status = _reflection.GeneratedProtocolMessageType('Status', (_message.Message,), {
-  'DESCRIPTOR' : _STATUS,
-  '__module__' : 'xarm_shuidi_pb2'
-  # @@protoc_insertion_point(class_scope:Status)
-  })
-_sym_db.RegisterMessage(Status)
-
-JntValues = _reflection.GeneratedProtocolMessageType('JntValues', (_message.Message,), {
-  'DESCRIPTOR' : _JNTVALUES,
-  '__module__' : 'xarm_shuidi_pb2'
-  # @@protoc_insertion_point(class_scope:JntValues)
-  })
-_sym_db.RegisterMessage(JntValues)
-
-Path = _reflection.GeneratedProtocolMessageType('Path', (_message.Message,), {
-  'DESCRIPTOR' : _PATH,
-  '__module__' : 'xarm_shuidi_pb2'
-  # @@protoc_insertion_point(class_scope:Path)
-  })
-_sym_db.RegisterMessage(Path)
-
-GripperStatus = _reflection.GeneratedProtocolMessageType('GripperStatus', (_message.Message,), {
-  'DESCRIPTOR' : _GRIPPERSTATUS,
-  '__module__' : 'xarm_shuidi_pb2'
-  # @@protoc_insertion_point(class_scope:GripperStatus)
-  })
-_sym_db.RegisterMessage(GripperStatus)
-
-Speed = _reflection.GeneratedProtocolMessageType('Speed', (_message.Message,), {
-  'DESCRIPTOR' : _SPEED,
-  '__module__' : 'xarm_shuidi_pb2'
-  # @@protoc_insertion_point(class_scope:Speed)
-  })
-_sym_db.RegisterMessage(Speed)
-
-
-
-_XARMSHUIDI = _descriptor.ServiceDescriptor(
-  name='XArmShuidi',
-  full_name='XArmShuidi',
-  file=DESCRIPTOR,
-  index=0,
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_start=303,
-  serialized_end=525,
-  methods=[
-  _descriptor.MethodDescriptor(
-    name='arm_move_jspace_path',
-    full_name='XArmShuidi.arm_move_jspace_path',
-    index=0,
-    containing_service=None,
-    input_type=_PATH,
-    output_type=_STATUS,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='arm_get_jnt_values',
-    full_name='XArmShuidi.arm_get_jnt_values',
-    index=1,
-    containing_service=None,
-    input_type=_EMPTY,
-    output_type=_JNTVALUES,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='arm_jaw_to',
-    full_name='XArmShuidi.arm_jaw_to',
-    index=2,
-    containing_service=None,
-    input_type=_GRIPPERSTATUS,
-    output_type=_STATUS,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='arm_get_gripper_status',
-    full_name='XArmShuidi.arm_get_gripper_status',
-    index=3,
-    containing_service=None,
-    input_type=_EMPTY,
-    output_type=_GRIPPERSTATUS,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='agv_move',
-    full_name='XArmShuidi.agv_move',
-    index=4,
-    containing_service=None,
-    input_type=_SPEED,
-    output_type=_STATUS,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-])
-_sym_db.RegisterServiceDescriptor(_XARMSHUIDI)
-
-DESCRIPTOR.services_by_name['XArmShuidi'] = _XARMSHUIDI
-
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n,robot_con/xarm_shuidi_grpc/xarm_shuidi.proto\x12\x0bxarm_shuidi\"\x07\n\x05\x45mpty\"\\\n\x06Status\x12.\n\x05value\x18\x01 \x01(\x0e\x32\x1f.xarm_shuidi.Status.StatusValue\"\"\n\x0bStatusValue\x12\t\n\x05\x45RROR\x10\x00\x12\x08\n\x04\x44ONE\x10\x01\"\x19\n\tJntValues\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\"3\n\x04Path\x12\x0e\n\x06length\x18\x01 \x01(\x05\x12\r\n\x05njnts\x18\x02 \x01(\x05\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c\"0\n\rGripperStatus\x12\r\n\x05speed\x18\x01 \x01(\x05\x12\x10\n\x08position\x18\x02 \x01(\x05\":\n\x05Speed\x12\x17\n\x0flinear_velocity\x18\x01 \x01(\x02\x12\x18\n\x10\x61ngular_velocity\x18\x02 \x01(\x02\"v\n\tPathChunk\x12\x10\n\x08start_id\x18\x01 \x01(\x05\x12\x0e\n\x06length\x18\x02 \x01(\x05\x12\r\n\x05njnts\x18\x03 \x01(\x05\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\x0c\x12\x19\n\x11\x63ontrol_frequency\x18\x05 \x01(\x02\x12\x0f\n\x07is_last\x18\x06 \x01(\x08\"C\n\x08Progress\x12\x12\n\nn_received\x18\x01 \x01(\x05\x12\x12\n\nn_executed\x18\x02 \x01(\x05\x12\x0f\n\x07is_done\x18\x03 \x01(\x08\x32\xa5\x03\n\nXArmShuidi\x12@\n\x14\x61rm_move_jspace_path\x12\x11.xarm_shuidi.Path\x1a\x13.xarm_shuidi.Status\"\x00\x12M\n\x16\x61rm_stream_jspace_path\x12\x16.xarm_shuidi.PathChunk\x1a\x15.xarm_shuidi.Progress\"\x00(\x01\x30\x01\x12\x42\n\x12\x61rm_get_jnt_values\x12\x12.xarm_shuidi.Empty\x1a\x16.xarm_shuidi.JntValues\"\x00\x12?\n\narm_jaw_to\x12\x1a.xarm_shuidi.GripperStatus\x1a\x13.xarm_shuidi.Status\"\x00\x12J\n\x16\x61rm_get_gripper_status\x12\x12.xarm_shuidi.Empty\x1a\x1a.xarm_shuidi.GripperStatus\"\x00\x12\x35\n\x08\x61gv_move\x12\x12.xarm_shuidi.Speed\x1a\x13.xarm_shuidi.Status\"\x00\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'robot_con.xarm_shuidi_grpc.xarm_shuidi_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_EMPTY']._serialized_start=61
+  _globals['_EMPTY']._serialized_end=68
+  _globals['_STATUS']._serialized_start=70
+  _globals['_STATUS']._serialized_end=162
+  _globals['_STATUS_STATUSVALUE']._serialized_start=128
+  _globals['_STATUS_STATUSVALUE']._serialized_end=162
+  _globals['_JNTVALUES']._serialized_start=164
+  _globals['_JNTVALUES']._serialized_end=189
+  _globals['_PATH']._serialized_start=191
+  _globals['_PATH']._serialized_end=242
+  _globals['_GRIPPERSTATUS']._serialized_start=244
+  _globals['_GRIPPERSTATUS']._serialized_end=292
+  _globals['_SPEED']._serialized_start=294
+  _globals['_SPEED']._serialized_end=352
+  _globals['_PATHCHUNK']._serialized_start=354
+  _globals['_PATHCHUNK']._serialized_end=472
+  _globals['_PROGRESS']._serialized_start=474
+  _globals['_PROGRESS']._serialized_end=541
+  _globals['_XARMSHUIDI']._serialized_start=544
+  _globals['_XARMSHUIDI']._serialized_end=965
 # @@protoc_insertion_point(module_scope)
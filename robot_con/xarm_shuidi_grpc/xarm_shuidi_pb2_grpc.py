@@ -1,11 +1,31 @@
 # Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
 """Client and server classes corresponding to protobuf-defined services."""
 import grpc
+import warnings
 
-import robot_con.xarm_shuidi_grpc.xarm_shuidi_pb2 as xarm__shuidi__pb2
+from robot_con.xarm_shuidi_grpc import xarm_shuidi_pb2 as robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2
 
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
 
-class XArmShuidiStub(object):
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in robot_con/xarm_shuidi_grpc/xarm_shuidi_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class XArmShuidiStub:
     """Missing associated documentation comment in .proto file."""
 
     def __init__(self, channel):
@@ -15,33 +35,38 @@ class XArmShuidiStub(object):
             channel: A grpc.Channel.
         """
         self.arm_move_jspace_path = channel.unary_unary(
-                '/XArmShuidi/arm_move_jspace_path',
-                request_serializer=xarm__shuidi__pb2.Path.SerializeToString,
-                response_deserializer=xarm__shuidi__pb2.Status.FromString,
-                )
+                '/xarm_shuidi.XArmShuidi/arm_move_jspace_path',
+                request_serializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Path.SerializeToString,
+                response_deserializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Status.FromString,
+                _registered_method=True)
+        self.arm_stream_jspace_path = channel.stream_stream(
+                '/xarm_shuidi.XArmShuidi/arm_stream_jspace_path',
+                request_serializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.PathChunk.SerializeToString,
+                response_deserializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Progress.FromString,
+                _registered_method=True)
         self.arm_get_jnt_values = channel.unary_unary(
-                '/XArmShuidi/arm_get_jnt_values',
-                request_serializer=xarm__shuidi__pb2.Empty.SerializeToString,
-                response_deserializer=xarm__shuidi__pb2.JntValues.FromString,
-                )
+                '/xarm_shuidi.XArmShuidi/arm_get_jnt_values',
+                request_serializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Empty.SerializeToString,
+                response_deserializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.JntValues.FromString,
+                _registered_method=True)
         self.arm_jaw_to = channel.unary_unary(
-                '/XArmShuidi/arm_jaw_to',
-                request_serializer=xarm__shuidi__pb2.GripperStatus.SerializeToString,
-                response_deserializer=xarm__shuidi__pb2.Status.FromString,
-                )
+                '/xarm_shuidi.XArmShuidi/arm_jaw_to',
+                request_serializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.GripperStatus.SerializeToString,
+                response_deserializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Status.FromString,
+                _registered_method=True)
         self.arm_get_gripper_status = channel.unary_unary(
-                '/XArmShuidi/arm_get_gripper_status',
-                request_serializer=xarm__shuidi__pb2.Empty.SerializeToString,
-                response_deserializer=xarm__shuidi__pb2.GripperStatus.FromString,
-                )
+                '/xarm_shuidi.XArmShuidi/arm_get_gripper_status',
+                request_serializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Empty.SerializeToString,
+                response_deserializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.GripperStatus.FromString,
+                _registered_method=True)
         self.agv_move = channel.unary_unary(
-                '/XArmShuidi/agv_move',
-                request_serializer=xarm__shuidi__pb2.Speed.SerializeToString,
-                response_deserializer=xarm__shuidi__pb2.Status.FromString,
-                )
+                '/xarm_shuidi.XArmShuidi/agv_move',
+                request_serializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Speed.SerializeToString,
+                response_deserializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Status.FromString,
+                _registered_method=True)
 
 
-class XArmShuidiServicer(object):
+class XArmShuidiServicer:
     """Missing associated documentation comment in .proto file."""
 
     def arm_move_jspace_path(self, request, context):
@@ -50,6 +75,12 @@ class XArmShuidiServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def arm_stream_jspace_path(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def arm_get_jnt_values(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -79,37 +110,43 @@ def add_XArmShuidiServicer_to_server(servicer, server):
     rpc_method_handlers = {
             'arm_move_jspace_path': grpc.unary_unary_rpc_method_handler(
                     servicer.arm_move_jspace_path,
-                    request_deserializer=xarm__shuidi__pb2.Path.FromString,
-                    response_serializer=xarm__shuidi__pb2.Status.SerializeToString,
+                    request_deserializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Path.FromString,
+                    response_serializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Status.SerializeToString,
+            ),
+            'arm_stream_jspace_path': grpc.stream_stream_rpc_method_handler(
+                    servicer.arm_stream_jspace_path,
+                    request_deserializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.PathChunk.FromString,
+                    response_serializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Progress.SerializeToString,
             ),
             'arm_get_jnt_values': grpc.unary_unary_rpc_method_handler(
                     servicer.arm_get_jnt_values,
-                    request_deserializer=xarm__shuidi__pb2.Empty.FromString,
-                    response_serializer=xarm__shuidi__pb2.JntValues.SerializeToString,
+                    request_deserializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Empty.FromString,
+                    response_serializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.JntValues.SerializeToString,
             ),
             'arm_jaw_to': grpc.unary_unary_rpc_method_handler(
                     servicer.arm_jaw_to,
-                    request_deserializer=xarm__shuidi__pb2.GripperStatus.FromString,
-                    response_serializer=xarm__shuidi__pb2.Status.SerializeToString,
+                    request_deserializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.GripperStatus.FromString,
+                    response_serializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Status.SerializeToString,
             ),
             'arm_get_gripper_status': grpc.unary_unary_rpc_method_handler(
                     servicer.arm_get_gripper_status,
-                    request_deserializer=xarm__shuidi__pb2.Empty.FromString,
-                    response_serializer=xarm__shuidi__pb2.GripperStatus.SerializeToString,
+                    request_deserializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Empty.FromString,
+                    response_serializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.GripperStatus.SerializeToString,
             ),
             'agv_move': grpc.unary_unary_rpc_method_handler(
                     servicer.agv_move,
-                    request_deserializer=xarm__shuidi__pb2.Speed.FromString,
-                    response_serializer=xarm__shuidi__pb2.Status.SerializeToString,
+                    request_deserializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Speed.FromString,
+                    response_serializer=robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Status.SerializeToString,
             ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
-            'XArmShuidi', rpc_method_handlers)
+            'xarm_shuidi.XArmShuidi', rpc_method_handlers)
     server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('xarm_shuidi.XArmShuidi', rpc_method_handlers)
 
 
  # This class is part of an EXPERIMENTAL API.
-class XArmShuidi(object):
+class XArmShuidi:
     """Missing associated documentation comment in .proto file."""
 
     @staticmethod
@@ -123,11 +160,48 @@ class XArmShuidi(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/XArmShuidi/arm_move_jspace_path',
-            xarm__shuidi__pb2.Path.SerializeToString,
-            xarm__shuidi__pb2.Status.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xarm_shuidi.XArmShuidi/arm_move_jspace_path',
+            robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Path.SerializeToString,
+            robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Status.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def arm_stream_jspace_path(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/xarm_shuidi.XArmShuidi/arm_stream_jspace_path',
+            robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.PathChunk.SerializeToString,
+            robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Progress.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def arm_get_jnt_values(request,
@@ -140,11 +214,21 @@ class XArmShuidi(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/XArmShuidi/arm_get_jnt_values',
-            xarm__shuidi__pb2.Empty.SerializeToString,
-            xarm__shuidi__pb2.JntValues.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xarm_shuidi.XArmShuidi/arm_get_jnt_values',
+            robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Empty.SerializeToString,
+            robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.JntValues.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def arm_jaw_to(request,
@@ -157,11 +241,21 @@ class XArmShuidi(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/XArmShuidi/arm_jaw_to',
-            xarm__shuidi__pb2.GripperStatus.SerializeToString,
-            xarm__shuidi__pb2.Status.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xarm_shuidi.XArmShuidi/arm_jaw_to',
+            robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.GripperStatus.SerializeToString,
+            robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Status.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def arm_get_gripper_status(request,
@@ -174,11 +268,21 @@ class XArmShuidi(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/XArmShuidi/arm_get_gripper_status',
-            xarm__shuidi__pb2.Empty.SerializeToString,
-            xarm__shuidi__pb2.GripperStatus.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xarm_shuidi.XArmShuidi/arm_get_gripper_status',
+            robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Empty.SerializeToString,
+            robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.GripperStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def agv_move(request,
@@ -191,8 +295,18 @@ class XArmShuidi(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/XArmShuidi/agv_move',
-            xarm__shuidi__pb2.Speed.SerializeToString,
-            xarm__shuidi__pb2.Status.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/xarm_shuidi.XArmShuidi/agv_move',
+            robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Speed.SerializeToString,
+            robot__con_dot_xarm__shuidi__grpc_dot_xarm__shuidi__pb2.Status.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,22 +1,31 @@
 import grpc
 import time
+import queue
+import threading
 from concurrent import futures
-import drivers.xarm.wrapper.xarm_api as arm
-import robot_con.xarm_shuidi_grpc.shuidi.shuidi_robot as agv
+import basis.utils as bu
 import robot_con.xarm_shuidi_grpc.xarm_shuidi_pb2 as aa_msg  # aa = arm_agv
 import robot_con.xarm_shuidi_grpc.xarm_shuidi_pb2_grpc as aa_rpc
 import numpy as np
 
+# the vendor drivers are imported at first use, so that injected arm_x/agv_x (e.g., stand-ins) do not need them
+arm = bu.lazy_import("drivers.xarm.wrapper.xarm_api")
+agv = bu.lazy_import("robot_con.xarm_shuidi_grpc.shuidi.shuidi_robot")
+
 
 class XArmShuidiServer(aa_rpc.XArmShuidiServicer):
 
-    def __init__(self, arm_ip, agv_ip="192.168.10.10"):
+    def __init__(self, arm_ip, agv_ip="192.168.10.10", arm_x=None, agv_x=None):
         """
-        :param _arm_x: an instancde of arm.XArmAPI
+        :param arm_ip:
+        :param agv_ip:
+        :param arm_x: an object with the interface of arm.XArmAPI (e.g. xarm_shuidi_standin.XArmAPIStandIn),
+                      an XArmAPI is connected to arm_ip if None
+        :param agv_x: an object with the interface of agv.ShuidiRobot, connected to agv_ip if None
         :return:
         """
         super().__init__()
-        self._arm_x = arm.XArmAPI(port=arm_ip)
+        self._arm_x = arm.XArmAPI(port=arm_ip) if arm_x is None else arm_x
         if self._arm_x.has_err_warn:
             if self._arm_x.get_err_warn_code()[1][0] == 1:
                 print("The Emergency Button is pushed in to stop!")
@@ -33,7 +42,7 @@ class XArmShuidiServer(aa_rpc.XArmShuidiServicer):
         self.__speed = 5000
         self._arm_x.set_gripper_speed(self.__speed)  # 1000-5000
         self._arm_x.set_gripper_position(850)  # 1000-5000
-        self._agv_x = agv.ShuidiRobot(ip=agv_ip)
+        self._agv_x = agv.ShuidiRobot(ip=agv_ip) if agv_x is None else agv_x
         print("The Shuidi server is started!")
 
     def arm_get_jnt_values(self, request, context):
@@ -52,6 +61,57 @@ class XArmShuidiServer(aa_rpc.XArmShuidiServicer):
             time.sleep(.01)
         return aa_msg.Status(value=aa_msg.Status.DONE)
 
+    def arm_stream_jspace_path(self, request_iterator, context):
+        """
+        execute a path that arrives in chunks; execution starts with the first chunk while the rest is
+        being received, and the progress is reported back after every executed chunk
+        setpoints are sent at the control_frequency of the chunks on a fixed clock, so that a late chunk
+        does not make the following setpoints faster
+        :param request_iterator: PathChunk messages, the last one has is_last=True
+        :param context:
+        :return: a generator of Progress messages
+        """
+        chunk_queue = queue.Queue()
+        n_received = [0]
+
+        def _recv_chunks():
+            try:
+                for chunk in request_iterator:
+                    if chunk.start_id != n_received[0]:
+                        raise ValueError(f"Chunk starts at {chunk.start_id}, {n_received[0]} is expected!")
+                    path = np.frombuffer(chunk.data, dtype=np.float64).reshape((chunk.length, chunk.njnts))
+                    n_received[0] += chunk.length
+                    chunk_queue.put((path, chunk.control_frequency))
+                    if chunk.is_last:
+                        break
+                chunk_queue.put(None)
+            except Exception as e:
+                chunk_queue.put(e)
+
+        threading.Thread(target=_recv_chunks, daemon=True).start()
+        n_executed = 0
+        next_time = None
+        while True:
+            item = chunk_queue.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                print(item, type(item))
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(item))
+            path, control_frequency = item
+            if next_time is None or next_time < time.perf_counter():
+                # first chunk or the stream underran, restart the clock
+                next_time = time.perf_counter()
+            for jnt_values in path.tolist():
+                self._arm_x.set_servo_angle_j(jnt_values, is_radian=True)
+                next_time += control_frequency
+                sleep_time = next_time - time.perf_counter()
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+            n_executed += len(path)
+            yield aa_msg.Progress(n_received=n_received[0], n_executed=n_executed, is_done=False)
+        yield aa_msg.Progress(n_received=n_received[0], n_executed=n_executed, is_done=True)
+
     def arm_jaw_to(self, request, context):
         self.__speed = request.speed
         self._arm_x.set_gripper_speed(self.__speed)
@@ -76,6 +136,7 @@ class XArmShuidiServer(aa_rpc.XArmShuidiServicer):
 
 def serve(arm_ip="192.168.50.99", agv_ip="192.168.10.10", host="localhost:18300"):
     _ONE_DAY_IN_SECONDS = 60 * 60 * 24
+    # long paths should use arm_stream_jspace_path, the large limit is kept for arm_move_jspace_path
     options = [('grpc.max_message_length', 100 * 1024 * 1024)]
     server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), options=options)
     aa_server = XArmShuidiServer(arm_ip=arm_ip, agv_ip=agv_ip)
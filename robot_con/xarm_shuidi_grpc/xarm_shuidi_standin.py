@@ -0,0 +1,141 @@
+"""
+Local stand-in of the xArm/Shuidi robot for running xarm_shuidi_server and xarm_shuidi_client without hardware
+The stand-ins implement the subsets of XArmAPI and ShuidiRobot used by XArmShuidiServer,
+so the real servicer (and the real grpc protocol) is exercised.
+usage:
+    python -m robot_con.xarm_shuidi_grpc.xarm_shuidi_standin --host localhost:18300
+"""
+import time
+import argparse
+import threading
+import numpy as np
+import grpc
+from concurrent import futures
+import robot_con.xarm_shuidi_grpc.xarm_shuidi_server as xss
+import robot_con.xarm_shuidi_grpc.xarm_shuidi_pb2_grpc as aa_rpc
+
+
+class XArmAPIStandIn(object):
+    """
+    the subset of drivers.xarm.wrapper.xarm_api.XArmAPI used by XArmShuidiServer
+    every servo setpoint is logged with its time
+    """
+
+    def __init__(self, robot_s=None, init_jnt_values=None, n_jnts=7):
+        """
+        :param robot_s: a robot_sim manipulator or robot, moved to every setpoint if given
+        :param init_jnt_values: zeros if None
+        :param n_jnts:
+        """
+        self.robot_s = robot_s
+        self._jnt_values = np.zeros(n_jnts) if init_jnt_values is None else np.asarray(init_jnt_values, dtype=float)
+        self._gripper_position = 850
+        self._lock = threading.Lock()
+        self.has_err_warn = False
+        self.clear_log()
+
+    def clear_log(self):
+        with self._lock:
+            self.servo_time_list = []
+            self.n_out_of_range = 0
+
+    def get_log(self):
+        """
+        :return: times of the servo setpoints (nparray)
+        """
+        with self._lock:
+            return np.array(self.servo_time_list)
+
+    def get_err_warn_code(self):
+        return 0, [0, 0]
+
+    def clean_error(self):
+        return 0
+
+    def motion_enable(self, enable=True):
+        return 0
+
+    def set_mode(self, mode):
+        return 0
+
+    def set_state(self, state=0):
+        return 0
+
+    def reset(self, wait=False):
+        return 0
+
+    def clean_gripper_error(self):
+        return 0
+
+    def set_gripper_enable(self, enable):
+        return 0
+
+    def set_gripper_mode(self, mode):
+        return 0
+
+    def set_gripper_speed(self, speed):
+        return 0
+
+    def set_gripper_position(self, position, wait=False, **kwargs):
+        self._gripper_position = position
+        return 0
+
+    def get_gripper_position(self):
+        return 0, self._gripper_position
+
+    def get_servo_angle(self, is_radian=True):
+        with self._lock:
+            jnt_values = self._jnt_values.tolist()
+        return 0, jnt_values if is_radian else np.degrees(jnt_values).tolist()
+
+    def set_servo_angle_j(self, angles, is_radian=True, **kwargs):
+        jnt_values = np.asarray(angles, dtype=float)
+        if not is_radian:
+            jnt_values = np.radians(jnt_values)
+        with self._lock:
+            self._jnt_values = jnt_values
+            self.servo_time_list.append(time.perf_counter())
+        if self.robot_s is not None:
+            if not self.robot_s.are_jnts_in_ranges(jnt_values):
+                self.n_out_of_range += 1
+            self.robot_s.goto_given_conf(jnt_values=jnt_values)
+        return 0
+
+
+class ShuidiStandIn(object):
+    """
+    the subset of shuidi_robot.ShuidiRobot used by XArmShuidiServer
+    """
+
+    def __init__(self):
+        self.speed_list = []
+
+    def joy_control(self, linear_velocity, angular_velocity):
+        self.speed_list.append((linear_velocity, angular_velocity))
+
+
+def start_standin_server(host="localhost:18300", robot_s=None, max_workers=10):
+    """
+    :param host:
+    :param robot_s: see XArmAPIStandIn
+    :param max_workers:
+    :return: grpc server (call stop to shut down), XArmShuidiServer with the stand-ins as _arm_x and _agv_x
+    """
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    aa_server = xss.XArmShuidiServer(arm_ip=None, arm_x=XArmAPIStandIn(robot_s=robot_s), agv_x=ShuidiStandIn())
+    aa_rpc.add_XArmShuidiServicer_to_server(aa_server, server)
+    server.add_insecure_port(host)
+    server.start()
+    return server, aa_server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stand-in of the xArm/Shuidi grpc server")
+    parser.add_argument("--host", default="localhost:18300")
+    args = parser.parse_args()
+    server, _ = start_standin_server(host=args.host)
+    print("The XArm stand-in server is started!")
+    try:
+        server.wait_for_termination()
+    except KeyboardInterrupt:
+        server.stop(0)
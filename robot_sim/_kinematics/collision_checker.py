@@ -1,3 +1,4 @@
+import copy
 import basis.data_adapter as da
 import modeling._panda_cdhelper as mph
 from panda3d.core import NodePath, CollisionTraverser, CollisionHandlerQueue, BitMask32
@@ -61,7 +62,7 @@ class CCElement(object):
         self.tfd_cdprim = None
         # remove the into bitmask of all cces in the cce_into_dict
         bitmask_list_to_return = []
-        for allocated_bitmask, cce_into_list in self.cce_into_dict:
+        for allocated_bitmask, cce_into_list in self.cce_into_dict.items():
             bitmask_list_to_return.append(allocated_bitmask)
             # delayed udpate
             cce_into_list[:] = [cce_into for cce_into in cce_into_list if cce_into.tfd_cdprim is not None]
@@ -89,7 +90,7 @@ class CCElement(object):
         date: 20231117
         """
         mph.change_cdmask(self.tfd_cdprim, allocated_bitmask, action="remove", type="from")
-        cce_into_list = self.cdpair_dict[allocated_bitmask]
+        cce_into_list = self.cce_into_dict.pop(allocated_bitmask)
         for cce_into in cce_into_list:
             cce_into.remove_into_cdmask(allocated_bitmask)
 
@@ -104,7 +105,10 @@ class CollisionChecker(object):
     """
     Hosts collision elements (robot links and manipulated objects),
     and checks their internal collisions and externaal collisions with other obstacles/robots
-    fast and allows maximum 32 collision pairs
+    fast and allows maximum 31 collision bitmasks; pairs sharing the same from lnks share a bitmask
+    obstacles are kept resident in the traverse tree across calls to avoid repeated attaching/detaching;
+    they are siblings of cd_pdndp under a private root, so that they are not traversed when cd_pdndp is
+    attached to another checker as an other robot
     author: weiwei
     date: 20201214osaka, 20230811toyonaka
     """
@@ -112,13 +116,36 @@ class CollisionChecker(object):
     def __init__(self, name="cc"):
         self.cd_trav = CollisionTraverser()
         self.cd_handler = CollisionHandlerQueue()
-        self.cd_pdndp = NodePath(name)  # path of the traverse tree
+        self._cd_root = NodePath(name + "_root")  # root of the traverse tree
+        self.cd_pdndp = self._cd_root.attachNewNode(name)  # lnks of this checker, reparented by other checkers
         self.bitmask_pool = [BitMask32(2 ** n) for n in range(31)]
         self.bitmask_ext = BitMask32(2 ** 31)  # 31 is prepared for cd with external non-active objects
         self.cce_dict = {}  # a dict of CCElement
+        # a dict with from uuids (frozenset) as keys and [allocated_bitmask, cce_into_list] as values
+        self._cdpair_dict = {}
+        # resident obstacles, uuid: [cmodel, reference cdprim of cmodel, tfd cdprim copy]
+        self._obstacle_dict = {}
+        self._obstacle_pdndp = NodePath("obstacles")
+        self._obstacle_pdndp.reparentTo(self._cd_root)
         # temporary parameter for toggling on/off show_cdprimit
         self._cdprim_list = []
 
+    def __deepcopy__(self, memo):
+        """
+        panda3d traversers cannot be copied; the copy is rebuilt from the copied lnks with the same cdpairs
+        the uuids of lnks come from their cmodels, which keep their uuids when they are shared by the copy
+        resident obstacles are not copied, they are attached again by the next is_collided
+        """
+        cc_copy = CollisionChecker(self.cd_pdndp.getName())
+        memo[id(self)] = cc_copy
+        id_map = {}
+        for uuid, cce in self.cce_dict.items():
+            id_map[uuid] = cc_copy.add_cce(copy.deepcopy(cce.lnk, memo), toggle_collider=cce._toggle_collider)
+        for from_key, (_, cce_into_list) in self._cdpair_dict.items():
+            cc_copy.set_cdpair_by_ids(uuid_from_list=[id_map[uuid] for uuid in from_key],
+                                      uuid_into_list=[id_map[cce_into.lnk.uuid] for cce_into in cce_into_list])
+        return cc_copy
+
     def add_cce(self, lnk, toggle_collider=True):
         """
         add a Link as a ccelement
@@ -138,9 +165,7 @@ class CollisionChecker(object):
         author: weiwei
         date: 20231117
         """
-        cce = self.cce_dict.pop(lnk.uuid)
-        bitmask_list_to_return = cce.isolate()
-        self.bitmask_pool += bitmask_list_to_return
+        self.remove_cce_by_id(lnk.uuid)
 
     def remove_cce_by_id(self, uuid):
         """
@@ -153,6 +178,8 @@ class CollisionChecker(object):
         cce = self.cce_dict.pop(uuid)
         bitmask_list_to_return = cce.isolate()
         self.bitmask_pool += bitmask_list_to_return
+        for from_key in [from_key for from_key in self._cdpair_dict if uuid in from_key]:
+            self._cdpair_dict.pop(from_key)
 
     def set_cdpair(self, lnk_from_list, lnk_into_list):
         """
@@ -163,46 +190,95 @@ class CollisionChecker(object):
         author: weiwei
         date: 20201215, 20230811, 20231116
         """
-        if len(self.bitmask_pool) == 0:
-            raise ValueError("Too many collision pairs! Maximum: 29")
-        allocated_bitmask = self.bitmask_pool.pop()
-        cce_into_list = []
-        for lnk_into in lnk_into_list:
-            if lnk_into.uuid in self.cce_dict.keys():
-                self.cce_dict[lnk_into.uuid].add_into_cdmask(allocated_bitmask)
-                cce_into_list.append(self.cce_dict[lnk_into.uuid])
-            else:
-                raise KeyError("Into lnks do not exist in the cce_dict.")
-        for lnk_from in lnk_from_list:
-            if lnk_from.uuid in self.cce_dict.keys():
-                self.cce_dict[lnk_from.uuid].add_from_cdmask(allocated_bitmask, cce_into_list)
-            else:
-                raise KeyError("From lnks do not exist in the cce_dict.")
+        self.set_cdpair_by_ids(uuid_from_list=[lnk.uuid for lnk in lnk_from_list],
+                               uuid_into_list=[lnk.uuid for lnk in lnk_into_list])
 
     def set_cdpair_by_ids(self, uuid_from_list, uuid_into_list):
         """
         The given two lists will be checked for collisions
+        pairs with exactly the same from lnks reuse the bitmask allocated earlier,
+        so that the 31 bitmasks limit the number of distinct from groups instead of the number of pairs
         :param uuid_from_list: a list of rkjlc.Link.uuid
         :param uuid_into_list: a list of rkjlc.Link.uuid
         :return:
         author: weiwei
         date: 20240303
         """
+        for uuid_into in uuid_into_list:
+            if uuid_into not in self.cce_dict.keys():
+                raise KeyError("Into lnks do not exist in the cce_dict.")
+        for uuid_from in uuid_from_list:
+            if uuid_from not in self.cce_dict.keys():
+                raise KeyError("From lnks do not exist in the cce_dict.")
+        from_key = frozenset(uuid_from_list)
+        if from_key in self._cdpair_dict:
+            allocated_bitmask, cce_into_list = self._cdpair_dict[from_key]
+            # the cce_into_list is shared by the from cces, extending it in place updates all of them
+            for uuid_into in uuid_into_list:
+                cce_into = self.cce_dict[uuid_into]
+                if cce_into not in cce_into_list:
+                    cce_into.add_into_cdmask(allocated_bitmask)
+                    cce_into_list.append(cce_into)
+            return
         if len(self.bitmask_pool) == 0:
-            raise ValueError("Too many collision pairs! Maximum: 29")
+            raise ValueError("Too many collision pairs with different from lnks! Maximum: 31")
         allocated_bitmask = self.bitmask_pool.pop()
         cce_into_list = []
         for uuid_into in uuid_into_list:
-            if uuid_into in self.cce_dict.keys():
-                self.cce_dict[uuid_into].add_into_cdmask(allocated_bitmask)
-                cce_into_list.append(self.cce_dict[uuid_into])
-            else:
-                raise KeyError("Into lnks do not exist in the cce_dict.")
+            self.cce_dict[uuid_into].add_into_cdmask(allocated_bitmask)
+            cce_into_list.append(self.cce_dict[uuid_into])
         for uuid_from in uuid_from_list:
-            if uuid_from in self.cce_dict.keys():
-                self.cce_dict[uuid_from].add_from_cdmask(allocated_bitmask, cce_into_list)
-            else:
-                raise KeyError("From lnks do not exist in the cce_dict.")
+            self.cce_dict[uuid_from].add_from_cdmask(allocated_bitmask, cce_into_list)
+        self._cdpair_dict[from_key] = [allocated_bitmask, cce_into_list]
+
+    def add_obstacles(self, obstacle_list):
+        """
+        make the given obstacles resident in the traverse tree
+        a transformed copy of the cdprim of each obstacle is kept, its pose is synchronized before every check
+        :param obstacle_list: a list of mcm.CollisionModel
+        :return:
+        """
+        for obstacle_cmodel in obstacle_list:
+            ref_cdprim = obstacle_cmodel.cdprim
+            if obstacle_cmodel.uuid in self._obstacle_dict:
+                if self._obstacle_dict[obstacle_cmodel.uuid][1] is ref_cdprim:
+                    continue
+                # the cdprim of the obstacle was changed, replace the stale copy
+                self._obstacle_dict.pop(obstacle_cmodel.uuid)[2].removeNode()
+            tfd_cdprim = mph.copy_cdprim_attach_to(obstacle_cmodel,
+                                                   self._obstacle_pdndp,
+                                                   homomat=obstacle_cmodel.homomat)
+            self._obstacle_dict[obstacle_cmodel.uuid] = [obstacle_cmodel, ref_cdprim, tfd_cdprim]
+
+    def remove_obstacles(self, obstacle_list=None):
+        """
+        :param obstacle_list: a list of mcm.CollisionModel; all resident obstacles will be removed if None
+        :return:
+        """
+        if obstacle_list is None:
+            uuid_list = list(self._obstacle_dict.keys())
+        else:
+            uuid_list = [obstacle_cmodel.uuid for obstacle_cmodel in obstacle_list]
+        for uuid in uuid_list:
+            if uuid in self._obstacle_dict:
+                self._obstacle_dict.pop(uuid)[2].removeNode()
+
+    def _sync_obstacles(self, obstacle_list):
+        """
+        make the resident obstacles identical to the given list and update their poses
+        obstacles that are no longer in the list are removed; new ones are added
+        :param obstacle_list:
+        :return:
+        """
+        if obstacle_list is None:
+            obstacle_list = []
+        uuid_set = {obstacle_cmodel.uuid for obstacle_cmodel in obstacle_list}
+        if len(uuid_set) != len(self._obstacle_dict) or any(uuid not in uuid_set for uuid in self._obstacle_dict):
+            self.remove_obstacles([obstacle_cmodel for obstacle_cmodel, _, _ in self._obstacle_dict.values()
+                                   if obstacle_cmodel.uuid not in uuid_set])
+        self.add_obstacles(obstacle_list)
+        for obstacle_cmodel, _, tfd_cdprim in self._obstacle_dict.values():
+            tfd_cdprim.setMat(da.npmat4_to_pdmat4(obstacle_cmodel.homomat))
 
     def is_collided(self, obstacle_list=None, other_robot_list=None, toggle_contacts=False):
         """
@@ -211,31 +287,9 @@ class CollisionChecker(object):
         :return:
         """
         for cce in self.cce_dict.values():
-            cce.tfd_cdprim.setPosQuat(da.npvec3_to_pdvec3(cce.lnk.gl_pos),
-                                      da.npmat3_to_pdquat(cce.lnk.gl_rotmat))
-            # print(da.npv3mat3_to_pdmat4(pos, rotmat))
-            # print("From", cdnp.node().getFromCollideMask())
-            # print("Into", cdnp.node().getIntoCollideMask())
-        # print("xxxx colliders xxxx")
-        # for collider in self.cd_trav.getColliders():
-        #     print(collider.getMat())
-        #     print("From", collider.node().getFromCollideMask())
-        #     print("Into", collider.node().getIntoCollideMask())
-        # attach obstacles
-        # print(len(obstacle_list))
-        # base.run()
-        # obstacle_cdprim_list = []
-        if obstacle_list is not None:
-            for obstacle_cmodel in obstacle_list:
-                obstacle_cmodel.attach_cdprim_to(self.cd_pdndp)
-            # obstacle_cdprim_list.append(mph.copy_cdprim_attach_to(obstacle_cmodel,
-            #                                                       self.cd_pdndp,
-            #                                                       homomat=obstacle_cmodel.homomat,
-            #                                                       clear_mask=True))
-            ## show all cdprims for debug purpose
-            # self.cd_pdndp.reparentTo(base.render)
-            # for cdprim in self.cd_pdndp.getChildren():
-            #     mph.toggle_show_collision_node(cdprim, toggle_show_on=True)
+            cce.tfd_cdprim.setMat(da.npmat4_to_pdmat4(cce.lnk.gl_homomat))
+        # obstacles stay resident across calls; only the difference to the last call is attached/detached
+        self._sync_obstacles(obstacle_list)
         # attach other robots
         if other_robot_list is not None:
             for robot in other_robot_list:
@@ -243,19 +297,13 @@ class CollisionChecker(object):
                     cce.enable_cd_ext(type="into")
                 robot.cc.cd_pdndp.reparentTo(self.cd_pdndp)
         # collision check
-        self.cd_trav.traverse(self.cd_pdndp)
-        # clear obstacles
-        if obstacle_list is not None:
-            for obstacle_cmodel in obstacle_list:
-                obstacle_cmodel.detach_cdprim()
-        # for obstacle_cdprim in obstacle_cdprim_list:
-        #     obstacle_cdprim.removeNode()
+        self.cd_trav.traverse(self._cd_root)
         # clear other robots
         if other_robot_list is not None:
             for robot in other_robot_list:
                 for cce in robot.cc.cce_dict.values():
                     cce.disable_cd_ext(type="into")
-                robot.cc.cd_pdndp.detachNode()
+                robot.cc.cd_pdndp.reparentTo(robot.cc._cd_root)
         if self.cd_handler.getNumEntries() > 0:
             collision_result = True
         else:
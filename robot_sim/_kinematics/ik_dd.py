@@ -5,8 +5,10 @@ date: 20231107
 """
 import warnings
 import os
+import tempfile
 import numpy as np
 import pickle
+import multiprocessing as mp
 import basis.robot_math as rm
 import basis.utils as bu
 import scipy.spatial
@@ -17,11 +19,32 @@ import robot_sim._kinematics.ik_opt as rko
 import robot_sim._kinematics.ik_trac as rkt
 import random
 import time
+import atexit
+import weakref
 # for debugging purpose
 import modeling.geometric_model as mgm
 import robot_sim._kinematics.model_generator as rkmg
 import basis.constant as bc10
 
+# the jlc used by the fk workers of a process pool, see DDIKSolver._build_data
+_worker_jlc = None
+
+
+def _init_fk_worker(jlc):
+    global _worker_jlc
+    _worker_jlc = jlc
+
+
+def _fk_worker(jnt_values_array):
+    return _worker_jlc.fk_batch(jnt_values_array=jnt_values_array, toggle_jacobian=False)
+
+
+def _persist_at_exit(solver_ref):
+    # a weak reference is registered, so that the solvers are not kept alive until exit
+    solver = solver_ref()
+    if solver is not None and len(solver._query_buffer) > 0:
+        solver.persist_data()
+
 
 class DDIKSolver(object):
     def __init__(self, jlc, path=None, identifier_str='test', backbone_solver='n', rebuild=False):
@@ -30,6 +53,8 @@ class DDIKSolver(object):
         :param path:
         :param backbone_solver: 'n': num ik; 'o': opt ik; 't': trac ik
         :param rebuild:
+        samples learned by ik are buffered and saved each time self._merge_size of them are merged,
+        the samples remaining in the buffer are saved at interpreter exit or by calling persist_data
         author: weiwei
         date: 20231111
         """
@@ -37,11 +62,21 @@ class DDIKSolver(object):
         current_file_dir = os.path.dirname(__file__)
         if path is None:
             path = os.path.join(os.path.dirname(current_file_dir), "_data_files")
-        self._fname_tree = os.path.join(path, f"{identifier_str}_ikdd_tree.pkl")
-        self._fname_jnt = os.path.join(path, f"{identifier_str}_jnt_data.pkl")
+        # the query data of the kd tree and the jnt data are saved as npy and loaded as read-only memmaps,
+        # so that processes loading the same database share one copy
+        self._fname_query = os.path.join(path, f"{identifier_str}_ikdd_query.npy")
+        self._fname_jnt = os.path.join(path, f"{identifier_str}_ikdd_jnt.npy")
+        # legacy pickle files, converted to npy when loaded for the first time
+        self._fname_tree_pkl = os.path.join(path, f"{identifier_str}_ikdd_tree.pkl")
+        self._fname_jnt_pkl = os.path.join(path, f"{identifier_str}_jnt_data.pkl")
         self._k_bbs = 20  # number of nearest neighbours examined by the backbone solver
         self._k_max = 20  # maximum nearest neighbours explored by the evolver
         self._max_n_iter = 5  # max_n_iter of the backbone solver
+        self._fk_batch_size = 10000  # number of configurations sent to jlc.fk_batch at once when building data
+        self._n_build_workers = os.cpu_count()  # size of the process pool used for building data
+        self._merge_size = 256  # newly learned samples are buffered and merged into the kd tree in chunks
+        self._query_buffer = []
+        self._jnt_buffer = []
         if backbone_solver == 'n':
             self._backbone_solver = rkn.NumIKSolver(self.jlc)
         elif backbone_solver == 'o':
@@ -57,12 +92,12 @@ class DDIKSolver(object):
                 self.evolve_data(n_times=100000)
         else:
             try:
-                self.query_tree = pickle.load(open(self._fname_tree, 'rb'))
-                self.jnt_data = pickle.load(open(self._fname_jnt, 'rb'))
+                self.query_tree, self.jnt_data = self._load_data()
             except FileNotFoundError:
                 self.query_tree, self.jnt_data = self._build_data()
                 self.persist_data()
                 self.evolve_data(n_times=100)
+        atexit.register(_persist_at_exit, weakref.ref(self))
 
     def __call__(self,
                  tgt_pos,
@@ -92,21 +127,24 @@ class DDIKSolver(object):
         convert a rotmat to vectors
         this will be used for computing the Minkowski p-norm required by KDTree query
         'f' or 'q' are recommended, they both have satisfying performance
+        :param rotmat: 3x3 nparray, or nx3x3 nparray for a batch of rotmats
         :param method: 'f': Frobenius; 'q': Quaternion; 'r': rpy; 'v': rotvec; '-': same value
         :return:
         author: weiwei
         date: 20231107
         """
         if method == 'f':
-            return rotmat.ravel()
+            return rotmat.reshape(rotmat.shape[:-2] + (9,))
         if method == 'q':
             return Rotation.from_matrix(rotmat).as_quat()
         if method == 'r':
+            if rotmat.ndim == 3:
+                return np.array([rm.rotmat_to_euler(each_rotmat) for each_rotmat in rotmat])
             return rm.rotmat_to_euler(rotmat)
         if method == 'v':
             return Rotation.from_matrix(rotmat).as_rotvec()
         if method == '-':
-            return np.array([0])
+            return np.zeros(rotmat.shape[:-2] + (1,))
 
     def _build_data(self):
         # gen sampled qs
@@ -119,18 +157,84 @@ class DDIKSolver(object):
         grid = np.meshgrid(*sampled_jnts)
         sampled_qs = np.vstack([x.ravel() for x in grid]).T
         # gen sampled qs and their correspondent flange poses
+        jnt_values_array_list = [sampled_qs[start:start + self._fk_batch_size] for start in
+                                 range(0, len(sampled_qs), self._fk_batch_size)]
+        n_workers = min(self._n_build_workers, len(jnt_values_array_list))
+        if n_workers > 1 and "fork" in mp.get_all_start_methods():
+            # fork to share the jlc with the workers without pickling it
+            with mp.get_context("fork").Pool(n_workers, initializer=_init_fk_worker, initargs=(self.jlc,)) as pool:
+                fk_result_list = list(tqdm(pool.imap(_fk_worker, jnt_values_array_list),
+                                           total=len(jnt_values_array_list)))
+        else:
+            fk_result_list = [self.jlc.fk_batch(jnt_values_array=jnt_values_array, toggle_jacobian=False) for
+                              jnt_values_array in tqdm(jnt_values_array_list)]
         query_data = []
-        jnt_data = []
-        for id in tqdm(range(len(sampled_qs))):
-            jnt_values = sampled_qs[id]
-            flange_pos, flange_rotmat = self.jlc.fk(jnt_values=jnt_values, toggle_jacobian=False)
+        for flange_pos_array, flange_rotmat_array in fk_result_list:
             # relative to base
-            rel_pos, rel_rotmat = rm.rel_pose(self.jlc.pos, self.jlc.rotmat, flange_pos, flange_rotmat)
-            rel_rotvec = self._rotmat_to_vec(rel_rotmat)
-            query_data.append(np.concatenate((rel_pos, rel_rotvec)))
-            jnt_data.append(jnt_values)
+            rel_pos_array = (flange_pos_array - self.jlc.pos) @ self.jlc.rotmat
+            rel_rotmat_array = self.jlc.rotmat.T @ flange_rotmat_array
+            rel_rotvec_array = self._rotmat_to_vec(rel_rotmat_array)
+            query_data.append(np.hstack((rel_pos_array, rel_rotvec_array.reshape(len(rel_pos_array), -1))))
+        query_data = np.vstack(query_data)
         query_tree = scipy.spatial.cKDTree(query_data)
-        return query_tree, jnt_data
+        return query_tree, sampled_qs
+
+    def _load_data(self):
+        """
+        load the npy files as read-only memmaps; legacy pickle files are converted to npy
+        :return: query_tree, jnt_data
+        """
+        if not (os.path.isfile(self._fname_query) and os.path.isfile(self._fname_jnt)):
+            if os.path.isfile(self._fname_tree_pkl) and os.path.isfile(self._fname_jnt_pkl):
+                print("Converting legacy ddik pickle files to npy...")
+                self.query_tree = pickle.load(open(self._fname_tree_pkl, 'rb'))
+                self.jnt_data = np.asarray(pickle.load(open(self._fname_jnt_pkl, 'rb')))
+                self.persist_data()
+            else:
+                raise FileNotFoundError(f"{self._fname_query} or {self._fname_jnt} does not exist.")
+        query_data = np.load(self._fname_query, mmap_mode='r')
+        jnt_data = np.load(self._fname_jnt, mmap_mode='r')
+        # a contiguous float64 memmap is used by the cKDTree without copying
+        return scipy.spatial.cKDTree(query_data), jnt_data
+
+    def _add_sample(self, query_point, jnt_values):
+        """
+        buffer a learned sample; the buffer is merged into the kd tree when it reaches self._merge_size
+        :param query_point:
+        :param jnt_values:
+        :return: True if the buffer was merged
+        """
+        self._query_buffer.append(query_point)
+        self._jnt_buffer.append(jnt_values)
+        if len(self._query_buffer) >= self._merge_size:
+            self._merge_buffer()
+            return True
+        return False
+
+    def _merge_buffer(self):
+        if len(self._query_buffer) == 0:
+            return
+        tree_data = np.vstack((self.query_tree.data, np.asarray(self._query_buffer)))
+        self.jnt_data = np.vstack((self.jnt_data, np.asarray(self._jnt_buffer)))
+        self.query_tree = scipy.spatial.cKDTree(tree_data)
+        self._query_buffer = []
+        self._jnt_buffer = []
+
+    def _query_seeds(self, query_point, k):
+        """
+        the k nearest seeds in both the kd tree and the buffer of learned samples, sorted by distance
+        :param query_point:
+        :param k:
+        :return: a list of jnt values
+        """
+        dist_value_array, nn_indx_array = self.query_tree.query(query_point, k=k, workers=-1)
+        seed_list = [self.jnt_data[nn_indx] for nn_indx in nn_indx_array]
+        if len(self._query_buffer) > 0:
+            buffer_dist_array = np.linalg.norm(np.asarray(self._query_buffer) - query_point, axis=1)
+            dist_value_array = np.concatenate((dist_value_array, buffer_dist_array))
+            seed_list = seed_list + self._jnt_buffer
+            seed_list = [seed_list[indx] for indx in np.argsort(dist_value_array, kind='stable')[:k]]
+        return seed_list
 
     def multiepoch_evolve(self, n_times_per_epoch=10000, target_success_rate=.96):
         """
@@ -161,10 +265,9 @@ class DDIKSolver(object):
             rel_pos, rel_rotmat = rm.rel_pose(self.jlc.pos, self.jlc.rotmat, flange_pos, flange_rotmat)
             rel_rotvec = self._rotmat_to_vec(rel_rotmat)
             query_point = np.concatenate((rel_pos, rel_rotvec))
-            dist_value_array, nn_indx_array = self.query_tree.query(query_point, k=self._k_max, workers=-1)
+            seed_list = self._query_seeds(query_point, k=self._k_max)
             is_solvable = False
-            for nn_indx in nn_indx_array[:self._k_bbs]:
-                seed_jnt_values = self.jnt_data[nn_indx]
+            for seed_jnt_values in seed_list[:self._k_bbs]:
                 result = self._backbone_solver(tgt_pos=flange_pos,
                                                tgt_rotmat=flange_rotmat,
                                                seed_jnt_values=seed_jnt_values,
@@ -181,9 +284,8 @@ class DDIKSolver(object):
                 #                           colour="green",
                 #                           position=1,
                 #                           leave=False)
-                for id, nn_indx in enumerate(nn_indx_array[self._k_bbs:]):
+                for id, seed_jnt_values in enumerate(seed_list[self._k_bbs:]):
                     # inner_progress_bar.update(1)
-                    seed_jnt_values = self.jnt_data[nn_indx]
                     result = self._backbone_solver(tgt_pos=flange_pos,
                                                    tgt_rotmat=flange_rotmat,
                                                    seed_jnt_values=seed_jnt_values,
@@ -191,10 +293,8 @@ class DDIKSolver(object):
                     if result is None:
                         continue
                     else:
-                        # if solved, add the new jnts to the data and update the kd tree
-                        tree_data = np.vstack((self.query_tree.data, query_point))
-                        self.jnt_data.append(result)
-                        self.query_tree = scipy.spatial.cKDTree(tree_data)
+                        # if solved, add the new jnts to the data; the kd tree is updated in chunks
+                        self._add_sample(query_point, result)
                         evolved_nns.append(self._k_bbs + id)
                         print(f"#### Previously unsolved ik solved using the {self._k_bbs + id}th nearest neighbour.")
                         break
@@ -213,8 +313,22 @@ class DDIKSolver(object):
         self.persist_data()
 
     def persist_data(self):
-        pickle.dump(self.query_tree, open(self._fname_tree, 'wb'))
-        pickle.dump(self.jnt_data, open(self._fname_jnt, 'wb'))
+        """
+        merge the buffered samples and save the query data and jnt data as npy
+        the files are written to unique temporary files in the same directory first and then replaced,
+        as they may be memory-mapped or saved concurrently by this or other processes
+        :return:
+        """
+        self._merge_buffer()
+        for fname, data in ((self._fname_query, self.query_tree.data), (self._fname_jnt, self.jnt_data)):
+            fd, tmp_fname = tempfile.mkstemp(suffix=".tmp.npy", dir=os.path.dirname(fname))
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.save(f, np.asarray(data))
+                os.replace(tmp_fname, fname)
+            except BaseException:
+                os.remove(tmp_fname)
+                raise
         print("ddik data file saved.")
 
     def ik(self,
@@ -245,9 +359,8 @@ class DDIKSolver(object):
             rel_pos, rel_rotmat = rm.rel_pose(self.jlc.pos, self.jlc.rotmat, tgt_pos, tgt_rotmat)
             rel_rotvec = self._rotmat_to_vec(rel_rotmat)
             query_point = np.concatenate((rel_pos, rel_rotvec))
-            dist_value_array, nn_indx_array = self.query_tree.query(query_point, k=self._k_max, workers=-1)
-            for id, nn_indx in enumerate(nn_indx_array):
-                seed_jnt_values = self.jnt_data[nn_indx]
+            seed_list = self._query_seeds(query_point, k=self._k_max)
+            for id, seed_jnt_values in enumerate(seed_list):
                 if toggle_dbg:
                     rkmg.gen_jlc_stick_by_jnt_values(self.jlc,
                                                      jnt_values=seed_jnt_values,
@@ -267,16 +380,58 @@ class DDIKSolver(object):
                         return None
                 else:
                     if id > self._k_bbs:
-                        tree_data = np.vstack((self.query_tree.data, query_point))
-                        self.jnt_data.append(result)
-                        self.query_tree = scipy.spatial.cKDTree(tree_data)
-                        print(f"Updating query tree, {id} explored...")
-                        self.persist_data()
-                        break
+                        # the data file is saved each time the buffered samples are merged
+                        if self._add_sample(query_point, result):
+                            self.persist_data()
                     return result
             # failed to find a solution, use optimization methods to solve and update the database?
         return None
 
+    def ik_batch(self,
+                 tgt_pos_array,
+                 tgt_rotmat_array,
+                 seed_jnt_values_array=None,
+                 max_n_iter=None):
+        """
+        the kd tree is queried once for all targets, the backbone solver is then run on the i-th nearest seeds
+        of the targets that remain unsolved, for i in range(self._k_max)
+        the database is not evolved by batched queries
+        :param tgt_pos_array: nx3 nparray
+        :param tgt_rotmat_array: nx3x3 nparray
+        :param seed_jnt_values_array: the database is skipped if seeds are given
+        :param max_n_iter: use self._max_n_iter if None
+        :return: jnt_values_array (nxn_dof, rows of failed targets are nan), success_mask (n bool)
+        """
+        max_n_iter = self._max_n_iter if max_n_iter is None else max_n_iter
+        tgt_pos_array = np.asarray(tgt_pos_array, dtype=np.float64).reshape(-1, 3)
+        tgt_rotmat_array = np.asarray(tgt_rotmat_array, dtype=np.float64).reshape(-1, 3, 3)
+        if seed_jnt_values_array is not None:
+            return self._backbone_solver.ik_batch(tgt_pos_array=tgt_pos_array,
+                                                  tgt_rotmat_array=tgt_rotmat_array,
+                                                  seed_jnt_values_array=seed_jnt_values_array,
+                                                  max_n_iter=max_n_iter)
+        n_tgts = len(tgt_pos_array)
+        # relative to base
+        rel_pos_array = (tgt_pos_array - self.jlc.pos) @ self.jlc.rotmat
+        rel_rotvec_array = self._rotmat_to_vec(self.jlc.rotmat.T @ tgt_rotmat_array)
+        query_array = np.hstack((rel_pos_array, rel_rotvec_array.reshape(n_tgts, -1)))
+        _, nn_indx_array = self.query_tree.query(query_array, k=self._k_max, workers=-1)
+        nn_indx_array = nn_indx_array.reshape(n_tgts, -1)
+        result_array = np.full((n_tgts, self.jlc.n_dof), np.nan)
+        success_mask = np.zeros(n_tgts, dtype=bool)
+        for i in range(nn_indx_array.shape[1]):
+            unsolved_ids = np.flatnonzero(~success_mask)
+            if len(unsolved_ids) == 0:
+                break
+            i_result_array, i_success_mask = self._backbone_solver.ik_batch(
+                tgt_pos_array=tgt_pos_array[unsolved_ids],
+                tgt_rotmat_array=tgt_rotmat_array[unsolved_ids],
+                seed_jnt_values_array=np.asarray(self.jnt_data[nn_indx_array[unsolved_ids, i]]),
+                max_n_iter=max_n_iter)
+            result_array[unsolved_ids[i_success_mask]] = i_result_array[i_success_mask]
+            success_mask[unsolved_ids[i_success_mask]] = True
+        return result_array, success_mask
+
     def test_success_rate(self, n_times=100):
         success = 0
         time_list = []
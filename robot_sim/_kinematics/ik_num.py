@@ -87,6 +87,41 @@ class NumIKSolver(object):
             clamped_vec[3:6] = self.clamp_rot_err * f2t_err_vec[3:6] / f2t_rot_err
         return clamped_vec
 
+    def _jnt_wt_batch(self, jnt_values_array):
+        """
+        vectorized version of _jnt_wt_mat; the diagonals are returned instead of the matrices
+        :param jnt_values_array: nxn_dof nparray
+        :return: W, W^(1/2), both nxn_dof
+        """
+        jnt_wt_array = np.ones_like(jnt_values_array)
+        # min damping interval
+        normalized_diff = (jnt_values_array - self.min_jnt_values) / (
+                self.min_jnt_value_thresholds - self.min_jnt_values)
+        damping_selection = jnt_values_array < self.min_jnt_value_thresholds
+        jnt_wt_array = np.where(damping_selection,
+                                -2 * np.power(normalized_diff, 3) + 3 * np.power(normalized_diff, 2),
+                                jnt_wt_array)
+        jnt_wt_array[jnt_values_array <= self.min_jnt_values] = 0.0
+        # max damping interval
+        normalized_diff = (self.max_jnt_values - jnt_values_array) / (
+                self.max_jnt_values - self.max_jnt_value_thresholds)
+        damping_selection = jnt_values_array > self.max_jnt_value_thresholds
+        jnt_wt_array = np.where(damping_selection,
+                                -2 * np.power(normalized_diff, 3) + 3 * np.power(normalized_diff, 2),
+                                jnt_wt_array)
+        jnt_wt_array[jnt_values_array >= self.max_jnt_values] = 0.0
+        return jnt_wt_array, np.sqrt(jnt_wt_array)
+
+    def _clamp_tgt_err_batch(self, f2t_pos_err_array, f2t_rot_err_array, f2t_err_vec_array):
+        clamped_vec_array = np.copy(f2t_err_vec_array)
+        selection = f2t_pos_err_array >= self.clamp_pos_err
+        clamped_vec_array[selection, :3] = (self.clamp_pos_err * f2t_err_vec_array[selection, :3] /
+                                            f2t_pos_err_array[selection, None])
+        selection = f2t_rot_err_array >= self.clamp_rot_err
+        clamped_vec_array[selection, 3:6] = (self.clamp_rot_err * f2t_err_vec_array[selection, 3:6] /
+                                             f2t_rot_err_array[selection, None])
+        return clamped_vec_array
+
     def are_jnts_in_range(self, jnt_values):
         if np.any(jnt_values < self.min_jnt_values):
             return False
@@ -304,6 +339,80 @@ class NumIKSolver(object):
                 # raise Exception("No IK solution")
             counter += 1
 
+    def ik_batch(self,
+                 tgt_pos_array,
+                 tgt_rotmat_array,
+                 seed_jnt_values_array=None,
+                 max_n_iter=100):
+        return self.pinv_cw_batch(tgt_pos_array=tgt_pos_array,
+                                  tgt_rotmat_array=tgt_rotmat_array,
+                                  seed_jnt_values_array=seed_jnt_values_array,
+                                  max_n_iter=max_n_iter)
+
+    def pinv_cw_batch(self,
+                      tgt_pos_array,
+                      tgt_rotmat_array,
+                      seed_jnt_values_array=None,
+                      max_n_iter=100):
+        """
+        vectorized pinv_cw over many targets
+        each iteration runs one fk_batch and one stacked pinv over the targets that have not converged
+        :param tgt_pos_array: nx3 nparray
+        :param tgt_rotmat_array: nx3x3 nparray
+        :param seed_jnt_values_array: nxn_dof nparray; the current jnt values are used for all targets if None
+        :param max_n_iter:
+        :return: jnt_values_array (nxn_dof, rows of failed targets are nan), success_mask (n bool)
+        """
+        tgt_pos_array = np.asarray(tgt_pos_array, dtype=np.float64).reshape(-1, 3)
+        tgt_rotmat_array = np.asarray(tgt_rotmat_array, dtype=np.float64).reshape(-1, 3, 3)
+        n_tgts = len(tgt_pos_array)
+        if seed_jnt_values_array is None:
+            iter_jnt_values_array = np.tile(self.jlc.get_jnt_values(), (n_tgts, 1))
+        else:
+            iter_jnt_values_array = np.array(seed_jnt_values_array, dtype=np.float64).reshape(n_tgts, -1)
+        result_array = np.full((n_tgts, self.jlc.n_dof), np.nan)
+        success_mask = np.zeros(n_tgts, dtype=bool)
+        active_ids = np.arange(n_tgts)
+        tmp_mm_jnt_values = self.max_jnt_values + self.min_jnt_values
+        k_phi = .1
+        # the same number of iterations as pinv_cw (its counter stops after exceeding max_n_iter)
+        for _ in range(max_n_iter + 2):
+            flange_pos_array, flange_rotmat_array, j_mat_array = self.jlc.fk_batch(
+                jnt_values_array=iter_jnt_values_array, toggle_jacobian=True)
+            f2t_pos_err_array, f2t_rot_err_array, f2t_err_vec_array = rm.diff_between_poses_batch(
+                src_pos_array=flange_pos_array,
+                src_rotmat_array=flange_rotmat_array,
+                tgt_pos_array=tgt_pos_array[active_ids],
+                tgt_rotmat_array=tgt_rotmat_array[active_ids])
+            in_ranges = np.all((iter_jnt_values_array >= self.min_jnt_values) &
+                               (iter_jnt_values_array <= self.max_jnt_values), axis=1)
+            converged = (f2t_pos_err_array < 1e-4) & (f2t_rot_err_array < 1e-3) & in_ranges
+            if np.any(converged):
+                result_array[active_ids[converged]] = iter_jnt_values_array[converged]
+                success_mask[active_ids[converged]] = True
+                remaining = ~converged
+                active_ids = active_ids[remaining]
+                if len(active_ids) == 0:
+                    break
+                iter_jnt_values_array = iter_jnt_values_array[remaining]
+                j_mat_array = j_mat_array[remaining]
+                f2t_pos_err_array = f2t_pos_err_array[remaining]
+                f2t_rot_err_array = f2t_rot_err_array[remaining]
+                f2t_err_vec_array = f2t_err_vec_array[remaining]
+            clamped_err_vec_array = self._clamp_tgt_err_batch(f2t_pos_err_array, f2t_rot_err_array,
+                                                              f2t_err_vec_array)
+            wln_array, wln_sqrt_array = self._jnt_wt_batch(iter_jnt_values_array)
+            # weighted clamping; the weight matrices are diagonal
+            phi_q_array = ((2 * iter_jnt_values_array - tmp_mm_jnt_values) / self.jnt_range_values) * k_phi
+            clamping_array = -(1 - wln_array) * phi_q_array
+            # pinv with weighted clamping
+            pinv_array = np.linalg.pinv(j_mat_array * wln_sqrt_array[:, None, :], rcond=1e-4)
+            rhs_array = clamped_err_vec_array - np.einsum('nij,nj->ni', j_mat_array, clamping_array)
+            delta_jnt_values_array = clamping_array + wln_sqrt_array * np.einsum('nij,nj->ni', pinv_array,
+                                                                                 rhs_array)
+            iter_jnt_values_array = iter_jnt_values_array + delta_jnt_values_array
+        return result_array, success_mask
+
     def pinv_gpm(self,
                  tgt_pos,
                  tgt_rotmat,
@@ -14,9 +14,11 @@ date: 20231107
 import numpy as np
 import multiprocessing as mp
 import basis.robot_math as rm
-import scipy.optimize as sopt
+import basis.utils as bu
 import robot_sim._kinematics.constant as rkc
 
+sopt = bu.lazy_import("scipy.optimize")
+
 
 class NumIKSolverProc(mp.Process):
 
@@ -335,6 +337,33 @@ class TracIKSolver(object):
                        max_n_iter=max_n_iter,
                        toggle_dbg=toggle_dbg)
 
+    def ik_batch(self,
+                 tgt_pos_array,
+                 tgt_rotmat_array,
+                 seed_jnt_values_array=None,
+                 max_n_iter=100):
+        """
+        solve the targets one by one; the solver processes handle one target at a time
+        :param tgt_pos_array: nx3 nparray
+        :param tgt_rotmat_array: nx3x3 nparray
+        :param seed_jnt_values_array: nxn_dof nparray or None
+        :param max_n_iter:
+        :return: jnt_values_array (nxn_dof, rows of failed targets are nan), success_mask (n bool)
+        """
+        n_tgts = len(tgt_pos_array)
+        result_array = np.full((n_tgts, self.jlc.n_dof), np.nan)
+        success_mask = np.zeros(n_tgts, dtype=bool)
+        for i in range(n_tgts):
+            seed_jnt_values = None if seed_jnt_values_array is None else seed_jnt_values_array[i]
+            result = self(tgt_pos=tgt_pos_array[i],
+                          tgt_rotmat=tgt_rotmat_array[i],
+                          seed_jnt_values=seed_jnt_values,
+                          max_n_iter=max_n_iter)
+            if result is not None:
+                result_array[i] = result
+                success_mask[i] = True
+        return result_array, success_mask
+
     def ik(self,
            tgt_pos,
            tgt_rotmat,
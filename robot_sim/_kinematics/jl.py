@@ -500,6 +500,20 @@ class Joint(object):
             pos_by_motion = self.loc_motion_ax * motion_value
             return self.loc_homomat @ rm.homomat_from_posrot(pos=pos_by_motion, rotmat=np.eye(3))
 
+    def get_motion_homomat_batch(self, motion_values):
+        """
+        vectorized version of get_motion_homomat
+        :param motion_values: 1xn nparray
+        :return: nx4x4 nparray
+        """
+        motion_values = np.asarray(motion_values, dtype=np.float64)
+        homomat_by_motion = np.tile(np.eye(4), (len(motion_values), 1, 1))
+        if self.type == rkc.JntType.REVOLUTE:
+            homomat_by_motion[:, :3, :3] = rm.rotmat_from_axangle_batch(self.loc_motion_ax, motion_values)
+        elif self.type == rkc.JntType.PRISMATIC:
+            homomat_by_motion[:, :3, 3] = np.outer(motion_values, self.loc_motion_ax)
+        return self.loc_homomat @ homomat_by_motion
+
     def gen_model(self,
                   toggle_frame_0=True,
                   toggle_frame_q=True,
@@ -178,6 +178,39 @@ class JLChain(object):
             else:
                 return self._gl_flange_pos, self._gl_flange_rotmat
 
+    def fk_batch(self, jnt_values_array, toggle_jacobian=False):
+        """
+        vectorized fk over many configurations; internal values are not updated
+        :param jnt_values_array: nxn_dof ndarray, each row is a configuration
+        :param toggle_jacobian: return jacobian matrices if true
+        :return: gl_flange_pos_array (nx3), gl_flange_rotmat_array (nx3x3), [j_mat_array (nx6xn_dof)]
+        """
+        jnt_values_array = np.asarray(jnt_values_array, dtype=np.float64).reshape(-1, self.n_dof)
+        n_confs = len(jnt_values_array)
+        homomat_array = np.tile(self.anchor.gl_flange_homomat_list[0], (n_confs, 1, 1))
+        jnt_pos_array = np.zeros((n_confs, self.n_dof, 3))
+        jnt_motion_ax_array = np.zeros((n_confs, self.n_dof, 3))
+        for i in range(self.flange_jnt_id + 1):
+            jnt_pos_array[:, i, :] = homomat_array[:, :3, 3] + homomat_array[:, :3, :3] @ self.jnts[i].loc_pos
+            homomat_array = homomat_array @ self.jnts[i].get_motion_homomat_batch(
+                motion_values=jnt_values_array[:, i])
+            jnt_motion_ax_array[:, i, :] = homomat_array[:, :3, :3] @ self.jnts[i].loc_motion_ax
+        gl_flange_homomat_array = homomat_array @ self.loc_flange_homomat
+        gl_flange_pos_array = gl_flange_homomat_array[:, :3, 3]
+        gl_flange_rotmat_array = gl_flange_homomat_array[:, :3, :3]
+        if toggle_jacobian:
+            j_mat_array = np.zeros((n_confs, 6, self.n_dof))
+            for i in range(self.flange_jnt_id + 1):
+                if self.jnts[i].type == rkc.JntType.REVOLUTE:
+                    j2t_vec_array = gl_flange_pos_array - jnt_pos_array[:, i, :]
+                    j_mat_array[:, :3, i] = np.cross(jnt_motion_ax_array[:, i, :], j2t_vec_array)
+                    j_mat_array[:, 3:6, i] = jnt_motion_ax_array[:, i, :]
+                if self.jnts[i].type == rkc.JntType.PRISMATIC:
+                    j_mat_array[:, :3, i] = jnt_motion_ax_array[:, i, :]
+            return gl_flange_pos_array, gl_flange_rotmat_array, j_mat_array
+        else:
+            return gl_flange_pos_array, gl_flange_rotmat_array
+
     def jacobian(self, jnt_values=None):
         """
         compute the jacobian matrix; use internal values if jnt_values is None
@@ -409,6 +442,24 @@ class JLChain(object):
                                      toggle_dbg=toggle_dbg)
         return jnt_values
 
+    @assert_finalize_decorator
+    def ik_batch(self,
+                 tgt_pos_array,
+                 tgt_rotmat_array,
+                 seeds=None):
+        """
+        solve many targets together
+        :param tgt_pos_array: nx3 nparray
+        :param tgt_rotmat_array: nx3x3 nparray
+        :param seeds: nxn_dof nparray, the starting configurations used in the numerical iteration
+        :return: jnt_values_array (nxn_dof, rows of failed targets are nan), success_mask (n bool)
+        """
+        if self._ik_solver is None:
+            raise Exception("IK solver undefined. Use JLChain.finalize to define it.")
+        return self._ik_solver.ik_batch(tgt_pos_array=tgt_pos_array,
+                                        tgt_rotmat_array=tgt_rotmat_array,
+                                        seed_jnt_values_array=seeds)
+
     def gen_stickmodel(self,
                        stick_rgba=rm.bc.lnk_stick_rgba,
                        toggle_jnt_frames=False,
@@ -3,6 +3,7 @@ import modeling.geometric_model as mgm
 import modeling.collision_model as mcm
 import modeling.model_collection as mmc
 import basis.robot_math as rm
+import basis.data_adapter as da
 import robot_sim._kinematics.constant as rkc
 import motion.motion_data as utils
 
@@ -61,11 +62,83 @@ def gen_lnk_mesh(lnk,
             cmodel.rgb = rgb
         if alpha is not None:
             cmodel.alpha = alpha
+        cmodel.src_lnk = lnk  # used by PosableMeshModel to follow the pose of the link
         return cmodel
     else:
         return mgm.GeometricModel(name="empty_lnk_mesh")
 
 
+class PosableMeshModel(object):
+    """
+    mesh model of a robot that is generated once and posed by pushing the global poses of the links into the
+    existing pandanodes (one setMat per link), used for animation instead of generating a mesh model per frame
+    only the link meshes follow the robot; frames and other decorations are not included
+    usage:
+        posable_meshmodel = PosableMeshModel(robot)
+        posable_meshmodel.attach_to(base)
+        # every frame
+        robot.goto_given_conf(jnt_values)
+        posable_meshmodel.update()
+    """
+
+    def __init__(self, robot, rgb=None, alpha=None, name="posable_meshmodel"):
+        self.robot = robot
+        self._rgb = rgb
+        self._alpha = alpha
+        self._name = name
+        self._target = None
+        self.m_col = None
+        self._lnk_cm_list = []
+        self._oiee_ids = None
+        self.rebuild()
+
+    def _get_oiee_ids(self):
+        return tuple(id(oiee) for oiee in self.robot.all_oiee_list)
+
+    def rebuild(self):
+        """
+        regenerate the mesh models, needed when links are added or removed, e.g., when the robot holds or
+        releases an object; update calls it automatically when the all_oiee_list of the robot changes
+        :return:
+        """
+        if self.m_col is not None:
+            self.m_col.detach()
+        self.m_col = self.robot.gen_meshmodel(rgb=self._rgb, alpha=self._alpha, name=self._name)
+        self._lnk_cm_list = [(cm.src_lnk, cm) for cm in self.m_col.cm_list if hasattr(cm, "src_lnk")]
+        self._oiee_ids = self._get_oiee_ids()
+        if self._target is not None:
+            self.m_col.attach_to(self._target)
+
+    def update(self):
+        """
+        push the current global poses of the links of self.robot into the mesh models
+        :return:
+        """
+        if self._get_oiee_ids() != self._oiee_ids:
+            self.rebuild()
+            return
+        for lnk, cm in self._lnk_cm_list:
+            cm.pdndp.setMat(da.npv3mat3_to_pdmat4(lnk.gl_pos, lnk.gl_rotmat))
+
+    def copy_to(self, robot):
+        """
+        a posable mesh model of robot with the same rgb, alpha, and name as this one, not attached
+        :param robot:
+        :return:
+        """
+        return PosableMeshModel(robot, rgb=self._rgb, alpha=self._alpha, name=self._name)
+
+    def attach_to(self, target):
+        if self._target is target:
+            return
+        self._target = target
+        self.m_col.attach_to(target)
+
+    def detach(self):
+        self._target = None
+        self.m_col.detach()
+
+
 def gen_anchor(anchor,
                toggle_root_frame=True,
                toggle_flange_frame=True,
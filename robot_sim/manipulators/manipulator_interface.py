@@ -2,6 +2,7 @@ import copy
 import numpy as np
 import basis.robot_math as rm
 import modeling.geometric_model as mgm
+import robot_sim._kinematics.constant as rkc
 import robot_sim._kinematics.jlchain as rkjlc
 import robot_sim._kinematics.collision_checker as cc
 
@@ -185,6 +186,38 @@ class ManipulatorInterface(object):
                            seed_jnt_values=seed_jnt_values,
                            toggle_dbg=toggle_dbg)
 
+    def ik_batch(self,
+                 tgt_pos_array: np.ndarray,
+                 tgt_rotmat_array: np.ndarray,
+                 seeds=None):
+        """
+        solve many tcp targets together using jlc.ik_batch
+        manipulators that override ik (analytical ik) are solved by calling their ik one by one
+        :param tgt_pos_array: nx3 nparray
+        :param tgt_rotmat_array: nx3x3 nparray
+        :param seeds: nxn_dof nparray
+        :return: jnt_values_array (nxn_dof, rows of failed targets are nan), success_mask (n bool)
+        """
+        tgt_pos_array = np.asarray(tgt_pos_array).reshape(-1, 3)
+        tgt_rotmat_array = np.asarray(tgt_rotmat_array).reshape(-1, 3, 3)
+        if type(self).ik is not ManipulatorInterface.ik:
+            n_tgts = len(tgt_pos_array)
+            result_array = np.full((n_tgts, self.jlc.n_dof), np.nan)
+            success_mask = np.zeros(n_tgts, dtype=bool)
+            for i in range(n_tgts):
+                result = self.ik(tgt_pos=tgt_pos_array[i],
+                                 tgt_rotmat=tgt_rotmat_array[i],
+                                 seed_jnt_values=None if seeds is None else seeds[i])
+                if result is not None:
+                    result_array[i] = result
+                    success_mask[i] = True
+            return result_array, success_mask
+        tgt_rotmat_array = tgt_rotmat_array @ self.loc_tcp_rotmat.T
+        tgt_pos_array = tgt_pos_array - tgt_rotmat_array @ self.loc_tcp_pos
+        return self.jlc.ik_batch(tgt_pos_array=tgt_pos_array,
+                                 tgt_rotmat_array=tgt_rotmat_array,
+                                 seeds=seeds)
+
     def jacobian(self, jnt_values=None):
         if jnt_values is None:
             j_mat = np.zeros((6, self.jlc.n_dof))
@@ -197,7 +230,7 @@ class ManipulatorInterface(object):
                     j_mat[:3, i] = self.jlc.jnts[i].gl_motion_ax
             return j_mat
         else:
-            homomat = self.jlc.anchor.gl_flange_homomat
+            homomat = self.jlc.anchor.gl_flange_homomat_list[0]
             jnt_pos = np.zeros((self.jlc.n_dof, 3))
             jnt_motion_ax = np.zeros((self.jlc.n_dof, 3))
             for i in range(self.jlc.flange_jnt_id + 1):
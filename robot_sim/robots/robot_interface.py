@@ -1,6 +1,49 @@
 import copy
 import numpy as np
+import modeling.geometric_model as mgm
 import robot_sim._kinematics.collision_checker as cc
+import robot_sim._kinematics.model_generator as rkmg
+import robot_sim._kinematics.ik_dd as rkd
+import robot_sim._kinematics.ik_trac as rkt
+
+
+def _gen_shared_memo(obj, memo=None):
+    """
+    walk the attributes of obj and register the immutable heavy members in a deepcopy memo, so that
+    copy.deepcopy(obj, memo) shares them instead of copying them
+    shared: the pose-free data of geometric/collision models (trimeshes, rendered geometry, collision solids,
+    ode trimesh data, bvhs), static geometric models, read-only nparrays (e.g., memmapped ik data),
+    the kd trees of DDIKSolver, and TracIKSolver (its worker processes cannot be copied)
+    geometric/collision models carry poses, they are replaced by light copies (see GeometricModel.light_copy)
+    :param obj:
+    :param memo: a dict, a new one is created if None
+    :return: memo
+    """
+    if memo is None:
+        memo = {}
+    visited = set()
+    stack = [obj]
+    while len(stack) > 0:
+        item = stack.pop()
+        if id(item) in visited:
+            continue
+        visited.add(id(item))
+        if isinstance(item, mgm.GeometricModel):
+            memo[id(item)] = item.light_copy()
+        elif isinstance(item, (mgm.StaticGeometricModel, rkt.TracIKSolver)):
+            memo[id(item)] = item
+        elif isinstance(item, np.ndarray):
+            if not item.flags.writeable:
+                memo[id(item)] = item
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            if isinstance(item, rkd.DDIKSolver):
+                memo[id(item.query_tree)] = item.query_tree
+            stack.extend(vars(item).values())
+    return memo
 
 
 class RobotInterface(object):
@@ -66,12 +109,33 @@ class RobotInterface(object):
         else:
             return self.delegator.oiee_list
 
+    @property
+    def all_oiee_list(self):
+        """
+        objects held by all end effectors of the robot regardless of the delegator, e.g., by both arms of a dual-arm
+        robot; the arms are the attributes that are robot interfaces themselves (the delegator is one of them)
+        :return:
+        """
+        arm_dict = {id(value): value for value in vars(self).values() if isinstance(value, RobotInterface)}
+        return [oiee for arm in arm_dict.values() for oiee in arm.all_oiee_list]
+
     def backup_state(self):
         raise NotImplementedError
 
     def restore_state(self):
         raise NotImplementedError
 
+    def gen_state_view(self):
+        """
+        a lightweight copy of the robot that shares the heavy immutable parts with this one: the mesh data of links
+        and held objects (trimeshes, collision solids, ode trimesh data) and ik databases are shared, while joint
+        values, the collision models wrapping the mesh data (with their poses), held objects, and the collision
+        checker (rebuilt with the same pairs) belong to the view
+        a view can be moved and collision-checked independently, e.g., one view per worker thread of a planner
+        :return: an instance of the same class
+        """
+        return copy.deepcopy(self, memo=_gen_shared_memo(self))
+
     def clear_cc(self):
         if self.cc is None:
             print("The cc is currently unavailable. Nothing to clear.")
@@ -107,6 +171,13 @@ class RobotInterface(object):
             return self.delegator.ik(tgt_pos=tgt_pos, tgt_rotmat=tgt_rotmat, seed_jnt_values=seed_jnt_values,
                                      toggle_dbg=toggle_dbg)
 
+    def ik_batch(self, tgt_pos_array, tgt_rotmat_array, seeds=None):
+        if self.delegator is None:
+            raise AttributeError("IK is not available.")
+        else:
+            return self.delegator.ik_batch(tgt_pos_array=tgt_pos_array, tgt_rotmat_array=tgt_rotmat_array,
+                                           seeds=seeds)
+
     def manipulability_val(self):
         if self.delegator is None:
             raise AttributeError("Manipulability value is not available.")
@@ -170,6 +241,16 @@ class RobotInterface(object):
                       name='single_arm_robot_interface_meshmodel'):
         raise NotImplementedError
 
+    def gen_posable_meshmodel(self, rgb=None, alpha=None, name='robot_interface_posable_meshmodel'):
+        """
+        a mesh model that follows the robot by updating the poses of its link meshes, see rkmg.PosableMeshModel
+        :param rgb:
+        :param alpha:
+        :param name:
+        :return:
+        """
+        return rkmg.PosableMeshModel(self, rgb=rgb, alpha=alpha, name=name)
+
     def is_collided(self, obstacle_list=None, other_robot_list=None, toggle_contacts=False):
         """
         Interface for "is cdprimit collided", must be implemented in child class
@@ -190,6 +271,29 @@ class RobotInterface(object):
                                                other_robot_list=other_robot_list,
                                                toggle_contacts=toggle_contacts)
 
+    def is_conf_list_collided(self, jnt_values_list, obstacle_list=None, other_robot_list=None, toggle_first_id=False):
+        """
+        check a sequence of confs (e.g., an interpolated segment) and stop at the first collided one
+        obstacles stay resident in the collision checker during the whole sequence
+        the state of the robot is restored after checking
+        :param jnt_values_list: a list of 1xn nparray
+        :param obstacle_list:
+        :param other_robot_list:
+        :param toggle_first_id: return (is_collided, id of the first collided conf or None) if True
+        :return:
+        """
+        self.backup_state()
+        first_id = None
+        for id, jnt_values in enumerate(jnt_values_list):
+            self.goto_given_conf(jnt_values=jnt_values)
+            if self.is_collided(obstacle_list=obstacle_list, other_robot_list=other_robot_list):
+                first_id = id
+                break
+        self.restore_state()
+        if toggle_first_id:
+            return first_id is not None, first_id
+        return first_id is not None
+
     def show_cdprim(self):
         """
         draw cdprim to base, you can use this function to double check if tf was correct
@@ -60,6 +60,10 @@ class SglArmRobotInterface(ri.RobotInterface):
     def oiee_list(self):
         return self.end_effector.oiee_list
 
+    @property
+    def all_oiee_list(self):
+        return [] if self.end_effector is None else self.end_effector.oiee_list
+
     def update_end_effector(self, ee_values=None):
         if self.end_effector is not None:
             if ee_values is not None:
@@ -106,6 +110,14 @@ class SglArmRobotInterface(ri.RobotInterface):
                                     seed_jnt_values=seed_jnt_values,
                                     toggle_dbg=toggle_dbg)
 
+    def ik_batch(self,
+                 tgt_pos_array: np.ndarray,
+                 tgt_rotmat_array: np.ndarray,
+                 seeds=None):
+        return self._manipulator.ik_batch(tgt_pos_array=tgt_pos_array,
+                                          tgt_rotmat_array=tgt_rotmat_array,
+                                          seeds=seeds)
+
     def manipulability_val(self):
         return self._manipulator.manipulability_val()
 
@@ -8,15 +8,41 @@ class RobotInfo(object):
         self.robot_path = None
         self.robot_path_counter = None
 
+    @staticmethod
+    def _cvt_meshmodel_parameters(robot_meshmodel_parameters):
+        """
+        :param robot_meshmodel_parameters: None, a dict with rgb, alpha, and name, or the old list
+                [tcp_jntid, tcp_loc_pos, tcp_loc_rotmat, toggle_tcpcs, toggle_jntscs, rgba, name]
+        :return: kwargs of robot_s.gen_posable_meshmodel
+        """
+        if robot_meshmodel_parameters is None:
+            return {}
+        if isinstance(robot_meshmodel_parameters, dict):
+            return robot_meshmodel_parameters
+        rgba, name = robot_meshmodel_parameters[5], robot_meshmodel_parameters[6]
+        kwargs = {} if name is None else {"name": name}
+        if rgba is not None:
+            kwargs.update(rgb=rgba[:3], alpha=rgba[3])
+        return kwargs
+
     @staticmethod
     def create_anime_info(robot_s,
                           robot_component_name,
                           robot_meshmodel_parameters,
                           robot_path):
+        """
+        :param robot_s:
+        :param robot_component_name: None or "all" for the whole robot, or the name of a component, e.g., "lft_arm"
+        :param robot_meshmodel_parameters: see _cvt_meshmodel_parameters
+        :param robot_path: a list of jnt values
+        :return:
+        """
         anime_info = RobotInfo()
         anime_info.robot_s = robot_s
         anime_info.robot_component_name = robot_component_name
-        anime_info.robot_meshmodel = robot_s.gen_mesh_model(robot_meshmodel_parameters)
+        # generated once and posed by World._external_update
+        anime_info.robot_meshmodel = robot_s.gen_posable_meshmodel(
+            **RobotInfo._cvt_meshmodel_parameters(robot_meshmodel_parameters))
         anime_info.robot_meshmodel_parameters = robot_meshmodel_parameters
         anime_info.robot_path = robot_path
         anime_info.robot_path_counter = 0
@@ -1,11 +1,14 @@
+import os
 from grpc_tools import protoc
 
+# generated from the root of the repository, so that the pb2_grpc module imports the pb2 module by package
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..")
 protoc.main(
     (
         '',
-        '-I.',
-        '--python_out=.',
-        '--grpc_python_out=.',
-        './rviz.proto',
+        f'-I{root_dir}',
+        f'--python_out={root_dir}',
+        f'--grpc_python_out={root_dir}',
+        os.path.join(root_dir, 'visualization/panda/rpc/rviz.proto'),
     )
-)
\ No newline at end of file
+)
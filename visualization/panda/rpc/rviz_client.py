@@ -1,11 +1,13 @@
 import pickle
 import grpc
+import queue
 import random
+import threading
 import numpy as np
 import visualization.panda.rpc.rviz_pb2 as rv_msg
 import visualization.panda.rpc.rviz_pb2_grpc as rv_rpc
 import modeling.geometric_model as gm
-import robot_sim.system.system_interface as ri
+import robot_sim.robots.robot_interface as ri
 
 
 class RVizClient(object):
@@ -14,6 +16,8 @@ class RVizClient(object):
         channel = grpc.insecure_channel(host)
         self.stub = rv_rpc.RVizStub(channel)
         # self.rmt_mesh_list = [] # TODO move to server side
+        self._state_queue = None
+        self._state_stream_thread = None
 
     def _gen_random_name(self, prefix):
         return prefix + str(random.randint(100000, 1e6))  # 6 digits
@@ -91,10 +95,84 @@ class RVizClient(object):
                                                                    data=pickle.dumps(loc_instance)))
         return given_rmt_robot_s_name
 
+    @staticmethod
+    def gen_state_batch(rmt_robot_names=(), jnt_values_list=(), rmt_obj_names=(), homomat_list=()):
+        """
+        pack the joint values and homomats of remote instances into a binary StateBatch
+        :param rmt_robot_names: names of remote robots
+        :param jnt_values_list: a list of 1xn nparrays, one for each remote robot
+        :param rmt_obj_names: names of remote objects
+        :param homomat_list: a list of 4x4 nparrays, one for each remote object
+        :return:
+        """
+        if len(rmt_robot_names) != len(jnt_values_list) or len(rmt_obj_names) != len(homomat_list):
+            raise ValueError("The number of names and states must be the same!")
+        jnt_values_list = [np.asarray(jnt_values, dtype='<f8').ravel() for jnt_values in jnt_values_list]
+        robot_jnt_values = np.concatenate(jnt_values_list) if len(jnt_values_list) > 0 else np.zeros(0, dtype='<f8')
+        obj_homomats = np.asarray(homomat_list, dtype='<f8').reshape(-1, 4, 4)
+        return rv_msg.StateBatch(robot_names=rmt_robot_names,
+                                 robot_n_dofs=[len(jnt_values) for jnt_values in jnt_values_list],
+                                 robot_jnt_values=robot_jnt_values.tobytes(),
+                                 obj_names=rmt_obj_names,
+                                 obj_homomats=obj_homomats.tobytes())
+
+    def open_state_stream(self, max_queue_size=2):
+        """
+        open a client-streaming call to the server; batches are sent by a background thread
+        :param max_queue_size: batches waiting to be sent, the oldest one is dropped when full
+        :return:
+        """
+        if self._state_stream_thread is not None:
+            return
+        self._state_queue = queue.Queue(maxsize=max_queue_size)
+
+        def _stream():
+            return_val = self.stub.stream_states(iter(self._state_queue.get, None)).value
+            if return_val == rv_msg.Status.ERROR:
+                print("Something went wrong with the server while streaming states!")
+
+        self._state_stream_thread = threading.Thread(target=_stream, daemon=True)
+        self._state_stream_thread.start()
+
+    def close_state_stream(self):
+        """
+        finish the client-streaming call and wait for the server to respond
+        :return:
+        """
+        if self._state_stream_thread is None:
+            return
+        self._state_queue.put(None)
+        self._state_stream_thread.join()
+        self._state_queue = None
+        self._state_stream_thread = None
+
+    def update_remote_states(self, rmt_robot_names=(), jnt_values_list=(), rmt_obj_names=(), homomat_list=()):
+        """
+        send the states of several remote instances in one binary message without waiting for the server;
+        only the latest states are shown when the server renders, stale batches are dropped
+        :param rmt_robot_names:
+        :param jnt_values_list:
+        :param rmt_obj_names:
+        :param homomat_list:
+        :return:
+        """
+        self.open_state_stream()
+        state_batch = self.gen_state_batch(rmt_robot_names, jnt_values_list, rmt_obj_names, homomat_list)
+        while True:
+            try:
+                self._state_queue.put_nowait(state_batch)
+                return
+            except queue.Full:
+                try:
+                    self._state_queue.get_nowait()
+                except queue.Empty:
+                    pass
+
     def update_remote(self, rmt_instance, loc_instance):
         if isinstance(loc_instance, ri.RobotInterface):
-            code = ("%s.fk(jnt_values=np.array(%s), hnd_name='all')\n" %
-                    (rmt_instance, np.array2string(loc_instance.get_jnt_values(), separator=',')))
+            self.update_remote_states(rmt_robot_names=[rmt_instance],
+                                      jnt_values_list=[loc_instance.get_jnt_values()])
+            return
         elif isinstance(loc_instance, gm.GeometricModel):
             code = ("%s.set_pos(np.array(%s))\n" % (
             rmt_instance, np.array2string(loc_instance.get_pos(), separator=',')) +
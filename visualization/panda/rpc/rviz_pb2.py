@@ -1,11 +1,22 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
-# source: rviz.proto
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: visualization/panda/rpc/rviz.proto
+# Protobuf Python Version: 7.35.1
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
 from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'visualization/panda/rpc/rviz.proto'
+)
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
@@ -13,242 +24,25 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor.FileDescriptor(
-  name='rviz.proto',
-  package='',
-  syntax='proto3',
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\nrviz.proto\"\x07\n\x05\x45mpty\"\x1b\n\x0b\x43odeRequest\x12\x0c\n\x04\x63ode\x18\x01 \x01(\x0c\"3\n\x15\x43reateInstanceRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\"P\n\x06Status\x12\"\n\x05value\x18\x01 \x01(\x0e\x32\x13.Status.StatusValue\"\"\n\x0bStatusValue\x12\t\n\x05\x45RROR\x10\x00\x12\x08\n\x04\x44ONE\x10\x01\x32\x61\n\x04RViz\x12#\n\x08run_code\x12\x0c.CodeRequest\x1a\x07.Status\"\x00\x12\x34\n\x0f\x63reate_instance\x12\x16.CreateInstanceRequest\x1a\x07.Status\"\x00\x62\x06proto3'
-)
-
-
-
-_STATUS_STATUSVALUE = _descriptor.EnumDescriptor(
-  name='StatusValue',
-  full_name='Status.StatusValue',
-  filename=None,
-  file=DESCRIPTOR,
-  create_key=_descriptor._internal_create_key,
-  values=[
-    _descriptor.EnumValueDescriptor(
-      name='ERROR', index=0, number=0,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='DONE', index=1, number=1,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-  ],
-  containing_type=None,
-  serialized_options=None,
-  serialized_start=151,
-  serialized_end=185,
-)
-_sym_db.RegisterEnumDescriptor(_STATUS_STATUSVALUE)
-
-
-_EMPTY = _descriptor.Descriptor(
-  name='Empty',
-  full_name='Empty',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=14,
-  serialized_end=21,
-)
-
-
-_CODEREQUEST = _descriptor.Descriptor(
-  name='CodeRequest',
-  full_name='CodeRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='code', full_name='CodeRequest.code', index=0,
-      number=1, type=12, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"",
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=23,
-  serialized_end=50,
-)
-
-
-_CREATEINSTANCEREQUEST = _descriptor.Descriptor(
-  name='CreateInstanceRequest',
-  full_name='CreateInstanceRequest',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='name', full_name='CreateInstanceRequest.name', index=0,
-      number=1, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='data', full_name='CreateInstanceRequest.data', index=1,
-      number=2, type=12, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"",
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=52,
-  serialized_end=103,
-)
-
-
-_STATUS = _descriptor.Descriptor(
-  name='Status',
-  full_name='Status',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='value', full_name='Status.value', index=0,
-      number=1, type=14, cpp_type=8, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-    _STATUS_STATUSVALUE,
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=105,
-  serialized_end=185,
-)
-
-_STATUS.fields_by_name['value'].enum_type = _STATUS_STATUSVALUE
-_STATUS_STATUSVALUE.containing_type = _STATUS
-DESCRIPTOR.message_types_by_name['Empty'] = _EMPTY
-DESCRIPTOR.message_types_by_name['CodeRequest'] = _CODEREQUEST
-DESCRIPTOR.message_types_by_name['CreateInstanceRequest'] = _CREATEINSTANCEREQUEST
-DESCRIPTOR.message_types_by_name['Status'] = _STATUS
-_sym_db.RegisterFileDescriptor(DESCRIPTOR)
-
-Empty = _reflection.GeneratedProtocolMessageType('Empty', (_message.Message,), {
-  'DESCRIPTOR' : _EMPTY,
-  '__module__' : 'rviz_pb2'
-  # @@protoc_insertion_point(class_scope:Empty)
-  })
-_sym_db.RegisterMessage(Empty)
-
-CodeRequest = _reflection.GeneratedProtocolMessageType('CodeRequest', (_message.Message,), {
-  'DESCRIPTOR' : _CODEREQUEST,
-  '__module__' : 'rviz_pb2'
-  # @@protoc_insertion_point(class_scope:CodeRequest)
-  })
-_sym_db.RegisterMessage(CodeRequest)
-
-CreateInstanceRequest = _reflection.GeneratedProtocolMessageType('CreateInstanceRequest', (_message.Message,), {
-  'DESCRIPTOR' : _CREATEINSTANCEREQUEST,
-  '__module__' : 'rviz_pb2'
-  # @@protoc_insertion_point(class_scope:CreateInstanceRequest)
-  })
-_sym_db.RegisterMessage(CreateInstanceRequest)
-
-Status = _reflection.GeneratedProtocolMessageType('Status', (_message.Message,), {
-  'DESCRIPTOR' : _STATUS,
-  '__module__' : 'rviz_pb2'
-  # @@protoc_insertion_point(class_scope:Status)
-  })
-_sym_db.RegisterMessage(Status)
-
-
-
-_RVIZ = _descriptor.ServiceDescriptor(
-  name='RViz',
-  full_name='RViz',
-  file=DESCRIPTOR,
-  index=0,
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_start=187,
-  serialized_end=284,
-  methods=[
-  _descriptor.MethodDescriptor(
-    name='run_code',
-    full_name='RViz.run_code',
-    index=0,
-    containing_service=None,
-    input_type=_CODEREQUEST,
-    output_type=_STATUS,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-  _descriptor.MethodDescriptor(
-    name='create_instance',
-    full_name='RViz.create_instance',
-    index=1,
-    containing_service=None,
-    input_type=_CREATEINSTANCEREQUEST,
-    output_type=_STATUS,
-    serialized_options=None,
-    create_key=_descriptor._internal_create_key,
-  ),
-])
-_sym_db.RegisterServiceDescriptor(_RVIZ)
-
-DESCRIPTOR.services_by_name['RViz'] = _RVIZ
-
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\"visualization/panda/rpc/rviz.proto\x12\x04rviz\"\x07\n\x05\x45mpty\"\x1b\n\x0b\x43odeRequest\x12\x0c\n\x04\x63ode\x18\x01 \x01(\x0c\"3\n\x15\x43reateInstanceRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\x0c\"U\n\x06Status\x12\'\n\x05value\x18\x01 \x01(\x0e\x32\x18.rviz.Status.StatusValue\"\"\n\x0bStatusValue\x12\t\n\x05\x45RROR\x10\x00\x12\x08\n\x04\x44ONE\x10\x01\"z\n\nStateBatch\x12\x13\n\x0brobot_names\x18\x01 \x03(\t\x12\x14\n\x0crobot_n_dofs\x18\x02 \x03(\x05\x12\x18\n\x10robot_jnt_values\x18\x03 \x01(\x0c\x12\x11\n\tobj_names\x18\x04 \x03(\t\x12\x14\n\x0cobj_homomats\x18\x05 \x01(\x0c\x32\xaa\x01\n\x04RViz\x12-\n\x08run_code\x12\x11.rviz.CodeRequest\x1a\x0c.rviz.Status\"\x00\x12>\n\x0f\x63reate_instance\x12\x1b.rviz.CreateInstanceRequest\x1a\x0c.rviz.Status\"\x00\x12\x33\n\rstream_states\x12\x10.rviz.StateBatch\x1a\x0c.rviz.Status\"\x00(\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'visualization.panda.rpc.rviz_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_EMPTY']._serialized_start=44
+  _globals['_EMPTY']._serialized_end=51
+  _globals['_CODEREQUEST']._serialized_start=53
+  _globals['_CODEREQUEST']._serialized_end=80
+  _globals['_CREATEINSTANCEREQUEST']._serialized_start=82
+  _globals['_CREATEINSTANCEREQUEST']._serialized_end=133
+  _globals['_STATUS']._serialized_start=135
+  _globals['_STATUS']._serialized_end=220
+  _globals['_STATUS_STATUSVALUE']._serialized_start=186
+  _globals['_STATUS_STATUSVALUE']._serialized_end=220
+  _globals['_STATEBATCH']._serialized_start=222
+  _globals['_STATEBATCH']._serialized_end=344
+  _globals['_RVIZ']._serialized_start=347
+  _globals['_RVIZ']._serialized_end=517
 # @@protoc_insertion_point(module_scope)
@@ -1,11 +1,31 @@
 # Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
 """Client and server classes corresponding to protobuf-defined services."""
 import grpc
+import warnings
 
-import visualization.panda.rpc.rviz_pb2 as rviz__pb2
+from visualization.panda.rpc import rviz_pb2 as visualization_dot_panda_dot_rpc_dot_rviz__pb2
 
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
 
-class RVizStub(object):
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in visualization/panda/rpc/rviz_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class RVizStub:
     """Missing associated documentation comment in .proto file."""
 
     def __init__(self, channel):
@@ -15,18 +35,23 @@ class RVizStub(object):
             channel: A grpc.Channel.
         """
         self.run_code = channel.unary_unary(
-                '/RViz/run_code',
-                request_serializer=rviz__pb2.CodeRequest.SerializeToString,
-                response_deserializer=rviz__pb2.Status.FromString,
-                )
+                '/rviz.RViz/run_code',
+                request_serializer=visualization_dot_panda_dot_rpc_dot_rviz__pb2.CodeRequest.SerializeToString,
+                response_deserializer=visualization_dot_panda_dot_rpc_dot_rviz__pb2.Status.FromString,
+                _registered_method=True)
         self.create_instance = channel.unary_unary(
-                '/RViz/create_instance',
-                request_serializer=rviz__pb2.CreateInstanceRequest.SerializeToString,
-                response_deserializer=rviz__pb2.Status.FromString,
-                )
+                '/rviz.RViz/create_instance',
+                request_serializer=visualization_dot_panda_dot_rpc_dot_rviz__pb2.CreateInstanceRequest.SerializeToString,
+                response_deserializer=visualization_dot_panda_dot_rpc_dot_rviz__pb2.Status.FromString,
+                _registered_method=True)
+        self.stream_states = channel.stream_unary(
+                '/rviz.RViz/stream_states',
+                request_serializer=visualization_dot_panda_dot_rpc_dot_rviz__pb2.StateBatch.SerializeToString,
+                response_deserializer=visualization_dot_panda_dot_rpc_dot_rviz__pb2.Status.FromString,
+                _registered_method=True)
 
 
-class RVizServicer(object):
+class RVizServicer:
     """Missing associated documentation comment in .proto file."""
 
     def run_code(self, request, context):
@@ -41,27 +66,39 @@ class RVizServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def stream_states(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_RVizServicer_to_server(servicer, server):
     rpc_method_handlers = {
             'run_code': grpc.unary_unary_rpc_method_handler(
                     servicer.run_code,
-                    request_deserializer=rviz__pb2.CodeRequest.FromString,
-                    response_serializer=rviz__pb2.Status.SerializeToString,
+                    request_deserializer=visualization_dot_panda_dot_rpc_dot_rviz__pb2.CodeRequest.FromString,
+                    response_serializer=visualization_dot_panda_dot_rpc_dot_rviz__pb2.Status.SerializeToString,
             ),
             'create_instance': grpc.unary_unary_rpc_method_handler(
                     servicer.create_instance,
-                    request_deserializer=rviz__pb2.CreateInstanceRequest.FromString,
-                    response_serializer=rviz__pb2.Status.SerializeToString,
+                    request_deserializer=visualization_dot_panda_dot_rpc_dot_rviz__pb2.CreateInstanceRequest.FromString,
+                    response_serializer=visualization_dot_panda_dot_rpc_dot_rviz__pb2.Status.SerializeToString,
+            ),
+            'stream_states': grpc.stream_unary_rpc_method_handler(
+                    servicer.stream_states,
+                    request_deserializer=visualization_dot_panda_dot_rpc_dot_rviz__pb2.StateBatch.FromString,
+                    response_serializer=visualization_dot_panda_dot_rpc_dot_rviz__pb2.Status.SerializeToString,
             ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
-            'RViz', rpc_method_handlers)
+            'rviz.RViz', rpc_method_handlers)
     server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('rviz.RViz', rpc_method_handlers)
 
 
  # This class is part of an EXPERIMENTAL API.
-class RViz(object):
+class RViz:
     """Missing associated documentation comment in .proto file."""
 
     @staticmethod
@@ -75,11 +112,21 @@ class RViz(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/RViz/run_code',
-            rviz__pb2.CodeRequest.SerializeToString,
-            rviz__pb2.Status.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/rviz.RViz/run_code',
+            visualization_dot_panda_dot_rpc_dot_rviz__pb2.CodeRequest.SerializeToString,
+            visualization_dot_panda_dot_rpc_dot_rviz__pb2.Status.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
 
     @staticmethod
     def create_instance(request,
@@ -92,8 +139,45 @@ class RViz(object):
             wait_for_ready=None,
             timeout=None,
             metadata=None):
-        return grpc.experimental.unary_unary(request, target, '/RViz/create_instance',
-            rviz__pb2.CreateInstanceRequest.SerializeToString,
-            rviz__pb2.Status.FromString,
-            options, channel_credentials,
-            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/rviz.RViz/create_instance',
+            visualization_dot_panda_dot_rpc_dot_rviz__pb2.CreateInstanceRequest.SerializeToString,
+            visualization_dot_panda_dot_rpc_dot_rviz__pb2.Status.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def stream_states(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/rviz.RViz/stream_states',
+            visualization_dot_panda_dot_rpc_dot_rviz__pb2.StateBatch.SerializeToString,
+            visualization_dot_panda_dot_rpc_dot_rviz__pb2.Status.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,15 +1,29 @@
 import grpc
 import pickle
+import threading
+import numpy as np
 from concurrent import futures
+import modeling.geometric_model as gm
 import modeling.model_collection as mc
 import visualization.panda.rpc.rviz_pb2 as rv_msg
 import visualization.panda.rpc.rviz_pb2_grpc as rv_rpc
 import visualization.panda.world as wd
-import robot_sim.system.system_interface as ri
+import robot_sim.robots.robot_interface as ri
 
 
 class RVizServer(rv_rpc.RVizServicer):
 
+    def __init__(self, toggle_dbg=False):
+        """
+        :param toggle_dbg: print the received code line by line
+        """
+        self.toggle_dbg = toggle_dbg
+        # latest states received by stream_states, applied once per frame by render_update
+        self._state_lock = threading.Lock()
+        self._pending_jnt_values_dict = {}  # remote robot name: jnt values
+        self._pending_homomat_dict = {}  # remote obj name: homomat
+        self._posable_meshmodel_dict = {}  # remote robot name: posable mesh model
+
     def run_code(self, request, context):
         """
         author: weiwei
@@ -17,8 +31,9 @@ class RVizServer(rv_rpc.RVizServicer):
         """
         try:
             code = request.code.decode('utf-8')
-            for i, line in enumerate(code.splitlines()):
-                print("{:< 4d}".format(i), ": ", line)
+            if self.toggle_dbg:
+                for i, line in enumerate(code.splitlines()):
+                    print("{:< 4d}".format(i), ": ", line)
             exec(code, globals())
             return rv_msg.Status(value=rv_msg.Status.DONE)
         except Exception as e:
@@ -45,9 +60,9 @@ class RVizServer(rv_rpc.RVizServicer):
             elif isinstance(globals()[name], mc.ModelCollection):
                 for cm in globals()[name].cm_list:
                     cm.pdndp_core.setShaderAuto()
-                for gm in globals()[name].gm_list:
-                    if isinstance(gm, gm.GeometricModel):
-                        gm.pdndp_core.setShaderAuto()
+                for gmodel in globals()[name].gm_list:
+                    if isinstance(gmodel, gm.GeometricModel):
+                        gmodel.pdndp_core.setShaderAuto()
             elif isinstance(globals()[name], ri.RobotInterface):
                 globals()[name].enable_cc()
             return rv_msg.Status(value=rv_msg.Status.DONE)
@@ -55,6 +70,69 @@ class RVizServer(rv_rpc.RVizServicer):
             print(e, type(e))
             return rv_msg.Status(value=rv_msg.Status.ERROR)
 
+    def stream_states(self, request_iterator, context):
+        """
+        receive StateBatch messages; only the latest state of each instance is kept until the next frame,
+        so a client sending faster than the render rate does not build up lag
+        states of names that are not robots or geometric models created by create_instance/run_code are dropped
+        :param request_iterator:
+        :param context:
+        :return:
+        """
+        try:
+            for state_batch in request_iterator:
+                jnt_values_array = np.frombuffer(state_batch.robot_jnt_values, dtype='<f8')
+                n_dofs = np.asarray(state_batch.robot_n_dofs, dtype=int)
+                if len(n_dofs) != len(state_batch.robot_names) or n_dofs.sum() != len(jnt_values_array):
+                    raise ValueError("The robot names, n_dofs, and jnt values of the StateBatch do not match!")
+                homomat_array = np.frombuffer(state_batch.obj_homomats, dtype='<f8').reshape(-1, 4, 4)
+                if len(homomat_array) != len(state_batch.obj_names):
+                    raise ValueError("The obj names and homomats of the StateBatch do not match!")
+                jnt_values_list = np.split(jnt_values_array, np.cumsum(n_dofs)[:-1]) if len(n_dofs) > 0 else []
+                jnt_values_dict = {name: jnt_values for name, jnt_values in zip(state_batch.robot_names, jnt_values_list)
+                                   if isinstance(globals().get(name), ri.RobotInterface)}
+                homomat_dict = {name: homomat for name, homomat in zip(state_batch.obj_names, homomat_array)
+                                if isinstance(globals().get(name), gm.GeometricModel)}
+                unknown_names = [name for name in state_batch.robot_names if name not in jnt_values_dict] + \
+                                [name for name in state_batch.obj_names if name not in homomat_dict]
+                if self.toggle_dbg and len(unknown_names) > 0:
+                    print("Dropped the states of unknown instances: ", unknown_names)
+                with self._state_lock:
+                    self._pending_jnt_values_dict.update(jnt_values_dict)
+                    self._pending_homomat_dict.update(homomat_dict)
+            return rv_msg.Status(value=rv_msg.Status.DONE)
+        except Exception as e:
+            print(e, type(e))
+            return rv_msg.Status(value=rv_msg.Status.ERROR)
+
+    def render_update(self, task):
+        """
+        apply the latest streamed states, registered as a task of the world so that it runs once per frame
+        robots are shown with posable mesh models that are generated when their first state arrives
+        :param task:
+        :return:
+        """
+        with self._state_lock:
+            jnt_values_dict, self._pending_jnt_values_dict = self._pending_jnt_values_dict, {}
+            homomat_dict, self._pending_homomat_dict = self._pending_homomat_dict, {}
+        for name, jnt_values in jnt_values_dict.items():
+            robot_s = globals().get(name)
+            if robot_s is None:  # removed by run_code after its state was received
+                continue
+            robot_s.goto_given_conf(jnt_values=jnt_values)
+            if name not in self._posable_meshmodel_dict:
+                self._posable_meshmodel_dict[name] = robot_s.gen_posable_meshmodel()
+                self._posable_meshmodel_dict[name].attach_to(base)
+            self._posable_meshmodel_dict[name].update()
+        for name, homomat in homomat_dict.items():
+            obj = globals().get(name)
+            if obj is None:
+                continue
+            obj.homomat = homomat
+            obj.attach_to(base)
+        return task.cont
+
+
 def serve(host="localhost:18300"):
     base = wd.World(cam_pos=[1, 1, 1], lookat_pos=[0, 0, 0])
     _ONE_DAY_IN_SECONDS = 60 * 60 * 24
@@ -63,6 +141,7 @@ def serve(host="localhost:18300"):
     server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), options=options)
     rvs = RVizServer()
     rv_rpc.add_RVizServicer_to_server(rvs, server)
+    base.taskMgr.add(rvs.render_update, "rviz_render_update", appendTask=True)
     server.add_insecure_port(host)
     server.start()
     print("The RViz server is started!")
@@ -70,4 +149,4 @@ def serve(host="localhost:18300"):
 
 
 if __name__ == "__main__":
-    serve(host="localhost:182001")
+    serve(host="localhost:18300")
@@ -203,20 +203,14 @@ class World(ShowBase, object):
         for _external_update_robotinfo in self._external_update_robotinfo_list:
             robot_s = _external_update_robotinfo.robot_s
             robot_component_name = _external_update_robotinfo.robot_component_name
-            robot_meshmodel = _external_update_robotinfo.robot_meshmodel
-            robot_meshmodel_parameter = _external_update_robotinfo.robot_meshmodel_parameters
             robot_path = _external_update_robotinfo.robot_path
             robot_path_counter = _external_update_robotinfo.robot_path_counter
-            robot_meshmodel.detach()
-            robot_s.fk(component_name=robot_component_name, joint_values=robot_path[robot_path_counter])
-            _external_update_robotinfo.robot_meshmodel = robot_s.gen_mesh_model(
-                tcp_jntid=robot_meshmodel_parameter[0],
-                tcp_loc_pos=robot_meshmodel_parameter[1],
-                tcp_loc_rotmat=robot_meshmodel_parameter[2],
-                toggle_tcpcs=robot_meshmodel_parameter[3],
-                toggle_jntscs=robot_meshmodel_parameter[4],
-                rgba=robot_meshmodel_parameter[5],
-                name=robot_meshmodel_parameter[6])
+            if robot_component_name is None or robot_component_name == "all":
+                robot_s.goto_given_conf(jnt_values=robot_path[robot_path_counter])
+            else:
+                getattr(robot_s, robot_component_name).goto_given_conf(jnt_values=robot_path[robot_path_counter])
+            # the mesh model is generated once in anime_info.RobotInfo, only the link poses are pushed per frame
+            _external_update_robotinfo.robot_meshmodel.update()
             _external_update_robotinfo.robot_meshmodel.attach_to(self)
             _external_update_robotinfo.robot_path_counter += 1
             if _external_update_robotinfo.robot_path_counter >= len(robot_path):